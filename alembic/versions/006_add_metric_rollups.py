@@ -0,0 +1,66 @@
+"""add metric rollups
+
+Revision ID: 006
+Revises: 005
+Create Date: 2025-01-20 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'metric_rollups',
+        sa.Column('id', sa.String(36), nullable=False),
+        sa.Column('contract_id', sa.String(36), nullable=False),
+        sa.Column('rollup_date', sa.Date(), nullable=False),
+        sa.Column('hour', sa.Integer(), nullable=False),
+        sa.Column('passed', sa.Integer(), nullable=False),
+        sa.Column('failed', sa.Integer(), nullable=False),
+        sa.Column('execution_time_ms', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    
+    op.create_index(
+        'ix_metric_rollups_contract_date_hour',
+        'metric_rollups',
+        ['contract_id', 'rollup_date', 'hour'],
+        unique=True
+    )
+    op.create_index('ix_metric_rollups_date', 'metric_rollups', ['rollup_date'], unique=False)
+    
+    op.create_table(
+        'metric_rollup_errors',
+        sa.Column('id', sa.String(36), nullable=False),
+        sa.Column('contract_id', sa.String(36), nullable=False),
+        sa.Column('rollup_date', sa.Date(), nullable=False),
+        sa.Column('hour', sa.Integer(), nullable=False),
+        sa.Column('error_type', sa.String(100), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    
+    op.create_index(
+        'ix_metric_rollup_errors_contract_date_hour_type',
+        'metric_rollup_errors',
+        ['contract_id', 'rollup_date', 'hour', 'error_type'],
+        unique=True
+    )
+
+
+def downgrade():
+    op.drop_index('ix_metric_rollup_errors_contract_date_hour_type', 'metric_rollup_errors')
+    op.drop_table('metric_rollup_errors')
+    op.drop_index('ix_metric_rollups_date', 'metric_rollups')
+    op.drop_index('ix_metric_rollups_contract_date_hour', 'metric_rollups')
+    op.drop_table('metric_rollups')
@@ -0,0 +1,158 @@
+"""partition validation results and batch summaries
+
+Revision ID: 007
+Revises: 006
+Create Date: 2025-01-27 10:00:00.000000
+
+Postgres only: validation_results and batch_summaries become tables
+range-partitioned by validated_at / processed_at, one partition per month
+plus a default partition. Existing rows are copied into the new layout.
+Other dialects keep the plain tables.
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+# Months created past the current one; the scheduler keeps extending this.
+PRECREATE_MONTHS = 3
+
+TABLES = {
+    'validation_results': {
+        'column': 'validated_at',
+        'indexes': [
+            ('ix_validation_results_batch_id', ['batch_id']),
+            ('ix_validation_results_contract_date', ['contract_id', 'validated_at']),
+            ('ix_validation_results_contract_id', ['contract_id']),
+            ('ix_validation_results_status', ['status']),
+            ('ix_validation_results_validated_at', ['validated_at']),
+        ],
+    },
+    'batch_summaries': {
+        'column': 'processed_at',
+        'indexes': [
+            ('ix_batch_summaries_batch_id', ['batch_id']),
+            ('ix_batch_summaries_contract_id', ['contract_id']),
+            ('ix_batch_summaries_processed_at', ['processed_at']),
+        ],
+    },
+}
+
+
+def _columns(table):
+    if table == 'validation_results':
+        return [
+            sa.Column('id', sa.String(36), nullable=False),
+            sa.Column('contract_id', sa.String(36), nullable=False),
+            sa.Column('status', sa.String(20), nullable=False),
+            sa.Column('data_snapshot', sa.JSON(), nullable=True),
+            sa.Column('errors', sa.JSON(), nullable=True),
+            sa.Column('execution_time_ms', sa.Float(), nullable=False),
+            sa.Column('validated_at', sa.DateTime(), nullable=False),
+            sa.Column('batch_id', sa.String(36), nullable=True),
+        ]
+    return [
+        sa.Column('id', sa.String(36), nullable=False),
+        sa.Column('batch_id', sa.String(36), nullable=False),
+        sa.Column('contract_id', sa.String(36), nullable=False),
+        sa.Column('total_records', sa.Integer(), nullable=False),
+        sa.Column('passed', sa.Integer(), nullable=False),
+        sa.Column('failed', sa.Integer(), nullable=False),
+        sa.Column('pass_rate', sa.Float(), nullable=False),
+        sa.Column('execution_time_ms', sa.Float(), nullable=False),
+        sa.Column('errors_summary', sa.JSON(), nullable=True),
+        sa.Column('processed_at', sa.DateTime(), nullable=False),
+    ]
+
+
+def _next_month(start):
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def _drop_indexes(table):
+    inspector = sa.inspect(op.get_bind())
+    for index in inspector.get_indexes(table):
+        op.drop_index(index['name'], table_name=table)
+
+
+def _copy_columns(table):
+    return ', '.join(column.name for column in _columns(table))
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, spec in TABLES.items():
+        column = spec['column']
+        legacy = f'{table}_unpartitioned'
+
+        _drop_indexes(table)
+        op.rename_table(table, legacy)
+        op.execute(f'ALTER TABLE {legacy} RENAME CONSTRAINT {table}_pkey TO {legacy}_pkey')
+
+        op.create_table(
+            table,
+            *_columns(table),
+            sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id', column),
+            postgresql_partition_by=f'RANGE ({column})'
+        )
+
+        oldest = op.get_bind().execute(sa.text(f'SELECT min({column}) FROM {legacy}')).scalar()
+        start = (oldest.date() if oldest else date.today()).replace(day=1)
+        last = date.today().replace(day=1)
+        for _ in range(PRECREATE_MONTHS):
+            last = _next_month(last)
+
+        while start <= last:
+            end = _next_month(start)
+            op.execute(
+                f"CREATE TABLE {table}_p{start.strftime('%Y%m')} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+            start = end
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+        columns = _copy_columns(table)
+        op.execute(f'INSERT INTO {table} ({columns}) SELECT {columns} FROM {legacy}')
+        op.drop_table(legacy)
+
+        for name, index_columns in spec['indexes']:
+            op.create_index(name, table, index_columns, unique=False)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, spec in TABLES.items():
+        partitioned = f'{table}_partitioned'
+
+        _drop_indexes(table)
+        op.rename_table(table, partitioned)
+        op.execute(f'ALTER TABLE {partitioned} RENAME CONSTRAINT {table}_pkey TO {partitioned}_pkey')
+
+        op.create_table(
+            table,
+            *_columns(table),
+            sa.ForeignKeyConstraint(['contract_id'], ['contracts.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+        columns = _copy_columns(table)
+        op.execute(f'INSERT INTO {table} ({columns}) SELECT {columns} FROM {partitioned}')
+        op.drop_table(partitioned)
+
+        for name, index_columns in spec['indexes']:
+            op.create_index(name, table, index_columns, unique=name == 'ix_batch_summaries_batch_id')
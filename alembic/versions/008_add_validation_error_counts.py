@@ -0,0 +1,93 @@
+"""add validation error counts
+
+Revision ID: 008
+Revises: 007
+Create Date: 2025-02-03 10:00:00.000000
+
+"""
+import json
+import uuid
+from collections import Counter
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def _backfill(table):
+    conn = op.get_bind()
+    result = conn.execution_options(stream_results=True).execute(sa.text(
+        "SELECT contract_id, validated_at, errors FROM validation_results "
+        "WHERE status = 'FAIL' AND errors IS NOT NULL"
+    ))
+
+    counts = Counter()
+    for contract_id, validated_at, errors in result:
+        if isinstance(errors, str):
+            errors = json.loads(errors)
+        if isinstance(validated_at, str):
+            validated_at = datetime.fromisoformat(validated_at)
+        if not isinstance(errors, list):
+            continue
+
+        bucket = validated_at.replace(minute=0, second=0, microsecond=0)
+        for error in errors:
+            counts[(
+                contract_id,
+                bucket,
+                error.get('field') or '',
+                error.get('error_type') or 'UNKNOWN'
+            )] += 1
+
+    rows = [
+        {
+            'id': str(uuid.uuid4()),
+            'contract_id': contract_id,
+            'bucket_start': bucket,
+            'field': field,
+            'error_type': error_type,
+            'count': count
+        }
+        for (contract_id, bucket, field, error_type), count in counts.items()
+    ]
+    for i in range(0, len(rows), BACKFILL_BATCH_SIZE):
+        op.bulk_insert(table, rows[i:i + BACKFILL_BATCH_SIZE])
+
+
+def upgrade():
+    table = op.create_table(
+        'validation_error_counts',
+        sa.Column('id', sa.String(36), nullable=False),
+        sa.Column('contract_id', sa.String(36), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('field', sa.String(255), nullable=False),
+        sa.Column('error_type', sa.String(100), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_index(
+        'ix_validation_error_counts_key',
+        'validation_error_counts',
+        ['contract_id', 'bucket_start', 'field', 'error_type'],
+        unique=True
+    )
+    op.create_index('ix_validation_error_counts_bucket', 'validation_error_counts', ['bucket_start'], unique=False)
+
+    _backfill(table)
+
+
+def downgrade():
+    op.drop_index('ix_validation_error_counts_bucket', 'validation_error_counts')
+    op.drop_index('ix_validation_error_counts_key', 'validation_error_counts')
+    op.drop_table('validation_error_counts')
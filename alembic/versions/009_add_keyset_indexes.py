@@ -0,0 +1,29 @@
+"""add keyset pagination indexes
+
+Revision ID: 009
+Revises: 008
+Create Date: 2025-02-10 10:00:00.000000
+
+"""
+from alembic import op
+
+
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_contracts_active_updated', 'contracts', ['is_active', 'updated_at', 'id'], unique=False)
+    op.create_index(
+        'ix_contract_versions_contract_created',
+        'contract_versions',
+        ['contract_id', 'created_at', 'id'],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('ix_contract_versions_contract_created', 'contract_versions')
+    op.drop_index('ix_contracts_active_updated', 'contracts')
@@ -0,0 +1,47 @@
+"""add job queue
+
+Revision ID: 010
+Revises: 009
+Create Date: 2025-02-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'job_queue',
+        sa.Column('id', sa.String(36), nullable=False),
+        sa.Column('kind', sa.String(50), nullable=False),
+        sa.Column('contract_id', sa.String(36), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('run_after', sa.DateTime(), nullable=False),
+        sa.Column('locked_by', sa.String(100), nullable=True),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.Column('progress', sa.JSON(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_index('ix_job_queue_status_run_after', 'job_queue', ['status', 'run_after'], unique=False)
+    op.create_index('ix_job_queue_locked_until', 'job_queue', ['locked_until'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_job_queue_locked_until', 'job_queue')
+    op.drop_index('ix_job_queue_status_run_after', 'job_queue')
+    op.drop_table('job_queue')
@@ -0,0 +1,37 @@
+"""unique batch summaries per batch
+
+Revision ID: 011
+Revises: 010
+Create Date: 2025-02-24 10:00:00.000000
+
+Partitioning dropped the unique index on batch_summaries.batch_id because
+unique indexes on a partitioned table must include processed_at. Duplicate
+rows from reruns are removed, keeping the earliest summary of each batch.
+
+"""
+from alembic import op
+
+
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        'DELETE FROM batch_summaries WHERE id IN ('
+        'SELECT id FROM batch_summaries b WHERE EXISTS ('
+        'SELECT 1 FROM batch_summaries e WHERE e.batch_id = b.batch_id '
+        'AND (e.processed_at < b.processed_at OR (e.processed_at = b.processed_at AND e.id < b.id))))'
+    )
+    op.create_index(
+        'uq_batch_summaries_batch_id_processed_at',
+        'batch_summaries',
+        ['batch_id', 'processed_at'],
+        unique=True
+    )
+
+
+def downgrade():
+    op.drop_index('uq_batch_summaries_batch_id_processed_at', 'batch_summaries')
@@ -19,6 +19,7 @@ from app.utils.exceptions import (
     InvalidYAMLError,
     InvalidContractSchemaError
 )
+from app.utils.pagination import decode_cursor, split_page
 import logging
 
 logger = logging.getLogger(__name__)
@@ -70,20 +71,31 @@ def list_contracts(
     is_active: bool = Query(True, description="Filter by active status"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(50, ge=1, le=100, description="Maximum records to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(False, description="Count all matching contracts"),
     db: Session = Depends(get_db)
 ):
     logger.info(
         f"GET /contracts - domain={domain}, active={is_active}, "
-        f"skip={skip}, limit={limit}"
+        f"skip={skip}, limit={limit}, cursor={cursor is not None}"
     )
     
+    after = decode_cursor(cursor)
+    
     try:
         manager = ContractManager(db)
         contracts, total = manager.list_contracts(
             domain=domain,
             is_active=is_active,
             skip=skip,
-            limit=limit
+            limit=limit + 1,
+            after=after,
+            include_total=include_total
+        )
+        contracts, next_cursor = split_page(
+            contracts,
+            limit,
+            key=lambda c: (c.updated_at, c.id)
         )
         
         contract_responses = [
@@ -94,7 +106,8 @@ def list_contracts(
             contracts=contract_responses,
             total=total,
             skip=skip,
-            limit=limit
+            limit=limit,
+            next_cursor=next_cursor
         )
         
         return response
@@ -1,13 +1,15 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from datetime import date, datetime, timedelta
 from typing import Optional
 
-from app.database import get_db
-from app.core.metrics_aggregator import MetricsAggregator
+from app.database import get_async_db
+from app.core.metrics_aggregator import AsyncMetricsAggregator
+from app.core.platform_summary import platform_summary_cache
 from app.models.schemas import DailyMetrics, TrendData, PlatformSummary
-from app.models.database import Contract, QualityMetric
+from app.models.database import MetricRollup, QualityMetric
 from app.utils.exceptions import ContractNotFoundError
 
 
@@ -18,16 +20,19 @@ router = APIRouter(prefix="/metrics", tags=["metrics"])
 async def get_daily_metrics(
     contract_id: UUID,
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     end_date = date.today()
     start_date = end_date - timedelta(days=days)
     
-    metrics = db.query(QualityMetric).filter(
-        QualityMetric.contract_id == str(contract_id),
-        QualityMetric.metric_date >= start_date,
-        QualityMetric.metric_date <= end_date
-    ).order_by(QualityMetric.metric_date).all()
+    result = await db.execute(
+        select(QualityMetric).where(
+            QualityMetric.contract_id == str(contract_id),
+            QualityMetric.metric_date >= start_date,
+            QualityMetric.metric_date <= end_date
+        ).order_by(QualityMetric.metric_date)
+    )
+    metrics = result.scalars().all()
     
     if not metrics:
         return {"metrics": [], "period_summary": {}}
@@ -35,7 +40,7 @@ async def get_daily_metrics(
     avg_pass_rate = sum(m.pass_rate for m in metrics) / len(metrics)
     total_validations = sum(m.total_validations for m in metrics)
     
-    aggregator = MetricsAggregator(db)
+    aggregator = AsyncMetricsAggregator(db)
     pass_rates = [m.pass_rate for m in metrics]
     trend = aggregator._calculate_trend(pass_rates)
     
@@ -49,14 +54,40 @@ async def get_daily_metrics(
     }
 
 
+@router.get("/{contract_id}/hourly")
+async def get_hourly_metrics(
+    contract_id: UUID,
+    hours: int = Query(24, ge=1, le=168),
+    db: AsyncSession = Depends(get_async_db)
+):
+    since = datetime.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(hours=hours - 1)
+    
+    result = await db.execute(
+        select(MetricRollup).where(
+            MetricRollup.contract_id == str(contract_id),
+            MetricRollup.rollup_date >= since.date()
+        ).order_by(MetricRollup.rollup_date, MetricRollup.hour)
+    )
+    rollups = [
+        r for r in result.scalars().all()
+        if (r.rollup_date, r.hour) >= (since.date(), since.hour)
+    ]
+    
+    return {
+        "metrics": [r.to_dict() for r in rollups],
+        "total_validations": sum(r.passed + r.failed for r in rollups),
+        "hours": hours
+    }
+
+
 @router.get("/{contract_id}/trend")
 async def get_trend_data(
     contract_id: UUID,
     days: int = Query(90, ge=7, le=365),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    aggregator = MetricsAggregator(db)
-    trend_data = aggregator.get_trend_data(str(contract_id), days)
+    aggregator = AsyncMetricsAggregator(db)
+    trend_data = await aggregator.get_trend_data(str(contract_id), days)
     return trend_data
 
 
@@ -65,15 +96,18 @@ async def get_top_errors(
     contract_id: UUID,
     days: int = Query(7, ge=1, le=90),
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     end_date = date.today()
     start_date = end_date - timedelta(days=days)
     
-    metrics = db.query(QualityMetric).filter(
-        QualityMetric.contract_id == str(contract_id),
-        QualityMetric.metric_date >= start_date
-    ).all()
+    result = await db.execute(
+        select(QualityMetric).where(
+            QualityMetric.contract_id == str(contract_id),
+            QualityMetric.metric_date >= start_date
+        )
+    )
+    metrics = result.scalars().all()
     
     all_errors = {}
     for m in metrics:
@@ -102,72 +136,26 @@ async def get_top_errors(
 
 
 @router.get("/summary")
-async def get_platform_summary(db: Session = Depends(get_db)):
-    total_contracts = db.query(Contract).count()
-    active_contracts = db.query(Contract).filter(Contract.is_active == True).count()
-    
-    today = date.today()
-    today_metrics = db.query(QualityMetric).filter(
-        QualityMetric.metric_date == today
-    ).all()
-    
-    total_validations_today = sum(m.total_validations for m in today_metrics)
-    
-    if today_metrics:
-        avg_pass_rate = sum(m.pass_rate for m in today_metrics) / len(today_metrics)
-    else:
-        avg_pass_rate = 0.0
-    
-    seven_days_ago = today - timedelta(days=7)
-    recent_metrics = db.query(QualityMetric).filter(
-        QualityMetric.metric_date >= seven_days_ago
-    ).all()
-    
-    contract_scores = {}
-    for m in recent_metrics:
-        if m.contract_id not in contract_scores:
-            contract_scores[m.contract_id] = []
-        contract_scores[m.contract_id].append(m.quality_score)
-    
-    contract_avg_scores = {
-        cid: sum(scores) / len(scores)
-        for cid, scores in contract_scores.items()
-    }
-    
-    top_performers = sorted(contract_avg_scores.items(), key=lambda x: x[1], reverse=True)[:5]
-    needs_attention = sorted(contract_avg_scores.items(), key=lambda x: x[1])[:5]
-    
-    def get_contract_info(contract_id, score):
-        contract = db.query(Contract).filter(Contract.id == contract_id).first()
-        return {
-            "contract_id": str(contract_id),
-            "name": contract.name if contract else "Unknown",
-            "quality_score": round(score, 2)
-        }
-    
-    return {
-        "total_contracts": total_contracts,
-        "active_contracts": active_contracts,
-        "total_validations_today": total_validations_today,
-        "avg_pass_rate": round(avg_pass_rate, 2),
-        "top_performing_contracts": [get_contract_info(cid, score) for cid, score in top_performers],
-        "contracts_needing_attention": [get_contract_info(cid, score) for cid, score in needs_attention]
-    }
+async def get_platform_summary(db: AsyncSession = Depends(get_async_db)):
+    return await platform_summary_cache.get(db)
 
 
 @router.get("/{contract_id}/quality-score")
 async def get_quality_score(
     contract_id: UUID,
     days: int = Query(7, ge=1, le=90),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     end_date = date.today()
     start_date = end_date - timedelta(days=days)
     
-    metrics = db.query(QualityMetric).filter(
-        QualityMetric.contract_id == str(contract_id),
-        QualityMetric.metric_date >= start_date
-    ).order_by(QualityMetric.metric_date.desc()).all()
+    result = await db.execute(
+        select(QualityMetric).where(
+            QualityMetric.contract_id == str(contract_id),
+            QualityMetric.metric_date >= start_date
+        ).order_by(QualityMetric.metric_date.desc())
+    )
+    metrics = result.scalars().all()
     
     if not metrics:
         raise ContractNotFoundError(f"No metrics found for contract {contract_id}")
@@ -175,11 +163,11 @@ async def get_quality_score(
     latest = metrics[0]
     quality_scores = [m.quality_score for m in metrics]
     
-    aggregator = MetricsAggregator(db)
+    aggregator = AsyncMetricsAggregator(db)
     trend = aggregator._calculate_trend(quality_scores)
     
     pass_rate_component = latest.pass_rate * 0.7
-    consistency_score = aggregator._calculate_consistency_score(str(contract_id))
+    consistency_score = await aggregator._calculate_consistency_score(str(contract_id))
     consistency_component = consistency_score * 0.2
     freshness_component = min(latest.total_validations / 1000, 1.0) * 10
     
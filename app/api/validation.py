@@ -1,33 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form, BackgroundTasks, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime, date
 from uuid import UUID
+import asyncio
 import uuid
 import tempfile
 import os
 
-from app.database import get_db
-from app.core.validation_engine import ValidationEngine
+from app.config import settings
+from app.database import get_async_db, get_db, get_db_session
+from app.core.batch_jobs import batch_jobs
+from app.core.error_counts import bucket_start
+from app.core.job_queue import JobQueue
+from app.core.result_export import EXPORT_FORMATS, ResultExporter, pq
+from app.core.telemetry import StageTimings
+from app.core.validation_engine import AsyncValidationEngine, ValidationEngine
+from app.core.upload_pipe import UploadPipe
+from app.utils.pagination import after_keyset, decode_cursor, keyset_order, split_page
 from app.models.schemas import (
     ValidationRequest,
     ValidationResult,
     BatchValidationResult,
+    BatchProcessingResult,
     ValidationHistoryResponse
 )
-from app.models.database import ValidationResult as DBValidationResult, BatchSummary
+from app.models.database import ValidationResult as DBValidationResult, BatchSummary, ValidationErrorCount
 
 router = APIRouter(prefix="/validate", tags=["validation"])
 
+# Stage timings are a debug aid, collected only when STAGE_TIMING_ENABLED
+def enable_stage_timings(engine: ValidationEngine) -> Optional[StageTimings]:
+    if not settings.STAGE_TIMING_ENABLED:
+        return None
+    timings = StageTimings()
+    engine.set_stage_timings(timings)
+    return timings
+
+def set_server_timing(response: Response, timings: Optional[StageTimings]) -> None:
+    if timings is not None and timings.stages:
+        response.headers["Server-Timing"] = timings.server_timing()
+
+def upload_too_large() -> HTTPException:
+    max_mb = settings.UPLOAD_MAX_SIZE / (1024 * 1024)
+    return HTTPException(status_code=413, detail=f"File too large (max {max_mb:g}MB)")
+
 @router.post("/{contract_id}", response_model=ValidationResult)
 async def validate_record(
     contract_id: UUID,
     request: ValidationRequest,
-    db: Session = Depends(get_db)
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
-        engine = ValidationEngine(db)
+        engine = AsyncValidationEngine(db)
+        timings = enable_stage_timings(engine)
         result = await engine.validate_record(contract_id, request.data)
+        set_server_timing(response, timings)
         return result
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -38,7 +70,8 @@ async def validate_record(
 async def validate_batch(
     contract_id: UUID,
     request: dict,
-    db: Session = Depends(get_db)
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
         if 'data' not in request or not isinstance(request['data'], list):
@@ -49,8 +82,10 @@ async def validate_batch(
         if len(data) > 10000:
             raise HTTPException(status_code=413, detail="Batch size exceeds maximum of 10,000 records")
         
-        engine = ValidationEngine(db)
+        engine = AsyncValidationEngine(db)
+        timings = enable_stage_timings(engine)
         result = await engine.validate_batch(contract_id, data)
+        set_server_timing(response, timings)
         return result
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -59,16 +94,30 @@ async def validate_batch(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Batch validation error: {str(e)}")
 
-@router.get("/{contract_id}/results", response_model=ValidationHistoryResponse)
+# Single-record results go through the write-behind result sink, so one
+# can take up to RESULT_SINK_FLUSH_INTERVAL seconds to show up here.
+@router.get(
+    "/{contract_id}/results",
+    response_model=ValidationHistoryResponse,
+    description=(
+        "Validation results for a contract. With the result sink enabled, a "
+        "single-record result is visible after the sink's next flush "
+        "(RESULT_SINK_FLUSH_INTERVAL, 1s by default), not immediately."
+    )
+)
 def get_validation_history(
     contract_id: UUID,
     status: Optional[str] = Query(None, regex="^(PASS|FAIL)$"),
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    limit: int = Query(100, le=1000),
+    limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     db: Session = Depends(get_db)
 ):
+    keyset = decode_cursor(cursor)
+    
     try:
         query = db.query(DBValidationResult).filter(
             DBValidationResult.contract_id == str(contract_id)
@@ -83,15 +132,29 @@ def get_validation_history(
         if end_date:
             query = query.filter(DBValidationResult.validated_at <= end_date)
         
-        total = query.count()
+        # Counting is a full scan of the contract's range, so only on request
+        total = query.count() if include_total else None
         
-        results = query.order_by(
-            DBValidationResult.validated_at.desc()
-        ).offset(offset).limit(limit).all()
+        page = query.order_by(
+            *keyset_order(DBValidationResult.validated_at, DBValidationResult.id)
+        )
+        if keyset:
+            page = page.filter(
+                after_keyset(DBValidationResult.validated_at, DBValidationResult.id, keyset)
+            )
+        elif offset:
+            page = page.offset(offset)
+        
+        results, next_cursor = split_page(
+            page.limit(limit + 1).all(),
+            limit,
+            key=lambda r: (r.validated_at, r.id)
+        )
         
         return ValidationHistoryResponse(
             results=[r.to_dict() for r in results],
             total=total,
+            next_cursor=next_cursor,
             filters_applied={
                 "status": status,
                 "start_date": start_date.isoformat() if start_date else None,
@@ -101,6 +164,35 @@ def get_validation_history(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Query error: {str(e)}")
 
+@router.get("/{contract_id}/results/export")
+def export_validation_results(
+    contract_id: UUID,
+    format: str = Query("ndjson", regex="^(ndjson|csv|parquet)$"),
+    status: Optional[str] = Query(None, regex="^(PASS|FAIL)$"),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+):
+    if format == "parquet" and pq is None:
+        raise HTTPException(status_code=400, detail="Parquet export requires pyarrow")
+    
+    # The response outlives request-scoped dependencies, so the stream owns
+    # its session and closes it once the last row is sent.
+    def stream():
+        db = get_db_session()
+        try:
+            exporter = ResultExporter(db)
+            query = exporter.export_query(contract_id, start_date, end_date, status)
+            yield from exporter.stream(format, query)
+        finally:
+            db.close()
+    
+    filename = f"validation_results_{contract_id}.{format}"
+    return StreamingResponse(
+        stream(),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 @router.get("/results/{result_id}")
 def get_validation_by_id(
     result_id: UUID,
@@ -128,31 +220,38 @@ def get_error_summary(
 ):
     try:
         from datetime import timedelta
-        from collections import Counter
         
-        start_date = datetime.utcnow() - timedelta(days=days)
+        # Counts are kept per hour, so the window starts on the hour
+        start_bucket = bucket_start(datetime.utcnow() - timedelta(days=days))
+        window = (
+            ValidationErrorCount.contract_id == str(contract_id),
+            ValidationErrorCount.bucket_start >= start_bucket
+        )
         
-        results = db.query(DBValidationResult).filter(
-            DBValidationResult.contract_id == str(contract_id),
-            DBValidationResult.validated_at >= start_date,
-            DBValidationResult.status == "FAIL"
+        error_rows = db.execute(
+            select(
+                ValidationErrorCount.error_type,
+                func.sum(ValidationErrorCount.count).label('count')
+            ).where(*window).group_by(ValidationErrorCount.error_type)
+        ).all()
+        field_rows = db.execute(
+            select(
+                ValidationErrorCount.field,
+                func.sum(ValidationErrorCount.count).label('count')
+            ).where(*window).group_by(ValidationErrorCount.field)
         ).all()
         
-        all_errors = []
-        for result in results:
-            if result.errors:
-                all_errors.extend([e.get('error_type') for e in result.errors])
-        
-        error_counts = Counter(all_errors)
+        error_counts = {row.error_type: int(row.count) for row in error_rows}
         top_errors = [
             {"error_type": err_type, "count": count}
-            for err_type, count in error_counts.most_common(10)
+            for err_type, count in sorted(error_counts.items(), key=lambda item: (-item[1], item[0]))[:10]
         ]
         
         return {
-            "error_counts": dict(error_counts),
+            "error_counts": error_counts,
+            "field_counts": {row.field: int(row.count) for row in field_rows},
             "top_errors": top_errors,
-            "total_errors": len(all_errors),
+            "total_errors": sum(error_counts.values()),
             "period": f"{days} days"
         }
     except Exception as e:
@@ -166,8 +265,8 @@ async def upload_file_for_validation(
     file_type: str = Form(...),
     db: Session = Depends(get_db)
 ):
-    if file.size > 100 * 1024 * 1024:
-        raise HTTPException(status_code=413, detail="File too large (max 100MB)")
+    if file.size > settings.UPLOAD_MAX_SIZE:
+        raise upload_too_large()
     
     if file_type not in ['csv', 'json', 'parquet']:
         raise HTTPException(
@@ -177,18 +276,49 @@ async def upload_file_for_validation(
     
     batch_id = uuid.uuid4()
     
-    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_type}") as tmp_file:
-        content = await file.read()
-        tmp_file.write(content)
+    # Queued uploads are picked up by a worker process, so they go to the
+    # shared upload directory rather than this process's temp dir
+    upload_dir = None
+    if settings.JOB_QUEUE_ENABLED:
+        upload_dir = settings.UPLOAD_DIR or os.path.join(tempfile.gettempdir(), "dce-uploads")
+        os.makedirs(upload_dir, exist_ok=True)
+    
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_type}", dir=upload_dir) as tmp_file:
+        while True:
+            chunk = await file.read(settings.UPLOAD_BUFFER_SIZE)
+            if not chunk:
+                break
+            tmp_file.write(chunk)
         tmp_path = tmp_file.name
     
-    background_tasks.add_task(
-        process_file_background,
-        contract_id,
-        tmp_path,
-        file_type,
-        batch_id
-    )
+    file_size = os.path.getsize(tmp_path)
+    
+    if settings.JOB_QUEUE_ENABLED:
+        JobQueue(db).enqueue(
+            batch_id,
+            contract_id,
+            payload={
+                "file_path": tmp_path,
+                "file_type": file_type,
+                "file_name": file.filename,
+                "file_size": file_size
+            }
+        )
+    else:
+        batch_jobs.register(
+            batch_id,
+            contract_id,
+            file_name=file.filename,
+            file_type=file_type,
+            file_size=file_size
+        )
+        background_tasks.add_task(
+            process_file_background,
+            contract_id,
+            tmp_path,
+            file_type,
+            batch_id
+        )
     
     return {
         "batch_id": str(batch_id),
@@ -199,34 +329,110 @@ async def upload_file_for_validation(
         "file_size": file.size
     }
 
+@router.post("/{contract_id}/upload/stream", response_model=BatchProcessingResult)
+async def stream_file_for_validation(
+    contract_id: UUID,
+    request: Request,
+    file_type: str = Query(...),
+    db: Session = Depends(get_db)
+):
+    from app.core.batch_processor import BatchProcessor
+    
+    if file_type not in ['csv', 'json', 'jsonl']:
+        raise HTTPException(
+            status_code=422,
+            detail="Unsupported file type for streaming. Must be csv, json, or jsonl"
+        )
+    
+    try:
+        ValidationEngine(db).get_compiled_validator(contract_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    batch_id = uuid.uuid4()
+    content_length = request.headers.get("content-length")
+    batch_jobs.register(
+        batch_id,
+        contract_id,
+        file_type=file_type,
+        file_size=int(content_length) if content_length and content_length.isdigit() else None
+    )
+    batch_jobs.start(batch_id)
+    
+    processor = BatchProcessor(db)
+    processor.set_progress_callback(lambda **progress: batch_jobs.update(batch_id, **progress))
+    
+    # The raw request body is piped into the file handler as it arrives,
+    # so validation runs while the upload is still in progress.
+    pipe = UploadPipe(max_buffered=settings.UPLOAD_BUFFER_SIZE)
+    processing = asyncio.create_task(
+        processor.process_stream(contract_id, pipe, file_type, batch_id=batch_id)
+    )
+    processing.add_done_callback(lambda _: pipe.abort())
+    loop = asyncio.get_running_loop()
+    
+    try:
+        async for chunk in request.stream():
+            if pipe.bytes_written + len(chunk) > settings.UPLOAD_MAX_SIZE:
+                raise upload_too_large()
+            await loop.run_in_executor(None, pipe.feed, chunk)
+    except BrokenPipeError:
+        pass
+    except BaseException as e:
+        processing.cancel()
+        pipe.abort()
+        batch_jobs.fail(batch_id, str(e) or e.__class__.__name__)
+        raise
+    finally:
+        pipe.finish()
+    
+    try:
+        result = await processing
+    except ValueError as e:
+        batch_jobs.fail(batch_id, str(e))
+        raise HTTPException(status_code=422, detail=f"Invalid {file_type} upload: {str(e)}")
+    except Exception as e:
+        batch_jobs.fail(batch_id, str(e))
+        raise
+    
+    batch_jobs.complete(batch_id, result)
+    return result
+
 @router.get("/batch/{batch_id}/status")
 async def get_batch_status(
     batch_id: UUID, 
     db: Session = Depends(get_db)
 ):
+    job = batch_jobs.get(batch_id)
+    if job is not None:
+        job_status = job.to_dict()
+        job_status["total_records"] = job.records_processed if job.finished else None
+        return job_status
+    
+    # Queued jobs run in a worker process, which writes its progress onto
+    # the queue row
+    queued = JobQueue(db).get(batch_id)
+    if queued is not None and queued.status != "COMPLETED":
+        job_status = dict(queued.progress or {})
+        job_status.update({
+            "batch_id": str(batch_id),
+            "contract_id": queued.contract_id,
+            "status": "PROCESSING" if queued.status == "RUNNING" else queued.status,
+            "attempts": queued.attempts,
+            "max_attempts": queued.max_attempts,
+            "error": queued.last_error
+        })
+        job_status.setdefault("progress", 0.0)
+        job_status.setdefault("processed_records", 0)
+        job_status["total_records"] = None
+        return job_status
+    
+    # Completed jobs, and jobs from before a restart, only have their
+    # stored summary
     batch = db.query(BatchSummary).filter(BatchSummary.batch_id == str(batch_id)).first()
     
     if not batch:
-        validation_results = db.query(DBValidationResult).filter(
-            DBValidationResult.batch_id == str(batch_id)
-        ).count()
-        
-        if validation_results > 0:
-            return {
-                "batch_id": str(batch_id),
-                "status": "PROCESSING",
-                "progress": 50.0,
-                "total_records": validation_results * 2,
-                "processed_records": validation_results
-            }
-        else:
-            return {
-                "batch_id": str(batch_id),
-                "status": "PROCESSING",
-                "progress": 0.0,
-                "total_records": 0,
-                "processed_records": 0
-            }
+        raise HTTPException(status_code=404, detail=f"Batch {batch_id} not found")
     
     return {
         "batch_id": str(batch_id),
@@ -260,34 +466,24 @@ async def process_file_background(
     
     try:
         logger.info(f"Starting batch processing for {batch_id}")
+        batch_jobs.start(batch_id)
         processor = BatchProcessor(db)
+        processor.set_progress_callback(lambda **progress: batch_jobs.update(batch_id, **progress))
         
+        # The processor stores the batch summary under this batch_id
         result = await processor.process_file(
             contract_id=contract_id,
             file_path=file_path,
-            file_type=file_type
-        )
-        
-        batch_summary = BatchSummary(
-            id=str(uuid.uuid4()),
-            batch_id=str(batch_id),
-            contract_id=str(contract_id),
-            total_records=result.total_records,
-            passed=result.passed,
-            failed=result.failed,
-            pass_rate=result.pass_rate,
-            execution_time_ms=result.execution_time_ms,
-            errors_summary=result.errors_summary,
-            processed_at=datetime.utcnow()
+            file_type=file_type,
+            batch_id=batch_id
         )
-        
-        db.add(batch_summary)
-        db.commit()
+        batch_jobs.complete(batch_id, result)
         
         logger.info(f"Batch {batch_id} completed: {result.passed}/{result.total_records} passed")
               
     except Exception as e:
         logger.error(f"Error processing batch {batch_id}: {str(e)}")
+        batch_jobs.fail(batch_id, str(e))
         db.rollback()
         
     finally:
@@ -1,7 +1,7 @@
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.database import get_db
 from app.core.version_controller import VersionController
@@ -13,6 +13,7 @@ from app.models.schemas import (
     ContractResponse
 )
 from app.utils.exceptions import ContractNotFoundError
+from app.utils.pagination import decode_cursor, split_page
 
 
 logger = logging.getLogger(__name__)
@@ -23,14 +24,23 @@ router = APIRouter(prefix="/contracts", tags=["versions"])
 def get_version_history(
     contract_id: str,
     limit: int = 50,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     db: Session = Depends(get_db)
 ):
     if limit > 100:
         limit = 100
+    limit = max(limit, 1)
+    
+    after = decode_cursor(cursor)
     
     try:
         version_controller = VersionController(db)
-        versions = version_controller.get_version_history(contract_id, limit)
+        versions, next_cursor = split_page(
+            version_controller.get_version_history(contract_id, limit + 1, after=after),
+            limit,
+            key=lambda v: (v.created_at, v.id)
+        )
         
         version_responses = [
             ContractVersionResponse(
@@ -48,7 +58,8 @@ def get_version_history(
         
         return VersionHistoryResponse(
             versions=version_responses,
-            total=len(version_responses)
+            total=version_controller.count_versions(contract_id) if include_total else None,
+            next_cursor=next_cursor
         )
     
     except Exception as e:
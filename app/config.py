@@ -10,6 +10,17 @@ class Settings(BaseSettings):
     DEBUG: bool = True
     LOG_LEVEL: str = "debug"
 
+    # Logging: "text" or "json" (unset means json in production). LOG_ASYNC
+    # writes records from a background thread (unset means on in
+    # production). Log files rotate at midnight. Debug and info messages
+    # from hot-path loggers pass at most once per call site per interval.
+    LOG_FORMAT: Optional[str] = None
+    LOG_ASYNC: Optional[bool] = None
+    LOG_DIR: str = "logs"
+    LOG_RETENTION_DAYS: int = 14
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_HOT_PATH_INTERVAL: float = 1.0
+
     # API
     API_V1_PREFIX: str = "/api/v1"
     PROJECT_NAME: str = "Data Contract Engine"
@@ -22,6 +33,82 @@ class Settings(BaseSettings):
     # CORS
     CORS_ORIGINS: list[str] = ["*"]
 
+    # Validation
+    VALIDATOR_CACHE_SIZE: int = 256
+
+    # Uniqueness rule: "exact" spills counts to disk once over budget;
+    # "approximate" spills every key and keeps only a Bloom filter and the
+    # candidates it flags in memory, confirming them with a pass over the keys
+    UNIQUENESS_MODE: str = "exact"
+    UNIQUENESS_MEMORY_BUDGET_MB: int = 64
+    UNIQUENESS_SPILL_DIR: Optional[str] = None
+    UNIQUENESS_EXPECTED_COUNT: int = 10_000_000
+    UNIQUENESS_FALSE_POSITIVE_RATE: float = 0.01
+
+    # Batch processing: fan chunks out to a process pool when enabled.
+    # Unset worker count uses all cores; unset window is twice the workers.
+    BATCH_PARALLEL: bool = False
+    BATCH_WORKERS: Optional[int] = None
+    BATCH_MAX_IN_FLIGHT: Optional[int] = None
+    # Finished batch jobs kept in memory for the status endpoint
+    BATCH_JOB_HISTORY: int = 1000
+
+    # Durable job queue for file uploads, drained by `python -m app.worker`.
+    # Off by default: uploads then run as in-process background tasks, and
+    # enabling it without a worker running leaves them QUEUED. Uploads are
+    # spooled to UPLOAD_DIR, which the workers must share. A job whose
+    # lease (seconds) runs out is retried up to JOB_MAX_ATTEMPTS times,
+    # backing off JOB_RETRY_BACKOFF * 2^n seconds.
+    JOB_QUEUE_ENABLED: bool = False
+    UPLOAD_DIR: Optional[str] = None
+    WORKER_CONCURRENCY: int = 2
+    WORKER_POLL_INTERVAL: float = 1.0
+    JOB_VISIBILITY_TIMEOUT: int = 300
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF: int = 30
+
+    # Uploads are copied (or piped to the validator) in buffers of this size
+    UPLOAD_BUFFER_SIZE: int = 1024 * 1024
+    UPLOAD_MAX_SIZE: int = 100 * 1024 * 1024
+
+    # Write-behind persistence of single-record validation results
+    RESULT_SINK_ENABLED: bool = True
+    RESULT_SINK_BATCH_SIZE: int = 500
+    RESULT_SINK_FLUSH_INTERVAL: float = 1.0
+    RESULT_SINK_MAX_QUEUE: int = 10000
+    # A failed batch write is retried, then saved as JSON lines under
+    # RESULT_SINK_SPILL_DIR and replayed once the database accepts writes
+    RESULT_SINK_WRITE_RETRIES: int = 3
+    RESULT_SINK_SPILL_DIR: Optional[str] = None
+    # Saved batches failing this many replays are moved to a quarantine subdirectory
+    RESULT_SINK_REPLAY_ATTEMPTS: int = 5
+
+    # Hourly metric rollups counted in-process and upserted every interval (seconds)
+    METRIC_ROLLUPS_ENABLED: bool = True
+    METRIC_ROLLUP_FLUSH_INTERVAL: int = 10
+
+    # validation_results / batch_summaries retention. On Postgres the tables
+    # are range-partitioned by "day" or "month" and expired partitions are
+    # dropped; PARTITION_PRECREATE future partitions are kept ready.
+    RESULT_RETENTION_DAYS: int = 90
+    PARTITION_INTERVAL: str = "month"
+    PARTITION_PRECREATE: int = 3
+
+    # Seconds a /metrics/summary snapshot is served before it is rebuilt
+    PLATFORM_SUMMARY_TTL: float = 30.0
+
+    # Rows fetched per round trip when streaming result exports
+    EXPORT_BATCH_SIZE: int = 5000
+
+    # Prometheus text exposition at /metrics. Batch worker processes serve
+    # their own on WORKER_METRICS_PORT + slot when it is set.
+    METRICS_ENABLED: bool = True
+    WORKER_METRICS_PORT: Optional[int] = None
+    # Debug aid: per-stage timings (contract lookup, YAML parse, compile,
+    # schema and quality checks, storage) in validation responses and a
+    # Server-Timing header
+    STAGE_TIMING_ENABLED: bool = False
+
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", case_sensitive=True
     )
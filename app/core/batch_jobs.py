@@ -0,0 +1,201 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.core.telemetry import BATCH_JOBS, BATCH_JOBS_ACTIVE
+from app.models.schemas import BatchProcessingResult
+
+
+class BatchJob:
+
+    def __init__(
+        self,
+        batch_id: str,
+        contract_id: str,
+        file_name: Optional[str] = None,
+        file_type: Optional[str] = None,
+        file_size: Optional[int] = None
+    ):
+        self.batch_id = batch_id
+        self.contract_id = contract_id
+        self.file_name = file_name
+        self.file_type = file_type
+        self.file_size = file_size
+        self.state = "QUEUED"
+        self.bytes_read = 0
+        self.records_processed = 0
+        self.passed = 0
+        self.failed = 0
+        self.error: Optional[str] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.updated_at = self.created_at
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ("COMPLETED", "FAILED")
+
+    def elapsed_seconds(self) -> float:
+        if self._started is None:
+            return 0.0
+        return (self._finished or time.monotonic()) - self._started
+
+    def progress(self) -> float:
+        if self.state == "COMPLETED":
+            return 100.0
+        if not self.file_size:
+            return 0.0
+        return min(self.bytes_read / self.file_size * 100, 99.9)
+
+    def records_per_second(self) -> float:
+        elapsed = self.elapsed_seconds()
+        return self.records_processed / elapsed if elapsed > 0 else 0.0
+
+    def bytes_per_second(self) -> float:
+        elapsed = self.elapsed_seconds()
+        return self.bytes_read / elapsed if elapsed > 0 else 0.0
+
+    # Remaining bytes at the average read rate so far; unknown until
+    # something has been read or when the size is not known up front.
+    def eta_seconds(self) -> Optional[float]:
+        if self.finished:
+            return 0.0
+        rate = self.bytes_per_second()
+        if not self.file_size or rate <= 0:
+            return None
+        return max(self.file_size - self.bytes_read, 0) / rate
+
+    def to_dict(self) -> Dict[str, Any]:
+        eta = self.eta_seconds()
+        return {
+            "batch_id": self.batch_id,
+            "contract_id": self.contract_id,
+            "status": self.state,
+            "file_name": self.file_name,
+            "file_type": self.file_type,
+            "file_size": self.file_size,
+            "bytes_read": self.bytes_read,
+            "progress": round(self.progress(), 2),
+            "processed_records": self.records_processed,
+            "passed": self.passed,
+            "failed": self.failed,
+            "records_per_second": round(self.records_per_second(), 2),
+            "bytes_per_second": round(self.bytes_per_second(), 2),
+            "elapsed_seconds": round(self.elapsed_seconds(), 3),
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+            "error": self.error,
+            "result": self.result,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "updated_at": self.updated_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+# Batch jobs known to this process, keyed by batch_id. Finished jobs are
+# kept for status queries until `max_finished` newer ones have finished.
+class BatchJobRegistry:
+
+    def __init__(self, max_finished: int = 1000):
+        self.max_finished = max_finished
+        self._jobs: "OrderedDict[str, BatchJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def register(
+        self,
+        batch_id,
+        contract_id,
+        file_name: Optional[str] = None,
+        file_type: Optional[str] = None,
+        file_size: Optional[int] = None
+    ) -> BatchJob:
+        job = BatchJob(str(batch_id), str(contract_id), file_name, file_type, file_size)
+        with self._lock:
+            self._jobs[job.batch_id] = job
+        return job
+
+    def get(self, batch_id) -> Optional[BatchJob]:
+        with self._lock:
+            return self._jobs.get(str(batch_id))
+
+    def start(self, batch_id) -> None:
+        job = self.get(batch_id)
+        if job is None:
+            return
+        job.state = "PROCESSING"
+        job._started = time.monotonic()
+        job.started_at = job.updated_at = datetime.utcnow()
+
+    def update(self, batch_id, bytes_read: int, records: int, passed: int, failed: int) -> None:
+        job = self.get(batch_id)
+        if job is None:
+            return
+        if job.file_size:
+            bytes_read = min(bytes_read, job.file_size)
+        job.bytes_read = max(job.bytes_read, bytes_read)
+        job.records_processed = records
+        job.passed = passed
+        job.failed = failed
+        job.updated_at = datetime.utcnow()
+
+    def complete(self, batch_id, result: BatchProcessingResult) -> None:
+        job = self.get(batch_id)
+        if job is None:
+            return
+        job.records_processed = result.total_records
+        job.passed = result.passed
+        job.failed = result.failed
+        if job.file_size:
+            job.bytes_read = job.file_size
+        job.result = {
+            "passed": result.passed,
+            "failed": result.failed,
+            "pass_rate": result.pass_rate,
+            "execution_time_ms": result.execution_time_ms,
+            "errors_summary": result.errors_summary
+        }
+        self._finish(job, "COMPLETED")
+
+    def fail(self, batch_id, error: str) -> None:
+        job = self.get(batch_id)
+        if job is None:
+            return
+        job.error = error
+        self._finish(job, "FAILED")
+
+    def _finish(self, job: BatchJob, state: str) -> None:
+        BATCH_JOBS.labels(state.lower()).inc()
+        job.state = state
+        job._finished = time.monotonic()
+        job.finished_at = job.updated_at = datetime.utcnow()
+
+        with self._lock:
+            if job.batch_id in self._jobs:
+                self._jobs.move_to_end(job.batch_id)
+            finished = [batch_id for batch_id, entry in self._jobs.items() if entry.finished]
+            for batch_id in finished[:max(len(finished) - self.max_finished, 0)]:
+                del self._jobs[batch_id]
+
+    def active(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if not job.finished)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._jobs.clear()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+
+batch_jobs = BatchJobRegistry(max_finished=settings.BATCH_JOB_HISTORY)
+BATCH_JOBS_ACTIVE.set_function(batch_jobs.active)
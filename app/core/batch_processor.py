@@ -1,66 +1,249 @@
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, AsyncIterator, BinaryIO, Iterator, Union
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from uuid import UUID
+import asyncio
+import multiprocessing
+import os
+import threading
 import uuid
 import time
 import logging
 from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.core.file_handlers import FileHandlerFactory
-from app.core.validation_engine import ValidationEngine
-from app.models.schemas import BatchProcessingResult
+from app.core.metric_rollups import metric_rollups
+from app.core.quality_validator import QualityAccumulator
+from app.core.telemetry import DB_FLUSH_SECONDS
+from app.core.validation_engine import ValidationEngine, validate_frame, validate_rows
+from app.core.validator_cache import CompiledValidator, validator_cache
+from app.models.schemas import BatchProcessingResult, ContractSchema, ValidationError
 from app.utils.exceptions import InvalidFileFormatError
 
 
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def batch_worker_count() -> int:
+    return settings.BATCH_WORKERS or os.cpu_count() or 1
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            # Spawned workers do not inherit the server's threads, sockets
+            # or database connections.
+            _process_pool = ProcessPoolExecutor(
+                max_workers=batch_worker_count(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=True, cancel_futures=True)
+            _process_pool = None
+
+
+class ChunkOutcome:
+    def __init__(
+        self,
+        total_records: int,
+        passed: int,
+        failed: int,
+        sample_errors: List[ValidationError],
+        errors_summary: Dict[str, int],
+        quality_accumulator: Optional[QualityAccumulator] = None,
+        validation_seconds: float = 0.0
+    ):
+        self.total_records = total_records
+        self.passed = passed
+        self.failed = failed
+        self.sample_errors = sample_errors
+        self.errors_summary = errors_summary
+        self.quality_accumulator = quality_accumulator
+        self.validation_seconds = validation_seconds
+
+
+def validate_chunk_in_worker(
+    contract_id: str,
+    version: str,
+    contract_schema: ContractSchema,
+    chunk: Union[List[Dict[str, Any]], pd.DataFrame]
+) -> ChunkOutcome:
+    # Each worker process keeps its own validator cache, so a contract
+    # version is compiled once per worker rather than once per chunk.
+    compiled = validator_cache.get(contract_id, version)
+    if compiled is None:
+        compiled = CompiledValidator(contract_id, version, contract_schema)
+        validator_cache.put(compiled)
+    
+    started = time.perf_counter()
+    if isinstance(chunk, pd.DataFrame):
+        passed, failed, errors, error_counts = validate_frame(compiled, chunk)
+    else:
+        passed, failed, errors, error_counts = validate_rows(compiled, chunk)
+    validation_seconds = time.perf_counter() - started
+    
+    quality_accumulator = None
+    if compiled.quality_validator:
+        quality_accumulator = compiled.quality_validator.create_accumulator()
+        quality_accumulator.update(chunk)
+    
+    return ChunkOutcome(
+        len(chunk), passed, failed, errors[:50], error_counts, quality_accumulator, validation_seconds
+    )
+
+
 class BatchProcessor:
     
     def __init__(self, db_session: Session):
         self.db = db_session
         self.logger = logging.getLogger(__name__)
-        self.progress_callback: Optional[Callable[[float], None]] = None
+        # Called after every chunk with bytes_read, records, passed and failed
+        self.progress_callback: Optional[Callable[..., None]] = None
     
     async def process_file(
         self,
         contract_id: UUID,
         file_path: str,
         file_type: str,
-        chunk_size: int = 1000
+        chunk_size: int = 1000,
+        parallel: Optional[bool] = None,
+        batch_id: Optional[UUID] = None
     ) -> BatchProcessingResult:
-        batch_id = uuid.uuid4()
+        batch_id = batch_id or uuid.uuid4()
         start_time = time.time()
         
         handler = FileHandlerFactory.get_handler(file_type)
         validation_engine = ValidationEngine(self.db)
         
         if not handler.validate_format(file_path):
-            raise InvalidFileFormatError(f"Invalid {file_type} format")
+            raise InvalidFileFormatError(file_type, "file could not be parsed")
+        
+        compiled = validation_engine.get_compiled_validator(contract_id)
+        
+        if handler.supports_frames:
+            chunks = handler.read_frames(file_path, chunk_size, columns=compiled.referenced_columns)
+        else:
+            chunks = handler.read_chunks(file_path, chunk_size)
+        chunks = handler.timed(chunks)
+        
+        return await self._process_chunks(
+            contract_id, batch_id, start_time, validation_engine, compiled, chunks, parallel,
+            bytes_read=lambda: handler.bytes_read
+        )
+    
+    async def process_stream(
+        self,
+        contract_id: UUID,
+        stream: BinaryIO,
+        file_type: str,
+        chunk_size: int = 1000,
+        parallel: Optional[bool] = None,
+        batch_id: Optional[UUID] = None
+    ) -> BatchProcessingResult:
+        batch_id = batch_id or uuid.uuid4()
+        start_time = time.time()
+        
+        handler = FileHandlerFactory.get_handler(file_type)
+        if not handler.supports_streams:
+            raise InvalidFileFormatError(file_type, "format cannot be validated while streaming")
+        
+        validation_engine = ValidationEngine(self.db)
+        compiled = validation_engine.get_compiled_validator(contract_id)
+        chunks = handler.timed(handler.read_stream(stream, chunk_size, columns=compiled.referenced_columns))
+        
+        return await self._process_chunks(
+            contract_id, batch_id, start_time, validation_engine, compiled, chunks, parallel,
+            bytes_read=lambda: getattr(stream, 'bytes_written', 0)
+        )
+    
+    async def _process_chunks(
+        self,
+        contract_id: UUID,
+        batch_id: UUID,
+        start_time: float,
+        validation_engine: ValidationEngine,
+        compiled: CompiledValidator,
+        chunks: Iterator,
+        parallel: Optional[bool],
+        bytes_read: Callable[[], int]
+    ) -> BatchProcessingResult:
+        quality_accumulator = (
+            compiled.quality_validator.create_accumulator()
+            if compiled.quality_validator else None
+        )
         
         total_records = 0
         passed_records = 0
         failed_records = 0
         all_errors = []
+        error_counts: Dict[str, int] = {}
         
-        for chunk_num, chunk in enumerate(handler.read_chunks(file_path, chunk_size)):
-            self.logger.info(f"Processing chunk {chunk_num}, {len(chunk)} records")
-            
-            chunk_result = await validation_engine.validate_batch(
-                contract_id=contract_id,
-                data=chunk,
-                batch_id=batch_id
+        if parallel is None:
+            parallel = settings.BATCH_PARALLEL
+        
+        if parallel:
+            outcomes = self._validate_parallel(compiled, chunks)
+        else:
+            outcomes = self._validate_serial(
+                validation_engine, contract_id, batch_id, chunks, quality_accumulator
             )
-            
-            total_records += chunk_result.total_records
-            passed_records += chunk_result.passed
-            failed_records += chunk_result.failed
-            all_errors.extend(chunk_result.sample_errors)
-            
-            if self.progress_callback and total_records > 0:
-                progress = (chunk_num + 1) * chunk_size / total_records * 100
-                self.progress_callback(min(progress, 100))
+        
+        try:
+            chunk_num = 0
+            async for outcome in outcomes:
+                self.logger.info("Processed chunk %d, %d records", chunk_num, outcome.total_records)
+                
+                total_records += outcome.total_records
+                passed_records += outcome.passed
+                failed_records += outcome.failed
+                if len(all_errors) < 50:
+                    all_errors.extend(outcome.sample_errors[:50 - len(all_errors)])
+                for error_type, count in outcome.errors_summary.items():
+                    error_counts[error_type] = error_counts.get(error_type, 0) + count
+                
+                if quality_accumulator and outcome.quality_accumulator:
+                    quality_accumulator.merge(outcome.quality_accumulator)
+                
+                if self.progress_callback:
+                    self.progress_callback(
+                        bytes_read=bytes_read(),
+                        records=total_records,
+                        passed=passed_records,
+                        failed=failed_records
+                    )
+                chunk_num += 1
+        except Exception:
+            if quality_accumulator:
+                quality_accumulator.close()
+            raise
+        
+        # Quality rules describe the whole file, so they are finalized once
+        # from the accumulated per-chunk state rather than per chunk.
+        if quality_accumulator and passed_records > 0:
+            quality_result = quality_accumulator.finalize()
+            if not quality_result.passed:
+                quality_errors = validation_engine.quality_errors_to_validation_errors(quality_result)
+                all_errors = quality_errors + all_errors
+                for error in quality_errors:
+                    error_counts[error.error_type] = error_counts.get(error.error_type, 0) + 1
+        elif quality_accumulator:
+            quality_accumulator.close()
         
         execution_time = (time.time() - start_time) * 1000
         pass_rate = (passed_records / total_records * 100) if total_records > 0 else 0
-        error_counts = self._count_errors_by_type(all_errors)
         
         result = BatchProcessingResult(
             batch_id=batch_id,
@@ -71,7 +254,7 @@ class BatchProcessor:
             pass_rate=pass_rate,
             execution_time_ms=execution_time,
             errors_summary=error_counts,
-            sample_errors=all_errors[:50],
+            sample_errors=[error.model_dump() for error in all_errors[:50]],
             processed_at=datetime.utcnow()
         )
         
@@ -79,20 +262,111 @@ class BatchProcessor:
         
         return result
     
-    def set_progress_callback(self, callback: Callable[[float], None]):
-        self.progress_callback = callback
+    async def _validate_serial(
+        self,
+        validation_engine: ValidationEngine,
+        contract_id: UUID,
+        batch_id: UUID,
+        chunks: Iterator,
+        quality_accumulator: Optional[QualityAccumulator]
+    ) -> AsyncIterator[ChunkOutcome]:
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            # Chunks are read off the event loop; streamed uploads block
+            # until the request body has delivered enough bytes.
+            chunk = await loop.run_in_executor(None, next, chunks, None)
+            if chunk is None:
+                break
+            
+            chunk_result = await validation_engine.validate_batch(
+                contract_id=contract_id,
+                data=chunk,
+                batch_id=batch_id,
+                check_quality=False
+            )
+            
+            if quality_accumulator:
+                quality_accumulator.update(chunk)
+            
+            yield ChunkOutcome(
+                chunk_result.total_records,
+                chunk_result.passed,
+                chunk_result.failed,
+                chunk_result.sample_errors,
+                chunk_result.errors_summary
+            )
     
-    def _count_errors_by_type(self, errors: List) -> Dict[str, int]:
-        from collections import Counter
-        error_types = [err.error_type for err in errors]
-        return dict(Counter(error_types))
+    async def _validate_parallel(
+        self,
+        compiled: CompiledValidator,
+        chunks: Iterator
+    ) -> AsyncIterator[ChunkOutcome]:
+        loop = asyncio.get_running_loop()
+        executor = get_process_pool()
+        window = settings.BATCH_MAX_IN_FLIGHT or 2 * batch_worker_count()
+        
+        in_flight = deque()
+        exhausted = False
+        
+        try:
+            while True:
+                # Reading happens off the event loop and stops once the
+                # window is full, so at most `window` chunks are in memory.
+                while not exhausted and len(in_flight) < window:
+                    chunk = await loop.run_in_executor(None, next, chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                        break
+                    
+                    in_flight.append(loop.run_in_executor(
+                        executor,
+                        validate_chunk_in_worker,
+                        compiled.contract_id,
+                        compiled.version,
+                        compiled.contract_schema,
+                        chunk
+                    ))
+                
+                if not in_flight:
+                    break
+                
+                # Worker processes have their own metrics registry, so the
+                # chunk is counted here from its outcome
+                outcome = await in_flight.popleft()
+                compiled.metrics.record_batch(
+                    outcome.passed, outcome.failed, outcome.errors_summary, outcome.validation_seconds
+                )
+                yield outcome
+        finally:
+            for future in in_flight:
+                future.cancel()
+    
+    def set_progress_callback(self, callback: Callable[..., None]):
+        self.progress_callback = callback
     
     def _store_batch_summary(self, result: BatchProcessingResult):
         from app.models.database import BatchSummary
         
+        # A queued job can run again after its worker died between writing
+        # the summary and completing the job; the batch is only counted once.
+        # The unique index includes processed_at, so on Postgres concurrent
+        # runs of one batch are serialized by a lock held until the commit.
+        if self.db.get_bind().dialect.name == "postgresql":
+            self.db.execute(
+                text("SELECT pg_advisory_xact_lock(hashtext(:batch_id))"),
+                {"batch_id": str(result.batch_id)}
+            )
+        existing = self.db.query(BatchSummary.id).filter(
+            BatchSummary.batch_id == str(result.batch_id)
+        ).first()
+        if existing is not None:
+            self.logger.warning(f"Batch {result.batch_id} already has a summary, not storing it again")
+            return
+        
         batch_summary = BatchSummary(
-            batch_id=result.batch_id,
-            contract_id=result.contract_id,
+            batch_id=str(result.batch_id),
+            contract_id=str(result.contract_id),
             total_records=result.total_records,
             passed=result.passed,
             failed=result.failed,
@@ -102,5 +376,16 @@ class BatchProcessor:
             processed_at=result.processed_at
         )
         
+        started = time.perf_counter()
         self.db.add(batch_summary)
-        self.db.commit()
\ No newline at end of file
+        self.db.commit()
+        DB_FLUSH_SECONDS.labels("batch_summary", "ok").observe(time.perf_counter() - started)
+        
+        metric_rollups.record(
+            result.contract_id,
+            result.processed_at,
+            passed=result.passed,
+            failed=result.failed,
+            execution_time_ms=result.execution_time_ms,
+            error_counts=result.errors_summary
+        )
\ No newline at end of file
@@ -0,0 +1,319 @@
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.schema_validator import SchemaValidator, CompiledField, FORMAT_PATTERNS
+from app.models.schemas import ContractSchema, FieldDefinition
+
+
+# validate_batch keeps the first five errors of every failed record, so
+# errors_summary only ever counts that many per row.
+MAX_ERRORS_PER_RECORD = 5
+
+ISO_OFFSET_PATTERN = r'(?:Z|[+-]\d{2}:?\d{2})$'
+
+# Strings of this shape parse the same with pandas and datetime.fromisoformat.
+# pandas' ISO8601 parser also takes "now", "2021" or " 2021-01-01", which the
+# row validator rejects, so anything else is checked one value at a time.
+ISO_TIMESTAMP_PATTERN = (
+    r'^\d{4}-\d{2}-\d{2}'
+    r'(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?)?'
+    r'(?:Z|[+-]\d{2}:?\d{2})?$'
+)
+
+
+class ColumnarValidationResult:
+    def __init__(
+        self,
+        total_records: int,
+        failed_mask: np.ndarray,
+        error_counts: Dict[str, int]
+    ):
+        self.total_records = total_records
+        self.failed_mask = failed_mask
+        self.error_counts = error_counts
+        self.failed = int(failed_mask.sum())
+        self.passed = total_records - self.failed
+
+    def failed_positions(self, limit: Optional[int] = None) -> np.ndarray:
+        positions = np.flatnonzero(self.failed_mask)
+        return positions if limit is None else positions[:limit]
+
+
+class _ErrorTally:
+    def __init__(self, total_records: int):
+        self.counted = np.zeros(total_records, dtype=np.int16)
+        self.counts: Counter = Counter()
+
+    def add(self, mask: np.ndarray, error_type: str) -> None:
+        keep = mask & (self.counted < MAX_ERRORS_PER_RECORD)
+        kept = int(keep.sum())
+        if kept:
+            self.counts[error_type] += kept
+            self.counted += keep
+
+    def add_record(self, position: int, error_types: List[str]) -> None:
+        room = MAX_ERRORS_PER_RECORD - int(self.counted[position])
+        for error_type in error_types[:room]:
+            self.counts[error_type] += 1
+        self.counted[position] += min(len(error_types), max(room, 0))
+
+
+class ColumnarValidator:
+    def __init__(
+        self,
+        contract_schema: ContractSchema,
+        schema_validator: Optional[SchemaValidator] = None
+    ):
+        self.schema = contract_schema.schema
+        self.schema_validator = schema_validator or SchemaValidator(contract_schema)
+        self.logger = logging.getLogger(__name__)
+
+    def validate(self, frame: pd.DataFrame) -> ColumnarValidationResult:
+        total_records = len(frame)
+        failed = np.zeros(total_records, dtype=bool)
+        tally = _ErrorTally(total_records)
+
+        for field in self.schema_validator.fields:
+            if field.name not in frame.columns:
+                if field.required and total_records:
+                    failed[:] = True
+                    tally.add(np.ones(total_records, dtype=bool), "REQUIRED_FIELD_MISSING")
+                continue
+
+            self._validate_column(
+                field,
+                self.schema[field.name],
+                frame[field.name],
+                failed,
+                tally
+            )
+
+        return ColumnarValidationResult(total_records, failed, dict(tally.counts))
+
+    def _validate_column(
+        self,
+        field: CompiledField,
+        field_def: FieldDefinition,
+        column: pd.Series,
+        failed: np.ndarray,
+        tally: _ErrorTally
+    ) -> None:
+        null = column.isna().to_numpy()
+        checked = np.ones(len(column), dtype=bool) if field.required else ~null
+
+        type_ok = self._type_mask(field.type_name, column, null)
+        if type_ok is None:
+            self._validate_per_value(field, column, null, checked, failed, tally)
+            return
+
+        type_failed = checked & ~type_ok
+        failed |= type_failed
+        tally.add(type_failed, "TYPE_MISMATCH")
+
+        valid = checked & type_ok
+        if not field.checks or not valid.any():
+            return
+
+        if field.type_name == 'string':
+            self._check_string(field, field_def, column, valid, failed, tally)
+        elif field.type_name in ['integer', 'float']:
+            self._check_number(field_def, column, valid, failed, tally)
+        elif field.type_name == 'timestamp':
+            self._check_timestamp(field, field_def, column, null, valid, failed, tally)
+
+    def _type_mask(
+        self,
+        expected_type: str,
+        column: pd.Series,
+        null: np.ndarray
+    ) -> Optional[np.ndarray]:
+        kind = column.dtype.kind
+        present = ~null
+
+        if expected_type in ['array', 'object']:
+            return None
+
+        if kind in 'iu':
+            accepted = ['integer', 'float', 'timestamp']
+        elif kind == 'f':
+            accepted = ['float', 'timestamp']
+        elif kind == 'b':
+            if expected_type == 'timestamp':
+                return None
+            accepted = ['boolean']
+        elif kind == 'M':
+            accepted = ['timestamp']
+        elif kind == 'O' and pd.api.types.infer_dtype(column, skipna=True) in ['string', 'empty']:
+            accepted = ['string', 'date', 'timestamp']
+        else:
+            return None
+
+        if expected_type in accepted:
+            return present
+        return np.zeros(len(column), dtype=bool)
+
+    def _check_string(
+        self,
+        field: CompiledField,
+        field_def: FieldDefinition,
+        column: pd.Series,
+        valid: np.ndarray,
+        failed: np.ndarray,
+        tally: _ErrorTally
+    ) -> None:
+        strings = column.str
+
+        compiled_pattern = self.schema_validator.compiled_patterns.get(field.name)
+        if field_def.pattern and compiled_pattern is not None:
+            matched = strings.match(compiled_pattern.pattern, flags=compiled_pattern.flags, na=True)
+            self._record(valid & ~matched.to_numpy(dtype=bool), "PATTERN_MISMATCH", failed, tally)
+
+        format_pattern = FORMAT_PATTERNS.get(field_def.format) if field_def.format else None
+        if format_pattern is not None:
+            matched = strings.match(format_pattern.pattern, flags=format_pattern.flags, na=True)
+            self._record(valid & ~matched.to_numpy(dtype=bool), "FORMAT_MISMATCH", failed, tally)
+
+        if field_def.min_length is not None or field_def.max_length is not None:
+            lengths = strings.len().to_numpy(dtype=float, na_value=np.nan)
+            if field_def.min_length is not None:
+                self._record(valid & (lengths < field_def.min_length), "LENGTH_TOO_SHORT", failed, tally)
+            if field_def.max_length is not None:
+                self._record(valid & (lengths > field_def.max_length), "LENGTH_TOO_LONG", failed, tally)
+
+        if field_def.enum:
+            allowed = column.isin(field_def.enum).to_numpy()
+            self._record(valid & ~allowed, "ENUM_MISMATCH", failed, tally)
+
+    def _check_number(
+        self,
+        field_def: FieldDefinition,
+        column: pd.Series,
+        valid: np.ndarray,
+        failed: np.ndarray,
+        tally: _ErrorTally
+    ) -> None:
+        values = column.to_numpy()
+
+        with np.errstate(invalid='ignore'):
+            if field_def.min is not None:
+                self._record(valid & (values < field_def.min), "VALUE_TOO_SMALL", failed, tally)
+            if field_def.max is not None:
+                self._record(valid & (values > field_def.max), "VALUE_TOO_LARGE", failed, tally)
+
+        if field_def.enum:
+            allowed = column.isin(field_def.enum).to_numpy()
+            self._record(valid & ~allowed, "ENUM_MISMATCH", failed, tally)
+
+    def _check_timestamp(
+        self,
+        field: CompiledField,
+        field_def: FieldDefinition,
+        column: pd.Series,
+        null: np.ndarray,
+        valid: np.ndarray,
+        failed: np.ndarray,
+        tally: _ErrorTally
+    ) -> None:
+        kind = column.dtype.kind
+
+        if kind == 'M':
+            instants = column.dt.tz_convert('UTC') if column.dt.tz is not None else column
+            aware = np.full(len(column), column.dt.tz is not None)
+            unparsed = np.zeros(len(column), dtype=bool)
+        elif kind == 'O':
+            aware = None
+            if field_def.min or field_def.max:
+                aware = column.str.contains(ISO_OFFSET_PATTERN, regex=True, na=False).to_numpy(dtype=bool)
+            instants = pd.to_datetime(
+                column,
+                format='ISO8601',
+                errors='coerce',
+                utc=True
+            )
+            strict = column.str.match(ISO_TIMESTAMP_PATTERN, na=False).to_numpy(dtype=bool)
+            unparsed = valid & (instants.isna().to_numpy() | ~strict)
+        else:
+            # Numeric epochs are interpreted in local time by the row
+            # validator, so they are not vectorized.
+            self._validate_per_value(field, column, null, valid, failed, tally)
+            return
+
+        fallback = unparsed.copy()
+        bounded = valid & ~unparsed
+
+        comparisons = []
+        for bound, op, error_type in [
+            (field_def.min, np.less, "TIMESTAMP_TOO_OLD"),
+            (field_def.max, np.greater, "TIMESTAMP_TOO_RECENT"),
+        ]:
+            if not bound:
+                continue
+
+            bound_dt = self._parse_bound(bound)
+            if bound_dt is None:
+                fallback |= bounded
+                continue
+
+            bound_aware = bound_dt.tzinfo is not None
+            fallback |= bounded & (aware != bound_aware)
+
+            bound_ts = pd.Timestamp(bound_dt)
+            bound_ts = bound_ts.tz_convert('UTC') if bound_aware else bound_ts.tz_localize('UTC')
+            comparisons.append((bound_ts.to_datetime64(), op, error_type))
+
+        if comparisons:
+            values = instants.to_numpy(dtype='datetime64[ns]')
+            comparable = bounded & ~fallback
+            for bound_value, op, error_type in comparisons:
+                self._record(comparable & op(values, bound_value), error_type, failed, tally)
+
+        if fallback.any():
+            self._validate_per_value(field, column, null, fallback, failed, tally)
+
+    def _parse_bound(self, bound: Any) -> Optional[datetime]:
+        try:
+            return datetime.fromisoformat(str(bound).replace('Z', '+00:00'))
+        except Exception:
+            return None
+
+    def _validate_per_value(
+        self,
+        field: CompiledField,
+        column: pd.Series,
+        null: np.ndarray,
+        rows: np.ndarray,
+        failed: np.ndarray,
+        tally: _ErrorTally
+    ) -> None:
+        values = column.tolist()
+
+        for position in np.flatnonzero(rows):
+            value = None if null[position] else values[position]
+
+            if not field.type_check(value):
+                error_types = ["TYPE_MISMATCH"]
+            else:
+                errors = []
+                for check in field.checks:
+                    check(value, errors)
+                if not errors:
+                    continue
+                error_types = [e.error_type for e in errors]
+
+            failed[position] = True
+            tally.add_record(position, error_types)
+
+    def _record(
+        self,
+        mask: np.ndarray,
+        error_type: str,
+        failed: np.ndarray,
+        tally: _ErrorTally
+    ) -> None:
+        failed |= mask
+        tally.add(mask, error_type)
@@ -2,13 +2,15 @@ import logging
 from typing import Optional, List, Tuple
 from uuid import UUID
 from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, func, select
 
 from app.models.database import Contract, ContractVersion
 from app.models.schemas import ContractCreate, ContractUpdate, ContractSchema
 from app.core.yaml_parser import YAMLParser, YAMLParserError
 from app.core.version_controller import VersionController
+from app.core.validator_cache import validator_cache
 from app.utils.exceptions import (
     DuplicateContractError,
     ContractNotFoundError,
@@ -16,6 +18,7 @@ from app.utils.exceptions import (
     InvalidContractSchemaError,
     DatabaseError
 )
+from app.utils.pagination import Keyset, after_keyset, keyset_order
 
 
 logger = logging.getLogger(__name__)
@@ -114,8 +117,10 @@ class ContractManager:
         domain: Optional[str] = None,
         is_active: bool = True,
         skip: int = 0,
-        limit: int = 50
-    ) -> Tuple[List[Contract], int]:
+        limit: int = 50,
+        after: Optional[Keyset] = None,
+        include_total: bool = True
+    ) -> Tuple[List[Contract], Optional[int]]:
         query = self.db.query(Contract)
         
         filters = [Contract.is_active == is_active]
@@ -125,11 +130,15 @@ class ContractManager:
         
         query = query.filter(and_(*filters))
         
-        total = query.count()
+        total = query.count() if include_total else None
         
-        contracts = query.order_by(
-            Contract.updated_at.desc()
-        ).offset(skip).limit(limit).all()
+        query = query.order_by(*keyset_order(Contract.updated_at, Contract.id))
+        if after:
+            query = query.filter(after_keyset(Contract.updated_at, Contract.id, after))
+        else:
+            query = query.offset(skip)
+        
+        contracts = query.limit(limit).all()
         
         self.logger.info(
             f"Listed {len(contracts)} contracts (total: {total}, "
@@ -215,6 +224,7 @@ class ContractManager:
                 self.logger.info(f"Soft deleted contract {contract_id}")
             
             self.db.commit()
+            validator_cache.invalidate(contract_id)
             return True
             
         except Exception as e:
@@ -237,6 +247,7 @@ class ContractManager:
             contract.is_active = True
             contract.updated_at = datetime.now(timezone.utc)
             self.db.commit()
+            validator_cache.invalidate(contract_id)
             
             self.logger.info(f"Contract activated: {contract_id}")
             return contract
@@ -255,15 +266,91 @@ class ContractManager:
         if not contract:
             raise ContractNotFoundError(contract_id=str(contract_id))
         
+        return self.parse_contract_schema(contract)
+    
+    def parse_contract_schema(self, contract: Contract) -> ContractSchema:
         try:
             schema = self.yaml_parser.parse_yaml(contract.yaml_content)
             return schema
         except YAMLParserError as e:
             raise InvalidYAMLError(
                 error_message=str(e),
-                details={"contract_id": str(contract_id)}
+                details={"contract_id": str(contract.id)}
             )
     
     def get_domains(self) -> List[str]:
         domains = self.db.query(Contract.domain).distinct().all()
-        return [d[0] for d in domains if d[0]]
\ No newline at end of file
+        return [d[0] for d in domains if d[0]]
+
+
+# Read paths used by the async request handlers. Contract writes stay on
+# ContractManager, which also owns versioning.
+class AsyncContractManager:
+    def __init__(self, db_session: AsyncSession):
+        self.db = db_session
+        self.yaml_parser = YAMLParser()
+        self.logger = logging.getLogger(__name__)
+    
+    async def get_contract_by_id(self, contract_id: UUID) -> Optional[Contract]:
+        result = await self.db.execute(
+            select(Contract).where(Contract.id == str(contract_id))
+        )
+        return result.scalars().first()
+    
+    async def get_contract_by_name(self, name: str) -> Optional[Contract]:
+        result = await self.db.execute(
+            select(Contract).where(Contract.name.ilike(name))
+        )
+        return result.scalars().first()
+    
+    async def list_contracts(
+        self,
+        domain: Optional[str] = None,
+        is_active: bool = True,
+        skip: int = 0,
+        limit: int = 50,
+        after: Optional[Keyset] = None,
+        include_total: bool = True
+    ) -> Tuple[List[Contract], Optional[int]]:
+        filters = [Contract.is_active == is_active]
+        
+        if domain:
+            filters.append(Contract.domain == domain)
+        
+        total = None
+        if include_total:
+            total = await self.db.scalar(
+                select(func.count()).select_from(Contract).where(and_(*filters))
+            )
+        
+        query = select(Contract).where(and_(*filters)).order_by(
+            *keyset_order(Contract.updated_at, Contract.id)
+        )
+        if after:
+            query = query.where(after_keyset(Contract.updated_at, Contract.id, after))
+        else:
+            query = query.offset(skip)
+        
+        result = await self.db.execute(query.limit(limit))
+        contracts = list(result.scalars().all())
+        
+        self.logger.info(
+            f"Listed {len(contracts)} contracts (total: {total}, "
+            f"domain: {domain}, active: {is_active})"
+        )
+        
+        return contracts, total
+    
+    async def get_contract_schema(self, contract_id: UUID) -> ContractSchema:
+        contract = await self.get_contract_by_id(contract_id)
+        if not contract:
+            raise ContractNotFoundError(contract_id=str(contract_id))
+        
+        return self.parse_contract_schema(contract)
+    
+    def parse_contract_schema(self, contract: Contract) -> ContractSchema:
+        return ContractManager.parse_contract_schema(self, contract)
+    
+    async def get_domains(self) -> List[str]:
+        result = await self.db.execute(select(Contract.domain).distinct())
+        return [d[0] for d in result.all() if d[0]]
@@ -0,0 +1,597 @@
+import logging
+import os
+import string
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.models.schemas import ContractSchema, FieldDefinition
+
+try:
+    import re._parser as sre_parse
+except ImportError:
+    import sre_parse
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+OUTPUT_FORMATS = ("csv", "jsonl", "json", "parquet")
+
+VIOLATION_KINDS = ("required", "type", "enum", "range", "length", "pattern", "format")
+
+# CSV and Parquet columns carry a single type, so a value of the wrong type
+# cannot be written without changing the rest of the column. Nulls in an
+# integer column come back as floats from pandas, failing every row, so
+# those columns get no nulls either.
+TYPED_FORMATS = ("csv", "parquet")
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Unbounded regex repeats (+, *) and unbounded lengths are capped here
+MAX_REPEAT = 8
+
+PRINTABLE = np.array([ord(c) for c in string.ascii_letters + string.digits + " -_.@"], dtype=np.uint32)
+
+CATEGORY_ALPHABETS = {
+    sre_parse.CATEGORY_DIGIT: string.digits,
+    sre_parse.CATEGORY_WORD: string.ascii_letters + string.digits + "_",
+    sre_parse.CATEGORY_SPACE: " ",
+}
+
+TYPE_VIOLATIONS = {
+    "string": 12345,
+    "integer": "not-an-integer",
+    "float": "not-a-float",
+    "boolean": "not-a-boolean",
+    "timestamp": "not-a-timestamp",
+    "date": 20240101,
+    "array": "not-an-array",
+    "object": "not-an-object",
+}
+
+FORMAT_VIOLATIONS = {
+    "email": "not-an-email",
+    "url": "not-a-url",
+    "uuid": "not-a-uuid",
+    "ipv4": "not-an-ip",
+}
+
+
+# A column of strings as a codepoint matrix plus per-row lengths. Pieces
+# are concatenated by scattering each one at the running row offsets, so
+# building strings never loops over rows in Python.
+class _Text:
+    __slots__ = ("codes", "lengths")
+
+    def __init__(self, codes: np.ndarray, lengths: np.ndarray):
+        self.codes = codes
+        self.lengths = lengths
+
+    @classmethod
+    def literal(cls, text: str, n: int) -> "_Text":
+        codes = np.array([ord(c) for c in text], dtype=np.uint32)
+        return cls(np.tile(codes, (n, 1)), np.full(n, len(text), dtype=np.int64))
+
+    @classmethod
+    def random(cls, rng: np.random.Generator, alphabet: np.ndarray, lengths: np.ndarray) -> "_Text":
+        width = int(lengths.max()) if len(lengths) else 0
+        codes = alphabet[rng.integers(0, len(alphabet), size=(len(lengths), width))]
+        codes[np.arange(width) >= lengths[:, None]] = 0
+        return cls(codes, lengths)
+
+    def truncate(self, keep: np.ndarray) -> "_Text":
+        # Rows where keep is False become empty strings
+        lengths = np.where(keep, self.lengths, 0)
+        codes = np.where(keep[:, None], self.codes, 0).astype(np.uint32)
+        return _Text(codes, lengths)
+
+    @classmethod
+    def concat(cls, pieces: List["_Text"]) -> "_Text":
+        n = len(pieces[0].lengths)
+        out = np.zeros((n, sum(piece.codes.shape[1] for piece in pieces)), dtype=np.uint32)
+        offsets = np.zeros(n, dtype=np.int64)
+        rows = np.arange(n)[:, None]
+        for piece in pieces:
+            width = piece.codes.shape[1]
+            if width and offsets[0] == offsets.min() == offsets.max():
+                # Everything so far had a fixed length: a plain slice will do
+                start = int(offsets[0])
+                out[:, start:start + width] = piece.codes
+            elif width:
+                columns = np.arange(width)
+                mask = columns < piece.lengths[:, None]
+                out[np.broadcast_to(rows, mask.shape)[mask], (offsets[:, None] + columns)[mask]] = piece.codes[mask]
+            offsets += piece.lengths
+        return cls(out, offsets)
+
+    @classmethod
+    def choose(cls, options: List["_Text"], choice: np.ndarray) -> "_Text":
+        width = max(option.codes.shape[1] for option in options)
+        codes = np.stack([np.pad(option.codes, ((0, 0), (0, width - option.codes.shape[1]))) for option in options])
+        lengths = np.stack([option.lengths for option in options])
+        rows = np.arange(len(choice))
+        return cls(codes[choice, rows], lengths[choice, rows])
+
+    def to_array(self) -> np.ndarray:
+        width = max(int(self.lengths.max()) if len(self.lengths) else 0, 1)
+        codes = np.zeros((len(self.lengths), width), dtype=np.uint32)
+        used = min(width, self.codes.shape[1])
+        codes[:, :used] = self.codes[:, :used]
+        return codes.view(f"<U{width}").reshape(len(self.lengths))
+
+
+def _octet_table() -> _Text:
+    octets = [str(i) for i in range(256)]
+    codes = np.zeros((256, 3), dtype=np.uint32)
+    for i, octet in enumerate(octets):
+        codes[i, :len(octet)] = [ord(c) for c in octet]
+    return _Text(codes, np.array([len(octet) for octet in octets], dtype=np.int64))
+
+
+OCTETS = _octet_table()
+
+DIGITS = np.array([ord(c) for c in string.digits], dtype=np.uint32)
+
+LOWERCASE = np.array([ord(c) for c in string.ascii_lowercase], dtype=np.uint32)
+
+HEX_DIGITS = np.array([ord(c) for c in "0123456789abcdef"], dtype=np.uint32)
+
+
+def _parse_bound(value: Any) -> datetime:
+    parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class PatternSampler:
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.nodes = sre_parse.parse(pattern)
+
+    def sample(self, rng: np.random.Generator, n: int) -> _Text:
+        return self._sequence(rng, list(self.nodes), n)
+
+    def _sequence(self, rng, nodes, n: int) -> _Text:
+        pieces = [self._node(rng, op, value, n) for op, value in nodes]
+        return _Text.concat(pieces) if pieces else _Text.literal("", n)
+
+    def _node(self, rng, op, value, n: int) -> _Text:
+        if op == sre_parse.LITERAL:
+            return _Text.literal(chr(value), n)
+        if op == sre_parse.AT:
+            return _Text.literal("", n)
+        if op in (sre_parse.IN, sre_parse.ANY, sre_parse.NOT_LITERAL):
+            return _Text.random(rng, self._alphabet(op, value), np.ones(n, dtype=np.int64))
+        if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            low, high, sub = value
+            if high == sre_parse.MAXREPEAT:
+                high = low + MAX_REPEAT
+            counts = rng.integers(low, high + 1, size=n)
+            if len(sub) == 1 and sub[0][0] in (sre_parse.IN, sre_parse.ANY, sre_parse.NOT_LITERAL, sre_parse.LITERAL):
+                sub_op, sub_value = sub[0]
+                alphabet = (
+                    np.array([sub_value], dtype=np.uint32) if sub_op == sre_parse.LITERAL
+                    else self._alphabet(sub_op, sub_value)
+                )
+                return _Text.random(rng, alphabet, counts)
+            pieces = []
+            for i in range(high):
+                pieces.append(self._sequence(rng, list(sub), n).truncate(counts > i))
+            return _Text.concat(pieces) if pieces else _Text.literal("", n)
+        if op == sre_parse.SUBPATTERN:
+            return self._sequence(rng, list(value[-1]), n)
+        if op == sre_parse.BRANCH:
+            branches = [self._sequence(rng, branch, n) for branch in value[1]]
+            return _Text.choose(branches, rng.integers(0, len(branches), size=n))
+        raise ValueError(f"Unsupported regex construct {op} in pattern {self.pattern!r}")
+
+    def _alphabet(self, op, value) -> np.ndarray:
+        if op == sre_parse.ANY:
+            return PRINTABLE
+        if op == sre_parse.NOT_LITERAL:
+            return PRINTABLE[PRINTABLE != value]
+
+        chars = set()
+        negate = False
+        for item_op, item_value in value:
+            if item_op == sre_parse.NEGATE:
+                negate = True
+            elif item_op == sre_parse.LITERAL:
+                chars.add(item_value)
+            elif item_op == sre_parse.RANGE:
+                chars.update(range(item_value[0], item_value[1] + 1))
+            elif item_op == sre_parse.CATEGORY and item_value in CATEGORY_ALPHABETS:
+                chars.update(ord(c) for c in CATEGORY_ALPHABETS[item_value])
+            else:
+                raise ValueError(f"Unsupported character class in pattern {self.pattern!r}")
+
+        if negate:
+            return PRINTABLE[~np.isin(PRINTABLE, list(chars))]
+        return np.array(sorted(chars), dtype=np.uint32)
+
+
+# Generates records for a contract a chunk at a time. Every column of a
+# chunk is drawn with numpy in one go; only nested objects and arrays are
+# assembled record by record. A `violation_rate` fraction of the records
+# gets one field overwritten with a value breaking one of `violations`.
+class DataGenerator:
+
+    def __init__(
+        self,
+        contract: ContractSchema,
+        seed: Optional[int] = None,
+        violation_rate: float = 0.0,
+        violations: Optional[Iterable[str]] = None,
+        null_rate: float = 0.0,
+        now: Optional[datetime] = None
+    ):
+        if not 0 <= violation_rate <= 1:
+            raise ValueError("violation_rate must be between 0 and 1")
+
+        self.contract = contract
+        self.rng = np.random.default_rng(seed)
+        self.violation_rate = violation_rate
+        self.violations = tuple(violations) if violations else VIOLATION_KINDS
+        unknown = set(self.violations) - set(VIOLATION_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown violation kinds: {', '.join(sorted(unknown))}")
+        self.null_rate = null_rate
+        self.now = now or datetime.utcnow()
+        self.violation_counts: Counter = Counter()
+        self.logger = logging.getLogger(__name__)
+        self._samplers: Dict[str, Optional[PatternSampler]] = {}
+
+    def generate_frame(self, rows: int, file_type: Optional[str] = None) -> pd.DataFrame:
+        columns = {
+            name: self._column(name, field, rows, nullable=_nullable(field, file_type))
+            for name, field in self.contract.schema.items()
+        }
+        if self.violation_rate:
+            self._inject_violations(columns, rows, file_type)
+        return pd.DataFrame(columns)
+
+    def iter_frames(
+        self,
+        rows: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        file_type: Optional[str] = None
+    ) -> Iterator[pd.DataFrame]:
+        remaining = rows
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            yield self.generate_frame(size, file_type)
+            remaining -= size
+
+    def records(self, rows: int) -> List[Dict[str, Any]]:
+        frame = self.generate_frame(rows, "json")
+        return [_drop_missing(record, self.contract.schema) for record in frame.to_dict(orient="records")]
+
+    def write(
+        self,
+        path: str,
+        rows: int,
+        file_type: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> int:
+        file_type = (file_type or os.path.splitext(path)[1].lstrip(".")).lower()
+        if file_type not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {file_type}")
+        if file_type == "csv":
+            # The CSV reader has no way to tell JSON text from a plain string,
+            # so nested fields would never read back as arrays or objects
+            nested = [name for name, field in self.contract.schema.items() if field.type in ("array", "object")]
+            if nested:
+                raise ValueError(f"CSV output does not support nested fields: {', '.join(nested)}")
+
+        frames = self.iter_frames(rows, chunk_size, file_type)
+        if file_type == "csv":
+            self._write_csv(path, frames)
+        elif file_type == "jsonl":
+            self._write_jsonl(path, frames)
+        elif file_type == "json":
+            self._write_json(path, frames)
+        else:
+            self._write_parquet(path, frames)
+
+        self.logger.info(f"Wrote {rows} {file_type} records to {path}")
+        return rows
+
+    def _write_csv(self, path: str, frames: Iterator[pd.DataFrame]) -> None:
+        with open(path, "w", newline="") as f:
+            for i, frame in enumerate(frames):
+                frame.to_csv(f, header=i == 0, index=False)
+
+    def _write_jsonl(self, path: str, frames: Iterator[pd.DataFrame]) -> None:
+        with open(path, "w") as f:
+            for frame in frames:
+                text = frame.to_json(orient="records", lines=True, force_ascii=False, double_precision=15)
+                f.write(text if text.endswith("\n") else text + "\n")
+
+    def _write_json(self, path: str, frames: Iterator[pd.DataFrame]) -> None:
+        with open(path, "w") as f:
+            f.write("[")
+            for i, frame in enumerate(frames):
+                text = frame.to_json(orient="records", force_ascii=False, double_precision=15)[1:-1]
+                if i and text:
+                    f.write(",")
+                f.write(text)
+            f.write("]")
+
+    def _write_parquet(self, path: str, frames: Iterator[pd.DataFrame]) -> None:
+        if pq is None:
+            raise ImportError("pyarrow is required to write Parquet files")
+
+        schema = pa.schema([
+            (name, self._arrow_type(field)) for name, field in self.contract.schema.items()
+        ])
+        # One row group per chunk
+        with pq.ParquetWriter(path, schema) as writer:
+            for frame in frames:
+                writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+
+    def _arrow_type(self, field: FieldDefinition):
+        if field.type == "integer" and not field.enum:
+            return pa.int64()
+        if field.type == "float" and not field.enum:
+            return pa.float64()
+        if field.type == "boolean":
+            return pa.bool_()
+        if field.type == "array" and field.items:
+            return pa.list_(self._arrow_type(field.items))
+        if field.type == "object" and field.properties:
+            return pa.struct([(name, self._arrow_type(prop)) for name, prop in field.properties.items()])
+        if field.enum and all(isinstance(v, int) and not isinstance(v, bool) for v in field.enum):
+            return pa.int64()
+        return pa.string()
+
+    def _column(self, path: str, field: FieldDefinition, n: int, nullable: bool = True) -> np.ndarray:
+        column = self._values(path, field, n)
+        if nullable and not field.required and self.null_rate:
+            nulls = self.rng.random(n) < self.null_rate
+            if nulls.any():
+                column = column.astype(object)
+                column[nulls] = None
+        return column
+
+    def _values(self, path: str, field: FieldDefinition, n: int) -> np.ndarray:
+        rng = self.rng
+
+        if field.enum:
+            options = np.empty(len(field.enum), dtype=object)
+            options[:] = field.enum
+            return options[rng.integers(0, len(options), size=n)]
+
+        if field.type == "string":
+            return self._strings(path, field, n).astype(object)
+
+        if field.type == "integer":
+            low, high = _numeric_range(field, 0, 1_000_000)
+            return rng.integers(int(np.ceil(low)), int(np.floor(high)) + 1, size=n)
+
+        if field.type == "float":
+            low, high = _numeric_range(field, 0.0, 1000.0)
+            return rng.uniform(low, high, size=n)
+
+        if field.type == "boolean":
+            return rng.random(n) < 0.5
+
+        if field.type in ("timestamp", "date"):
+            unit = "s" if field.type == "timestamp" else "D"
+            window = timedelta(days=1) if field.type == "timestamp" else timedelta(days=365)
+            low = _parse_bound(field.min) if field.min is not None else None
+            high = _parse_bound(field.max) if field.max is not None else None
+            if high is None:
+                high = max(self.now, low + window) if low is not None else self.now
+            if low is None:
+                low = high - window
+
+            start = np.datetime64(low, unit)
+            span = max(int((np.datetime64(high, unit) - start).astype(np.int64)), 0)
+            values = start + rng.integers(0, span + 1, size=n).astype(f"timedelta64[{unit}]")
+            text = np.datetime_as_string(values, unit=unit)
+            if field.type == "timestamp":
+                # datetime_as_string pads to a wider dtype than it fills
+                codes = text.view(np.uint32).reshape(n, -1)[:, :len("YYYY-MM-DDTHH:MM:SS")]
+                suffix = np.full((n, 1), ord("Z"), dtype=np.uint32)
+                text = np.hstack([codes, suffix]).view(f"<U{codes.shape[1] + 1}").reshape(n)
+            return text.astype(object)
+
+        if field.type == "array":
+            low = int(field.min) if field.min is not None else 1
+            high = int(field.max) if field.max is not None else low + 2
+            high = min(high, low + MAX_REPEAT)
+            lengths = rng.integers(low, high + 1, size=n)
+            ends = np.cumsum(lengths)
+            if field.items is None:
+                flat = [None] * int(ends[-1] if n else 0)
+            else:
+                flat = self._values(f"{path}[]", field.items, int(ends[-1]) if n else 0).tolist()
+            starts = ends - lengths
+            values = np.empty(n, dtype=object)
+            values[:] = [flat[s:e] for s, e in zip(starts.tolist(), ends.tolist())]
+            return values
+
+        if field.type == "object":
+            properties = field.properties or {}
+            names = list(properties)
+            # Optional properties that come out null are left out, since a
+            # present-but-null property fails its type check
+            columns = [self._column(f"{path}.{name}", prop, n).tolist() for name, prop in properties.items()]
+            optional = {name for name, prop in properties.items() if not prop.required}
+            values = np.empty(n, dtype=object)
+            if not names:
+                values[:] = [{} for _ in range(n)]
+            elif optional and self.null_rate:
+                values[:] = [
+                    {name: value for name, value in zip(names, row) if value is not None or name not in optional}
+                    for row in zip(*columns)
+                ]
+            else:
+                values[:] = [dict(zip(names, row)) for row in zip(*columns)]
+            return values
+
+        raise ValueError(f"Cannot generate values for type {field.type}")
+
+    def _strings(self, path: str, field: FieldDefinition, n: int) -> np.ndarray:
+        return self._text(path, field, n).to_array()
+
+    def _text(self, path: str, field: FieldDefinition, n: int) -> _Text:
+        rng = self.rng
+
+        if field.pattern:
+            sampler = self._sampler(path, field.pattern)
+            if sampler is not None:
+                return sampler.sample(rng, n)
+
+        if field.format == "email":
+            return _Text.concat([
+                _Text.literal("user", n),
+                _Text.random(rng, DIGITS, rng.integers(1, 10, size=n)),
+                _Text.literal("@example.com", n),
+            ])
+
+        if field.format == "uuid":
+            nibbles = rng.integers(0, 16, size=(n, 32))
+            nibbles[:, 12] = 4
+            nibbles[:, 16] = 8 + (nibbles[:, 16] & 3)
+            codes = np.full((n, 36), ord("-"), dtype=np.uint32)
+            codes[:, [i for i in range(36) if i not in (8, 13, 18, 23)]] = HEX_DIGITS[nibbles]
+            return _Text(codes, np.full(n, 36, dtype=np.int64))
+
+        if field.format == "ipv4":
+            pieces = []
+            for i, octet in enumerate(rng.integers(0, 256, size=(4, n))):
+                if i:
+                    pieces.append(_Text.literal(".", n))
+                pieces.append(_Text(OCTETS.codes[octet], OCTETS.lengths[octet]))
+            return _Text.concat(pieces)
+
+        low = field.min_length if field.min_length is not None else 5
+        high = field.max_length if field.max_length is not None else max(low, 12)
+        high = min(high, max(low, 12) + MAX_REPEAT)
+        lengths = rng.integers(low, high + 1, size=n)
+
+        if field.format == "url":
+            return _Text.concat([
+                _Text.literal("https://example.com/", n),
+                _Text.random(rng, LOWERCASE, np.maximum(lengths, 1)),
+            ])
+        return _Text.random(rng, LOWERCASE, lengths)
+
+    def _sampler(self, path: str, pattern: str) -> Optional[PatternSampler]:
+        if path not in self._samplers:
+            try:
+                sampler = PatternSampler(pattern)
+                sampler.sample(np.random.default_rng(0), 1)
+            except ValueError as e:
+                self.logger.warning(f"Generating plain strings for {path}: {e}")
+                sampler = None
+            self._samplers[path] = sampler
+        return self._samplers[path]
+
+    def _violation_value(self, kind: str, field: FieldDefinition) -> Any:
+        if kind == "required":
+            return None if field.required else _NOT_APPLICABLE
+        if kind == "type":
+            return TYPE_VIOLATIONS.get(field.type, _NOT_APPLICABLE)
+        if kind == "enum":
+            if not field.enum:
+                return _NOT_APPLICABLE
+            numbers = [v for v in field.enum if isinstance(v, (int, float)) and not isinstance(v, bool)]
+            return max(numbers) + 1 if len(numbers) == len(field.enum) else "__not_in_enum__"
+        if field.enum:
+            # Enum values take precedence over the other rules when generating
+            return _NOT_APPLICABLE
+        if kind == "range":
+            if field.type in ("integer", "float"):
+                step = 1 if field.type == "integer" else 1.0
+                if field.max is not None:
+                    return field.max + step
+                if field.min is not None:
+                    return field.min - step
+            if field.type == "timestamp" and field.min is not None:
+                return (_parse_bound(field.min) - timedelta(days=1)).isoformat() + "Z"
+            if field.type == "timestamp" and field.max is not None:
+                return (_parse_bound(field.max) + timedelta(days=1)).isoformat() + "Z"
+            return _NOT_APPLICABLE
+        if field.type != "string":
+            return _NOT_APPLICABLE
+        if kind == "length":
+            if field.max_length is not None:
+                return "x" * (field.max_length + 1)
+            if field.min_length:
+                return "x" * (field.min_length - 1)
+            return _NOT_APPLICABLE
+        if kind == "pattern" and field.pattern:
+            return "!!!"
+        if kind == "format" and field.format in FORMAT_VIOLATIONS:
+            return FORMAT_VIOLATIONS[field.format]
+        return _NOT_APPLICABLE
+
+    def _inject_violations(self, columns: Dict[str, np.ndarray], n: int, file_type: Optional[str]) -> None:
+        kinds = self.violations
+        if file_type in TYPED_FORMATS:
+            kinds = tuple(kind for kind in kinds if kind != "type")
+
+        candidates = []
+        for name, field in self.contract.schema.items():
+            for kind in kinds:
+                if kind == "required" and not _nullable(field, file_type):
+                    continue
+                value = self._violation_value(kind, field)
+                if value is not _NOT_APPLICABLE:
+                    candidates.append((name, kind, value))
+
+        if not candidates:
+            self.logger.warning(f"No field in the contract can break rules {kinds}")
+            return
+
+        rows = np.flatnonzero(self.rng.random(n) < self.violation_rate)
+        picks = self.rng.integers(0, len(candidates), size=len(rows))
+        for index in np.unique(picks):
+            name, kind, value = candidates[index]
+            targets = rows[picks == index]
+            column = columns[name]
+            if column.dtype != object:
+                column = columns[name] = column.astype(object)
+            column[targets] = [value] * len(targets) if isinstance(value, (list, dict)) else value
+            self.violation_counts[kind] += len(targets)
+
+
+# Marks rules a field has nothing to violate with; None is a real value
+_NOT_APPLICABLE = object()
+
+
+def _numeric_range(field: FieldDefinition, default_low: float, default_high: float):
+    low = float(field.min) if field.min is not None else None
+    high = float(field.max) if field.max is not None else None
+    span = default_high - default_low
+    if low is None and high is None:
+        return default_low, default_high
+    if low is None:
+        return high - span, high
+    if high is None:
+        return low, low + span
+    return low, high
+
+
+def _nullable(field: FieldDefinition, file_type: Optional[str]) -> bool:
+    return not (file_type in TYPED_FORMATS and field.type == "integer")
+
+
+def _drop_missing(record: Dict[str, Any], schema: Dict[str, FieldDefinition]) -> Dict[str, Any]:
+    # Required-field violations leave the key out entirely
+    return {
+        name: value for name, value in record.items()
+        if value is not None or not schema[name].required
+    }
@@ -0,0 +1,51 @@
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy.orm import Session
+
+from app.core.upserts import increment_upsert
+from app.models.database import ValidationErrorCount
+
+
+KEY_COLUMNS = ['contract_id', 'bucket_start', 'field', 'error_type']
+
+
+def bucket_start(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def count_errors(results: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    counts: Counter = Counter()
+    for result in results:
+        errors = result.get('errors')
+        if not errors:
+            continue
+
+        bucket = bucket_start(result['validated_at'])
+        for error in errors:
+            counts[(
+                str(result['contract_id']),
+                bucket,
+                error.get('field') or '',
+                error.get('error_type') or 'UNKNOWN'
+            )] += 1
+
+    return [
+        dict(
+            id=str(uuid.uuid4()),
+            contract_id=contract_id,
+            bucket_start=bucket,
+            field=field,
+            error_type=error_type,
+            count=count
+        )
+        for (contract_id, bucket, field, error_type), count in counts.items()
+    ]
+
+
+# Called in the same transaction that inserts the validation_results rows,
+# so the counts always match what was stored.
+def record_error_counts(db: Session, results: Iterable[Dict[str, Any]]) -> None:
+    increment_upsert(db, ValidationErrorCount, KEY_COLUMNS, count_errors(results), increments=['count'])
@@ -1,20 +1,128 @@
 from abc import ABC, abstractmethod
-from typing import Iterator, List, Dict, Any
+from typing import Iterator, List, Dict, Any, Optional, BinaryIO, TextIO, Union
+import io
 import json
 import pandas as pd
 import math
 import logging
+import time
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from app.core.telemetry import CHUNK_READ_SECONDS
+
+
+def frame_to_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    return clean_records(frame.to_dict('records'))
+
+
+def clean_records(records: List[Dict]) -> List[Dict]:
+    cleaned = []
+    for record in records:
+        cleaned_record = {}
+        for key, value in record.items():
+            if (isinstance(value, float) and math.isnan(value)) or value is pd.NaT:
+                cleaned_record[key] = None
+            else:
+                cleaned_record[key] = value
+        cleaned.append(cleaned_record)
+    return cleaned
+
+
+# Raw file wrapper that counts the bytes handed to the reader on top of it,
+# so batch jobs can report how far into the file they are.
+class CountingReader(io.RawIOBase):
+    
+    def __init__(self, raw: BinaryIO):
+        super().__init__()
+        self.raw = raw
+        self.bytes_read = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        size = self.raw.readinto(buffer)
+        if size:
+            self.bytes_read += size
+        return size
+    
+    def seekable(self) -> bool:
+        return self.raw.seekable()
+    
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self.raw.seek(offset, whence)
+    
+    def tell(self) -> int:
+        return self.raw.tell()
+    
+    def close(self) -> None:
+        self.raw.close()
+        super().close()
 
 
 class FileHandler(ABC):
     
+    file_type = ''
+    supports_frames = False
+    supports_streams = False
+    
     def __init__(self):
         self.logger = logging.getLogger(self.__class__.__name__)
+        self._sources: List[CountingReader] = []
+    
+    @property
+    def bytes_read(self) -> int:
+        return sum(source.bytes_read for source in self._sources)
+    
+    def open_source(self, file_path: str) -> BinaryIO:
+        source = CountingReader(open(file_path, 'rb'))
+        self._sources.append(source)
+        return io.BufferedReader(source)
     
     @abstractmethod
     def read_chunks(self, file_path: str, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
         pass
     
+    def timed(self, chunks: Iterator) -> Iterator:
+        # Records how long each chunk took to read and parse. For streamed
+        # uploads this includes waiting on the request body.
+        observe = CHUNK_READ_SECONDS.labels(self.file_type).observe
+        clock = time.perf_counter
+        try:
+            while True:
+                start = clock()
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                observe(clock() - start)
+                yield chunk
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close is not None:
+                close()
+    
+    def read_frames(
+        self,
+        file_path: str,
+        chunk_size: int,
+        columns: Optional[List[str]] = None
+    ) -> Iterator[pd.DataFrame]:
+        raise NotImplementedError(f"{self.__class__.__name__} does not yield DataFrames")
+    
+    def read_stream(
+        self,
+        stream: BinaryIO,
+        chunk_size: int,
+        columns: Optional[List[str]] = None
+    ) -> Iterator[Any]:
+        raise NotImplementedError(f"{self.__class__.__name__} cannot read from a stream")
+    
     @abstractmethod
     def validate_format(self, file_path: str) -> bool:
         pass
@@ -22,44 +130,68 @@ class FileHandler(ABC):
 
 class CSVHandler(FileHandler):
     
+    file_type = 'csv'
+    supports_frames = True
+    
     def read_chunks(self, file_path: str, chunk_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        for chunk in self.read_frames(file_path, chunk_size):
+            yield frame_to_records(chunk)
+    
+    supports_streams = True
+    
+    def read_frames(
+        self,
+        file_path: str,
+        chunk_size: int = 1000,
+        columns: Optional[List[str]] = None
+    ) -> Iterator[pd.DataFrame]:
+        usecols = self._usecols(columns)
+        
         try:
-            for chunk in pd.read_csv(
-                file_path,
-                chunksize=chunk_size,
-                encoding='utf-8',
-                skipinitialspace=True,
-                skip_blank_lines=True,
-                on_bad_lines='warn'
-            ):
-                chunk.columns = chunk.columns.str.strip()
-                records = chunk.to_dict('records')
-                records = self._clean_records(records)
-                yield records
+            with self.open_source(file_path) as source:
+                yield from self._read_csv(source, chunk_size, usecols, encoding='utf-8')
                 
         except UnicodeDecodeError:
-            for chunk in pd.read_csv(
-                file_path,
-                chunksize=chunk_size,
-                encoding='latin1',
-                skipinitialspace=True
-            ):
-                chunk.columns = chunk.columns.str.strip()
-                records = chunk.to_dict('records')
-                records = self._clean_records(records)
-                yield records
-    
-    def _clean_records(self, records: List[Dict]) -> List[Dict]:
-        cleaned = []
-        for record in records:
-            cleaned_record = {}
-            for key, value in record.items():
-                if isinstance(value, float) and math.isnan(value):
-                    cleaned_record[key] = None
-                else:
-                    cleaned_record[key] = value
-            cleaned.append(cleaned_record)
-        return cleaned
+            # The file is read again from the start
+            self._sources.clear()
+            with self.open_source(file_path) as source:
+                for chunk in pd.read_csv(
+                    source,
+                    chunksize=chunk_size,
+                    usecols=usecols,
+                    encoding='latin1',
+                    skipinitialspace=True
+                ):
+                    chunk.columns = chunk.columns.str.strip()
+                    yield chunk
+    
+    def read_stream(
+        self,
+        stream: BinaryIO,
+        chunk_size: int = 1000,
+        columns: Optional[List[str]] = None
+    ) -> Iterator[pd.DataFrame]:
+        # A consumed stream cannot be re-read, so there is no latin1 retry.
+        yield from self._read_csv(stream, chunk_size, self._usecols(columns), encoding='utf-8')
+    
+    def _read_csv(self, source, chunk_size: int, usecols, encoding: str) -> Iterator[pd.DataFrame]:
+        for chunk in pd.read_csv(
+            source,
+            chunksize=chunk_size,
+            usecols=usecols,
+            encoding=encoding,
+            skipinitialspace=True,
+            skip_blank_lines=True,
+            on_bad_lines='warn'
+        ):
+            chunk.columns = chunk.columns.str.strip()
+            yield chunk
+    
+    def _usecols(self, columns: Optional[List[str]]):
+        if columns is None:
+            return None
+        wanted = set(columns)
+        return lambda name: name.strip() in wanted
     
     def validate_format(self, file_path: str) -> bool:
         try:
@@ -69,53 +201,228 @@ class CSVHandler(FileHandler):
             return False
 
 
-class JSONHandler(FileHandler):
+VALUE_TERMINATORS = frozenset(' \t\n\r,:]}')
+
+# Largest single JSON value (record) buffered before giving up
+MAX_JSON_VALUE_SIZE = 16 * 1024 * 1024
+
+# A decode error this close to the end of the buffer may just be a value
+# cut off by the read ("tru" of "true"); one further back is a real error.
+INCOMPLETE_MARGIN = 16
+
+
+class JSONStreamReader:
     
-    def read_chunks(self, file_path: str, chunk_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+    def __init__(self, f, buffer_size: int = 64 * 1024, max_value_size: int = MAX_JSON_VALUE_SIZE):
+        self.f = f
+        self.buffer_size = buffer_size
+        self.max_value_size = max_value_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+    
+    def records(self) -> Iterator[Any]:
+        first = self._peek()
         
-        if isinstance(data, dict):
-            if 'data' in data:
-                data = data['data']
-            else:
-                data = [data]
-        elif not isinstance(data, list):
+        if first == '[':
+            self.pos += 1
+            yield from self._array_items()
+        elif first == '{':
+            yield from self._object_records()
+        else:
             raise ValueError("JSON must be object or array")
+    
+    def _object_records(self) -> Iterator[Any]:
+        # Yields the items of the "data" array without materializing it;
+        # an object without one is a single record, as with json.load.
+        self.pos += 1
+        fields = {}
+        found_data = False
+        
+        if self._peek() == '}':
+            self.pos += 1
+            yield fields
+            return
         
-        for i in range(0, len(data), chunk_size):
-            yield data[i:i + chunk_size]
+        while True:
+            key = self._value()
+            if not isinstance(key, str):
+                self._error("Expecting property name enclosed in double quotes")
+            self._expect(':')
+            
+            if key == 'data' and not found_data and self._peek() == '[':
+                found_data = True
+                self.pos += 1
+                yield from self._array_items()
+            elif key == 'data' and not found_data:
+                found_data = True
+                yield self._value()
+            elif found_data:
+                self._value()
+            else:
+                fields[key] = self._value()
+            
+            separator = self._peek()
+            self.pos += 1
+            if separator == '}':
+                break
+            if separator != ',':
+                self.pos -= 1
+                self._error("Expecting ',' delimiter")
+        
+        if not found_data:
+            yield fields
     
-    def validate_format(self, file_path: str) -> bool:
+    def _array_items(self) -> Iterator[Any]:
+        if self._peek() == ']':
+            self.pos += 1
+            return
+        
+        while True:
+            yield self._value()
+            
+            separator = self._peek()
+            self.pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                self.pos -= 1
+                self._error("Expecting ',' delimiter")
+    
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number cut at the buffer edge ("12" of "12.5") still
+                # decodes, so only trust a value followed by a delimiter.
+                if self.eof or (end < len(self.buffer) and self.buffer[end] in VALUE_TERMINATORS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self.eof or not self._incomplete(e):
+                    raise
+            if len(self.buffer) - self.pos > self.max_value_size:
+                self._error(f"JSON value exceeds {self.max_value_size} characters")
+            self._fill()
+    
+    def _incomplete(self, error: json.JSONDecodeError) -> bool:
+        # Strings report the position they start at, so an unterminated one
+        # can only be resolved by reading on (up to max_value_size)
+        return (
+            error.pos >= len(self.buffer) - INCOMPLETE_MARGIN
+            or error.msg.startswith("Unterminated string")
+        )
+    
+    def _peek(self) -> str:
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\n\r':
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if self.eof:
+                return ''
+            self._fill()
+    
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            self._error(f"Expecting '{char}' delimiter")
+        self.pos += 1
+    
+    def _fill(self) -> None:
+        # Read at least as much as is already pending so re-decoding a
+        # value that spans many reads stays linear.
+        pending = self.buffer[self.pos:]
+        chunk = self.f.read(max(self.buffer_size, len(pending)))
+        if not chunk:
+            self.eof = True
+        self.buffer = pending + chunk
+        self.pos = 0
+    
+    def _error(self, message: str) -> None:
+        raise json.JSONDecodeError(message, self.buffer, self.pos)
+
+
+class JSONHandler(FileHandler):
+    
+    file_type = 'json'
+    supports_streams = True
+    
+    def __init__(self, buffer_size: int = 64 * 1024):
+        super().__init__()
+        self.buffer_size = buffer_size
+    
+    def read_chunks(self, file_path: str, chunk_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        with io.TextIOWrapper(self.open_source(file_path), encoding='utf-8') as f:
+            yield from self._read_text(f, chunk_size)
+    
+    def read_stream(
+        self,
+        stream: BinaryIO,
+        chunk_size: int = 1000,
+        columns: Optional[List[str]] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        yield from self._read_text(io.TextIOWrapper(stream, encoding='utf-8'), chunk_size)
+    
+    def _read_text(self, f: TextIO, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+        chunk = []
+        for record in JSONStreamReader(f, self.buffer_size).records():
+            chunk.append(record)
+            
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        
+        if chunk:
+            yield chunk
+    
+    def validate_format(self, file_path: str, sample_size: int = 10) -> bool:
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                json.load(f)
+                for i, _ in enumerate(JSONStreamReader(f, self.buffer_size).records()):
+                    if i + 1 >= sample_size:
+                        break
             return True
-        except json.JSONDecodeError:
+        except ValueError:
             return False
 
 
 class JSONLHandler(FileHandler):
     
+    file_type = 'jsonl'
+    supports_streams = True
+    
     def read_chunks(self, file_path: str, chunk_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        with io.TextIOWrapper(self.open_source(file_path), encoding='utf-8') as f:
+            yield from self._read_text(f, chunk_size)
+    
+    def read_stream(
+        self,
+        stream: BinaryIO,
+        chunk_size: int = 1000,
+        columns: Optional[List[str]] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        yield from self._read_text(io.TextIOWrapper(stream, encoding='utf-8'), chunk_size)
+    
+    def _read_text(self, f: TextIO, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
         chunk = []
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            
+            try:
+                record = json.loads(line)
+                chunk.append(record)
                 
-                try:
-                    record = json.loads(line)
-                    chunk.append(record)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
                     
-                    if len(chunk) >= chunk_size:
-                        yield chunk
-                        chunk = []
-                        
-                except json.JSONDecodeError as e:
-                    self.logger.warning(f"Skipping invalid line: {e}")
-                    continue
+            except json.JSONDecodeError as e:
+                self.logger.warning(f"Skipping invalid line: {e}")
+                continue
         
         if chunk:
             yield chunk
@@ -133,6 +440,60 @@ class JSONLHandler(FileHandler):
             return False
 
 
+class ParquetHandler(FileHandler):
+    
+    file_type = 'parquet'
+    supports_frames = True
+    
+    def read_chunks(self, file_path: str, chunk_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        for chunk in self.read_frames(file_path, chunk_size):
+            yield frame_to_records(chunk)
+    
+    def read_frames(
+        self,
+        file_path: str,
+        chunk_size: int = 1000,
+        columns: Optional[List[str]] = None
+    ) -> Iterator[pd.DataFrame]:
+        with self.open_source(file_path) as source:
+            parquet_file = self._open(source)
+            
+            if columns is not None:
+                available = set(parquet_file.schema_arrow.names)
+                columns = [name for name in columns if name in available]
+            
+            # Record batches are read one row group at a time, so memory stays
+            # bounded by the batch size rather than the file size.
+            for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+                yield self._to_frame(batch)
+    
+    def validate_format(self, file_path: str) -> bool:
+        try:
+            self._open(file_path)
+            return True
+        except Exception:
+            return False
+    
+    def _open(self, source: Union[str, BinaryIO]) -> "pq.ParquetFile":
+        if pq is None:
+            raise ImportError("pyarrow is required to read Parquet files")
+        return pq.ParquetFile(source)
+    
+    def _to_frame(self, batch: "pa.RecordBatch") -> pd.DataFrame:
+        if batch.num_columns == 0:
+            return pd.DataFrame(index=range(batch.num_rows))
+        
+        frame = batch.to_pandas()
+        
+        # Nested columns arrive as numpy arrays; the validators expect the
+        # same lists and dicts a JSON reader would produce.
+        for i, field in enumerate(batch.schema):
+            if pa.types.is_nested(field.type):
+                frame[field.name] = pd.Series(batch.column(i).to_pylist(), index=frame.index, dtype=object)
+        
+        return frame
+
+
 class FileHandlerFactory:
     
     @staticmethod
@@ -141,6 +502,7 @@ class FileHandlerFactory:
             'csv': CSVHandler(),
             'json': JSONHandler(),
             'jsonl': JSONLHandler(),
+            'parquet': ParquetHandler(),
         }
         
         handler = handlers.get(file_type.lower())
@@ -0,0 +1,212 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.database import QueuedJob
+
+
+JOB_KIND_VALIDATE_FILE = "validate_file"
+
+# Candidates looked at per claim before giving up for this poll
+CLAIM_RETRIES = 5
+
+
+# Jobs are leased rather than locked for their whole run: a claim sets
+# locked_until to now + visibility_timeout and the worker keeps extending it
+# with heartbeats. If the worker dies the lease runs out and the next claim
+# picks the job up again, counting it as another attempt.
+class JobQueue:
+
+    def __init__(
+        self,
+        db_session: Session,
+        visibility_timeout: Optional[int] = None,
+        retry_backoff: Optional[int] = None
+    ):
+        self.db = db_session
+        self.visibility_timeout = visibility_timeout or settings.JOB_VISIBILITY_TIMEOUT
+        self.retry_backoff = settings.JOB_RETRY_BACKOFF if retry_backoff is None else retry_backoff
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def skip_locked(self) -> bool:
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    def enqueue(
+        self,
+        job_id,
+        contract_id,
+        payload: Dict[str, Any],
+        kind: str = JOB_KIND_VALIDATE_FILE,
+        max_attempts: Optional[int] = None
+    ) -> QueuedJob:
+        job = QueuedJob(
+            id=str(job_id),
+            kind=kind,
+            contract_id=str(contract_id),
+            payload=payload,
+            status="QUEUED",
+            attempts=0,
+            max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+            run_after=datetime.utcnow()
+        )
+        self.db.add(job)
+        self.db.commit()
+        self.logger.info(f"Queued {kind} job {job.id}")
+        return job
+
+    def depth(self) -> int:
+        return self.db.scalar(
+            select(func.count()).select_from(QueuedJob).where(QueuedJob.status == "QUEUED")
+        )
+
+    def get(self, job_id) -> Optional[QueuedJob]:
+        return self.db.get(QueuedJob, str(job_id))
+
+    def _claimable(self, now: datetime):
+        return and_(
+            QueuedJob.attempts < QueuedJob.max_attempts,
+            or_(
+                and_(QueuedJob.status == "QUEUED", QueuedJob.run_after <= now),
+                and_(QueuedJob.status == "RUNNING", QueuedJob.locked_until < now)
+            )
+        )
+
+    def claim(self, worker_id: str) -> Optional[QueuedJob]:
+        for _ in range(CLAIM_RETRIES):
+            now = datetime.utcnow()
+            candidate = select(QueuedJob.id).where(self._claimable(now)).order_by(
+                QueuedJob.run_after, QueuedJob.created_at
+            ).limit(1)
+            if self.skip_locked:
+                # Rows locked by another worker's claim are skipped, not waited on
+                candidate = candidate.with_for_update(skip_locked=True)
+
+            job_id = self.db.execute(candidate).scalar()
+            if job_id is None:
+                self.db.rollback()
+                return None
+
+            # Compare-and-set on the claimable condition, so two workers
+            # racing for the same row (SQLite has no SKIP LOCKED) cannot
+            # both win it.
+            claimed = self.db.execute(
+                update(QueuedJob).where(
+                    QueuedJob.id == job_id,
+                    self._claimable(now)
+                ).values(
+                    status="RUNNING",
+                    attempts=QueuedJob.attempts + 1,
+                    locked_by=worker_id,
+                    locked_until=now + timedelta(seconds=self.visibility_timeout),
+                    started_at=now,
+                    last_error=None
+                ).execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+
+            if claimed.rowcount == 1:
+                job = self.get(job_id)
+                self.db.refresh(job)
+                self.logger.info(f"Worker {worker_id} claimed job {job_id} (attempt {job.attempts})")
+                return job
+
+        return None
+
+    def heartbeat(self, job_id, worker_id: str, progress: Optional[Dict[str, Any]] = None) -> bool:
+        values: Dict[str, Any] = {
+            "locked_until": datetime.utcnow() + timedelta(seconds=self.visibility_timeout)
+        }
+        if progress is not None:
+            values["progress"] = progress
+        return self._update_owned(job_id, worker_id, values)
+
+    def complete(self, job_id, worker_id: str, progress: Optional[Dict[str, Any]] = None) -> bool:
+        values: Dict[str, Any] = {
+            "status": "COMPLETED",
+            "locked_by": None,
+            "locked_until": None,
+            "finished_at": datetime.utcnow()
+        }
+        if progress is not None:
+            values["progress"] = progress
+        return self._update_owned(job_id, worker_id, values)
+
+    # A failed attempt goes back to the queue after an exponential backoff
+    # until max_attempts is reached, then the job is marked FAILED. Errors
+    # that another attempt cannot fix pass retry=False.
+    def fail(
+        self,
+        job_id,
+        worker_id: str,
+        error: str,
+        progress: Optional[Dict[str, Any]] = None,
+        retry: bool = True
+    ) -> bool:
+        job = self.get(job_id)
+        if job is None:
+            return False
+        self.db.refresh(job)
+
+        now = datetime.utcnow()
+        values: Dict[str, Any] = {"locked_by": None, "locked_until": None, "last_error": error}
+        if progress is not None:
+            values["progress"] = progress
+
+        if retry and job.attempts < job.max_attempts:
+            values["status"] = "QUEUED"
+            values["run_after"] = now + timedelta(seconds=self.retry_backoff * 2 ** (job.attempts - 1))
+        else:
+            values["status"] = "FAILED"
+            values["finished_at"] = now
+
+        return self._update_owned(job_id, worker_id, values)
+
+    # Jobs whose lease ran out on their last attempt are not claimable any
+    # more, so they are closed out here.
+    def reap_expired(self) -> int:
+        now = datetime.utcnow()
+        result = self.db.execute(
+            update(QueuedJob).where(
+                QueuedJob.status == "RUNNING",
+                QueuedJob.locked_until < now,
+                QueuedJob.attempts >= QueuedJob.max_attempts
+            ).values(
+                status="FAILED",
+                locked_by=None,
+                locked_until=None,
+                finished_at=now,
+                last_error="Visibility timeout expired on the final attempt"
+            ).execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        if result.rowcount:
+            self.logger.warning(f"Marked {result.rowcount} abandoned job(s) as failed")
+        return result.rowcount
+
+    def purge_finished(self, cutoff: datetime) -> int:
+        result = self.db.execute(
+            delete(QueuedJob).where(
+                QueuedJob.status.in_(("COMPLETED", "FAILED")),
+                QueuedJob.finished_at < cutoff
+            ).execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return result.rowcount
+
+    # Only the worker holding the lease may move the job on; a worker that
+    # lost its lease to a newer claim gets False back.
+    def _update_owned(self, job_id, worker_id: str, values: Dict[str, Any]) -> bool:
+        result = self.db.execute(
+            update(QueuedJob).where(
+                QueuedJob.id == str(job_id),
+                QueuedJob.locked_by == worker_id,
+                QueuedJob.status == "RUNNING"
+            ).values(**values).execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return result.rowcount == 1
@@ -0,0 +1,166 @@
+import logging
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import date, datetime
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.telemetry import DB_FLUSH_SECONDS
+from app.core.upserts import increment_upsert
+from app.models.database import MetricRollup, MetricRollupError
+
+
+RollupKey = Tuple[str, date, int]
+
+
+class RollupCounter:
+    __slots__ = ('passed', 'failed', 'execution_time_ms', 'error_counts')
+
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+        self.execution_time_ms = 0.0
+        self.error_counts: Counter = Counter()
+
+    def merge(self, other: "RollupCounter") -> None:
+        self.passed += other.passed
+        self.failed += other.failed
+        self.execution_time_ms += other.execution_time_ms
+        self.error_counts.update(other.error_counts)
+
+
+# Per (contract, date, hour) counters updated as results are produced.
+# `flush` swaps the buffer out and adds it onto the rollup tables with
+# increment upserts, so several processes can share the rows.
+class MetricRollupBuffer:
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        enabled: bool = True
+    ):
+        self.session_factory = session_factory
+        self.enabled = enabled
+        self._counters: Dict[RollupKey, RollupCounter] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def record(
+        self,
+        contract_id,
+        validated_at: datetime,
+        passed: int,
+        failed: int,
+        execution_time_ms: float,
+        error_counts: Optional[Mapping[str, int]] = None
+    ) -> None:
+        if not self.enabled:
+            return
+
+        key = (str(contract_id), validated_at.date(), validated_at.hour)
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = self._counters[key] = RollupCounter()
+            counter.passed += passed
+            counter.failed += failed
+            counter.execution_time_ms += execution_time_ms
+            if error_counts:
+                counter.error_counts.update(error_counts)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._counters)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters = {}
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                counters, self._counters = self._counters, {}
+
+            if not counters:
+                return 0
+
+            if self.session_factory is None:
+                from app.database import SessionLocal
+                self.session_factory = SessionLocal
+
+            db = None
+            started = time.perf_counter()
+            try:
+                db = self.session_factory()
+                self._upsert(db, counters)
+                db.commit()
+            except Exception as e:
+                if db is not None:
+                    db.rollback()
+                DB_FLUSH_SECONDS.labels("metric_rollups", "error").observe(time.perf_counter() - started)
+                self._restore(counters)
+                self.logger.error(f"Failed to flush {len(counters)} metric rollups: {e}")
+                return 0
+            finally:
+                if db is not None:
+                    db.close()
+
+            DB_FLUSH_SECONDS.labels("metric_rollups", "ok").observe(time.perf_counter() - started)
+            self.logger.debug(f"Flushed {len(counters)} metric rollups")
+            return len(counters)
+
+    def _restore(self, counters: Dict[RollupKey, RollupCounter]) -> None:
+        with self._lock:
+            for key, counter in counters.items():
+                if key in self._counters:
+                    counter.merge(self._counters[key])
+                self._counters[key] = counter
+
+    def _upsert(self, db: Session, counters: Dict[RollupKey, RollupCounter]) -> None:
+        now = datetime.utcnow()
+        rollup_rows = []
+        error_rows = []
+        for (contract_id, rollup_date, hour), counter in counters.items():
+            rollup_rows.append(dict(
+                id=str(uuid.uuid4()),
+                contract_id=contract_id,
+                rollup_date=rollup_date,
+                hour=hour,
+                passed=counter.passed,
+                failed=counter.failed,
+                execution_time_ms=counter.execution_time_ms,
+                updated_at=now
+            ))
+            for error_type, count in counter.error_counts.items():
+                error_rows.append(dict(
+                    id=str(uuid.uuid4()),
+                    contract_id=contract_id,
+                    rollup_date=rollup_date,
+                    hour=hour,
+                    error_type=error_type,
+                    count=count
+                ))
+
+        increment_upsert(
+            db,
+            MetricRollup,
+            ['contract_id', 'rollup_date', 'hour'],
+            rollup_rows,
+            increments=['passed', 'failed', 'execution_time_ms'],
+            replace=['updated_at']
+        )
+        increment_upsert(
+            db,
+            MetricRollupError,
+            ['contract_id', 'rollup_date', 'hour', 'error_type'],
+            error_rows,
+            increments=['count']
+        )
+
+
+metric_rollups = MetricRollupBuffer(enabled=settings.METRIC_ROLLUPS_ENABLED)
@@ -1,81 +1,269 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from uuid import UUID
 from datetime import date, datetime, timedelta
 import logging
+from sqlalchemy import Integer, Select, case, cast, func, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.models.database import ValidationResult, Contract, QualityMetric
+from app.models.database import (
+    ValidationResult,
+    BatchSummary,
+    Contract,
+    QualityMetric,
+    MetricRollup,
+    MetricRollupError,
+    ValidationErrorCount
+)
 from app.models.schemas import DailyMetrics, TrendData
 
 
 class MetricsAggregator:
     
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Session, from_rollups: bool = False):
         self.db = db_session
+        self.from_rollups = from_rollups
         self.logger = logging.getLogger(__name__)
     
     def calculate_daily_metrics(self, contract_id: UUID, target_date: date) -> DailyMetrics:
-        start_datetime = datetime.combine(target_date, datetime.min.time())
-        end_datetime = datetime.combine(target_date, datetime.max.time())
+        results = self._aggregate(target_date, [str(contract_id)])
         
-        validations = self.db.query(ValidationResult).filter(
-            ValidationResult.contract_id == contract_id,
-            ValidationResult.validated_at >= start_datetime,
-            ValidationResult.validated_at < end_datetime
-        ).all()
-        
-        if not validations:
+        if str(contract_id) not in results:
             return self._create_empty_metrics(contract_id, target_date)
         
-        total = len(validations)
-        passed = sum(1 for v in validations if v.status == 'PASS')
-        failed = total - passed
-        pass_rate = (passed / total * 100) if total > 0 else 0
-        
-        avg_execution_time = sum(v.execution_time_ms for v in validations) / total
+        return results[str(contract_id)]
+    
+    def _aggregate(
+        self,
+        target_date: date,
+        contract_ids: Optional[List[str]] = None
+    ) -> Dict[str, DailyMetrics]:
+        summary_query, error_query, batch_error_query = self._aggregation_queries(target_date, contract_ids)
         
-        all_errors = []
-        for v in validations:
-            if v.status == 'FAIL' and v.errors:
-                all_errors.extend(v.errors)
+        summaries = self.db.execute(summary_query).all()
         
-        error_counts = self._count_errors(all_errors)
-        top_errors = sorted(error_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        if not summaries:
+            return {}
         
-        quality_score = self._calculate_quality_score(
-            pass_rate=pass_rate,
-            total_validations=total,
-            error_variety=len(error_counts),
-            contract_id=contract_id
+        error_counts = self._group_error_counts(
+            self.db.execute(error_query).all(),
+            self.db.execute(batch_error_query).all() if batch_error_query is not None else []
         )
         
-        metrics = QualityMetric(
-            contract_id=contract_id,
-            metric_date=target_date,
-            total_validations=total,
-            passed=passed,
-            failed=failed,
-            pass_rate=pass_rate,
-            avg_execution_time_ms=avg_execution_time,
-            top_errors=dict(top_errors),
-            quality_score=quality_score
+        pass_rates = self._group_pass_rates(
+            self.db.execute(self._recent_pass_rates_query(contract_ids)).all()
         )
+        existing = self.db.execute(
+            self._existing_metrics_query(target_date, contract_ids)
+        ).scalars().all()
         
-        existing = self.db.query(QualityMetric).filter(
-            QualityMetric.contract_id == contract_id,
-            QualityMetric.metric_date == target_date
-        ).first()
-        
-        if existing:
-            for key, value in metrics.__dict__.items():
-                if not key.startswith('_'):
-                    setattr(existing, key, value)
-        else:
-            self.db.add(metrics)
+        results = self._apply_summaries(target_date, summaries, error_counts, pass_rates, existing)
         
         self.db.commit()
         
-        return DailyMetrics.from_orm(metrics)
+        return results
+    
+    def _day_bounds(self, target_date: date) -> Tuple[datetime, datetime]:
+        start_datetime = datetime.combine(target_date, datetime.min.time())
+        return start_datetime, start_datetime + timedelta(days=1)
+    
+    def _scope(self, contract_column, contract_ids: Optional[List[str]]):
+        if contract_ids is None:
+            return contract_column.in_(select(Contract.id).where(Contract.is_active == True))
+        return contract_column.in_(contract_ids)
+    
+    # Rollups already hold per-hour sums, so finalizing a day from them only
+    # reads 24 rows per contract instead of the raw validation results.
+    # Both paths count single-record results plus the records of batch
+    # files; the raw path takes the latter from batch_summaries.
+    def _aggregation_queries(
+        self,
+        target_date: date,
+        contract_ids: Optional[List[str]]
+    ) -> Tuple[Select, Select, Optional[Select]]:
+        if self.from_rollups:
+            return (
+                self._rollup_summary_query(target_date, contract_ids),
+                self._rollup_error_counts_query(target_date, contract_ids),
+                None
+            )
+        
+        start_datetime, end_datetime = self._day_bounds(target_date)
+        return (
+            self._summary_query(start_datetime, end_datetime, contract_ids),
+            self._error_counts_query(start_datetime, end_datetime, contract_ids),
+            self._batch_error_counts_query(start_datetime, end_datetime, contract_ids)
+        )
+    
+    def _rollup_summary_query(self, target_date: date, contract_ids: Optional[List[str]]) -> Select:
+        total = func.sum(MetricRollup.passed + MetricRollup.failed)
+        return select(
+            MetricRollup.contract_id,
+            total.label('total'),
+            func.sum(MetricRollup.passed).label('passed'),
+            (func.sum(MetricRollup.execution_time_ms) / func.nullif(total, 0)).label('avg_execution_time_ms')
+        ).where(
+            self._scope(MetricRollup.contract_id, contract_ids),
+            MetricRollup.rollup_date == target_date
+        ).group_by(MetricRollup.contract_id).having(total > 0)
+    
+    def _rollup_error_counts_query(self, target_date: date, contract_ids: Optional[List[str]]) -> Select:
+        return select(
+            MetricRollupError.contract_id,
+            MetricRollupError.error_type,
+            func.sum(MetricRollupError.count).label('count')
+        ).where(
+            self._scope(MetricRollupError.contract_id, contract_ids),
+            MetricRollupError.rollup_date == target_date
+        ).group_by(MetricRollupError.contract_id, MetricRollupError.error_type)
+    
+    def _summary_query(
+        self,
+        start_datetime: datetime,
+        end_datetime: datetime,
+        contract_ids: Optional[List[str]]
+    ) -> Select:
+        records = select(
+            ValidationResult.contract_id.label('contract_id'),
+            func.count().label('total'),
+            func.sum(case((ValidationResult.status == 'PASS', 1), else_=0)).label('passed'),
+            func.sum(ValidationResult.execution_time_ms).label('execution_time_ms')
+        ).where(
+            self._scope(ValidationResult.contract_id, contract_ids),
+            ValidationResult.validated_at >= start_datetime,
+            ValidationResult.validated_at < end_datetime
+        ).group_by(ValidationResult.contract_id)
+        
+        batches = select(
+            BatchSummary.contract_id.label('contract_id'),
+            func.sum(BatchSummary.total_records).label('total'),
+            func.sum(BatchSummary.passed).label('passed'),
+            func.sum(BatchSummary.execution_time_ms).label('execution_time_ms')
+        ).where(
+            self._scope(BatchSummary.contract_id, contract_ids),
+            BatchSummary.processed_at >= start_datetime,
+            BatchSummary.processed_at < end_datetime
+        ).group_by(BatchSummary.contract_id)
+        
+        combined = union_all(records, batches).subquery()
+        total = func.sum(combined.c.total)
+        return select(
+            combined.c.contract_id,
+            cast(total, Integer).label('total'),
+            cast(func.sum(combined.c.passed), Integer).label('passed'),
+            (func.sum(combined.c.execution_time_ms) / func.nullif(total, 0)).label('avg_execution_time_ms')
+        ).group_by(combined.c.contract_id).having(total > 0)
+    
+    # Error types come from validation_error_counts, which is maintained
+    # when results are written, so no errors JSON has to be read here.
+    def _error_counts_query(
+        self,
+        start_datetime: datetime,
+        end_datetime: datetime,
+        contract_ids: Optional[List[str]]
+    ) -> Select:
+        return select(
+            ValidationErrorCount.contract_id,
+            ValidationErrorCount.error_type,
+            func.sum(ValidationErrorCount.count).label('count')
+        ).where(
+            self._scope(ValidationErrorCount.contract_id, contract_ids),
+            ValidationErrorCount.bucket_start >= start_datetime,
+            ValidationErrorCount.bucket_start < end_datetime
+        ).group_by(ValidationErrorCount.contract_id, ValidationErrorCount.error_type)
+    
+    # Batch files only keep error-type totals in their summary row
+    def _batch_error_counts_query(
+        self,
+        start_datetime: datetime,
+        end_datetime: datetime,
+        contract_ids: Optional[List[str]]
+    ) -> Select:
+        return select(BatchSummary.contract_id, BatchSummary.errors_summary).where(
+            self._scope(BatchSummary.contract_id, contract_ids),
+            BatchSummary.processed_at >= start_datetime,
+            BatchSummary.processed_at < end_datetime,
+            BatchSummary.failed > 0
+        )
+    
+    def _recent_pass_rates_query(self, contract_ids: Optional[List[str]]) -> Select:
+        seven_days_ago = date.today() - timedelta(days=7)
+        return select(QualityMetric.contract_id, QualityMetric.pass_rate).where(
+            self._scope(QualityMetric.contract_id, contract_ids),
+            QualityMetric.metric_date >= seven_days_ago
+        )
+    
+    def _existing_metrics_query(self, target_date: date, contract_ids: Optional[List[str]]) -> Select:
+        return select(QualityMetric).where(
+            self._scope(QualityMetric.contract_id, contract_ids),
+            QualityMetric.metric_date == target_date
+        )
+    
+    def _group_error_counts(self, rows, batch_rows=()) -> Dict[str, Dict[str, int]]:
+        error_counts: Dict[str, Dict[str, int]] = {}
+        for contract_id, error_type, count in rows:
+            error_counts.setdefault(contract_id, {})[error_type] = count
+        for contract_id, errors_summary in batch_rows:
+            counts = error_counts.setdefault(contract_id, {})
+            for error_type, count in (errors_summary or {}).items():
+                counts[error_type] = counts.get(error_type, 0) + count
+        return error_counts
+    
+    def _group_pass_rates(self, rows) -> Dict[str, List[float]]:
+        pass_rates: Dict[str, List[float]] = {}
+        for contract_id, pass_rate in rows:
+            pass_rates.setdefault(contract_id, []).append(pass_rate)
+        return pass_rates
+    
+    def _apply_summaries(
+        self,
+        target_date: date,
+        summaries,
+        error_counts: Dict[str, Dict[str, int]],
+        pass_rates: Dict[str, List[float]],
+        existing: List[QualityMetric]
+    ) -> Dict[str, DailyMetrics]:
+        existing_by_contract = {m.contract_id: m for m in existing}
+        results = {}
+        
+        for row in summaries:
+            total = row.total
+            passed = int(row.passed or 0)
+            pass_rate = (passed / total * 100) if total > 0 else 0
+            
+            counts = error_counts.get(row.contract_id, {})
+            top_errors = sorted(counts.items(), key=lambda x: (-x[1], x[0]))[:10]
+            
+            quality_score = self._score(
+                pass_rate=pass_rate,
+                total_validations=total,
+                error_variety=len(counts),
+                consistency_score=self._consistency_from_pass_rates(
+                    pass_rates.get(row.contract_id, [])
+                )
+            )
+            
+            values = dict(
+                total_validations=total,
+                passed=passed,
+                failed=total - passed,
+                pass_rate=pass_rate,
+                avg_execution_time_ms=float(row.avg_execution_time_ms or 0),
+                top_errors=dict(top_errors),
+                quality_score=quality_score
+            )
+            
+            metrics = existing_by_contract.get(row.contract_id)
+            if metrics:
+                for key, value in values.items():
+                    setattr(metrics, key, value)
+            else:
+                metrics = QualityMetric(contract_id=row.contract_id, metric_date=target_date, **values)
+                self.db.add(metrics)
+            
+            results[row.contract_id] = DailyMetrics.from_orm(metrics)
+        
+        return results
     
     def _calculate_quality_score(
         self,
@@ -83,12 +271,26 @@ class MetricsAggregator:
         total_validations: int,
         error_variety: int,
         contract_id: UUID
+    ) -> float:
+        return self._score(
+            pass_rate=pass_rate,
+            total_validations=total_validations,
+            error_variety=error_variety,
+            consistency_score=self._calculate_consistency_score(contract_id)
+        )
+    
+    def _score(
+        self,
+        pass_rate: float,
+        total_validations: int,
+        error_variety: int,
+        consistency_score: float
     ) -> float:
         pass_rate_score = pass_rate * 0.7
-        consistency_score = self._calculate_consistency_score(contract_id) * 0.2
+        consistency_component = consistency_score * 0.2
         freshness_score = min(total_validations / 1000, 1.0) * 10
         
-        quality_score = pass_rate_score + consistency_score + freshness_score
+        quality_score = pass_rate_score + consistency_component + freshness_score
         
         if error_variety > 5:
             quality_score *= 0.95
@@ -102,10 +304,12 @@ class MetricsAggregator:
             QualityMetric.metric_date >= seven_days_ago
         ).all()
         
-        if len(metrics) < 2:
+        return self._consistency_from_pass_rates([m.pass_rate for m in metrics])
+    
+    def _consistency_from_pass_rates(self, pass_rates: List[float]) -> float:
+        if len(pass_rates) < 2:
             return 100
         
-        pass_rates = [m.pass_rate for m in metrics]
         variance = self._calculate_variance(pass_rates)
         consistency_score = max(0, 100 - variance)
         
@@ -131,6 +335,9 @@ class MetricsAggregator:
             QualityMetric.metric_date <= end_date
         ).order_by(QualityMetric.metric_date).all()
         
+        return self._build_trend(contract_id, metrics, days)
+    
+    def _build_trend(self, contract_id: UUID, metrics: List[QualityMetric], days: int) -> TrendData:
         if not metrics:
             return self._create_empty_trend(contract_id, days)
         
@@ -178,20 +385,19 @@ class MetricsAggregator:
         else:
             return 'STABLE'
     
-    def aggregate_daily_metrics(self, target_date: Optional[date] = None):
+    def aggregate_daily_metrics(self, target_date: Optional[date] = None) -> Dict[str, DailyMetrics]:
         if target_date is None:
             target_date = date.today() - timedelta(days=1)
         
-        contracts = self.db.query(Contract).filter(Contract.is_active == True).all()
+        results = self._aggregate(target_date)
+        self._log_aggregation(target_date, results)
         
-        self.logger.info(f"Aggregating metrics for {len(contracts)} contracts on {target_date}")
-        
-        for contract in contracts:
-            try:
-                metrics = self.calculate_daily_metrics(contract.id, target_date)
-                self.logger.info(f"Contract {contract.name}: {metrics.pass_rate:.2f}% pass rate")
-            except Exception as e:
-                self.logger.error(f"Failed to aggregate metrics for {contract.name}: {e}")
+        return results
+    
+    def _log_aggregation(self, target_date: date, results: Dict[str, DailyMetrics]) -> None:
+        self.logger.info(f"Aggregated metrics for {len(results)} contracts on {target_date}")
+        for contract_id, metrics in results.items():
+            self.logger.debug(f"Contract {contract_id}: {metrics.pass_rate:.2f}% pass rate")
     
     def _count_errors(self, errors: List) -> Dict[str, int]:
         from collections import Counter
@@ -221,4 +427,101 @@ class MetricsAggregator:
             volume_trend='STABLE',
             quality_trend='STABLE',
             days=days
-        )
\ No newline at end of file
+        )
+
+
+class AsyncMetricsAggregator(MetricsAggregator):
+    
+    def __init__(self, db_session: AsyncSession, from_rollups: bool = False):
+        self.db = db_session
+        self.from_rollups = from_rollups
+        self.logger = logging.getLogger(__name__)
+    
+    async def calculate_daily_metrics(self, contract_id: UUID, target_date: date) -> DailyMetrics:
+        results = await self._aggregate(target_date, [str(contract_id)])
+        
+        if str(contract_id) not in results:
+            return self._create_empty_metrics(contract_id, target_date)
+        
+        return results[str(contract_id)]
+    
+    async def _aggregate(
+        self,
+        target_date: date,
+        contract_ids: Optional[List[str]] = None
+    ) -> Dict[str, DailyMetrics]:
+        summary_query, error_query, batch_error_query = self._aggregation_queries(target_date, contract_ids)
+        
+        result = await self.db.execute(summary_query)
+        summaries = result.all()
+        
+        if not summaries:
+            return {}
+        
+        result = await self.db.execute(error_query)
+        error_rows = result.all()
+        batch_error_rows = []
+        if batch_error_query is not None:
+            result = await self.db.execute(batch_error_query)
+            batch_error_rows = result.all()
+        error_counts = self._group_error_counts(error_rows, batch_error_rows)
+        
+        result = await self.db.execute(self._recent_pass_rates_query(contract_ids))
+        pass_rates = self._group_pass_rates(result.all())
+        
+        result = await self.db.execute(self._existing_metrics_query(target_date, contract_ids))
+        existing = result.scalars().all()
+        
+        results = self._apply_summaries(target_date, summaries, error_counts, pass_rates, existing)
+        
+        await self.db.commit()
+        
+        return results
+    
+    async def _calculate_quality_score(
+        self,
+        pass_rate: float,
+        total_validations: int,
+        error_variety: int,
+        contract_id: UUID
+    ) -> float:
+        return self._score(
+            pass_rate=pass_rate,
+            total_validations=total_validations,
+            error_variety=error_variety,
+            consistency_score=await self._calculate_consistency_score(contract_id)
+        )
+    
+    async def _calculate_consistency_score(self, contract_id: UUID) -> float:
+        seven_days_ago = date.today() - timedelta(days=7)
+        result = await self.db.execute(
+            select(QualityMetric.pass_rate).where(
+                QualityMetric.contract_id == contract_id,
+                QualityMetric.metric_date >= seven_days_ago
+            )
+        )
+        
+        return self._consistency_from_pass_rates(list(result.scalars().all()))
+    
+    async def get_trend_data(self, contract_id: UUID, days: int = 30) -> TrendData:
+        end_date = date.today()
+        start_date = end_date - timedelta(days=days)
+        
+        result = await self.db.execute(
+            select(QualityMetric).where(
+                QualityMetric.contract_id == contract_id,
+                QualityMetric.metric_date >= start_date,
+                QualityMetric.metric_date <= end_date
+            ).order_by(QualityMetric.metric_date)
+        )
+        
+        return self._build_trend(contract_id, list(result.scalars().all()), days)
+    
+    async def aggregate_daily_metrics(self, target_date: Optional[date] = None) -> Dict[str, DailyMetrics]:
+        if target_date is None:
+            target_date = date.today() - timedelta(days=1)
+        
+        results = await self._aggregate(target_date)
+        self._log_aggregation(target_date, results)
+        
+        return results
@@ -0,0 +1,241 @@
+import logging
+import re
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import column as sql_column, table as sql_table
+from sqlalchemy.sql.expression import TableClause
+
+from app.config import settings
+from app.models.database import BatchSummary, ValidationErrorCount, ValidationResult
+
+
+# Partitioned tables and the column they are ranged on
+PARTITIONED_TABLES: Dict[str, str] = {
+    "validation_results": "validated_at",
+    "batch_summaries": "processed_at",
+}
+
+PARTITION_INTERVALS = ("day", "month")
+
+# Rows removed per statement when retention has to fall back to DELETE
+DELETE_BATCH_SIZE = 10000
+
+
+def partition_start(day: date, interval: str) -> date:
+    if interval == "day":
+        return day
+    if interval == "month":
+        return day.replace(day=1)
+    raise ValueError(f"Unknown partition interval: {interval}")
+
+
+def next_partition_start(start: date, interval: str) -> date:
+    if interval == "day":
+        return start + timedelta(days=1)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def partition_name(table: str, start: date, interval: str) -> str:
+    suffix = start.strftime("%Y%m%d") if interval == "day" else start.strftime("%Y%m")
+    return f"{table}_p{suffix}"
+
+
+def parse_partition_name(table: str, name: str) -> Optional[Tuple[date, str]]:
+    match = re.fullmatch(rf"{re.escape(table)}_p(\d{{6}}|\d{{8}})", name)
+    if not match:
+        return None
+
+    suffix = match.group(1)
+    if len(suffix) == 8:
+        return datetime.strptime(suffix, "%Y%m%d").date(), "day"
+    return datetime.strptime(suffix, "%Y%m").date(), "month"
+
+
+class PartitionManager:
+
+    def __init__(self, db_session: Session, interval: Optional[str] = None):
+        self.db = db_session
+        self.interval = interval or settings.PARTITION_INTERVAL
+        if self.interval not in PARTITION_INTERVALS:
+            raise ValueError(f"PARTITION_INTERVAL must be one of {PARTITION_INTERVALS}")
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def supported(self) -> bool:
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    def is_partitioned(self, table: str) -> bool:
+        if not self.supported:
+            return False
+
+        row = self.db.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table pt "
+                "JOIN pg_class c ON c.oid = pt.partrelid "
+                "WHERE c.relname = :table AND pg_table_is_visible(c.oid)"
+            ),
+            {"table": table}
+        ).first()
+        return row is not None
+
+    def list_partitions(self, table: str) -> List[str]:
+        rows = self.db.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = :table AND pg_table_is_visible(p.oid) "
+                "ORDER BY c.relname"
+            ),
+            {"table": table}
+        ).all()
+        return [row[0] for row in rows]
+
+    def ensure_partitions(self, today: Optional[date] = None, ahead: Optional[int] = None) -> List[str]:
+        today = today or datetime.utcnow().date()
+        ahead = settings.PARTITION_PRECREATE if ahead is None else ahead
+        created = []
+
+        for table in PARTITIONED_TABLES:
+            if not self.is_partitioned(table):
+                continue
+
+            existing = set(self.list_partitions(table))
+            quoted_table = self._quote(table)
+
+            default_name = f"{table}_default"
+            if default_name not in existing:
+                self.db.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {self._quote(default_name)} "
+                    f"PARTITION OF {quoted_table} DEFAULT"
+                ))
+                created.append(default_name)
+
+            start = partition_start(today, self.interval)
+            for _ in range(ahead + 1):
+                end = next_partition_start(start, self.interval)
+                name = partition_name(table, start, self.interval)
+                if name not in existing and not self._overlaps(table, existing, start, end):
+                    if self._create_partition(table, name, start, end):
+                        created.append(name)
+                start = end
+
+        self.db.commit()
+        if created:
+            self.logger.info(f"Created partitions: {', '.join(created)}")
+        return created
+
+    def apply_retention(self, cutoff: datetime) -> Dict[str, int]:
+        removed = {}
+        for model in (ValidationResult, BatchSummary):
+            name = model.__table__.name
+            column_name = PARTITIONED_TABLES[name]
+            if self.is_partitioned(name):
+                removed[name] = len(self.drop_partitions_before(name, cutoff))
+                # Rows outside every dated range never leave with a dropped
+                # partition, so the default partition is trimmed row by row.
+                default_name = f"{name}_default"
+                removed[default_name] = self._delete_before(
+                    sql_table(default_name, sql_column("id"), sql_column(column_name)), column_name, cutoff
+                )
+            else:
+                removed[name] = self._delete_before(model.__table__, column_name, cutoff)
+
+        # Error counts are small and stay unpartitioned
+        removed[ValidationErrorCount.__tablename__] = self._delete_before(
+            ValidationErrorCount.__table__, "bucket_start", cutoff
+        )
+        return removed
+
+    # A partition is only dropped once all of its range is past the cutoff,
+    # so up to one interval of extra data is kept.
+    def drop_partitions_before(self, table: str, cutoff: datetime) -> List[str]:
+        dropped = []
+        quoted_table = self._quote(table)
+
+        for name in self.list_partitions(table):
+            parsed = parse_partition_name(table, name)
+            if parsed is None:
+                continue
+
+            start, interval = parsed
+            if next_partition_start(start, interval) > cutoff.date():
+                continue
+
+            self.db.execute(text(f"ALTER TABLE {quoted_table} DETACH PARTITION {self._quote(name)}"))
+            self.db.execute(text(f"DROP TABLE {self._quote(name)}"))
+            dropped.append(name)
+
+        self.db.commit()
+        if dropped:
+            self.logger.info(f"Dropped expired partitions: {', '.join(dropped)}")
+        return dropped
+
+    # Postgres refuses to create a partition while the default partition holds
+    # rows in its range, so those rows are moved into the new table before it
+    # is attached. A failure is logged and skipped so startup carries on; the
+    # scheduled maintenance job tries again.
+    def _create_partition(self, table: str, name: str, start: date, end: date) -> bool:
+        column_name = self._quote(PARTITIONED_TABLES[table])
+        quoted_table = self._quote(table)
+        quoted_name = self._quote(name)
+        bounds = f"FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        in_range = f"{column_name} >= '{start.isoformat()}' AND {column_name} < '{end.isoformat()}'"
+
+        savepoint = self.db.begin_nested()
+        try:
+            default_name = self._quote(f"{table}_default")
+            stranded = self.db.execute(text(f"SELECT 1 FROM {default_name} WHERE {in_range} LIMIT 1")).first()
+            if stranded is None:
+                self.db.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {quoted_name} PARTITION OF {quoted_table} FOR VALUES {bounds}"
+                ))
+            else:
+                self.db.execute(text(f"CREATE TABLE {quoted_name} (LIKE {quoted_table} INCLUDING DEFAULTS)"))
+                moved = self.db.execute(text(
+                    f"WITH moved AS (DELETE FROM {default_name} WHERE {in_range} RETURNING *) "
+                    f"INSERT INTO {quoted_name} SELECT * FROM moved"
+                ))
+                self.db.execute(text(f"ALTER TABLE {quoted_table} ATTACH PARTITION {quoted_name} FOR VALUES {bounds}"))
+                self.logger.info(f"Moved {moved.rowcount} rows from the default partition into {name}")
+            savepoint.commit()
+            return True
+        except SQLAlchemyError as e:
+            savepoint.rollback()
+            self.logger.error(f"Could not create partition {name}: {e}")
+            return False
+
+    def _delete_before(self, table: TableClause, column_name: str, cutoff: datetime) -> int:
+        column = table.c[column_name]
+        deleted = 0
+
+        # Small batches keep each transaction (and its locks) short
+        while True:
+            expired = select(table.c.id).where(column < cutoff).limit(DELETE_BATCH_SIZE)
+            result = self.db.execute(delete(table).where(table.c.id.in_(expired)))
+            self.db.commit()
+            deleted += result.rowcount
+            if result.rowcount < DELETE_BATCH_SIZE:
+                return deleted
+
+    def _overlaps(self, table: str, existing: set, start: date, end: date) -> bool:
+        # Partitions of the other interval size may exist if
+        # PARTITION_INTERVAL was changed on a live table; rows in any gap
+        # they leave go to the default partition.
+        for name in existing:
+            parsed = parse_partition_name(table, name)
+            if parsed is None:
+                continue
+            existing_start, interval = parsed
+            if existing_start < end and start < next_partition_start(existing_start, interval):
+                return True
+        return False
+
+    def _quote(self, name: str) -> str:
+        return self.db.get_bind().dialect.identifier_preparer.quote(name)
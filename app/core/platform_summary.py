@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Select, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.database import Contract, MetricRollup, QualityMetric
+
+
+# Contracts listed in each of the top / needs-attention lists
+RANKED_CONTRACTS = 5
+SCORE_WINDOW_DAYS = 7
+
+
+def _today_query(from_rollups: bool) -> Select:
+    if from_rollups:
+        # Rollups are keyed by UTC date, like validated_at
+        total = func.sum(MetricRollup.passed + MetricRollup.failed)
+        return select(
+            total.label('total'),
+            (func.sum(MetricRollup.passed) * 100.0 / total).label('pass_rate')
+        ).where(
+            MetricRollup.rollup_date == datetime.utcnow().date()
+        ).group_by(MetricRollup.contract_id).having(total > 0)
+
+    return select(
+        QualityMetric.total_validations.label('total'),
+        QualityMetric.pass_rate.label('pass_rate')
+    ).where(QualityMetric.metric_date == date.today())
+
+
+def totals_query(from_rollups: bool) -> Select:
+    today = _today_query(from_rollups).subquery()
+    return select(
+        select(func.count()).select_from(Contract).scalar_subquery().label('total_contracts'),
+        select(func.count()).select_from(Contract).where(
+            Contract.is_active == True
+        ).scalar_subquery().label('active_contracts'),
+        select(func.coalesce(func.sum(today.c.total), 0)).scalar_subquery().label('validations_today'),
+        select(func.avg(today.c.pass_rate)).scalar_subquery().label('avg_pass_rate')
+    )
+
+
+# Average quality score per contract over the window, joined to the contract
+# name and ranked both ways, so only the rows that are shown come back.
+def ranked_scores_query() -> Select:
+    scores = select(
+        Contract.id,
+        Contract.name,
+        func.avg(QualityMetric.quality_score).label('score')
+    ).join(
+        QualityMetric, QualityMetric.contract_id == Contract.id
+    ).where(
+        QualityMetric.metric_date >= date.today() - timedelta(days=SCORE_WINDOW_DAYS)
+    ).group_by(Contract.id, Contract.name).subquery()
+
+    ranked = select(
+        scores,
+        func.row_number().over(order_by=(scores.c.score.desc(), scores.c.id)).label('top_rank'),
+        func.row_number().over(order_by=(scores.c.score.asc(), scores.c.id)).label('bottom_rank')
+    ).subquery()
+
+    return select(ranked).where(
+        or_(ranked.c.top_rank <= RANKED_CONTRACTS, ranked.c.bottom_rank <= RANKED_CONTRACTS)
+    )
+
+
+def _contract_info(row) -> Dict[str, Any]:
+    return {
+        "contract_id": str(row.id),
+        "name": row.name,
+        "quality_score": round(row.score, 2)
+    }
+
+
+async def build_platform_summary(db: AsyncSession, from_rollups: Optional[bool] = None) -> Dict[str, Any]:
+    if from_rollups is None:
+        from_rollups = settings.METRIC_ROLLUPS_ENABLED
+
+    totals = (await db.execute(totals_query(from_rollups))).one()
+    ranked = (await db.execute(ranked_scores_query())).all()
+
+    top = sorted((row for row in ranked if row.top_rank <= RANKED_CONTRACTS), key=lambda row: row.top_rank)
+    bottom = sorted((row for row in ranked if row.bottom_rank <= RANKED_CONTRACTS), key=lambda row: row.bottom_rank)
+
+    return {
+        "total_contracts": totals.total_contracts,
+        "active_contracts": totals.active_contracts,
+        "total_validations_today": int(totals.validations_today),
+        "avg_pass_rate": round(totals.avg_pass_rate or 0.0, 2),
+        "top_performing_contracts": [_contract_info(row) for row in top],
+        "contracts_needing_attention": [_contract_info(row) for row in bottom]
+    }
+
+
+# Snapshot of the platform summary shared by all requests in the process.
+# A stale snapshot is rebuilt by the first request that sees it while the
+# others wait on the lock, and the daily aggregation job refreshes it as
+# soon as new quality scores are written.
+class PlatformSummaryCache:
+
+    def __init__(self, ttl: float = 30.0):
+        self.ttl = ttl
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def current(self) -> Optional[Dict[str, Any]]:
+        if self._snapshot is not None and time.monotonic() < self._expires_at:
+            return self._snapshot
+        return None
+
+    async def get(self, db: AsyncSession) -> Dict[str, Any]:
+        snapshot = self.current()
+        if snapshot is not None:
+            return snapshot
+
+        async with self._lock:
+            snapshot = self.current()
+            if snapshot is not None:
+                return snapshot
+            return await self._build(db)
+
+    async def refresh(self, db: AsyncSession) -> Dict[str, Any]:
+        async with self._lock:
+            return await self._build(db)
+
+    def invalidate(self) -> None:
+        self._snapshot = None
+        self._expires_at = 0.0
+
+    async def _build(self, db: AsyncSession) -> Dict[str, Any]:
+        snapshot = await build_platform_summary(db)
+        self._snapshot = snapshot
+        self._expires_at = time.monotonic() + self.ttl
+        self.logger.debug("Platform summary snapshot refreshed")
+        return snapshot
+
+
+platform_summary_cache = PlatformSummaryCache(ttl=settings.PLATFORM_SUMMARY_TTL)
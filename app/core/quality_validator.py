@@ -1,8 +1,22 @@
 import logging
 from typing import Dict, Any, List, Optional, Union
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
 from collections import Counter
 
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.core.uniqueness_tracker import ExactUniquenessTracker, ApproximateUniquenessTracker
+
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_FIELDS = ['timestamp', 'created_at', 'updated_at', 'date']
+
+ISO_OFFSET_PATTERN = r'(?:Z|[+-]\d{2}:?\d{2})$'
+
+UNIQUENESS_MODES = ("exact", "approximate")
 
 class QualityError:
     def __init__(
@@ -54,138 +68,333 @@ class QualityValidationResult:
         }
 
 
-class QualityValidator:
-    def __init__(self, quality_rules: Dict[str, Any]):
-        self.rules = quality_rules
-        self.logger = logging.getLogger(__name__)
+def calculate_quality_score(errors: List[QualityError]) -> float:
+    base_score = 100.0
     
-    def validate(self, data: Union[Dict, List[Dict]]) -> QualityValidationResult:
-        if isinstance(data, dict):
-            data = [data]
-        
-        errors = []
-        
-        if 'freshness' in self.rules:
-            freshness_error = self._check_freshness(data)
-            if freshness_error:
-                errors.append(freshness_error)
-        
-        if 'completeness' in self.rules:
-            errors.extend(self._check_completeness(data))
-        
-        if 'uniqueness' in self.rules:
-            errors.extend(self._check_uniqueness(data))
-        
-        if 'statistics' in self.rules:
-            errors.extend(self._check_statistics(data))
-        
-        quality_score = self._calculate_quality_score(errors)
-        passed = len([e for e in errors if e.severity == "ERROR"]) == 0
-        
-        return QualityValidationResult(
-            passed=passed,
-            errors=errors,
-            quality_score=quality_score
-        )
+    for error in errors:
+        if error.severity == "ERROR":
+            base_score -= 10
+        elif error.severity == "WARNING":
+            base_score -= 3
     
-    def _check_freshness(self, data: List[Dict]) -> Optional[QualityError]:
-        max_latency_hours = self.rules['freshness'].get('max_latency_hours')
-        if not max_latency_hours:
-            return None
-        
-        timestamp_fields = ['timestamp', 'created_at', 'updated_at', 'date']
-        
-        for record in data:
-            for field in timestamp_fields:
+    return max(0.0, base_score)
+
+
+def _column_values(column: pd.Series) -> List[Any]:
+    return column.astype(object).where(column.notna(), None).tolist()
+
+
+class FreshnessAccumulator:
+    def __init__(self, max_latency_hours: float):
+        self.max_latency_hours = max_latency_hours
+        self.oldest: Optional[float] = None
+        self.newest: Optional[float] = None
+    
+    def update(self, records: List[Dict]) -> None:
+        for record in records:
+            for field in TIMESTAMP_FIELDS:
                 if field in record:
+                    value = record[field]
                     try:
-                        if isinstance(record[field], str):
-                            ts = datetime.fromisoformat(record[field].replace('Z', '+00:00'))
-                        elif isinstance(record[field], (int, float)):
-                            ts = datetime.fromtimestamp(record[field])
+                        if isinstance(value, str):
+                            ts = datetime.fromisoformat(value.replace('Z', '+00:00'))
+                        elif isinstance(value, (int, float)):
+                            ts = datetime.fromtimestamp(value, timezone.utc)
                         else:
                             continue
                         
-                        age_hours = (datetime.now(ts.tzinfo) - ts).total_seconds() / 3600
-                        
-                        if age_hours > max_latency_hours:
-                            return QualityError(
-                                rule_type="FRESHNESS",
-                                message=f"Data is {age_hours:.1f} hours old, exceeds limit of {max_latency_hours} hours",
-                                severity="ERROR",
-                                details={"age_hours": age_hours, "max_latency_hours": max_latency_hours}
-                            )
+                        self._observe(ts.timestamp(), ts.timestamp())
                     except Exception as e:
-                        self.logger.warning(f"Cannot parse timestamp from {field}: {e}")
+                        logger.warning(f"Cannot parse timestamp from {field}: {e}")
                     break
+    
+    def update_frame(self, frame: pd.DataFrame) -> None:
+        unresolved = np.ones(len(frame), dtype=bool)
+        
+        for field in TIMESTAMP_FIELDS:
+            if field not in frame.columns or not unresolved.any():
+                continue
+            
+            column = frame[field]
+            candidates = unresolved & column.notna().to_numpy()
+            unresolved &= ~candidates
+            if not candidates.any():
+                continue
+            
+            values = column[candidates]
+            kind = values.dtype.kind
+            
+            if kind in 'iuf':
+                epochs = values.to_numpy(dtype=float)
+                self._observe(float(epochs.min()), float(epochs.max()))
+            elif kind == 'M':
+                self._observe_datetimes(values, values.dt.tz is not None)
+            else:
+                parsed = pd.to_datetime(values, format='ISO8601', errors='coerce', utc=True)
+                unparsed = int(parsed.isna().sum())
+                if unparsed:
+                    logger.warning(f"Cannot parse {unparsed} timestamp(s) from {field}")
+                
+                aware = values.str.contains(ISO_OFFSET_PATTERN, regex=True, na=False).to_numpy(dtype=bool)
+                self._observe_datetimes(parsed[aware], True)
+                self._observe_datetimes(parsed[~aware].dt.tz_localize(None), False)
+    
+    def _observe_datetimes(self, values: pd.Series, aware: bool) -> None:
+        values = values.dropna()
+        if values.empty:
+            return
+        
+        if aware:
+            oldest = values.min().timestamp()
+            newest = values.max().timestamp()
+        else:
+            # Naive timestamps are local wall-clock time, as in datetime.timestamp().
+            oldest = values.min().to_pydatetime().timestamp()
+            newest = values.max().to_pydatetime().timestamp()
+        self._observe(oldest, newest)
+    
+    def _observe(self, oldest: float, newest: float) -> None:
+        if self.oldest is None or oldest < self.oldest:
+            self.oldest = oldest
+        if self.newest is None or newest > self.newest:
+            self.newest = newest
+    
+    def merge(self, other: "FreshnessAccumulator") -> "FreshnessAccumulator":
+        if other.oldest is not None:
+            self._observe(other.oldest, other.newest)
+        return self
+    
+    def finalize(self) -> List[QualityError]:
+        if self.oldest is None:
+            return []
+        
+        age_hours = (datetime.now(timezone.utc).timestamp() - self.oldest) / 3600
         
-        return None
+        if age_hours > self.max_latency_hours:
+            return [QualityError(
+                rule_type="FRESHNESS",
+                message=f"Data is {age_hours:.1f} hours old, exceeds limit of {self.max_latency_hours} hours",
+                severity="ERROR",
+                details={"age_hours": age_hours, "max_latency_hours": self.max_latency_hours}
+            )]
+        return []
+
+
+class CompletenessAccumulator:
+    def __init__(self, min_row_count: Optional[int], max_null_percentage: Optional[float]):
+        self.min_row_count = min_row_count
+        self.max_null_percentage = max_null_percentage
+        self.row_count = 0
+        self.fields: Optional[List[str]] = None
+        self.non_null_counts: Counter = Counter()
     
-    def _check_completeness(self, data: List[Dict]) -> List[QualityError]:
+    def update(self, records: List[Dict]) -> None:
+        if not records:
+            return
+        
+        if self.fields is None:
+            self.fields = list(records[0].keys())
+        self.row_count += len(records)
+        
+        if self.max_null_percentage:
+            non_null_counts = self.non_null_counts
+            for record in records:
+                for field, value in record.items():
+                    if value is not None:
+                        non_null_counts[field] += 1
+    
+    def update_frame(self, frame: pd.DataFrame) -> None:
+        if frame.empty:
+            return
+        
+        if self.fields is None:
+            self.fields = list(frame.columns)
+        self.row_count += len(frame)
+        
+        if self.max_null_percentage:
+            for field, count in frame.notna().sum().items():
+                self.non_null_counts[field] += int(count)
+    
+    def merge(self, other: "CompletenessAccumulator") -> "CompletenessAccumulator":
+        if self.fields is None:
+            self.fields = other.fields
+        self.row_count += other.row_count
+        self.non_null_counts.update(other.non_null_counts)
+        return self
+    
+    def finalize(self) -> List[QualityError]:
         errors = []
-        rules = self.rules['completeness']
         
-        min_row_count = rules.get('min_row_count')
-        if min_row_count and len(data) < min_row_count:
+        if self.min_row_count and self.row_count < self.min_row_count:
             errors.append(QualityError(
                 rule_type="COMPLETENESS",
-                message=f"Insufficient records: got {len(data)}, expected {min_row_count}",
+                message=f"Insufficient records: got {self.row_count}, expected {self.min_row_count}",
                 severity="ERROR",
-                details={"actual_count": len(data), "min_count": min_row_count}
+                details={"actual_count": self.row_count, "min_count": self.min_row_count}
             ))
         
-        max_null_percentage = rules.get('max_null_percentage')
-        if max_null_percentage and data:
-            for field in data[0].keys():
-                null_count = sum(1 for record in data if record.get(field) is None)
-                null_pct = (null_count / len(data)) * 100
+        if self.max_null_percentage and self.row_count:
+            for field in self.fields or []:
+                null_count = self.row_count - self.non_null_counts[field]
+                null_pct = (null_count / self.row_count) * 100
                 
-                if null_pct > max_null_percentage:
+                if null_pct > self.max_null_percentage:
                     errors.append(QualityError(
                         rule_type="COMPLETENESS",
-                        message=f"Field '{field}' has {null_pct:.1f}% nulls, exceeds {max_null_percentage}% limit",
+                        message=f"Field '{field}' has {null_pct:.1f}% nulls, exceeds {self.max_null_percentage}% limit",
                         severity="ERROR",
                         details={"field": field, "null_percentage": null_pct}
                     ))
         
         return errors
+
+
+class UniquenessAccumulator:
+    def __init__(
+        self,
+        fields: List[str],
+        mode: str = "exact",
+        memory_budget_mb: float = 64,
+        expected_count: int = 10_000_000,
+        false_positive_rate: float = 0.01,
+        spill_dir: Optional[str] = None
+    ):
+        if mode not in UNIQUENESS_MODES:
+            raise ValueError(f"Unknown uniqueness mode '{mode}', expected one of {UNIQUENESS_MODES}")
+        
+        self.fields = fields
+        self.mode = mode
+        field_budget_mb = memory_budget_mb / max(1, len(fields))
+        
+        if mode == "approximate":
+            self.trackers = {
+                field: ApproximateUniquenessTracker(field_budget_mb, expected_count, false_positive_rate, spill_dir)
+                for field in fields
+            }
+        else:
+            self.trackers = {
+                field: ExactUniquenessTracker(field_budget_mb, spill_dir)
+                for field in fields
+            }
+    
+    def update(self, records: List[Dict]) -> None:
+        for field in self.fields:
+            self.trackers[field].add([record.get(field) for record in records if field in record])
+    
+    def update_frame(self, frame: pd.DataFrame) -> None:
+        for field in self.fields:
+            if field in frame.columns:
+                self.trackers[field].add(_column_values(frame[field]))
+    
+    def merge(self, other: "UniquenessAccumulator") -> "UniquenessAccumulator":
+        for field in self.fields:
+            self.trackers[field].merge(other.trackers[field])
+        return self
     
-    def _check_uniqueness(self, data: List[Dict]) -> List[QualityError]:
+    def finalize(self) -> List[QualityError]:
         errors = []
-        fields = self.rules['uniqueness'].get('fields', [])
         
-        for field in fields:
-            values = [record.get(field) for record in data if field in record]
-            if not values:
-                continue
-            
-            counter = Counter(values)
-            duplicates = {val: count for val, count in counter.items() if count > 1}
+        for field in self.fields:
+            duplicate_count, sample = self.trackers[field].duplicates()
             
-            if duplicates:
-                dup_list = [f"'{val}' ({count}x)" for val, count in list(duplicates.items())[:5]]
+            if duplicate_count:
+                dup_list = [f"'{val}' ({count}x)" for val, count in sample]
+                details = {"field": field, "duplicate_count": duplicate_count}
+                
                 errors.append(QualityError(
                     rule_type="UNIQUENESS",
                     message=f"Duplicate values in '{field}': {', '.join(dup_list)}",
                     severity="ERROR",
-                    details={"field": field, "duplicate_count": len(duplicates)}
+                    details=details
                 ))
         
+        self.close()
         return errors
     
-    def _check_statistics(self, data: List[Dict]) -> List[QualityError]:
-        errors = []
-        stats_rules = self.rules['statistics']
+    def close(self) -> None:
+        for tracker in self.trackers.values():
+            tracker.close()
+
+
+class RunningStats:
+    __slots__ = ('count', 'mean', 'm2')
+    
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+    
+    @classmethod
+    def from_values(cls, values) -> "RunningStats":
+        count = len(values)
+        if count == 0:
+            return cls()
+        mean = sum(values) / count
+        m2 = sum((x - mean) ** 2 for x in values)
+        return cls(count, mean, m2)
+    
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            return self
         
-        for field, constraints in stats_rules.items():
-            values = [record.get(field) for record in data if field in record and isinstance(record.get(field), (int, float))]
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        return self
+    
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+
+class StatisticsAccumulator:
+    def __init__(self, constraints: Dict[str, Dict]):
+        self.constraints = constraints
+        self.stats: Dict[str, RunningStats] = {field: RunningStats() for field in constraints}
+    
+    def update(self, records: List[Dict]) -> None:
+        for field, stats in self.stats.items():
+            values = [
+                record.get(field) for record in records
+                if field in record and isinstance(record.get(field), (int, float))
+            ]
+            stats.merge(RunningStats.from_values(values))
+    
+    def update_frame(self, frame: pd.DataFrame) -> None:
+        for field, stats in self.stats.items():
+            if field not in frame.columns:
+                continue
             
-            if not values:
+            column = frame[field]
+            if column.dtype.kind in 'iufb':
+                values = column.dropna().to_numpy(dtype=float)
+                if len(values):
+                    mean = float(values.mean())
+                    stats.merge(RunningStats(len(values), mean, float(((values - mean) ** 2).sum())))
+            else:
+                values = [v for v in _column_values(column) if isinstance(v, (int, float))]
+                stats.merge(RunningStats.from_values(values))
+    
+    def merge(self, other: "StatisticsAccumulator") -> "StatisticsAccumulator":
+        for field, stats in self.stats.items():
+            stats.merge(other.stats[field])
+        return self
+    
+    def finalize(self) -> List[QualityError]:
+        errors = []
+        
+        for field, constraints in self.constraints.items():
+            stats = self.stats[field]
+            if stats.count == 0:
                 continue
             
-            mean = sum(values) / len(values)
-            variance = sum((x - mean) ** 2 for x in values) / len(values)
-            std_dev = variance ** 0.5
+            mean = stats.mean
+            std_dev = stats.variance ** 0.5
             
             if 'mean' in constraints:
                 mean_constraints = constraints['mean']
@@ -215,14 +424,103 @@ class QualityValidator:
                     ))
         
         return errors
+
+
+class QualityAccumulator:
+    def __init__(self, accumulators: List[Any]):
+        self.accumulators = accumulators
     
-    def _calculate_quality_score(self, errors: List[QualityError]) -> float:
-        base_score = 100.0
+    def update(self, data: Union[Dict, List[Dict], pd.DataFrame]) -> None:
+        if isinstance(data, pd.DataFrame):
+            for accumulator in self.accumulators:
+                accumulator.update_frame(data)
+            return
         
-        for error in errors:
-            if error.severity == "ERROR":
-                base_score -= 10
-            elif error.severity == "WARNING":
-                base_score -= 3
+        if isinstance(data, dict):
+            data = [data]
+        for accumulator in self.accumulators:
+            accumulator.update(data)
+    
+    def merge(self, other: "QualityAccumulator") -> "QualityAccumulator":
+        for accumulator, other_accumulator in zip(self.accumulators, other.accumulators):
+            accumulator.merge(other_accumulator)
+        return self
+    
+    def close(self) -> None:
+        for accumulator in self.accumulators:
+            if hasattr(accumulator, 'close'):
+                accumulator.close()
+    
+    def finalize(self) -> QualityValidationResult:
+        errors = []
+        for accumulator in self.accumulators:
+            errors.extend(accumulator.finalize())
         
-        return max(0.0, base_score)
\ No newline at end of file
+        quality_score = calculate_quality_score(errors)
+        passed = len([e for e in errors if e.severity == "ERROR"]) == 0
+        
+        return QualityValidationResult(
+            passed=passed,
+            errors=errors,
+            quality_score=quality_score
+        )
+
+
+class QualityValidator:
+    def __init__(self, quality_rules: Dict[str, Any]):
+        self.rules = quality_rules
+        self.logger = logging.getLogger(__name__)
+    
+    def validate(self, data: Union[Dict, List[Dict], pd.DataFrame]) -> QualityValidationResult:
+        accumulator = self.create_accumulator()
+        accumulator.update(data)
+        return accumulator.finalize()
+    
+    def create_accumulator(self) -> QualityAccumulator:
+        accumulators = []
+        
+        if 'freshness' in self.rules:
+            max_latency_hours = self.rules['freshness'].get('max_latency_hours')
+            if max_latency_hours:
+                accumulators.append(FreshnessAccumulator(max_latency_hours))
+        
+        if 'completeness' in self.rules:
+            rules = self.rules['completeness']
+            accumulators.append(CompletenessAccumulator(
+                min_row_count=rules.get('min_row_count'),
+                max_null_percentage=rules.get('max_null_percentage')
+            ))
+        
+        if 'uniqueness' in self.rules:
+            rules = self.rules['uniqueness']
+            accumulators.append(UniquenessAccumulator(
+                rules.get('fields', []),
+                mode=rules.get('mode', settings.UNIQUENESS_MODE),
+                memory_budget_mb=rules.get('memory_budget_mb', settings.UNIQUENESS_MEMORY_BUDGET_MB),
+                expected_count=rules.get('expected_count', settings.UNIQUENESS_EXPECTED_COUNT),
+                false_positive_rate=rules.get('false_positive_rate', settings.UNIQUENESS_FALSE_POSITIVE_RATE),
+                spill_dir=settings.UNIQUENESS_SPILL_DIR
+            ))
+        
+        if 'statistics' in self.rules:
+            accumulators.append(StatisticsAccumulator(self.rules['statistics']))
+        
+        return QualityAccumulator(accumulators)
+    
+    def referenced_fields(self) -> Optional[List[str]]:
+        # Null percentages are measured over every column in the data, so
+        # that rule cannot be evaluated on a projection.
+        if self.rules.get('completeness', {}).get('max_null_percentage'):
+            return None
+        
+        fields = []
+        if 'freshness' in self.rules:
+            fields.extend(TIMESTAMP_FIELDS)
+        if 'uniqueness' in self.rules:
+            fields.extend(self.rules['uniqueness'].get('fields', []))
+        if 'statistics' in self.rules:
+            fields.extend(self.rules['statistics'].keys())
+        return fields
+    
+    def _calculate_quality_score(self, errors: List[QualityError]) -> float:
+        return calculate_quality_score(errors)
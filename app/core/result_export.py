@@ -0,0 +1,190 @@
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import Row, Select, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.database import ValidationResult as DBValidationResult
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+EXPORT_FORMATS: Dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+EXPORT_COLUMNS = [
+    "id",
+    "contract_id",
+    "status",
+    "validated_at",
+    "execution_time_ms",
+    "batch_id",
+    "errors",
+    "data_snapshot",
+]
+
+# JSON columns are written as JSON text in CSV and Parquet
+JSON_COLUMNS = ("errors", "data_snapshot")
+
+
+def _to_json(value) -> Optional[str]:
+    return None if value is None else json.dumps(value, default=str)
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+# Parquet output sink that hands back what was written so far. The writer
+# asks for tell() to place row groups in the footer, so the position keeps
+# counting across drains.
+class _ChunkSink(io.RawIOBase):
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+# Streams validation results for one contract in validated_at order. Rows
+# come off a server-side cursor `batch_size` at a time and each batch is
+# encoded and yielded before the next one is fetched, so memory use does
+# not depend on how many rows match.
+class ResultExporter:
+
+    def __init__(self, db_session: Session, batch_size: Optional[int] = None):
+        self.db = db_session
+        self.batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+        self.logger = logging.getLogger(__name__)
+
+    def export_query(
+        self,
+        contract_id,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        status: Optional[str] = None
+    ) -> Select:
+        query = select(
+            *(getattr(DBValidationResult, column) for column in EXPORT_COLUMNS)
+        ).where(DBValidationResult.contract_id == str(contract_id))
+
+        if start_date:
+            query = query.where(DBValidationResult.validated_at >= start_date)
+        if end_date:
+            query = query.where(DBValidationResult.validated_at <= end_date)
+        if status:
+            query = query.where(DBValidationResult.status == status)
+
+        return query.order_by(DBValidationResult.validated_at, DBValidationResult.id)
+
+    def iter_batches(self, query: Select) -> Iterator[List[Row]]:
+        # yield_per implies stream_results, i.e. a server-side cursor on
+        # Postgres instead of buffering the whole result in the driver
+        result = self.db.execute(query.execution_options(yield_per=self.batch_size))
+        rows = 0
+        try:
+            for batch in result.partitions():
+                rows += len(batch)
+                yield batch
+        finally:
+            result.close()
+            self.logger.info(f"Exported {rows} validation results")
+
+    def stream(self, export_format: str, query: Select) -> Iterator[bytes]:
+        writers: Dict[str, Callable[[Select], Iterator[bytes]]] = {
+            "ndjson": self.stream_ndjson,
+            "csv": self.stream_csv,
+            "parquet": self.stream_parquet,
+        }
+        if export_format not in writers:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        return writers[export_format](query)
+
+    def stream_ndjson(self, query: Select) -> Iterator[bytes]:
+        for batch in self.iter_batches(query):
+            lines = []
+            for row in batch:
+                record = dict(row._mapping)
+                record["validated_at"] = _isoformat(record["validated_at"])
+                lines.append(json.dumps(record, default=str))
+            yield ("\n".join(lines) + "\n").encode()
+
+    def stream_csv(self, query: Select) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+
+        for batch in self.iter_batches(query):
+            for row in batch:
+                record = row._mapping
+                writer.writerow([
+                    _to_json(record[column]) if column in JSON_COLUMNS
+                    else _isoformat(record[column]) if column == "validated_at"
+                    else record[column]
+                    for column in EXPORT_COLUMNS
+                ])
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+        # Header only when nothing matched
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+    def stream_parquet(self, query: Select) -> Iterator[bytes]:
+        if pq is None:
+            raise ImportError("pyarrow is required to export Parquet files")
+
+        schema = pa.schema([
+            ("id", pa.string()),
+            ("contract_id", pa.string()),
+            ("status", pa.string()),
+            ("validated_at", pa.timestamp("us")),
+            ("execution_time_ms", pa.float64()),
+            ("batch_id", pa.string()),
+            ("errors", pa.string()),
+            ("data_snapshot", pa.string()),
+        ])
+
+        sink = _ChunkSink()
+        # One row group per fetched batch
+        with pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema) as writer:
+            for batch in self.iter_batches(query):
+                columns = {column: [] for column in EXPORT_COLUMNS}
+                for row in batch:
+                    record = row._mapping
+                    for column in EXPORT_COLUMNS:
+                        value = record[column]
+                        columns[column].append(_to_json(value) if column in JSON_COLUMNS else value)
+                writer.write_table(pa.table(columns, schema=schema))
+                yield sink.drain()
+
+        yield sink.drain()
@@ -0,0 +1,287 @@
+import json
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.error_counts import record_error_counts
+from app.core.telemetry import DB_FLUSH_SECONDS, RESULT_SINK_QUEUE_DEPTH, RESULT_SINK_ROWS
+from app.models.database import ValidationResult as DBValidationResult
+
+
+FLUSH_OK = DB_FLUSH_SECONDS.labels("result_sink", "ok")
+FLUSH_ERROR = DB_FLUSH_SECONDS.labels("result_sink", "error")
+ROWS_DIRECT = RESULT_SINK_ROWS.labels("direct")
+ROWS_SPILLED = RESULT_SINK_ROWS.labels("spilled")
+ROWS_REPLAYED = RESULT_SINK_ROWS.labels("replayed")
+ROWS_DROPPED = RESULT_SINK_ROWS.labels("dropped")
+ROWS_QUARANTINED = RESULT_SINK_ROWS.labels("quarantined")
+
+# Seconds before the first retry of a failed write; doubled per attempt
+RETRY_BACKOFF = 0.5
+
+
+def _encode_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: {"$datetime": value.isoformat()} if isinstance(value, datetime) else value
+        for key, value in row.items()
+    }
+
+
+def _decode_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: datetime.fromisoformat(value["$datetime"])
+        if isinstance(value, dict) and "$datetime" in value else value
+        for key, value in row.items()
+    }
+
+
+# Write-behind buffer for single-record validation results. Rows are queued
+# by the request path and written by a background thread with one
+# multi-row INSERT per batch, either when `batch_size` rows are waiting or
+# `flush_interval` seconds have passed. The queue is bounded: `submit`
+# blocks once the database falls `max_queue_size` rows behind, while
+# `offer` refuses the row so request handlers can write it themselves.
+#
+# A batch that still fails after `write_retries` retries is saved to
+# `spill_dir` and replayed when the sink starts and after the next
+# successful write, so a database outage does not lose results. A saved
+# batch that fails `replay_attempts` replays (a constraint error, say) is
+# moved to `spill_dir/quarantine` for inspection instead of being retried
+# after every write.
+class ValidationResultSink:
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10000,
+        write_retries: int = 3,
+        spill_dir: Optional[str] = None,
+        replay_attempts: int = 5
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.write_retries = write_retries
+        self.spill_dir = Path(spill_dir or os.path.join(tempfile.gettempdir(), "dce-result-sink"))
+        self.replay_attempts = replay_attempts
+        self._replay_failures: Dict[str, int] = {}
+        self._has_spilled = True
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue_size)
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.written = 0
+        self.spilled = 0
+        self.dropped = 0
+        self.quarantined = 0
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+
+        if self.session_factory is None:
+            from app.database import SessionLocal
+            self.session_factory = SessionLocal
+
+        self.replay_spilled()
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="validation-result-sink", daemon=True)
+        self._thread.start()
+        self.logger.info("Validation result sink started")
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.flush()
+        self.logger.info(f"Validation result sink stopped ({self.written} rows written)")
+
+    def submit(self, row: Dict[str, Any]) -> None:
+        self._queue.put(row)
+
+    def offer(self, row: Dict[str, Any]) -> bool:
+        # Never blocks; safe to call from the event loop
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            ROWS_DIRECT.inc()
+            return False
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def flush(self) -> int:
+        written = 0
+        while True:
+            batch = self._drain(self.batch_size)
+            if not batch:
+                return written
+            self._write(batch)
+            written += len(batch)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            deadline = time.monotonic() + self.flush_interval
+            batch: List[Dict[str, Any]] = []
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0 or self._stop.is_set():
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=min(timeout, 0.1)))
+                except queue.Empty:
+                    continue
+                batch.extend(self._drain(self.batch_size - len(batch)))
+
+            if batch:
+                self._write(batch)
+
+    def _drain(self, limit: int) -> List[Dict[str, Any]]:
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        with self._write_lock:
+            for attempt in range(self.write_retries + 1):
+                if attempt:
+                    time.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+                try:
+                    self._insert(batch)
+                except Exception as e:
+                    self.logger.warning(
+                        f"Failed to write {len(batch)} validation results (attempt {attempt + 1}): {e}"
+                    )
+                    continue
+                self.written += len(batch)
+                break
+            else:
+                self._spill(batch)
+                return
+
+        if self._has_spilled:
+            self.replay_spilled()
+
+    def _insert(self, batch: List[Dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        db = self.session_factory()
+        try:
+            db.execute(insert(DBValidationResult), batch)
+            record_error_counts(db, batch)
+            db.commit()
+            FLUSH_OK.observe(time.perf_counter() - started)
+        except Exception:
+            db.rollback()
+            FLUSH_ERROR.observe(time.perf_counter() - started)
+            raise
+        finally:
+            db.close()
+
+    def _spill(self, batch: List[Dict[str, Any]]) -> None:
+        path = self.spill_dir / f"{int(time.time() * 1000)}-{uuid.uuid4().hex}.jsonl"
+        try:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            partial = path.with_suffix(".tmp")
+            with open(partial, "w", encoding="utf-8") as f:
+                for row in batch:
+                    f.write(json.dumps(_encode_row(row), default=str) + "\n")
+            os.replace(partial, path)
+        except Exception as e:
+            self.dropped += len(batch)
+            ROWS_DROPPED.inc(len(batch))
+            self.logger.error(f"Dropped {len(batch)} validation results; could not save them to {path}: {e}")
+            return
+
+        self._has_spilled = True
+        self.spilled += len(batch)
+        ROWS_SPILLED.inc(len(batch))
+        self.logger.error(f"Saved {len(batch)} unwritten validation results to {path}")
+
+    def replay_spilled(self) -> int:
+        with self._write_lock:
+            self._has_spilled = False
+            if not self.spill_dir.is_dir():
+                return 0
+
+            replayed = 0
+            for path in sorted(self.spill_dir.glob("*.jsonl")):
+                with open(path, encoding="utf-8") as f:
+                    batch = [_decode_row(json.loads(line)) for line in f if line.strip()]
+                try:
+                    self._insert(batch)
+                except Exception as e:
+                    failures = self._replay_failures.get(path.name, 0) + 1
+                    if failures < self.replay_attempts:
+                        self._replay_failures[path.name] = failures
+                        self._has_spilled = True
+                        self.logger.warning(f"Could not replay {path.name}, keeping it: {e}")
+                        break
+                    self._quarantine(path, len(batch), e)
+                    continue
+                path.unlink()
+                self._replay_failures.pop(path.name, None)
+                replayed += len(batch)
+
+        if replayed:
+            self.written += replayed
+            ROWS_REPLAYED.inc(replayed)
+            self.logger.info(f"Replayed {replayed} saved validation results")
+        return replayed
+
+
+    def _quarantine(self, path: Path, rows: int, error: Exception) -> None:
+        self._replay_failures.pop(path.name, None)
+        target = self.spill_dir / "quarantine" / path.name
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(path, target)
+        except OSError as e:
+            self.logger.error(f"Could not move {path.name} to {target.parent}: {e}")
+            return
+        self.quarantined += rows
+        ROWS_QUARANTINED.inc(rows)
+        self.logger.error(
+            f"Moved {path.name} ({rows} validation results) to {target.parent} "
+            f"after {self.replay_attempts} failed replays: {error}"
+        )
+
+
+result_sink = ValidationResultSink(
+    batch_size=settings.RESULT_SINK_BATCH_SIZE,
+    flush_interval=settings.RESULT_SINK_FLUSH_INTERVAL,
+    max_queue_size=settings.RESULT_SINK_MAX_QUEUE,
+    write_retries=settings.RESULT_SINK_WRITE_RETRIES,
+    spill_dir=settings.RESULT_SINK_SPILL_DIR,
+    replay_attempts=settings.RESULT_SINK_REPLAY_ATTEMPTS
+)
+RESULT_SINK_QUEUE_DEPTH.set_function(result_sink.pending)
@@ -1,19 +1,87 @@
 import re
 import logging
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Callable, Tuple
 from datetime import datetime
-from functools import lru_cache
 
 from app.models.schemas import ContractSchema, FieldDefinition, ValidationError
 
 
+Check = Callable[[Any, List[ValidationError]], None]
+
+
+TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    'string': lambda v: isinstance(v, str),
+    'integer': lambda v: isinstance(v, int) and not isinstance(v, bool),
+    'float': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    'boolean': lambda v: isinstance(v, bool),
+    'timestamp': lambda v: isinstance(v, (str, int, float, datetime)),
+    'date': lambda v: isinstance(v, str),
+    'array': lambda v: isinstance(v, list),
+    'object': lambda v: isinstance(v, dict)
+}
+
+FORMAT_PATTERNS: Dict[str, re.Pattern] = {
+    'email': re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', re.IGNORECASE),
+    'url': re.compile(r'^https?://[^\s/$.?#].[^\s]*$', re.IGNORECASE),
+    'uuid': re.compile(r'^[0-9a-f]{8}-([0-9a-f]{4}-){3}[0-9a-f]{12}$', re.IGNORECASE),
+    'ipv4': re.compile(r'^(\d{1,3}\.){3}\d{1,3}$', re.IGNORECASE)
+}
+
+
+def _never(value: Any) -> bool:
+    return False
+
+
+def _type_error(field_name: str, value: Any, expected_type: str) -> ValidationError:
+    return ValidationError(
+        field=field_name,
+        error_type="TYPE_MISMATCH",
+        message=f"Expected {expected_type}, got {type(value).__name__}",
+        value=str(value)[:100],
+        expected=expected_type
+    )
+
+
+def _enum_lookup(enum: List[Any]):
+    try:
+        return frozenset(enum)
+    except TypeError:
+        return tuple(enum)
+
+
+def _parse_timestamp_bound(bound: Any) -> Tuple[Optional[datetime], Optional[str]]:
+    try:
+        return datetime.fromisoformat(str(bound).replace('Z', '+00:00')), None
+    except Exception as e:
+        return None, str(e)
+
+
+class CompiledField:
+    __slots__ = ('name', 'required', 'type_check', 'type_name', 'checks')
+
+    def __init__(
+        self,
+        name: str,
+        required: bool,
+        type_check: Callable[[Any], bool],
+        type_name: str,
+        checks: Tuple[Check, ...]
+    ):
+        self.name = name
+        self.required = required
+        self.type_check = type_check
+        self.type_name = type_name
+        self.checks = checks
+
+
 class SchemaValidator:
     def __init__(self, contract_schema: ContractSchema):
         self.schema = contract_schema.schema
         self.logger = logging.getLogger(__name__)
         self.compiled_patterns = {}
         self._compile_patterns()
-    
+        self.fields: List[CompiledField] = self._compile_schema()
+
     def _compile_patterns(self):
         for field_name, field_def in self.schema.items():
             if field_def.pattern:
@@ -21,337 +89,357 @@ class SchemaValidator:
                     self.compiled_patterns[field_name] = re.compile(field_def.pattern)
                 except re.error as e:
                     self.logger.error(f"Invalid regex pattern for {field_name}: {e}")
-    
+
+    def _compile_schema(self) -> List[CompiledField]:
+        fields = []
+        for field_name, field_def in self.schema.items():
+            fields.append(CompiledField(
+                name=field_name,
+                required=field_def.required,
+                type_check=TYPE_CHECKS.get(field_def.type, _never),
+                type_name=field_def.type,
+                checks=tuple(self._compile_field_checks(field_name, field_def))
+            ))
+        return fields
+
     def validate(self, data: Dict[str, Any]) -> List[ValidationError]:
         errors = []
-        
-        for field_name, field_def in self.schema.items():
-            if field_def.required and field_name not in data:
-                errors.append(ValidationError(
-                    field=field_name,
-                    error_type="REQUIRED_FIELD_MISSING",
-                    message=f"Required field '{field_name}' is missing",
-                    value=None,
-                    expected="required field"
-                ))
-                continue
-            
+
+        for field in self.fields:
+            field_name = field.name
+
             if field_name not in data:
+                if field.required:
+                    errors.append(ValidationError(
+                        field=field_name,
+                        error_type="REQUIRED_FIELD_MISSING",
+                        message=f"Required field '{field_name}' is missing",
+                        value=None,
+                        expected="required field"
+                    ))
                 continue
-            
+
             value = data[field_name]
-            
-            if value is None and not field_def.required:
+
+            if value is None and not field.required:
                 continue
-            
-            type_error = self._validate_type(field_name, value, field_def.type)
-            if type_error:
-                errors.append(type_error)
+
+            if not field.type_check(value):
+                errors.append(_type_error(field_name, value, field.type_name))
                 continue
-            
-            if field_def.type == 'string':
-                errors.extend(self._validate_string(field_name, value, field_def))
-            elif field_def.type in ['integer', 'float']:
-                errors.extend(self._validate_number(field_name, value, field_def))
-            elif field_def.type == 'timestamp':
-                errors.extend(self._validate_timestamp(field_name, value, field_def))
-            elif field_def.type == 'array':
-                errors.extend(self._validate_array(field_name, value, field_def))
-            elif field_def.type == 'object':
-                errors.extend(self._validate_object(field_name, value, field_def))
-            
+
+            for check in field.checks:
+                check(value, errors)
+
             if len(errors) >= 10:
                 break
-        
+
         return errors
-    
-    def _validate_type(
-        self,
-        field_name: str,
-        value: Any,
-        expected_type: str
-    ) -> Optional[ValidationError]:
-        type_checks = {
-            'string': lambda v: isinstance(v, str),
-            'integer': lambda v: isinstance(v, int) and not isinstance(v, bool),
-            'float': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
-            'boolean': lambda v: isinstance(v, bool),
-            'timestamp': lambda v: isinstance(v, (str, int, float, datetime)),
-            'date': lambda v: isinstance(v, str),
-            'array': lambda v: isinstance(v, list),
-            'object': lambda v: isinstance(v, dict)
-        }
-        
-        check = type_checks.get(expected_type)
-        if not check or not check(value):
-            return ValidationError(
-                field=field_name,
-                error_type="TYPE_MISMATCH",
-                message=f"Expected {expected_type}, got {type(value).__name__}",
-                value=str(value)[:100],
-                expected=expected_type
-            )
-        return None
-    
-    def _validate_string(
-        self,
-        field_name: str,
-        value: str,
-        field_def: FieldDefinition
-    ) -> List[ValidationError]:
-        errors = []
-        
-        if field_def.pattern and field_name in self.compiled_patterns:
-            if not self.compiled_patterns[field_name].match(value):
-                errors.append(ValidationError(
-                    field=field_name,
-                    error_type="PATTERN_MISMATCH",
-                    message=f"Value does not match pattern: {field_def.pattern}",
-                    value=value[:100],
-                    expected=field_def.pattern
-                ))
-        
+
+    def _compile_field_checks(self, field_name: str, field_def: FieldDefinition) -> List[Check]:
+        if field_def.type == 'string':
+            return self._compile_string(field_name, field_def)
+        elif field_def.type in ['integer', 'float']:
+            return self._compile_number(field_name, field_def)
+        elif field_def.type == 'timestamp':
+            return [self._compile_timestamp(field_name, field_def)]
+        elif field_def.type == 'array':
+            return self._compile_array(field_name, field_def)
+        elif field_def.type == 'object':
+            return self._compile_object(field_name, field_def)
+        return []
+
+    def _compile_string(self, field_name: str, field_def: FieldDefinition) -> List[Check]:
+        checks = []
+
+        compiled_pattern = self.compiled_patterns.get(field_name) if field_def.pattern else None
+        if compiled_pattern is not None:
+            pattern_match = compiled_pattern.match
+            pattern = field_def.pattern
+
+            def check_pattern(value, errors):
+                if not pattern_match(value):
+                    errors.append(ValidationError(
+                        field=field_name,
+                        error_type="PATTERN_MISMATCH",
+                        message=f"Value does not match pattern: {pattern}",
+                        value=value[:100],
+                        expected=pattern
+                    ))
+
+            checks.append(check_pattern)
+
         if field_def.format:
-            if not self._validate_format(value, field_def.format):
-                errors.append(ValidationError(
-                    field=field_name,
-                    error_type="FORMAT_MISMATCH",
-                    message=f"Value does not match format: {field_def.format}",
-                    value=value[:100],
-                    expected=field_def.format
-                ))
-        
-        if field_def.min_length is not None and len(value) < field_def.min_length:
-            errors.append(ValidationError(
-                field=field_name,
-                error_type="LENGTH_TOO_SHORT",
-                message=f"Length {len(value)} is less than minimum {field_def.min_length}",
-                value=value[:100],
-                expected=f"min_length: {field_def.min_length}"
-            ))
-        
-        if field_def.max_length is not None and len(value) > field_def.max_length:
-            errors.append(ValidationError(
-                field=field_name,
-                error_type="LENGTH_TOO_LONG",
-                message=f"Length {len(value)} exceeds maximum {field_def.max_length}",
-                value=value[:100],
-                expected=f"max_length: {field_def.max_length}"
-            ))
-        
-        if field_def.enum and value not in field_def.enum:
-            errors.append(ValidationError(
-                field=field_name,
-                error_type="ENUM_MISMATCH",
-                message=f"Value not in allowed list: {field_def.enum}",
-                value=value[:100],
-                expected=str(field_def.enum)
-            ))
-        
-        return errors
-    
-    def _validate_number(
-        self,
-        field_name: str,
-        value: Union[int, float],
-        field_def: FieldDefinition
-    ) -> List[ValidationError]:
-        errors = []
-        
-        if field_def.min is not None and value < field_def.min:
-            errors.append(ValidationError(
-                field=field_name,
-                error_type="VALUE_TOO_SMALL",
-                message=f"Value {value} is less than minimum {field_def.min}",
-                value=str(value),
-                expected=f"min: {field_def.min}"
-            ))
-        
-        if field_def.max is not None and value > field_def.max:
-            errors.append(ValidationError(
-                field=field_name,
-                error_type="VALUE_TOO_LARGE",
-                message=f"Value {value} exceeds maximum {field_def.max}",
-                value=str(value),
-                expected=f"max: {field_def.max}"
-            ))
-        
-        if field_def.enum and value not in field_def.enum:
-            errors.append(ValidationError(
-                field=field_name,
-                error_type="ENUM_MISMATCH",
-                message=f"Value not in allowed list: {field_def.enum}",
-                value=str(value),
-                expected=str(field_def.enum)
-            ))
-        
-        return errors
-    
-    def _validate_timestamp(
-        self,
-        field_name: str,
-        value: Any,
-        field_def: FieldDefinition
-    ) -> List[ValidationError]:
-        errors = []
-        
-        try:
-            if isinstance(value, str):
-                dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
-            elif isinstance(value, (int, float)):
-                dt = datetime.fromtimestamp(value)
-            elif isinstance(value, datetime):
-                dt = value
-            else:
-                errors.append(ValidationError(
-                    field=field_name,
-                    error_type="INVALID_TIMESTAMP",
-                    message="Cannot parse timestamp",
-                    value=str(value)[:100],
-                    expected="ISO 8601 or Unix timestamp"
-                ))
-                return errors
-            
-            if field_def.min:
-                min_dt = datetime.fromisoformat(str(field_def.min).replace('Z', '+00:00'))
-                if dt < min_dt:
+            format_type = field_def.format
+            format_pattern = FORMAT_PATTERNS.get(format_type)
+
+            if format_pattern is not None:
+                format_match = format_pattern.match
+
+                def check_format(value, errors):
+                    if not format_match(value):
+                        errors.append(ValidationError(
+                            field=field_name,
+                            error_type="FORMAT_MISMATCH",
+                            message=f"Value does not match format: {format_type}",
+                            value=value[:100],
+                            expected=format_type
+                        ))
+
+                checks.append(check_format)
+
+        if field_def.min_length is not None:
+            min_length = field_def.min_length
+
+            def check_min_length(value, errors):
+                if len(value) < min_length:
                     errors.append(ValidationError(
                         field=field_name,
-                        error_type="TIMESTAMP_TOO_OLD",
-                        message=f"Timestamp before minimum: {field_def.min}",
-                        value=str(value)[:100],
-                        expected=f"min: {field_def.min}"
+                        error_type="LENGTH_TOO_SHORT",
+                        message=f"Length {len(value)} is less than minimum {min_length}",
+                        value=value[:100],
+                        expected=f"min_length: {min_length}"
                     ))
-            
-            if field_def.max:
-                max_dt = datetime.fromisoformat(str(field_def.max).replace('Z', '+00:00'))
-                if dt > max_dt:
+
+            checks.append(check_min_length)
+
+        if field_def.max_length is not None:
+            max_length = field_def.max_length
+
+            def check_max_length(value, errors):
+                if len(value) > max_length:
                     errors.append(ValidationError(
                         field=field_name,
-                        error_type="TIMESTAMP_TOO_RECENT",
-                        message=f"Timestamp after maximum: {field_def.max}",
-                        value=str(value)[:100],
-                        expected=f"max: {field_def.max}"
+                        error_type="LENGTH_TOO_LONG",
+                        message=f"Length {len(value)} exceeds maximum {max_length}",
+                        value=value[:100],
+                        expected=f"max_length: {max_length}"
                     ))
-        
-        except Exception as e:
-            errors.append(ValidationError(
-                field=field_name,
-                error_type="INVALID_TIMESTAMP",
-                message=f"Cannot parse timestamp: {str(e)}",
-                value=str(value)[:100],
-                expected="Valid timestamp"
-            ))
-        
-        return errors
-    
-    def _validate_array(
-        self,
-        field_name: str,
-        value: List,
-        field_def: FieldDefinition
-    ) -> List[ValidationError]:
-        errors = []
-        
-        if field_def.min is not None and len(value) < field_def.min:
-            errors.append(ValidationError(
-                field=field_name,
-                error_type="ARRAY_TOO_SHORT",
-                message=f"Array length {len(value)} less than minimum {field_def.min}",
-                value=f"[{len(value)} items]",
-                expected=f"min: {field_def.min}"
-            ))
-        
-        if field_def.max is not None and len(value) > field_def.max:
-            errors.append(ValidationError(
-                field=field_name,
-                error_type="ARRAY_TOO_LONG",
-                message=f"Array length {len(value)} exceeds maximum {field_def.max}",
-                value=f"[{len(value)} items]",
-                expected=f"max: {field_def.max}"
-            ))
-        
-        if field_def.items:
-            for idx, item in enumerate(value[:10]):
-                item_errors = self._validate_nested_field(
-                    f"{field_name}[{idx}]",
-                    item,
-                    field_def.items
-                )
-                errors.extend(item_errors)
-                if len(errors) >= 10:
-                    break
-        
-        return errors
-    
-    def _validate_object(
+
+            checks.append(check_max_length)
+
+        if field_def.enum:
+            checks.append(self._compile_enum(field_name, field_def.enum, lambda v: v[:100]))
+
+        return checks
+
+    def _compile_number(self, field_name: str, field_def: FieldDefinition) -> List[Check]:
+        checks = []
+
+        if field_def.min is not None:
+            min_value = field_def.min
+
+            def check_min(value, errors):
+                if value < min_value:
+                    errors.append(ValidationError(
+                        field=field_name,
+                        error_type="VALUE_TOO_SMALL",
+                        message=f"Value {value} is less than minimum {min_value}",
+                        value=str(value),
+                        expected=f"min: {min_value}"
+                    ))
+
+            checks.append(check_min)
+
+        if field_def.max is not None:
+            max_value = field_def.max
+
+            def check_max(value, errors):
+                if value > max_value:
+                    errors.append(ValidationError(
+                        field=field_name,
+                        error_type="VALUE_TOO_LARGE",
+                        message=f"Value {value} exceeds maximum {max_value}",
+                        value=str(value),
+                        expected=f"max: {max_value}"
+                    ))
+
+            checks.append(check_max)
+
+        if field_def.enum:
+            checks.append(self._compile_enum(field_name, field_def.enum, str))
+
+        return checks
+
+    def _compile_enum(
         self,
         field_name: str,
-        value: Dict,
-        field_def: FieldDefinition
-    ) -> List[ValidationError]:
-        errors = []
-        
-        if field_def.properties:
-            for prop_name, prop_def in field_def.properties.items():
-                prop_path = f"{field_name}.{prop_name}"
-                
-                if prop_def.required and prop_name not in value:
+        enum: List[Any],
+        render: Callable[[Any], str]
+    ) -> Check:
+        allowed = _enum_lookup(enum)
+        message = f"Value not in allowed list: {enum}"
+        expected = str(enum)
+
+        def check_enum(value, errors):
+            if value not in allowed:
+                errors.append(ValidationError(
+                    field=field_name,
+                    error_type="ENUM_MISMATCH",
+                    message=message,
+                    value=render(value),
+                    expected=expected
+                ))
+
+        return check_enum
+
+    def _compile_timestamp(self, field_name: str, field_def: FieldDefinition) -> Check:
+        min_bound = field_def.min
+        max_bound = field_def.max
+        min_dt, min_error = _parse_timestamp_bound(min_bound) if min_bound else (None, None)
+        max_dt, max_error = _parse_timestamp_bound(max_bound) if max_bound else (None, None)
+
+        def check_timestamp(value, errors):
+            try:
+                if isinstance(value, str):
+                    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+                elif isinstance(value, (int, float)):
+                    dt = datetime.fromtimestamp(value)
+                elif isinstance(value, datetime):
+                    dt = value
+                else:
                     errors.append(ValidationError(
-                        field=prop_path,
-                        error_type="REQUIRED_FIELD_MISSING",
-                        message=f"Required property '{prop_name}' is missing",
-                        value=None,
-                        expected="required property"
+                        field=field_name,
+                        error_type="INVALID_TIMESTAMP",
+                        message="Cannot parse timestamp",
+                        value=str(value)[:100],
+                        expected="ISO 8601 or Unix timestamp"
                     ))
-                    continue
-                
-                if prop_name in value:
-                    prop_errors = self._validate_nested_field(
-                        prop_path,
-                        value[prop_name],
-                        prop_def
-                    )
-                    errors.extend(prop_errors)
-                
-                if len(errors) >= 10:
+                    return
+
+                if min_bound:
+                    if min_error is not None:
+                        raise ValueError(min_error)
+                    if dt < min_dt:
+                        errors.append(ValidationError(
+                            field=field_name,
+                            error_type="TIMESTAMP_TOO_OLD",
+                            message=f"Timestamp before minimum: {min_bound}",
+                            value=str(value)[:100],
+                            expected=f"min: {min_bound}"
+                        ))
+
+                if max_bound:
+                    if max_error is not None:
+                        raise ValueError(max_error)
+                    if dt > max_dt:
+                        errors.append(ValidationError(
+                            field=field_name,
+                            error_type="TIMESTAMP_TOO_RECENT",
+                            message=f"Timestamp after maximum: {max_bound}",
+                            value=str(value)[:100],
+                            expected=f"max: {max_bound}"
+                        ))
+
+            except Exception as e:
+                errors.append(ValidationError(
+                    field=field_name,
+                    error_type="INVALID_TIMESTAMP",
+                    message=f"Cannot parse timestamp: {str(e)}",
+                    value=str(value)[:100],
+                    expected="Valid timestamp"
+                ))
+
+        return check_timestamp
+
+    def _compile_array(self, field_name: str, field_def: FieldDefinition) -> List[Check]:
+        min_items = field_def.min
+        max_items = field_def.max
+        item_checks: Tuple[Check, ...] = ()
+        if field_def.items:
+            item_checks = tuple(
+                self._compile_nested_field(f"{field_name}[{idx}]", field_def.items)
+                for idx in range(10)
+            )
+
+        if min_items is None and max_items is None and not item_checks:
+            return []
+
+        def check_array(value, errors):
+            array_errors: List[ValidationError] = []
+
+            if min_items is not None and len(value) < min_items:
+                array_errors.append(ValidationError(
+                    field=field_name,
+                    error_type="ARRAY_TOO_SHORT",
+                    message=f"Array length {len(value)} less than minimum {min_items}",
+                    value=f"[{len(value)} items]",
+                    expected=f"min: {min_items}"
+                ))
+
+            if max_items is not None and len(value) > max_items:
+                array_errors.append(ValidationError(
+                    field=field_name,
+                    error_type="ARRAY_TOO_LONG",
+                    message=f"Array length {len(value)} exceeds maximum {max_items}",
+                    value=f"[{len(value)} items]",
+                    expected=f"max: {max_items}"
+                ))
+
+            if item_checks:
+                for item_check, item in zip(item_checks, value):
+                    item_check(item, array_errors)
+                    if len(array_errors) >= 10:
+                        break
+
+            errors.extend(array_errors)
+
+        return [check_array]
+
+    def _compile_object(self, field_name: str, field_def: FieldDefinition) -> List[Check]:
+        if not field_def.properties:
+            return []
+
+        properties = []
+        for prop_name, prop_def in field_def.properties.items():
+            prop_path = f"{field_name}.{prop_name}"
+            properties.append((
+                prop_name,
+                prop_path,
+                prop_def.required,
+                self._compile_nested_field(prop_path, prop_def)
+            ))
+
+        def check_properties(value, errors):
+            prop_errors: List[ValidationError] = []
+            for prop_name, prop_path, required, prop_check in properties:
+                if prop_name not in value:
+                    if required:
+                        prop_errors.append(ValidationError(
+                            field=prop_path,
+                            error_type="REQUIRED_FIELD_MISSING",
+                            message=f"Required property '{prop_name}' is missing",
+                            value=None,
+                            expected="required property"
+                        ))
+                        continue
+                else:
+                    prop_check(value[prop_name], prop_errors)
+
+                if len(prop_errors) >= 10:
                     break
-        
-        return errors
-    
-    def _validate_nested_field(
-        self,
-        field_path: str,
-        value: Any,
-        field_def: FieldDefinition
-    ) -> List[ValidationError]:
-        errors = []
-        
-        type_error = self._validate_type(field_path, value, field_def.type)
-        if type_error:
-            errors.append(type_error)
-            return errors
-        
+            errors.extend(prop_errors)
+
+        return [check_properties]
+
+    def _compile_nested_field(self, field_path: str, field_def: FieldDefinition) -> Check:
+        type_check = TYPE_CHECKS.get(field_def.type, _never)
+        type_name = field_def.type
+
         if field_def.type == 'string':
-            errors.extend(self._validate_string(field_path, value, field_def))
+            checks = tuple(self._compile_string(field_path, field_def))
         elif field_def.type in ['integer', 'float']:
-            errors.extend(self._validate_number(field_path, value, field_def))
+            checks = tuple(self._compile_number(field_path, field_def))
         elif field_def.type == 'object' and field_def.properties:
-            errors.extend(self._validate_object(field_path, value, field_def))
-        
-        return errors
-    
-    @lru_cache(maxsize=100)
-    def _validate_format(self, value: str, format_type: str) -> bool:
-        format_patterns = {
-            'email': r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$',
-            'url': r'^https?://[^\s/$.?#].[^\s]*$',
-            'uuid': r'^[0-9a-f]{8}-([0-9a-f]{4}-){3}[0-9a-f]{12}$',
-            'ipv4': r'^(\d{1,3}\.){3}\d{1,3}$'
-        }
-        
-        pattern = format_patterns.get(format_type)
-        if not pattern:
-            return True
-        
-        return bool(re.match(pattern, value, re.IGNORECASE))
\ No newline at end of file
+            checks = tuple(self._compile_object(field_path, field_def))
+        else:
+            checks = ()
+
+        def check_nested(value, errors):
+            if not type_check(value):
+                errors.append(_type_error(field_path, value, type_name))
+                return
+            for check in checks:
+                check(value, errors)
+
+        return check_nested
@@ -0,0 +1,472 @@
+import bisect
+import logging
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans sub-millisecond chunk reads up to multi-second flushes
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+logger = logging.getLogger(__name__)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str]) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+class CounterChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class GaugeChild:
+    __slots__ = ('value', '_lock', '_function')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        # Sampled at scrape time instead of being pushed on every change
+        self._function = function
+
+    def get(self) -> float:
+        return self._function() if self._function is not None else self.value
+
+
+class HistogramChild:
+    __slots__ = ('bounds', 'counts', 'sum', '_lock')
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        # One slot per bound plus +Inf; made cumulative only when rendered
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+
+# A metric family. `labels(...)` binds a child once; callers on hot paths
+# keep the child and update it directly, so recording a value is a lock and
+# an addition with nothing allocated.
+class Metric:
+    kind = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional["MetricsRegistry"] = None
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is not None:
+            return child
+
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        key = tuple(str(value) for value in values)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = self._new_child()
+            # Cache under the caller's values too, so non-string labels
+            # also skip the conversion next time
+            self._children.setdefault(values, child)
+        return child
+
+    def children(self) -> List[Tuple[Tuple[str, ...], object]]:
+        with self._lock:
+            return [
+                (key, child) for key, child in self._children.items()
+                if all(type(value) is str for value in key)
+            ]
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def _series(self, suffix: str, key: Tuple[str, ...], value: float, extra: str = "") -> str:
+        labels = _label_text(self.labelnames, key)
+        if extra:
+            labels = f"{labels},{extra}" if labels else extra
+        name = self.name + suffix
+        return f"{name}{{{labels}}} {_format_value(value)}" if labels else f"{name} {_format_value(value)}"
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def samples(self) -> List[str]:
+        return [self._series("", key, child.value) for key, child in self.children()]
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self.labels().set_function(function)
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, child in self.children():
+            try:
+                value = child.get()
+            except Exception as e:
+                logger.warning(f"Could not sample gauge {self.name}: {e}")
+                continue
+            lines.append(self._series("", key, value))
+        return lines
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        registry: Optional["MetricsRegistry"] = None
+    ):
+        self.bounds = tuple(sorted(float(bound) for bound in buckets if not math.isinf(bound)))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.bounds)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, child in self.children():
+            with child._lock:
+                counts = list(child.counts)
+                total = child.sum
+            cumulative = 0
+            for bound, count in zip(self.bounds + (math.inf,), counts):
+                cumulative += count
+                lines.append(self._series("_bucket", key, cumulative, f'le="{_format_value(bound)}"'))
+            lines.append(self._series("_sum", key, total))
+            lines.append(self._series("_count", key, cumulative))
+        return lines
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> None:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+# Validation
+RECORDS_VALIDATED = Counter(
+    "dce_records_validated_total",
+    "Records validated, by contract, validation mode and outcome",
+    ["contract", "mode", "outcome"]
+)
+VALIDATION_ERRORS = Counter(
+    "dce_validation_errors_total",
+    "Validation errors, by contract and error type",
+    ["contract", "error_type"]
+)
+VALIDATION_SECONDS = Histogram(
+    "dce_validation_duration_seconds",
+    "Time spent validating one record or one batch chunk",
+    ["contract", "mode"]
+)
+
+# Batch files
+CHUNK_READ_SECONDS = Histogram(
+    "dce_chunk_read_duration_seconds",
+    "Time spent reading and parsing one chunk of an uploaded file",
+    ["file_type"]
+)
+BATCH_JOBS = Counter(
+    "dce_batch_jobs_total",
+    "Batch file validations finished, by outcome",
+    ["outcome"]
+)
+BATCH_JOBS_ACTIVE = Gauge(
+    "dce_batch_jobs_active",
+    "Batch file validations currently queued or running in this process"
+)
+JOB_QUEUE_DEPTH = Gauge(
+    "dce_job_queue_depth",
+    "Jobs waiting in the durable job queue"
+)
+
+# Database
+DB_FLUSH_SECONDS = Histogram(
+    "dce_db_flush_duration_seconds",
+    "Time spent writing buffered rows to the database",
+    ["target", "outcome"]
+)
+RESULT_SINK_QUEUE_DEPTH = Gauge(
+    "dce_result_sink_queue_depth",
+    "Validation results waiting to be written by the result sink"
+)
+RESULT_SINK_ROWS = Counter(
+    "dce_result_sink_rows_total",
+    "Validation results handled outside the normal sink path, by outcome: "
+    "direct (queue full, written by the request), spilled (saved to disk "
+    "after failed writes), replayed, quarantined (replays kept failing) or dropped",
+    ["outcome"]
+)
+POOL_CONNECTIONS = Counter(
+    "dce_db_pool_connections_total",
+    "New database connections opened by the pool"
+)
+POOL_CHECKOUTS = Counter(
+    "dce_db_pool_checkouts_total",
+    "Connections checked out of the pool"
+)
+POOL_CHECKOUT_SECONDS = Histogram(
+    "dce_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ["pool"]
+)
+POOL_CHECKED_OUT = Gauge(
+    "dce_db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ["pool"]
+)
+
+# Logging
+LOG_RECORDS_DROPPED = Gauge(
+    "dce_log_records_dropped",
+    "Log records dropped because the background log queue was full"
+)
+
+VALIDATION_STAGE_SECONDS = Histogram(
+    "dce_validation_stage_duration_seconds",
+    "Time spent in each stage of a validation request, when stage timing is enabled",
+    ["mode", "stage"]
+)
+
+# HTTP
+HTTP_REQUESTS = Counter(
+    "dce_http_requests_total",
+    "HTTP requests, by method, route template and status code",
+    ["method", "endpoint", "status"]
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "dce_http_request_duration_seconds",
+    "HTTP request latency until the response body is sent",
+    ["method", "endpoint"]
+)
+
+
+# Pre-bound children for one compiled contract, kept on its
+# CompiledValidator so validation never looks labels up.
+class ContractMetrics:
+    __slots__ = (
+        'contract', 'record_passed', 'record_failed', 'batch_passed', 'batch_failed',
+        'record_seconds', 'batch_seconds', '_errors'
+    )
+
+    def __init__(self, contract_id: str):
+        self.contract = contract_id
+        self.record_passed = RECORDS_VALIDATED.labels(contract_id, "record", "pass")
+        self.record_failed = RECORDS_VALIDATED.labels(contract_id, "record", "fail")
+        self.batch_passed = RECORDS_VALIDATED.labels(contract_id, "batch", "pass")
+        self.batch_failed = RECORDS_VALIDATED.labels(contract_id, "batch", "fail")
+        self.record_seconds = VALIDATION_SECONDS.labels(contract_id, "record")
+        self.batch_seconds = VALIDATION_SECONDS.labels(contract_id, "batch")
+        self._errors: Dict[str, CounterChild] = {}
+
+    def count_errors(self, error_counts: Dict[str, int]) -> None:
+        errors = self._errors
+        for error_type, count in error_counts.items():
+            child = errors.get(error_type)
+            if child is None:
+                child = errors[error_type] = VALIDATION_ERRORS.labels(self.contract, error_type)
+            child.inc(count)
+
+    def record_batch(self, passed: int, failed: int, error_counts: Dict[str, int], seconds: float) -> None:
+        if passed:
+            self.batch_passed.inc(passed)
+        if failed:
+            self.batch_failed.inc(failed)
+        if error_counts:
+            self.count_errors(error_counts)
+        self.batch_seconds.observe(seconds)
+
+
+# Wall-clock seconds per named stage of one validation request, kept in
+# the order the stages first ran. Rendered as milliseconds for the
+# response body and as a Server-Timing header value.
+class StageTimings:
+    __slots__ = ('stages',)
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def as_ms(self) -> Dict[str, float]:
+        return {stage: round(seconds * 1000, 3) for stage, seconds in self.stages.items()}
+
+    def server_timing(self) -> str:
+        return ", ".join(f"{stage};dur={seconds * 1000:.3f}" for stage, seconds in self.stages.items())
+
+    def observe(self, mode: str) -> None:
+        for stage, seconds in self.stages.items():
+            VALIDATION_STAGE_SECONDS.labels(mode, stage).observe(seconds)
+
+
+# Plain ASGI middleware rather than BaseHTTPMiddleware: it adds no task or
+# body buffering per request. Routes are labeled by their path template so
+# ids in URLs do not create a series each.
+class MetricsMiddleware:
+
+    def __init__(self, app):
+        self.app = app
+        self._children: Dict[Tuple[str, str, int], Tuple[CounterChild, HistogramChild]] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            endpoint = getattr(route, "path", None) or "<unmatched>"
+            key = (scope["method"], endpoint, status)
+            children = self._children.get(key)
+            if children is None:
+                children = self._children[key] = (
+                    HTTP_REQUESTS.labels(scope["method"], endpoint, str(status)),
+                    HTTP_REQUEST_SECONDS.labels(scope["method"], endpoint)
+                )
+            children[0].inc()
+            children[1].observe(time.perf_counter() - start)
+
+
+class _ExpositionHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    # For processes without the API, such as batch workers
+    server = ThreadingHTTPServer((host, port), _ExpositionHandler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+    thread.start()
+    logger.info(f"Serving metrics on {host}:{port}")
+    return server
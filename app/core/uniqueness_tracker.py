@@ -0,0 +1,370 @@
+import json
+import math
+import os
+import shutil
+import tempfile
+import zlib
+import logging
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Fan-out per partitioning pass. A bucket that still holds more lines than
+# the memory budget allows is split again on the next bits of its hash.
+SPILL_BUCKETS = 64
+MAX_SPILL_DEPTH = 4
+
+# Rough per-entry cost of a Counter/dict entry holding a short key.
+ENTRY_BYTES = 128
+
+# Pending approximate keys are inserted into the Bloom filter in batches.
+# A tracker that was only fed one chunk is still pending, so merging it
+# into another tracker replays its keys exactly.
+BLOOM_FLUSH_ROWS = 100_000
+
+SAMPLE_SIZE = 5
+
+_HASH_KEYS = ('dce-uniqueness-1', 'dce-uniqueness-2')
+
+
+def _encode(value: Any) -> str:
+    # Every tracker counts this encoding, in memory and on disk alike, so 1
+    # and 1.0 are one value (a column with nulls turns ints into floats)
+    # while True and "1" stay distinct from 1.
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return json.dumps(value, default=str, ensure_ascii=False)
+
+
+# Counts values in memory and hash-partitions them to on-disk buckets once
+# the memory budget is exceeded; buckets are resolved one at a time.
+class ExactUniquenessTracker:
+
+    def __init__(self, memory_budget_mb: float, spill_dir: Optional[str] = None):
+        self.max_entries = max(1, int(memory_budget_mb * 1024 * 1024) // ENTRY_BYTES)
+        self.spill_dir = spill_dir
+        self.counts: Counter = Counter()
+        self.bucket_dir: Optional[str] = None
+        self.bucket_lines = [0] * SPILL_BUCKETS
+        self.logger = logging.getLogger(__name__)
+
+    def add(self, values: List[Any]) -> None:
+        self.counts.update(_encode(value) for value in values)
+        if len(self.counts) > self.max_entries:
+            self._spill()
+
+    def merge(self, other: "ExactUniquenessTracker") -> "ExactUniquenessTracker":
+        self.counts.update(other.counts)
+
+        if other.bucket_dir is not None:
+            self._ensure_bucket_dir()
+            for bucket in range(SPILL_BUCKETS):
+                source = other._bucket_path(bucket)
+                if os.path.exists(source):
+                    with open(source, 'rb') as src, open(self._bucket_path(bucket), 'ab') as dst:
+                        shutil.copyfileobj(src, dst)
+                    self.bucket_lines[bucket] += other.bucket_lines[bucket]
+            other.close()
+
+        if len(self.counts) > self.max_entries:
+            self._spill()
+        return self
+
+    def duplicates(self) -> Tuple[int, List[Tuple[Any, int]]]:
+        if self.bucket_dir is None:
+            duplicates = [(key, count) for key, count in self.counts.items() if count > 1]
+            return len(duplicates), [(json.loads(key), count) for key, count in duplicates[:SAMPLE_SIZE]]
+
+        self._spill()
+
+        duplicates: List[Tuple[str, int]] = []
+        duplicate_count = 0
+        for bucket in range(SPILL_BUCKETS):
+            path = self._bucket_path(bucket)
+            if os.path.exists(path):
+                duplicate_count += self._resolve(path, self.bucket_lines[bucket], 1, duplicates)
+
+        return duplicate_count, [(json.loads(key), count) for key, count in duplicates]
+
+    def close(self) -> None:
+        if self.bucket_dir is not None:
+            shutil.rmtree(self.bucket_dir, ignore_errors=True)
+            self.bucket_dir = None
+            self.bucket_lines = [0] * SPILL_BUCKETS
+        self.counts.clear()
+
+    def _spill(self) -> None:
+        if not self.counts:
+            return
+
+        self._ensure_bucket_dir()
+
+        buckets: List[List[str]] = [[] for _ in range(SPILL_BUCKETS)]
+        for key, count in self.counts.items():
+            buckets[zlib.crc32(key.encode('utf-8')) % SPILL_BUCKETS].append(f"{key}\t{count}\n")
+
+        for bucket, lines in enumerate(buckets):
+            if lines:
+                with open(self._bucket_path(bucket), 'a', encoding='utf-8') as f:
+                    f.writelines(lines)
+                self.bucket_lines[bucket] += len(lines)
+
+        self.logger.debug(f"Spilled {len(self.counts)} distinct values to {self.bucket_dir}")
+        self.counts.clear()
+
+    def _resolve(self, path: str, lines: int, depth: int, sample: List[Tuple[str, int]]) -> int:
+        if lines > self.max_entries and depth < MAX_SPILL_DEPTH:
+            parts = self._partition(path, depth)
+            # A bucket made of one hot key's spill lines cannot be split
+            if max(parts.values()) < lines:
+                os.remove(path)
+                return sum(
+                    self._resolve(part, part_lines, depth + 1, sample)
+                    for part, part_lines in parts.items()
+                )
+            for part in parts:
+                os.remove(part)
+
+        counts: Counter = Counter()
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                key, _, count = line.rpartition('\t')
+                counts[key] += int(count)
+
+        duplicate_count = 0
+        for key, count in counts.items():
+            if count > 1:
+                duplicate_count += 1
+                if len(sample) < SAMPLE_SIZE:
+                    sample.append((key, count))
+        return duplicate_count
+
+    def _partition(self, path: str, depth: int) -> Dict[str, int]:
+        parts: Dict[str, int] = {}
+        files = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    key = line.rpartition('\t')[0]
+                    # Each pass buckets on the next digits of the same hash
+                    digit = zlib.crc32(key.encode('utf-8')) // SPILL_BUCKETS ** depth % SPILL_BUCKETS
+                    part = f"{path}.{digit:02d}"
+                    if part not in files:
+                        files[part] = open(part, 'w', encoding='utf-8')
+                        parts[part] = 0
+                    files[part].write(line)
+                    parts[part] += 1
+        finally:
+            for f in files.values():
+                f.close()
+        return parts
+
+    def _ensure_bucket_dir(self) -> None:
+        if self.bucket_dir is None:
+            self.bucket_dir = tempfile.mkdtemp(prefix="dce-uniqueness-", dir=self.spill_dir)
+
+    def _bucket_path(self, bucket: int) -> str:
+        return os.path.join(self.bucket_dir, f"bucket-{bucket:02d}.tsv")
+
+
+class BloomFilter:
+    def __init__(self, num_bits: int, num_hashes: int):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        # Allocated on first insert so per-chunk trackers stay cheap to ship
+        # between processes.
+        self.bits: Optional[np.ndarray] = None
+
+    @property
+    def nbytes(self) -> int:
+        return (self.num_bits + 7) // 8
+
+    @classmethod
+    def for_capacity(
+        cls,
+        expected_count: int,
+        false_positive_rate: float,
+        max_bytes: int
+    ) -> "BloomFilter":
+        expected_count = max(1, expected_count)
+        num_bits = math.ceil(-expected_count * math.log(false_positive_rate) / (math.log(2) ** 2))
+        num_bits = max(64, min(num_bits, max_bytes * 8))
+        num_hashes = max(1, round(num_bits / expected_count * math.log(2)))
+        return cls(num_bits, num_hashes)
+
+    def add(self, keys: np.ndarray) -> np.ndarray:
+        if self.bits is None:
+            self.bits = np.zeros(self.nbytes, dtype=np.uint8)
+
+        h1 = pd.util.hash_array(keys, hash_key=_HASH_KEYS[0])
+        h2 = pd.util.hash_array(keys, hash_key=_HASH_KEYS[1]) | np.uint64(1)
+        rounds = np.arange(self.num_hashes, dtype=np.uint64)
+        positions = (h1[:, None] + rounds[None, :] * h2[:, None]) % np.uint64(self.num_bits)
+
+        byte_index = (positions >> np.uint64(3)).astype(np.intp)
+        masks = np.left_shift(np.uint8(1), (positions & np.uint64(7)).astype(np.uint8))
+
+        present = ((self.bits[byte_index] & masks) != 0).all(axis=1)
+        np.bitwise_or.at(self.bits, byte_index.ravel(), masks.ravel())
+        return present
+
+    def merge(self, other: "BloomFilter") -> "BloomFilter":
+        if other.bits is not None:
+            if self.bits is None:
+                self.bits = other.bits.copy()
+            else:
+                self.bits |= other.bits
+        return self
+
+
+# The Bloom filter only nominates candidates: every key is also appended to
+# a spill file, and duplicates() confirms the candidates exactly with a pass
+# over that file per max_candidates of them, so filter false positives
+# never surface as duplicates.
+class ApproximateUniquenessTracker:
+
+    def __init__(
+        self,
+        memory_budget_mb: float,
+        expected_count: int,
+        false_positive_rate: float,
+        spill_dir: Optional[str] = None
+    ):
+        budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self.bloom = BloomFilter.for_capacity(
+            expected_count,
+            false_positive_rate,
+            max_bytes=budget_bytes * 3 // 4
+        )
+        self.max_candidates = max(1000, (budget_bytes - self.bloom.nbytes) // ENTRY_BYTES)
+        self.spill_dir = spill_dir
+        self.candidates: set = set()
+        self.overflow = 0
+        self.inserted = 0
+        self.pending: Counter = Counter()
+        self.pending_rows = 0
+        self.key_dir: Optional[str] = None
+
+    def add(self, values: List[Any]) -> None:
+        self.pending.update(_encode(value) for value in values)
+        self.pending_rows += len(values)
+        if self.pending_rows >= BLOOM_FLUSH_ROWS:
+            self._flush()
+
+    def merge(self, other: "ApproximateUniquenessTracker") -> "ApproximateUniquenessTracker":
+        # The other filter's keys are replayed through this one, so repeats
+        # across the two trackers are found as well.
+        if other.key_dir is not None:
+            with open(other._keys_path(), 'r', encoding='utf-8') as f:
+                for line in f:
+                    key, _, count = line.rpartition('\t')
+                    self.pending[key] += int(count)
+                    self.pending_rows += int(count)
+                    if self.pending_rows >= BLOOM_FLUSH_ROWS:
+                        self._flush()
+
+        self.pending.update(other.pending)
+        self.pending_rows += other.pending_rows
+        other.close()
+        if self.pending_rows >= BLOOM_FLUSH_ROWS:
+            self._flush()
+        return self
+
+    def duplicates(self) -> Tuple[int, List[Tuple[Any, int]]]:
+        if not self.inserted:
+            # Fewer than BLOOM_FLUSH_ROWS values were seen, so they are
+            # counted exactly rather than allocating the filter for them.
+            duplicates = [(key, count) for key, count in self.pending.items() if count > 1]
+            return len(duplicates), [(json.loads(key), count) for key, count in duplicates[:SAMPLE_SIZE]]
+
+        self._flush()
+
+        duplicate_count = 0
+        sample: List[Tuple[str, int]] = []
+        for candidates in self._candidate_batches():
+            counts: Counter = Counter()
+            with open(self._keys_path(), 'r', encoding='utf-8') as f:
+                for line in f:
+                    key, _, count = line.rpartition('\t')
+                    if key in candidates:
+                        counts[key] += int(count)
+
+            for key, count in counts.items():
+                if count > 1:
+                    duplicate_count += 1
+                    if len(sample) < SAMPLE_SIZE:
+                        sample.append((key, count))
+
+        return duplicate_count, [(json.loads(key), count) for key, count in sample]
+
+    def close(self) -> None:
+        if self.key_dir is not None:
+            shutil.rmtree(self.key_dir, ignore_errors=True)
+            self.key_dir = None
+        self.pending = Counter()
+        self.pending_rows = 0
+        self.candidates = set()
+        self.overflow = 0
+
+    def _flush(self) -> None:
+        if not self.pending:
+            return
+
+        chunk_counts, self.pending = self.pending, Counter()
+        self.pending_rows = 0
+
+        keys = np.array(list(chunk_counts), dtype=object)
+        present = self.bloom.add(keys)
+        self.inserted += len(keys)
+
+        if self.key_dir is None:
+            self.key_dir = tempfile.mkdtemp(prefix="dce-uniqueness-", dir=self.spill_dir)
+        with open(self._keys_path(), 'a', encoding='utf-8') as f:
+            f.writelines(f"{key}\t{count}\n" for key, count in chunk_counts.items())
+
+        overflow = []
+        for key, seen in zip(keys, present):
+            if (seen or chunk_counts[key] > 1) and key not in self.candidates:
+                if len(self.candidates) < self.max_candidates:
+                    self.candidates.add(key)
+                else:
+                    overflow.append(f"{key}\n")
+        if overflow:
+            with open(self._overflow_path(), 'a', encoding='utf-8') as f:
+                f.writelines(overflow)
+            self.overflow += len(overflow)
+
+    def _candidate_batches(self):
+        if self.candidates:
+            yield self.candidates
+        if not self.overflow:
+            return
+
+        # Candidates past max_candidates were written out. They are hash
+        # partitioned so that a key flagged more than once lands in one
+        # batch, and each batch costs one pass over the keys.
+        partitions = math.ceil(self.overflow / self.max_candidates)
+        paths = [f"{self._overflow_path()}.{i}" for i in range(partitions)]
+        files = [open(path, 'w', encoding='utf-8') for path in paths]
+        try:
+            with open(self._overflow_path(), 'r', encoding='utf-8') as f:
+                for line in f:
+                    files[zlib.crc32(line.encode('utf-8')) % partitions].write(line)
+        finally:
+            for part in files:
+                part.close()
+
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                batch = {line[:-1] for line in f}
+            os.remove(path)
+            yield batch - self.candidates
+
+    def _keys_path(self) -> str:
+        return os.path.join(self.key_dir, "keys.tsv")
+
+    def _overflow_path(self) -> str:
+        return os.path.join(self.key_dir, "candidates.txt")
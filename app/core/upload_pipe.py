@@ -0,0 +1,73 @@
+import io
+import threading
+from collections import deque
+
+
+# Bounded in-memory byte pipe. The API writes upload chunks into it while a
+# file handler reads from it on a worker thread, so validation can start
+# before the upload has finished and at most `max_buffered` bytes (plus one
+# chunk) are held for the request.
+class UploadPipe(io.RawIOBase):
+
+    def __init__(self, max_buffered: int):
+        super().__init__()
+        self.max_buffered = max_buffered
+        self.bytes_written = 0
+        self._chunks = deque()
+        self._buffered = 0
+        self._eof = False
+        self._aborted = False
+        self._condition = threading.Condition()
+
+    def readable(self) -> bool:
+        return True
+
+    def feed(self, data: bytes) -> None:
+        if not data:
+            return
+
+        with self._condition:
+            while self._buffered >= self.max_buffered and not self._aborted:
+                self._condition.wait()
+            if self._aborted:
+                raise BrokenPipeError("Upload reader stopped")
+
+            self._chunks.append(memoryview(data))
+            self._buffered += len(data)
+            self.bytes_written += len(data)
+            self._condition.notify_all()
+
+    def finish(self) -> None:
+        with self._condition:
+            self._eof = True
+            self._condition.notify_all()
+
+    def abort(self) -> None:
+        with self._condition:
+            self._aborted = True
+            self._chunks.clear()
+            self._buffered = 0
+            self._condition.notify_all()
+
+    def readinto(self, buffer) -> int:
+        with self._condition:
+            while not self._chunks and not self._eof and not self._aborted:
+                self._condition.wait()
+            if not self._chunks:
+                return 0
+
+            chunk = self._chunks[0]
+            size = min(len(buffer), len(chunk))
+            buffer[:size] = chunk[:size]
+            if size == len(chunk):
+                self._chunks.popleft()
+            else:
+                self._chunks[0] = chunk[size:]
+
+            self._buffered -= size
+            self._condition.notify_all()
+            return size
+
+    def close(self) -> None:
+        self.abort()
+        super().close()
@@ -0,0 +1,46 @@
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+# Insert `rows`, or add their `increments` columns onto the existing row
+# with the same `index_elements` (which must carry a unique index).
+# Postgres and SQLite do this in one INSERT ... ON CONFLICT statement, so
+# concurrent writers never lose counts; other dialects lock and update.
+def increment_upsert(
+    db: Session,
+    model,
+    index_elements: Sequence[str],
+    rows: List[Dict[str, Any]],
+    increments: Sequence[str],
+    replace: Sequence[str] = ()
+) -> None:
+    if not rows:
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        stmt = insert(model)
+
+        set_ = {column: getattr(model, column) + getattr(stmt.excluded, column) for column in increments}
+        set_.update({column: getattr(stmt.excluded, column) for column in replace})
+
+        db.execute(stmt.on_conflict_do_update(index_elements=list(index_elements), set_=set_), rows)
+        return
+
+    for row in rows:
+        existing = db.execute(
+            select(model).filter_by(**{key: row[key] for key in index_elements}).with_for_update()
+        ).scalars().first()
+
+        if existing is None:
+            db.add(model(**row))
+            continue
+
+        for column in increments:
+            setattr(existing, column, getattr(existing, column) + row[column])
+        for column in replace:
+            setattr(existing, column, row[column])
@@ -1,17 +1,76 @@
 import time
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime
 from uuid import UUID
 import uuid
+from collections import Counter
 
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.contract_manager import ContractManager
-from app.core.schema_validator import SchemaValidator
-from app.core.quality_validator import QualityValidator, QualityValidationResult
+from app.core.contract_manager import AsyncContractManager, ContractManager
+from app.core.error_counts import record_error_counts
+from app.core.file_handlers import frame_to_records
+from app.core.metric_rollups import metric_rollups
+from app.core.quality_validator import QualityValidationResult
+from app.core.result_sink import result_sink
+from app.core.telemetry import StageTimings
+from app.core.validator_cache import CompiledValidator, validator_cache
 from app.models.schemas import ValidationResult, ValidationError, BatchValidationResult
-from app.models.database import ValidationResult as DBValidationResult
+from app.models.database import Contract, ValidationResult as DBValidationResult
+
+
+def validate_rows(
+    compiled: CompiledValidator,
+    data: List[Dict[str, Any]]
+) -> Tuple[int, int, List[ValidationError], Dict[str, int]]:
+    schema_validator = compiled.schema_validator
+    passed = 0
+    failed = 0
+    all_errors = []
+    
+    for record in data:
+        errors = schema_validator.validate(record)
+    
+        if len(errors) == 0:
+            passed += 1
+        else:
+            failed += 1
+            all_errors.extend(errors[:5])
+    
+    error_counts = {}
+    for error in all_errors:
+        error_counts[error.error_type] = error_counts.get(error.error_type, 0) + 1
+    
+    return passed, failed, all_errors, error_counts
+
+
+def validate_frame(
+    compiled: CompiledValidator,
+    frame: pd.DataFrame
+) -> Tuple[int, int, List[ValidationError], Dict[str, int]]:
+    columnar_result = compiled.columnar_validator.validate(frame)
+    
+    # Only the rows needed to fill the 50-error sample are materialized
+    # and re-validated row by row to build the error objects.
+    sample_positions = columnar_result.failed_positions(limit=50)
+    sample_records = frame_to_records(frame.iloc[sample_positions])
+    
+    all_errors = []
+    for record in sample_records:
+        all_errors.extend(compiled.schema_validator.validate(record)[:5])
+        if len(all_errors) >= 50:
+            break
+    
+    return (
+        columnar_result.passed,
+        columnar_result.failed,
+        all_errors,
+        dict(columnar_result.error_counts)
+    )
 
 
 class ValidationEngine:
@@ -19,6 +78,8 @@ class ValidationEngine:
         self.db = db_session
         self.contract_manager = ContractManager(db_session)
         self.logger = logging.getLogger(__name__)
+        # Collects per-stage timings when set; see set_stage_timings
+        self.timings: Optional[StageTimings] = None
     
     async def validate_record(
         self,
@@ -27,21 +88,46 @@ class ValidationEngine:
     ) -> ValidationResult:
         start_time = time.time()
         
-        contract = self.contract_manager.get_contract_by_id(contract_id)
-        if not contract:
-            raise ValueError(f"Contract {contract_id} not found")
+        compiled = self.get_compiled_validator(contract_id)
+        result = self._build_record_result(compiled, data, start_time)
         
-        contract_schema = self.contract_manager.get_contract_schema(contract_id)
+        self._store_validation_result(contract_id, result)
+        
+        self._attach_timings(result, "record")
+        return result
+    
+    async def validate_batch(
+        self,
+        contract_id: UUID,
+        data: Union[List[Dict[str, Any]], pd.DataFrame],
+        batch_id: Optional[UUID] = None,
+        check_quality: bool = True
+    ) -> BatchValidationResult:
+        start_time = time.time()
         
-        schema_validator = SchemaValidator(contract_schema)
-        schema_errors = schema_validator.validate(data)
+        compiled = self.get_compiled_validator(contract_id)
+        
+        result = self._build_batch_result(compiled, data, batch_id, check_quality, start_time)
+        self._attach_timings(result, "batch")
+        return result
+    
+    def _build_record_result(
+        self,
+        compiled: CompiledValidator,
+        data: Dict[str, Any],
+        start_time: float
+    ) -> ValidationResult:
+        started = time.perf_counter()
+        schema_errors = compiled.schema_validator.validate(data)
+        self._record_stage("schema", started)
         
         status = "PASS" if len(schema_errors) == 0 else "FAIL"
         
         quality_errors = []
-        if status == "PASS" and contract_schema.quality_rules:
-            quality_validator = QualityValidator(contract_schema.quality_rules)
-            quality_result = quality_validator.validate(data)
+        if status == "PASS" and compiled.quality_validator:
+            quality_started = time.perf_counter()
+            quality_result = compiled.quality_validator.validate(data)
+            self._record_stage("quality", quality_started)
             
             if not quality_result.passed:
                 status = "FAIL"
@@ -58,74 +144,61 @@ class ValidationEngine:
         
         all_errors = schema_errors + quality_errors
         
+        metrics = compiled.metrics
+        metrics.record_seconds.observe(time.perf_counter() - started)
+        if status == "PASS":
+            metrics.record_passed.inc()
+        else:
+            metrics.record_failed.inc()
+            metrics.count_errors(Counter(e.error_type for e in all_errors))
+        
         execution_time_ms = (time.time() - start_time) * 1000
         
-        result = ValidationResult(
+        return ValidationResult(
             status=status,
             errors=all_errors,
             execution_time_ms=execution_time_ms,
             validated_at=datetime.utcnow(),
-            contract_version=contract.version
+            contract_version=compiled.version
         )
-        
-        self._store_validation_result(contract_id, result)
-        
-        return result
     
-    async def validate_batch(
+    def _build_batch_result(
         self,
-        contract_id: UUID,
-        data: List[Dict[str, Any]],
-        batch_id: Optional[UUID] = None
+        compiled: CompiledValidator,
+        data: Union[List[Dict[str, Any]], pd.DataFrame],
+        batch_id: Optional[UUID],
+        check_quality: bool,
+        start_time: float
     ) -> BatchValidationResult:
         if batch_id is None:
             batch_id = uuid.uuid4()
         
-        start_time = time.time()
-        
-        contract = self.contract_manager.get_contract_by_id(contract_id)
-        if not contract:
-            raise ValueError(f"Contract {contract_id} not found")
-        
-        contract_schema = self.contract_manager.get_contract_schema(contract_id)
-        schema_validator = SchemaValidator(contract_schema)
-        
         total_records = len(data)
-        passed = 0
-        failed = 0
-        all_errors = []
+        started = time.perf_counter()
         
-        for record in data:
-            errors = schema_validator.validate(record)
-            
-            if len(errors) == 0:
-                passed += 1
-            else:
-                failed += 1
-                all_errors.extend(errors[:5])
-        
-        if passed > 0 and contract_schema.quality_rules:
-            quality_validator = QualityValidator(contract_schema.quality_rules)
-            quality_result = quality_validator.validate(data)
+        if isinstance(data, pd.DataFrame):
+            passed, failed, all_errors, error_counts = validate_frame(compiled, data)
+        else:
+            passed, failed, all_errors, error_counts = validate_rows(compiled, data)
+        self._record_stage("schema", started)
+        
+        if check_quality and passed > 0 and compiled.quality_validator:
+            quality_started = time.perf_counter()
+            quality_result = compiled.quality_validator.validate(data)
+            self._record_stage("quality", quality_started)
             
             if not quality_result.passed:
-                for qe in quality_result.errors:
-                    all_errors.append(ValidationError(
-                        field="batch_quality",
-                        error_type=qe.rule_type,
-                        message=qe.message,
-                        value=None,
-                        expected=str(qe.details)
-                    ))
+                quality_errors = self.quality_errors_to_validation_errors(quality_result)
+                all_errors.extend(quality_errors)
+                for error in quality_errors:
+                    error_counts[error.error_type] = error_counts.get(error.error_type, 0) + 1
+        
+        compiled.metrics.record_batch(passed, failed, error_counts, time.perf_counter() - started)
         
         execution_time_ms = (time.time() - start_time) * 1000
         pass_rate = (passed / total_records * 100) if total_records > 0 else 0
         
-        error_counts = {}
-        for error in all_errors:
-            error_counts[error.error_type] = error_counts.get(error.error_type, 0) + 1
-        
-        result = BatchValidationResult(
+        return BatchValidationResult(
             batch_id=str(batch_id),
             total_records=total_records,
             passed=passed,
@@ -135,16 +208,77 @@ class ValidationEngine:
             errors_summary=error_counts,
             sample_errors=all_errors[:50]
         )
+    
+    def quality_errors_to_validation_errors(
+        self,
+        quality_result: QualityValidationResult
+    ) -> List[ValidationError]:
+        return [
+            ValidationError(
+                field="batch_quality",
+                error_type=qe.rule_type,
+                message=qe.message,
+                value=None,
+                expected=str(qe.details)
+            )
+            for qe in quality_result.errors
+        ]
+    
+    def get_compiled_validator(self, contract_id: UUID) -> CompiledValidator:
+        started = time.perf_counter()
+        row = self.db.query(Contract.version).filter(
+            Contract.id == str(contract_id)
+        ).first()
+        if not row:
+            raise ValueError(f"Contract {contract_id} not found")
         
-        return result
+        version = row[0]
+        compiled = validator_cache.get(contract_id, version)
+        self._record_stage("lookup", started)
+        if compiled is not None:
+            return compiled
+        
+        started = time.perf_counter()
+        contract = self.contract_manager.get_contract_by_id(contract_id)
+        self._record_stage("load", started)
+        return self._compile(contract_id, contract)
     
-    def _store_validation_result(
+    def _compile(self, contract_id: UUID, contract: Optional[Contract]) -> CompiledValidator:
+        if not contract:
+            raise ValueError(f"Contract {contract_id} not found")
+        
+        started = time.perf_counter()
+        contract_schema = self.contract_manager.parse_contract_schema(contract)
+        self._record_stage("parse", started)
+        
+        started = time.perf_counter()
+        compiled = CompiledValidator(str(contract_id), contract.version, contract_schema)
+        validator_cache.put(compiled)
+        self._record_stage("compile", started)
+        
+        self.logger.debug(f"Compiled validator for contract {contract_id} v{contract.version}")
+        return compiled
+    
+    def set_stage_timings(self, timings: Optional[StageTimings]) -> None:
+        self.timings = timings
+    
+    def _record_stage(self, stage: str, started: float) -> None:
+        if self.timings is not None:
+            self.timings.add(stage, time.perf_counter() - started)
+    
+    def _attach_timings(self, result: Union[ValidationResult, BatchValidationResult], mode: str) -> None:
+        if self.timings is not None:
+            result.timings = self.timings.as_ms()
+            self.timings.observe(mode)
+    
+    def _result_row(
         self,
         contract_id: UUID,
         validation_result: ValidationResult,
         batch_id: Optional[UUID] = None
-    ) -> None:
-        db_result = DBValidationResult(
+    ) -> Dict[str, Any]:
+        return dict(
+            id=str(uuid.uuid4()),
             contract_id=str(contract_id),
             status=validation_result.status,
             errors=[e.dict() for e in validation_result.errors] if validation_result.errors else None,
@@ -152,6 +286,107 @@ class ValidationEngine:
             validated_at=validation_result.validated_at,
             batch_id=str(batch_id) if batch_id else None
         )
+    
+    def _record_rollup(self, contract_id: UUID, validation_result: ValidationResult) -> None:
+        passed = validation_result.status == "PASS"
+        metric_rollups.record(
+            contract_id,
+            validation_result.validated_at,
+            passed=1 if passed else 0,
+            failed=0 if passed else 1,
+            execution_time_ms=validation_result.execution_time_ms,
+            error_counts=Counter(e.error_type for e in validation_result.errors)
+        )
+    
+    def _store_validation_result(
+        self,
+        contract_id: UUID,
+        validation_result: ValidationResult,
+        batch_id: Optional[UUID] = None
+    ) -> None:
+        started = time.perf_counter()
+        row = self._result_row(contract_id, validation_result, batch_id)
+        self._record_rollup(contract_id, validation_result)
+        
+        # A full sink queue is not waited on: the request writes its own row
+        if not result_sink.offer(row):
+            self.db.add(DBValidationResult(**row))
+            record_error_counts(self.db, [row])
+            self.db.commit()
+        self._record_stage("store", started)
+
+
+# Same validation paths over an AsyncSession, so request handlers wait on
+# the connection pool instead of blocking the event loop on database I/O.
+class AsyncValidationEngine(ValidationEngine):
+    def __init__(self, db_session: AsyncSession):
+        self.db = db_session
+        self.contract_manager = AsyncContractManager(db_session)
+        self.logger = logging.getLogger(__name__)
+        self.timings: Optional[StageTimings] = None
+    
+    async def validate_record(
+        self,
+        contract_id: UUID,
+        data: Dict[str, Any]
+    ) -> ValidationResult:
+        start_time = time.time()
+        
+        compiled = await self.get_compiled_validator(contract_id)
+        result = self._build_record_result(compiled, data, start_time)
+        
+        await self._store_validation_result(contract_id, result)
+        
+        self._attach_timings(result, "record")
+        return result
+    
+    async def validate_batch(
+        self,
+        contract_id: UUID,
+        data: Union[List[Dict[str, Any]], pd.DataFrame],
+        batch_id: Optional[UUID] = None,
+        check_quality: bool = True
+    ) -> BatchValidationResult:
+        start_time = time.time()
+        
+        compiled = await self.get_compiled_validator(contract_id)
+        
+        result = self._build_batch_result(compiled, data, batch_id, check_quality, start_time)
+        self._attach_timings(result, "batch")
+        return result
+    
+    async def get_compiled_validator(self, contract_id: UUID) -> CompiledValidator:
+        started = time.perf_counter()
+        result = await self.db.execute(
+            select(Contract.version).where(Contract.id == str(contract_id))
+        )
+        version = result.scalar_one_or_none()
+        if version is None:
+            raise ValueError(f"Contract {contract_id} not found")
+        
+        compiled = validator_cache.get(contract_id, version)
+        self._record_stage("lookup", started)
+        if compiled is not None:
+            return compiled
+        
+        started = time.perf_counter()
+        contract = await self.contract_manager.get_contract_by_id(contract_id)
+        self._record_stage("load", started)
+        return self._compile(contract_id, contract)
+    
+    async def _store_validation_result(
+        self,
+        contract_id: UUID,
+        validation_result: ValidationResult,
+        batch_id: Optional[UUID] = None
+    ) -> None:
+        started = time.perf_counter()
+        row = self._result_row(contract_id, validation_result, batch_id)
+        self._record_rollup(contract_id, validation_result)
         
-        self.db.add(db_result)
-        self.db.commit()
\ No newline at end of file
+        # A full sink queue is not waited on: the request writes its own row
+        if not result_sink.offer(row):
+            self.db.add(DBValidationResult(**row))
+            await self.db.run_sync(record_error_counts, [row])
+            await self.db.commit()
+        self._record_stage("store", started)
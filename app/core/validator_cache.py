@@ -0,0 +1,97 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.core.schema_validator import SchemaValidator
+from app.core.columnar_validator import ColumnarValidator
+from app.core.quality_validator import QualityValidator
+from app.core.telemetry import ContractMetrics
+from app.models.schemas import ContractSchema
+
+
+class CompiledValidator:
+    def __init__(self, contract_id: str, version: str, contract_schema: ContractSchema):
+        self.contract_id = contract_id
+        self.version = version
+        self.contract_schema = contract_schema
+        self.schema_validator = SchemaValidator(contract_schema)
+        self.columnar_validator = ColumnarValidator(contract_schema, self.schema_validator)
+        self.quality_validator = (
+            QualityValidator(contract_schema.quality_rules)
+            if contract_schema.quality_rules else None
+        )
+        self.referenced_columns = self._referenced_columns()
+        self.metrics = ContractMetrics(contract_id)
+
+    def _referenced_columns(self) -> Optional[List[str]]:
+        columns = list(self.contract_schema.schema.keys())
+        if self.quality_validator:
+            quality_fields = self.quality_validator.referenced_fields()
+            if quality_fields is None:
+                return None
+            columns.extend(quality_fields)
+        return list(dict.fromkeys(columns))
+
+
+class ValidatorCache:
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, str], CompiledValidator]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.logger = logging.getLogger(__name__)
+
+    def get(self, contract_id, version: str) -> Optional[CompiledValidator]:
+        key = (str(contract_id), version)
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return compiled
+
+    def put(self, compiled: CompiledValidator) -> None:
+        key = (compiled.contract_id, compiled.version)
+        with self._lock:
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                evicted, _ = self._entries.popitem(last=False)
+                self.logger.debug(f"Evicted compiled validator {evicted}")
+
+    def invalidate(self, contract_id) -> int:
+        contract_id = str(contract_id)
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == contract_id]
+            for key in keys:
+                del self._entries[key]
+        if keys:
+            self.logger.debug(f"Invalidated {len(keys)} compiled validator(s) for {contract_id}")
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+validator_cache = ValidatorCache(max_size=settings.VALIDATOR_CACHE_SIZE)
@@ -6,7 +6,9 @@ from sqlalchemy.orm import Session
 from app.models.database import Contract, ContractVersion
 from app.core.change_detector import ChangeDetector, ChangeReport
 from app.core.yaml_parser import YAMLParser
+from app.core.validator_cache import validator_cache
 from app.utils.exceptions import ContractNotFoundError, InvalidYAMLError
+from app.utils.pagination import Keyset, after_keyset, keyset_order
 
 
 logger = logging.getLogger(__name__)
@@ -66,6 +68,7 @@ class VersionController:
         
         self.db.add(version)
         self.db.commit()
+        validator_cache.invalidate(contract_id)
         
         self.logger.info(
             f"Version created: {contract_id} v{current_version} → v{new_version} "
@@ -99,15 +102,24 @@ class VersionController:
     def get_version_history(
         self,
         contract_id: str,
-        limit: int = 50
+        limit: int = 50,
+        after: Optional[Keyset] = None
     ) -> List[ContractVersion]:
-        versions = self.db.query(ContractVersion).filter(
+        query = self.db.query(ContractVersion).filter(
             ContractVersion.contract_id == str(contract_id)
         ).order_by(
-            ContractVersion.created_at.desc()
-        ).limit(limit).all()
+            *keyset_order(ContractVersion.created_at, ContractVersion.id)
+        )
+        
+        if after:
+            query = query.filter(after_keyset(ContractVersion.created_at, ContractVersion.id, after))
         
-        return versions
+        return query.limit(limit).all()
+    
+    def count_versions(self, contract_id: str) -> int:
+        return self.db.query(ContractVersion).filter(
+            ContractVersion.contract_id == str(contract_id)
+        ).count()
     
     def get_version_by_number(
         self,
@@ -213,6 +225,7 @@ class VersionController:
         
         self.db.add(rollback_version)
         self.db.commit()
+        validator_cache.invalidate(contract_id)
         
         self.logger.info(
             f"Rollback complete: {contract_id} "
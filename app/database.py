@@ -1,16 +1,46 @@
 import logging
-from typing import Generator
+import time
+from typing import AsyncGenerator, Generator, Optional
 from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import Pool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
 
 from app.config import settings
+from app.core.telemetry import POOL_CHECKED_OUT, POOL_CHECKOUT_SECONDS, POOL_CHECKOUTS, POOL_CONNECTIONS
 
 logger = logging.getLogger(__name__)
 
+pool_connections = POOL_CONNECTIONS.labels()
+pool_checkouts = POOL_CHECKOUTS.labels()
+
+
+# The pool events fire once a connection is in hand, so the time spent
+# waiting for one (or opening a new one) is measured around _do_get.
+class _TimedCheckout:
+    checkout_seconds = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.checkout_seconds.observe(time.perf_counter() - started)
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    checkout_seconds = POOL_CHECKOUT_SECONDS.labels("sync")
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    checkout_seconds = POOL_CHECKOUT_SECONDS.labels("async")
+
+
 engine = create_engine(
     settings.DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
     pool_pre_ping=True,
     pool_size=5,
     max_overflow=15,
@@ -21,19 +51,39 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+# Bound to the async engine on first use, so importing this module does not
+# require the async driver to be installed.
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+_async_engine: Optional[AsyncEngine] = None
+
 Base = declarative_base()
 
 
 @event.listens_for(Pool, "connect")
 def receive_connect(dbapi_conn, connection_record):
+    pool_connections.inc()
     logger.debug("Database connection established")
 
 
 @event.listens_for(Pool, "checkout")
 def receive_checkout(dbapi_conn, connection_record, connection_proxy):
+    pool_checkouts.inc()
     logger.debug("Connection checked out from pool")
 
 
+def _async_checked_out() -> int:
+    return _async_engine.pool.checkedout() if _async_engine is not None else 0
+
+
+POOL_CHECKED_OUT.labels("sync").set_function(lambda: engine.pool.checkedout())
+
+
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     try:
@@ -42,6 +92,49 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def to_async_url(database_url: str) -> str:
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def create_async_db_engine(database_url: str, **kwargs) -> AsyncEngine:
+    async_url = to_async_url(database_url)
+    if make_url(async_url).get_backend_name() == "postgresql":
+        kwargs.setdefault("pool_size", 5)
+        kwargs.setdefault("max_overflow", 15)
+        kwargs.setdefault("pool_timeout", 30)
+        kwargs.setdefault("pool_recycle", 3600)
+        kwargs.setdefault("poolclass", InstrumentedAsyncQueuePool)
+    return create_async_engine(async_url, pool_pre_ping=True, **kwargs)
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_db_engine(settings.DATABASE_URL, echo=settings.DEBUG)
+        AsyncSessionLocal.configure(bind=_async_engine)
+        if isinstance(_async_engine.pool, QueuePool):
+            POOL_CHECKED_OUT.labels("async").set_function(_async_checked_out)
+    return _async_engine
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def close_async_db() -> None:
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        logger.info("Async database connections closed")
+
+
 def init_db() -> None:
     logger.info("Initializing database tables...")
     Base.metadata.create_all(bind=engine)
@@ -54,6 +147,16 @@ def close_db() -> None:
     logger.info("Database connections closed")
 
 
+def ensure_partitions() -> None:
+    from app.core.partitioning import PartitionManager
+    
+    db = SessionLocal()
+    try:
+        PartitionManager(db).ensure_partitions()
+    finally:
+        db.close()
+
+
 def test_connection() -> bool:
     try:
         with engine.connect() as conn:
@@ -66,4 +169,9 @@ def test_connection() -> bool:
 
 def get_db_session():
     db = SessionLocal()
-    return db
\ No newline at end of file
+    return db
+
+
+def get_async_db_session() -> AsyncSession:
+    get_async_engine()
+    return AsyncSessionLocal()
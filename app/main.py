@@ -1,15 +1,20 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from app.api import versions, metrics
 import logging
 from app.config import settings
-from app.database import test_connection, close_db, init_db
+from app.database import SessionLocal, test_connection, close_db, close_async_db, init_db, ensure_partitions
 from app.utils.logging import setup_logging
 from app.utils.exceptions import DCEBaseException, format_error_response
 from app.utils.scheduler import setup_scheduler
+from app.core.batch_processor import shutdown_process_pool
+from app.core.metric_rollups import metric_rollups
+from app.core.job_queue import JobQueue
+from app.core.result_sink import result_sink
+from app.core.telemetry import CONTENT_TYPE, JOB_QUEUE_DEPTH, REGISTRY, MetricsMiddleware
 from app.api import contracts, templates, validation
 
 setup_logging()
@@ -26,9 +31,14 @@ async def lifespan(app: FastAPI):
         init_db()
         logger.info("Database initialized")
         
+        ensure_partitions()
+        
         setup_scheduler()
         logger.info("Scheduler setup complete")
         
+        if settings.RESULT_SINK_ENABLED:
+            result_sink.start()
+        
     except Exception as e:
         logger.error(f"Startup failed: {e}")
         raise
@@ -38,7 +48,11 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down Data Contract Engine...")
     
     try:
+        result_sink.stop()
+        metric_rollups.flush()
+        shutdown_process_pool()
         close_db()
+        await close_async_db()
         logger.info("Database connections closed")
     except Exception as e:
         logger.error(f"Shutdown error: {e}")
@@ -62,6 +76,9 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 @app.exception_handler(DCEBaseException)
 async def dce_exception_handler(request: Request, exc: DCEBaseException):
     return JSONResponse(
@@ -107,6 +124,23 @@ async def health_check():
         "service": settings.PROJECT_NAME
     }
 
+def job_queue_depth() -> int:
+    db = SessionLocal()
+    try:
+        return JobQueue(db).depth()
+    finally:
+        db.close()
+
+if settings.JOB_QUEUE_ENABLED:
+    JOB_QUEUE_DEPTH.set_function(job_queue_depth)
+
+# Sync so the job queue count runs in the threadpool, not on the event loop
+def prometheus_metrics():
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+
+if settings.METRICS_ENABLED:
+    app.add_api_route("/metrics", prometheus_metrics, methods=["GET"], include_in_schema=False)
+
 @app.get("/")
 async def root():
     return {
@@ -115,6 +149,7 @@ async def root():
         "description": "API for managing and validating data contracts",
         "docs": "/docs",
         "health": "/health",
+        "metrics": "/metrics",
         "api_version": "v1",
         "api_prefix": settings.API_V1_PREFIX
     }
@@ -30,6 +30,14 @@ class Contract(Base):
     validation_results = relationship("ValidationResult", back_populates="contract", cascade="all, delete-orphan")
     quality_metrics = relationship("QualityMetric", back_populates="contract", cascade="all, delete-orphan")
     batch_summaries = relationship("BatchSummary", back_populates="contract", cascade="all, delete-orphan")
+    metric_rollups = relationship("MetricRollup", back_populates="contract", cascade="all, delete-orphan")
+    metric_rollup_errors = relationship("MetricRollupError", back_populates="contract", cascade="all, delete-orphan")
+    validation_error_counts = relationship("ValidationErrorCount", back_populates="contract", cascade="all, delete-orphan")
+    queued_jobs = relationship("QueuedJob", back_populates="contract", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index('ix_contracts_active_updated', 'is_active', 'updated_at', 'id'),
+    )
     
     def __repr__(self) -> str:
         return f"<Contract(id={self.id}, name='{self.name}', version='{self.version}')>"
@@ -65,6 +73,7 @@ class ContractVersion(Base):
     __table_args__ = (
         Index('ix_contract_versions_contract_version', 'contract_id', 'version', unique=True),
         Index('ix_contract_versions_created_at', 'created_at'),
+        Index('ix_contract_versions_contract_created', 'contract_id', 'created_at', 'id'),
     )
     
     def __repr__(self) -> str:
@@ -92,13 +101,16 @@ class ValidationResult(Base):
     data_snapshot = Column(JSON, nullable=True)
     errors = Column(JSON, nullable=True)
     execution_time_ms = Column(Float, nullable=False)
-    validated_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    # Part of the primary key because Postgres requires the partition key in
+    # every unique constraint of a partitioned table.
+    validated_at = Column(DateTime, default=datetime.utcnow, primary_key=True, index=True)
     batch_id = Column(String(36), nullable=True, index=True)
     
     contract = relationship("Contract", back_populates="validation_results")
     
     __table_args__ = (
         Index('ix_validation_results_contract_date', 'contract_id', 'validated_at'),
+        {'postgresql_partition_by': 'RANGE (validated_at)'},
     )
     
     def __repr__(self) -> str:
@@ -173,7 +185,7 @@ class BatchSummary(Base):
     __tablename__ = "batch_summaries"
     
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    batch_id = Column(String(36), unique=True, nullable=False, index=True)
+    batch_id = Column(String(36), nullable=False, index=True)
     contract_id = Column(String(36), ForeignKey('contracts.id'), nullable=False, index=True)
     total_records = Column(Integer, nullable=False)
     passed = Column(Integer, nullable=False)
@@ -181,12 +193,16 @@ class BatchSummary(Base):
     pass_rate = Column(Float, nullable=False)
     execution_time_ms = Column(Float, nullable=False)
     errors_summary = Column(JSON, nullable=True)
-    processed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    processed_at = Column(DateTime, default=datetime.utcnow, primary_key=True)
     
     contract = relationship("Contract", back_populates="batch_summaries")
     
     __table_args__ = (
         Index('ix_batch_summaries_processed_at', 'processed_at'),
+        # Unique keys on a partitioned table must include the partition
+        # column; BatchProcessor keeps batch_id unique across times.
+        Index('uq_batch_summaries_batch_id_processed_at', 'batch_id', 'processed_at', unique=True),
+        {'postgresql_partition_by': 'RANGE (processed_at)'},
     )
     
     def __repr__(self) -> str:
@@ -209,4 +225,137 @@ class BatchSummary(Base):
     def calculate_pass_rate(self) -> float:
         if self.total_records == 0:
             return 0.0
-        return float((self.passed / self.total_records) * 100)
\ No newline at end of file
+        return float((self.passed / self.total_records) * 100)
+
+
+class MetricRollup(Base):
+    __tablename__ = "metric_rollups"
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    contract_id = Column(String(36), ForeignKey('contracts.id', ondelete='CASCADE'), nullable=False)
+    rollup_date = Column(Date, nullable=False)
+    hour = Column(Integer, nullable=False)
+    passed = Column(Integer, default=0, nullable=False)
+    failed = Column(Integer, default=0, nullable=False)
+    execution_time_ms = Column(Float, default=0.0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    contract = relationship("Contract", back_populates="metric_rollups")
+    
+    __table_args__ = (
+        Index('ix_metric_rollups_contract_date_hour', 'contract_id', 'rollup_date', 'hour', unique=True),
+        Index('ix_metric_rollups_date', 'rollup_date'),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<MetricRollup(contract_id={self.contract_id}, date={self.rollup_date}, hour={self.hour})>"
+    
+    def to_dict(self) -> dict:
+        return {
+            "contract_id": str(self.contract_id),
+            "rollup_date": self.rollup_date.isoformat() if self.rollup_date else None,
+            "hour": self.hour,
+            "passed": self.passed,
+            "failed": self.failed,
+            "total_validations": self.passed + self.failed,
+            "avg_execution_time_ms": self.execution_time_ms / (self.passed + self.failed) if self.passed + self.failed else 0.0,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
+class MetricRollupError(Base):
+    __tablename__ = "metric_rollup_errors"
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    contract_id = Column(String(36), ForeignKey('contracts.id', ondelete='CASCADE'), nullable=False)
+    rollup_date = Column(Date, nullable=False)
+    hour = Column(Integer, nullable=False)
+    error_type = Column(String(100), nullable=False)
+    count = Column(Integer, default=0, nullable=False)
+    
+    contract = relationship("Contract", back_populates="metric_rollup_errors")
+    
+    __table_args__ = (
+        Index(
+            'ix_metric_rollup_errors_contract_date_hour_type',
+            'contract_id', 'rollup_date', 'hour', 'error_type',
+            unique=True
+        ),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<MetricRollupError(contract_id={self.contract_id}, error_type={self.error_type}, count={self.count})>"
+
+
+class ValidationErrorCount(Base):
+    __tablename__ = "validation_error_counts"
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    contract_id = Column(String(36), ForeignKey('contracts.id', ondelete='CASCADE'), nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+    field = Column(String(255), nullable=False)
+    error_type = Column(String(100), nullable=False)
+    count = Column(Integer, default=0, nullable=False)
+    
+    contract = relationship("Contract", back_populates="validation_error_counts")
+    
+    __table_args__ = (
+        Index(
+            'ix_validation_error_counts_key',
+            'contract_id', 'bucket_start', 'field', 'error_type',
+            unique=True
+        ),
+        Index('ix_validation_error_counts_bucket', 'bucket_start'),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<ValidationErrorCount(contract_id={self.contract_id}, error_type={self.error_type}, count={self.count})>"
+
+
+# Durable batch job queue. Workers lease a job by setting locked_by and
+# locked_until; a lease that runs out makes the job claimable again.
+class QueuedJob(Base):
+    __tablename__ = "job_queue"
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind = Column(String(50), nullable=False)
+    contract_id = Column(String(36), ForeignKey('contracts.id', ondelete='CASCADE'), nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(String(20), default="QUEUED", nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    run_after = Column(DateTime, default=datetime.utcnow, nullable=False)
+    locked_by = Column(String(100), nullable=True)
+    locked_until = Column(DateTime, nullable=True)
+    progress = Column(JSON, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    contract = relationship("Contract", back_populates="queued_jobs")
+    
+    __table_args__ = (
+        Index('ix_job_queue_status_run_after', 'status', 'run_after'),
+        Index('ix_job_queue_locked_until', 'locked_until'),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<QueuedJob(id={self.id}, kind={self.kind}, status={self.status}, attempts={self.attempts})>"
+    
+    def to_dict(self) -> dict:
+        return {
+            "id": str(self.id),
+            "kind": self.kind,
+            "contract_id": str(self.contract_id),
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "locked_by": self.locked_by,
+            "locked_until": self.locked_until.isoformat() if self.locked_until else None,
+            "progress": self.progress,
+            "last_error": self.last_error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -196,22 +196,30 @@ class ContractResponse(BaseModel):
 
 class ContractList(BaseModel):
     contracts: List[ContractResponse]
-    total: int
+    total: Optional[int] = None
     page: int = 1
     page_size: int = 50
     has_next: bool = False
+    next_cursor: Optional[str] = None
     
     @classmethod
-    def paginate(cls, contracts: List[ContractResponse], total: int, skip: int, limit: int):
+    def paginate(
+        cls,
+        contracts: List[ContractResponse],
+        total: Optional[int],
+        skip: int,
+        limit: int,
+        next_cursor: Optional[str] = None
+    ):
         page = (skip // limit) + 1
-        has_next = (skip + limit) < total
         
         return cls(
             contracts=contracts,
             total=total,
             page=page,
             page_size=limit,
-            has_next=has_next
+            has_next=next_cursor is not None,
+            next_cursor=next_cursor
         )
 
 
@@ -278,6 +286,8 @@ class ValidationResult(BaseModel):
     execution_time_ms: float
     validated_at: datetime
     contract_version: str
+    # Milliseconds per stage, only when STAGE_TIMING_ENABLED is set
+    timings: Optional[Dict[str, float]] = None
     
     def is_pass(self) -> bool:
         return self.status == "PASS"
@@ -307,6 +317,7 @@ class BatchValidationResult(BaseModel):
     errors_summary: Dict[str, int]
     sample_errors: List[ValidationError]
     batch_id: str
+    timings: Optional[Dict[str, float]] = None
     
     def get_top_errors(self, n: int = 10) -> List[tuple]:
         sorted_errors = sorted(
@@ -319,7 +330,8 @@ class BatchValidationResult(BaseModel):
 
 class ValidationHistoryResponse(BaseModel):
     results: List[Dict[str, Any]]
-    total: int
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
     filters_applied: Dict[str, Any]
     
 class ContractVersionResponse(BaseModel):
@@ -337,7 +349,8 @@ class ContractVersionResponse(BaseModel):
 
 class VersionHistoryResponse(BaseModel):
     versions: List[ContractVersionResponse]
-    total: int
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class RollbackRequest(BaseModel):
@@ -9,7 +9,7 @@ schema:
   user_id:
     type: string
     required: true
-    pattern: "^usr_\\d+$"
+    pattern: "^usr_\\\\d+$"
     description: "Unique user identifier"
   email:
     type: string
@@ -294,6 +294,16 @@ class SchedulerError(DCEBaseException):
         )
 
 
+class InvalidCursorError(DCEBaseException):
+    """Raised when a pagination cursor cannot be decoded."""
+    def __init__(self, cursor: str, details: Optional[Dict] = None):
+        super().__init__(
+            message="Invalid pagination cursor",
+            details=details or {"cursor": cursor},
+            status_code=400
+        )
+
+
 def get_http_status_code(exception: Exception) -> int:
     """Get the HTTP status code for an exception."""
     if isinstance(exception, DCEBaseException):
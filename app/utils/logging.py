@@ -1,15 +1,37 @@
 """
 Logging configuration for the application.
-Provides structured logging with color formatting.
+Provides colored text logging for development and structured JSON
+logging, written from a background thread, for production.
 """
 
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
 import sys
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from app.config import settings
+from app.core.telemetry import LOG_RECORDS_DROPPED
+
+
+TEXT_FORMAT = "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Loggers whose messages fire per chunk or per pooled connection. Below
+# WARNING they are rate limited per call site.
+HOT_PATH_LOGGERS = ("app.core.batch_processor", "app.database")
+
+# LogRecord attributes; anything else on a record came from `extra`
+RESERVED_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional["DroppingQueueHandler"] = None
 
 
 # Color codes for terminal output
@@ -45,58 +67,244 @@ class ColoredFormatter(logging.Formatter):
         + LogColors.RESET,
     }
 
+    def __init__(self):
+        super().__init__(TEXT_FORMAT, datefmt=DATE_FORMAT)
+        # One formatter per level, built once rather than on every record
+        self._formatters = {
+            level: logging.Formatter(fmt, datefmt=DATE_FORMAT)
+            for level, fmt in self.FORMATS.items()
+        }
+
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt, datefmt="%Y-%m-%d %H:%M:%S")
+        formatter = self._formatters.get(record.levelno)
+        if formatter is None:
+            return super().format(record)
         return formatter.format(record)
 
 
-def setup_logging(log_level: Optional[str] = None) -> None:
+class JSONFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line."""
+
+    def __init__(self):
+        super().__init__()
+        # json.dumps builds a new encoder whenever options are passed
+        self._encode = json.JSONEncoder(default=str, ensure_ascii=False, separators=(",", ":")).encode
+
+    def format(self, record):
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        for key, value in record.__dict__.items():
+            if key not in RESERVED_ATTRS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return self._encode(entry)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets through at most one record per call site every `interval` seconds.
+
+    Records at WARNING and above always pass. The next record let through
+    from a call site carries the number dropped since as `suppressed`.
+    """
+
+    def __init__(self, interval: float, clock=time.monotonic):
+        super().__init__()
+        self.interval = interval
+        self.clock = clock
+        self._sites: Dict[Tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+
+        now = self.clock()
+        site = (record.pathname, record.lineno)
+        with self._lock:
+            state = self._sites.get(site)
+            if state is None:
+                self._sites[site] = [now, 0]
+                return True
+            if now - state[0] < self.interval:
+                state[1] += 1
+                return False
+            suppressed = state[1]
+            state[0] = now
+            state[1] = 0
+
+        if suppressed:
+            record.suppressed = suppressed
+            record.msg = f"{record.msg} ({suppressed} similar suppressed)"
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that never blocks the logging thread.
+
+    When the queue is full the record is dropped and counted instead.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Like QueueHandler.prepare, but the traceback stays in exc_text
+        # rather than being folded into the message, so the listener's
+        # formatter can still output it as its own field.
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record = logging.makeLogRecord(record.__dict__)
+        record.message = message
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def dropped_records() -> int:
+    """Number of records the current background log writer has dropped."""
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+def stop_logging() -> None:
+    """Stop the background log writer, flushing any queued records."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        _listener.stop()
+        dropped = dropped_records()
+        if dropped:
+            # The queue is no longer read, so this goes to the handlers directly
+            record = logging.makeLogRecord({
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"Dropped {dropped} log records because the log queue was full",
+                "dropped": dropped,
+            })
+            for handler in _listener.handlers:
+                handler.handle(record)
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        _queue_handler = None
+
+
+def setup_logging(
+    log_level: Optional[str] = None,
+    log_format: Optional[str] = None,
+    use_queue: Optional[bool] = None,
+    log_dir: Optional[str] = None,
+) -> None:
     """
     Setup logging configuration for the application.
 
     Args:
         log_level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL).
                   If None, uses settings.LOG_LEVEL.
+        log_format: "text" or "json". If None, uses settings.LOG_FORMAT,
+                  which defaults to JSON in production.
+        use_queue: Write records from a background thread. If None, uses
+                  settings.LOG_ASYNC, which defaults to on in production.
+        log_dir: Directory for the daily log files. If None, uses
+                  settings.LOG_DIR.
     """
     # Determine log level
     level = log_level or settings.LOG_LEVEL
     numeric_level = getattr(logging, level.upper(), logging.INFO)
 
+    log_format = (log_format or settings.LOG_FORMAT or ("json" if settings.is_production else "text")).lower()
+    if use_queue is None:
+        use_queue = settings.LOG_ASYNC if settings.LOG_ASYNC is not None else settings.is_production
+
     # Create logs directory if it doesn't exist
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
+    log_path = Path(log_dir or settings.LOG_DIR)
+    log_path.mkdir(parents=True, exist_ok=True)
 
     # Create root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(numeric_level)
 
-    # Remove existing handlers
+    # Remove existing handlers, closing their files
+    stop_logging()
+    for handler in root_logger.handlers:
+        handler.close()
     root_logger.handlers = []
 
-    # Console handler with color formatting
+    if log_format == "json":
+        console_formatter = file_formatter = JSONFormatter()
+    else:
+        console_formatter = ColoredFormatter()
+        file_formatter = logging.Formatter(TEXT_FORMAT, datefmt=DATE_FORMAT)
+
+    # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(numeric_level)
-    console_handler.setFormatter(ColoredFormatter())
-    root_logger.addHandler(console_handler)
-
-    # File handler (without colors)
-    if settings.is_production or True:  # Always log to file
-        log_file = log_dir / f"dce_{datetime.now().strftime('%Y%m%d')}.log"
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(numeric_level)
-        file_formatter = logging.Formatter(
-            "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
+    console_handler.setFormatter(console_formatter)
+
+    # File handler (without colors), rotated at midnight
+    file_handler = logging.handlers.TimedRotatingFileHandler(
+        log_path / "dce.log",
+        when="midnight",
+        backupCount=settings.LOG_RETENTION_DAYS,
+        encoding="utf-8",
+    )
+    file_handler.setLevel(numeric_level)
+    file_handler.setFormatter(file_formatter)
+
+    if use_queue:
+        # Request threads only enqueue; formatting and I/O happen on the
+        # listener's thread
+        global _listener, _queue_handler
+        queue_handler = _queue_handler = DroppingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+        root_logger.addHandler(queue_handler)
+        _listener = logging.handlers.QueueListener(
+            queue_handler.queue, console_handler, file_handler, respect_handler_level=True
         )
-        file_handler.setFormatter(file_formatter)
+        _listener.start()
+    else:
+        root_logger.addHandler(console_handler)
         root_logger.addHandler(file_handler)
 
+    # Per-chunk and per-checkout messages are sampled
+    for name in HOT_PATH_LOGGERS:
+        hot_logger = logging.getLogger(name)
+        hot_logger.filters = [f for f in hot_logger.filters if not isinstance(f, RateLimitFilter)]
+        if settings.LOG_HOT_PATH_INTERVAL > 0:
+            hot_logger.addFilter(RateLimitFilter(settings.LOG_HOT_PATH_INTERVAL))
+
+    # aiosqlite logs every statement it hands to its worker thread
+    logging.getLogger("aiosqlite").setLevel(max(numeric_level, logging.INFO))
+
     # Log startup message
     root_logger.info(f"Logging initialized at {level.upper()} level")
     root_logger.info(f"Environment: {settings.ENV}")
 
 
+atexit.register(stop_logging)
+LOG_RECORDS_DROPPED.set_function(dropped_records)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance for a module.
@@ -0,0 +1,57 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.utils.exceptions import InvalidCursorError
+
+
+# Keyset pagination over (timestamp, id), newest first. A cursor is the
+# sort key of the last row on the previous page, so every page is an index
+# range scan no matter how deep it is. Cursors are base64 JSON and opaque
+# to clients.
+Keyset = Tuple[datetime, str]
+
+
+def encode_cursor(timestamp: datetime, row_id: Any) -> str:
+    payload = json.dumps([timestamp.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Keyset]:
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(timestamp), str(row_id)
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise InvalidCursorError(cursor, {"cursor": cursor, "error": str(e)})
+
+
+def keyset_order(timestamp_column, id_column) -> Tuple[ColumnElement, ColumnElement]:
+    return timestamp_column.desc(), id_column.desc()
+
+
+def after_keyset(timestamp_column, id_column, keyset: Keyset) -> ColumnElement:
+    return tuple_(timestamp_column, id_column) < tuple_(*keyset)
+
+
+# `rows` is expected to hold up to limit + 1 rows; the extra one only
+# tells whether another page exists.
+def split_page(
+    rows: Sequence,
+    limit: int,
+    key: Callable[[Any], Keyset]
+) -> Tuple[List, Optional[str]]:
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor(*key(rows[-1]))
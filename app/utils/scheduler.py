@@ -1,11 +1,17 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+import asyncio
 import logging
 from datetime import datetime, timedelta
 
-from app.database import get_db_session
-from app.core.metrics_aggregator import MetricsAggregator
-from app.models.database import ValidationResult
+from app.config import settings
+from app.database import get_async_db_session, get_db_session
+from app.core.job_queue import JobQueue
+from app.core.metric_rollups import metric_rollups
+from app.core.metrics_aggregator import AsyncMetricsAggregator
+from app.core.partitioning import PartitionManager
+from app.core.platform_summary import platform_summary_cache
 
 
 logger = logging.getLogger(__name__)
@@ -29,41 +35,80 @@ def setup_scheduler():
         replace_existing=True
     )
     
+    scheduler.add_job(
+        maintain_partitions_job,
+        CronTrigger(hour=0, minute=30),
+        id='maintain_partitions',
+        name='Pre-create result partitions',
+        replace_existing=True
+    )
+    
+    if settings.METRIC_ROLLUPS_ENABLED:
+        scheduler.add_job(
+            flush_metric_rollups_job,
+            IntervalTrigger(seconds=settings.METRIC_ROLLUP_FLUSH_INTERVAL),
+            id='flush_metric_rollups',
+            name='Flush metric rollups',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
+        )
+    
     scheduler.start()
     logger.info("Scheduler started")
 
 
+async def flush_metric_rollups_job():
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, metric_rollups.flush)
+
+
 async def aggregate_daily_metrics_job():
     logger.info("Starting daily metrics aggregation")
     
-    db = get_db_session()
-    aggregator = MetricsAggregator(db)
+    # With rollups enabled the day is finalized from the hourly rows, so
+    # anything still buffered in this process is written out first.
+    if settings.METRIC_ROLLUPS_ENABLED:
+        await flush_metric_rollups_job()
+    
+    db = get_async_db_session()
+    aggregator = AsyncMetricsAggregator(db, from_rollups=settings.METRIC_ROLLUPS_ENABLED)
     
     try:
-        aggregator.aggregate_daily_metrics()
+        await aggregator.aggregate_daily_metrics()
         logger.info("Daily metrics aggregation completed")
+        await platform_summary_cache.refresh(db)
     except Exception as e:
         logger.error(f"Metrics aggregation failed: {e}")
     finally:
-        db.close()
+        await db.close()
 
 
 async def cleanup_old_data_job():
     logger.info("Starting data cleanup")
     
     db = get_db_session()
-    retention_days = 90
-    cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
+    cutoff_date = datetime.utcnow() - timedelta(days=settings.RESULT_RETENTION_DAYS)
     
     try:
-        deleted_count = db.query(ValidationResult).filter(
-            ValidationResult.validated_at < cutoff_date
-        ).delete()
-        
-        db.commit()
-        logger.info(f"Cleaned up {deleted_count} old validation results")
+        # Drops whole partitions on Postgres, batched deletes elsewhere
+        removed = PartitionManager(db).apply_retention(cutoff_date)
+        removed["job_queue"] = JobQueue(db).purge_finished(cutoff_date)
+        logger.info(f"Cleaned up data older than {cutoff_date.date()}: {removed}")
     except Exception as e:
         logger.error(f"Data cleanup failed: {e}")
         db.rollback()
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def maintain_partitions_job():
+    db = get_db_session()
+    
+    try:
+        PartitionManager(db).ensure_partitions()
+    except Exception as e:
+        logger.error(f"Partition maintenance failed: {e}")
+        db.rollback()
+    finally:
+        db.close()
@@ -0,0 +1,272 @@
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.batch_jobs import batch_jobs
+from app.core.batch_processor import BatchProcessor
+from app.core.job_queue import JOB_KIND_VALIDATE_FILE, JobQueue
+from app.core.metric_rollups import metric_rollups
+from app.core.telemetry import start_http_server
+from app.models.database import QueuedJob
+from app.utils.exceptions import DCEBaseException
+from app.utils.logging import setup_logging
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds between progress writes / lease extensions while a job runs
+PROGRESS_INTERVAL = 5.0
+
+# Seconds between sweeps for jobs abandoned on their final attempt
+REAP_INTERVAL = 60.0
+
+
+def is_retryable(error: Exception) -> bool:
+    # Bad input fails the same way every time
+    if isinstance(error, DCEBaseException):
+        return error.status_code >= 500
+    return not isinstance(error, (ValueError, FileNotFoundError))
+
+
+def remove_upload(file_path: Optional[str]) -> None:
+    if file_path and os.path.exists(file_path):
+        try:
+            os.remove(file_path)
+        except OSError as e:
+            logger.error(f"Error removing file {file_path}: {e}")
+
+
+# Claims jobs from the queue one at a time and runs them through
+# BatchProcessor. Queue calls are short transactions on their own session,
+# run off the event loop; the job itself gets a separate session.
+class BatchWorker:
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        session_factory: Optional[Callable[[], Session]] = None,
+        poll_interval: Optional[float] = None,
+        visibility_timeout: Optional[int] = None
+    ):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.session_factory = session_factory
+        self.poll_interval = settings.WORKER_POLL_INTERVAL if poll_interval is None else poll_interval
+        self.visibility_timeout = visibility_timeout or settings.JOB_VISIBILITY_TIMEOUT
+        self.progress_interval = min(PROGRESS_INTERVAL, self.visibility_timeout / 3)
+        self._stopping = False
+        self.logger = logging.getLogger(__name__)
+
+    def stop(self) -> None:
+        self._stopping = True
+
+    async def run(self, max_jobs: Optional[int] = None) -> int:
+        if self.session_factory is None:
+            from app.database import SessionLocal
+            self.session_factory = SessionLocal
+
+        processed = 0
+        last_reap = 0.0
+        self.logger.info(f"Batch worker {self.worker_id} started")
+
+        while not self._stopping and (max_jobs is None or processed < max_jobs):
+            if time.monotonic() - last_reap > REAP_INTERVAL:
+                await self._queue_call(lambda queue: queue.reap_expired())
+                last_reap = time.monotonic()
+
+            job = await self._queue_call(lambda queue: queue.claim(self.worker_id))
+            if job is None:
+                if max_jobs is not None:
+                    break
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            await self.run_job(job)
+            processed += 1
+            await self._flush_rollups()
+
+        # Picks up rollups a failed flush put back
+        await self._flush_rollups()
+        self.logger.info(f"Batch worker {self.worker_id} stopped after {processed} job(s)")
+        return processed
+
+    async def run_job(self, job: QueuedJob) -> None:
+        payload: Dict[str, Any] = job.payload
+        if job.kind != JOB_KIND_VALIDATE_FILE:
+            await self._queue_call(
+                lambda queue: queue.fail(job.id, self.worker_id, f"Unknown job kind: {job.kind}", retry=False)
+            )
+            return
+
+        batch_jobs.register(
+            job.id,
+            job.contract_id,
+            file_name=payload.get("file_name"),
+            file_type=payload["file_type"],
+            file_size=payload.get("file_size")
+        )
+        batch_jobs.start(job.id)
+
+        db = self.session_factory()
+        processor = BatchProcessor(db)
+        processor.set_progress_callback(lambda **progress: batch_jobs.update(job.id, **progress))
+
+        processing = asyncio.create_task(processor.process_file(
+            contract_id=UUID(job.contract_id),
+            file_path=payload["file_path"],
+            file_type=payload["file_type"],
+            batch_id=UUID(job.id)
+        ))
+        heartbeat = asyncio.create_task(self._heartbeat(job.id, processing))
+
+        try:
+            result = await processing
+        except asyncio.CancelledError:
+            # The lease was lost; whoever holds it now owns the job
+            db.rollback()
+            batch_jobs.fail(job.id, "Lease lost")
+            self.logger.warning(f"Abandoned job {job.id} after losing its lease")
+        except Exception as e:
+            db.rollback()
+            retry = is_retryable(e)
+            error = str(e)
+            batch_jobs.fail(job.id, error)
+            self.logger.error(f"Job {job.id} failed on attempt {job.attempts}: {error}")
+
+            snapshot = self._snapshot(job.id)
+            await self._queue_call(
+                lambda queue: queue.fail(job.id, self.worker_id, error, progress=snapshot, retry=retry)
+            )
+            if not retry or job.attempts >= job.max_attempts:
+                remove_upload(payload["file_path"])
+        else:
+            batch_jobs.complete(job.id, result)
+            snapshot = self._snapshot(job.id)
+            await self._queue_call(lambda queue: queue.complete(job.id, self.worker_id, progress=snapshot))
+            remove_upload(payload["file_path"])
+            self.logger.info(f"Job {job.id} completed: {result.passed}/{result.total_records} passed")
+        finally:
+            heartbeat.cancel()
+            db.close()
+
+    async def _heartbeat(self, job_id: str, processing: asyncio.Task) -> None:
+        while not processing.done():
+            await asyncio.sleep(self.progress_interval)
+            snapshot = self._snapshot(job_id)
+            try:
+                owned = await self._queue_call(
+                    lambda queue: queue.heartbeat(job_id, self.worker_id, progress=snapshot)
+                )
+            except Exception as e:
+                # A missed heartbeat is retried on the next tick; the lease
+                # only lapses after visibility_timeout.
+                self.logger.warning(f"Heartbeat for job {job_id} failed: {e}")
+                continue
+            if not owned and not processing.done():
+                processing.cancel()
+                return
+
+    async def _flush_rollups(self) -> None:
+        # Batch summaries are counted into this process's rollup buffer;
+        # there is no scheduler here to flush it, so each job flushes it.
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, metric_rollups.flush)
+
+    def _snapshot(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = batch_jobs.get(job_id)
+        return job.to_dict() if job else None
+
+    async def _queue_call(self, operation: Callable[[JobQueue], Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._with_queue, operation)
+
+    def _with_queue(self, operation: Callable[[JobQueue], Any]) -> Any:
+        db = self.session_factory()
+        try:
+            return operation(JobQueue(db, visibility_timeout=self.visibility_timeout))
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+def run_worker_process(metrics_port: Optional[int] = None) -> None:
+    setup_logging()
+    if metrics_port:
+        start_http_server(metrics_port)
+    worker = BatchWorker()
+
+    # SIGTERM lets the current job finish; the supervisor handles SIGINT
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(worker.run())
+
+
+# Keeps `concurrency` worker processes alive, replacing any that die. Jobs
+# held by a crashed worker become claimable again once their lease expires.
+def supervise(concurrency: int, metrics_port: Optional[int] = None) -> None:
+    context = multiprocessing.get_context("spawn")
+    workers: Dict[int, multiprocessing.Process] = {}
+    stopping = False
+
+    def request_stop(*_):
+        nonlocal stopping
+        if stopping:
+            return
+        stopping = True
+        logger.info("Stopping batch workers after their current jobs")
+        for process in workers.values():
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    while not stopping:
+        for slot in range(concurrency):
+            process = workers.get(slot)
+            if process is not None and process.is_alive():
+                continue
+            if process is not None:
+                logger.warning(f"Batch worker {process.name} exited with {process.exitcode}, restarting")
+            process = context.Process(
+                target=run_worker_process,
+                args=(metrics_port + slot if metrics_port else None,),
+                name=f"batch-worker-{slot}"
+            )
+            process.start()
+            workers[slot] = process
+        time.sleep(1.0)
+
+    for process in workers.values():
+        process.join()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Run batch validation workers")
+    parser.add_argument("--concurrency", type=int, default=settings.WORKER_CONCURRENCY)
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=settings.WORKER_METRICS_PORT,
+        help="Serve /metrics from each worker on this port plus its slot number"
+    )
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    logger.info(f"Starting {args.concurrency} batch worker process(es)")
+    supervise(max(args.concurrency, 1), args.metrics_port)
+
+
+if __name__ == "__main__":
+    main()
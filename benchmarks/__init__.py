@@ -0,0 +1,4 @@
+import warnings
+
+# Printed once per benchmark case process otherwise
+warnings.filterwarnings("ignore", message='Field name "schema"')
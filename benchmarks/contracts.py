@@ -0,0 +1,246 @@
+"""
+Synthetic contracts and records for the benchmark suite.
+
+Three shapes cover the validator's main cost drivers:
+    small   - 6 flat fields, the typical event contract
+    wide    - 50 flat fields mixing every check type
+    nested  - objects three levels deep and arrays of objects
+
+Records are generated from a seeded RNG, so every run validates exactly
+the same data.
+"""
+
+import random
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.schemas import ContractSchema, FieldDefinition
+
+
+SHAPES = ("small", "wide", "nested")
+
+COUNTRIES = ["US", "GB", "DE", "FR", "JP"]
+
+QUALITY_RULES: Dict[str, Dict[str, Any]] = {
+    "small": {
+        "freshness": {"max_latency_hours": 24},
+        "completeness": {"min_row_count": 1, "max_null_percentage": 5},
+        "uniqueness": {"fields": ["user_id"]},
+        "statistics": {"age": {"mean": {"min": 18, "max": 65}}},
+    },
+    "wide": {
+        "completeness": {"min_row_count": 1, "max_null_percentage": 5},
+        "uniqueness": {"fields": ["field_00"]},
+        "statistics": {"field_04": {"mean": {"min": 0, "max": 1000}}},
+    },
+    "nested": {
+        "freshness": {"max_latency_hours": 24},
+        "uniqueness": {"fields": ["order_id"]},
+    },
+}
+
+
+def build_small_schema() -> Dict[str, FieldDefinition]:
+    return {
+        "user_id": FieldDefinition(type="string", pattern=r"^usr_\d+$"),
+        "email": FieldDefinition(type="string", format="email"),
+        "age": FieldDefinition(type="integer", min=0, max=120, required=False),
+        "country": FieldDefinition(type="string", enum=COUNTRIES),
+        "active": FieldDefinition(type="boolean"),
+        "created_at": FieldDefinition(type="timestamp"),
+    }
+
+
+def build_wide_schema(num_fields: int = 50) -> Dict[str, FieldDefinition]:
+    fields = {}
+    for i in range(num_fields):
+        kind = i % 10
+        name = f"field_{i:02d}"
+        if kind == 0:
+            fields[name] = FieldDefinition(type="string", pattern=r"^usr_\d+$")
+        elif kind == 1:
+            fields[name] = FieldDefinition(type="string", format="email")
+        elif kind == 2:
+            fields[name] = FieldDefinition(type="string", enum=COUNTRIES)
+        elif kind == 3:
+            fields[name] = FieldDefinition(type="string", min_length=3, max_length=32)
+        elif kind == 4:
+            fields[name] = FieldDefinition(type="integer", min=0, max=1000)
+        elif kind == 5:
+            fields[name] = FieldDefinition(type="float", min=0.0, max=1.0)
+        elif kind == 6:
+            fields[name] = FieldDefinition(type="timestamp")
+        elif kind == 7:
+            fields[name] = FieldDefinition(type="boolean", required=False)
+        elif kind == 8:
+            fields[name] = FieldDefinition(type="string", format="uuid", required=False)
+        else:
+            fields[name] = FieldDefinition(type="integer", enum=[1, 2, 3, 4, 5])
+    return fields
+
+
+def build_nested_schema() -> Dict[str, FieldDefinition]:
+    geo = FieldDefinition(type="object", properties={
+        "lat": FieldDefinition(type="float", min=-90, max=90),
+        "lon": FieldDefinition(type="float", min=-180, max=180),
+    })
+    address = FieldDefinition(type="object", properties={
+        "street": FieldDefinition(type="string", min_length=3, max_length=64),
+        "city": FieldDefinition(type="string", min_length=2, max_length=32),
+        "country": FieldDefinition(type="string", enum=COUNTRIES),
+        "geo": geo,
+    })
+    item = FieldDefinition(type="object", properties={
+        "sku": FieldDefinition(type="string", pattern=r"^SKU-\d{6}$"),
+        "quantity": FieldDefinition(type="integer", min=1, max=100),
+        "price": FieldDefinition(type="float", min=0),
+        "tags": FieldDefinition(type="array", max=5, items=FieldDefinition(type="string", enum=["new", "sale", "gift"])),
+    })
+    return {
+        "order_id": FieldDefinition(type="string", format="uuid"),
+        "customer": FieldDefinition(type="object", properties={
+            "id": FieldDefinition(type="string", pattern=r"^usr_\d+$"),
+            "email": FieldDefinition(type="string", format="email"),
+            "address": address,
+        }),
+        "items": FieldDefinition(type="array", min=1, max=10, items=item),
+        "created_at": FieldDefinition(type="timestamp"),
+    }
+
+
+def build_contract(shape: str) -> ContractSchema:
+    if shape == "small":
+        fields = build_small_schema()
+    elif shape == "wide":
+        fields = build_wide_schema()
+    elif shape == "nested":
+        fields = build_nested_schema()
+    else:
+        raise ValueError(f"Unknown contract shape: {shape}")
+
+    return ContractSchema(
+        contract_version="1.0",
+        domain="bench",
+        description=f"{shape} benchmark contract",
+        schema=fields,
+        quality_rules=QUALITY_RULES[shape],
+    )
+
+
+def contract_yaml(shape: str) -> str:
+    return yaml.safe_dump(build_contract(shape).model_dump(exclude_none=True), sort_keys=False)
+
+
+def _small_record(rng: random.Random, i: int, invalid_rate: float) -> Dict[str, Any]:
+    record = {
+        "user_id": f"usr_{i}",
+        "email": f"user{i}@example.com",
+        "age": rng.randint(18, 80),
+        "country": rng.choice(COUNTRIES),
+        "active": rng.random() < 0.5,
+        "created_at": f"2024-01-{rng.randint(1, 28):02d}T10:30:00Z",
+    }
+    if rng.random() < invalid_rate:
+        record[rng.choice(list(record))] = "invalid"
+    return record
+
+
+def _wide_record(rng: random.Random, num_fields: int, invalid_rate: float) -> Dict[str, Any]:
+    record = {}
+    for i in range(num_fields):
+        kind = i % 10
+        name = f"field_{i:02d}"
+        if kind == 0:
+            value = f"usr_{rng.randint(1, 10**6)}"
+        elif kind == 1:
+            value = f"user{rng.randint(1, 10**6)}@example.com"
+        elif kind == 2:
+            value = rng.choice(COUNTRIES)
+        elif kind == 3:
+            value = "x" * rng.randint(3, 32)
+        elif kind == 4:
+            value = rng.randint(0, 1000)
+        elif kind == 5:
+            value = rng.random()
+        elif kind == 6:
+            value = "2024-01-15T10:30:00Z"
+        elif kind == 7:
+            value = rng.random() < 0.5
+        elif kind == 8:
+            value = "123e4567-e89b-12d3-a456-426614174000"
+        else:
+            value = rng.randint(1, 5)
+
+        if rng.random() < invalid_rate:
+            value = None if kind != 7 else "not-a-bool"
+
+        record[name] = value
+    return record
+
+
+def _nested_record(rng: random.Random, i: int, invalid_rate: float) -> Dict[str, Any]:
+    items = [
+        {
+            "sku": f"SKU-{rng.randint(0, 999999):06d}",
+            "quantity": rng.randint(1, 5),
+            "price": round(rng.uniform(1, 500), 2),
+            "tags": rng.sample(["new", "sale", "gift"], rng.randint(0, 2)),
+        }
+        for _ in range(rng.randint(1, 4))
+    ]
+    record = {
+        "order_id": f"123e4567-e89b-12d3-a456-{i:012d}",
+        "customer": {
+            "id": f"usr_{rng.randint(1, 10**6)}",
+            "email": f"user{i}@example.com",
+            "address": {
+                "street": f"{rng.randint(1, 999)} Main Street",
+                "city": "Springfield",
+                "country": rng.choice(COUNTRIES),
+                "geo": {"lat": rng.uniform(-90, 90), "lon": rng.uniform(-180, 180)},
+            },
+        },
+        "items": items,
+        "created_at": f"2024-01-{rng.randint(1, 28):02d}T10:30:00Z",
+    }
+    if rng.random() < invalid_rate:
+        record["customer"]["address"]["geo"]["lat"] = 123.0
+    return record
+
+
+def generate_records(shape: str, count: int, seed: int = 42, invalid_rate: float = 0.05) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    if shape == "small":
+        return [_small_record(rng, i, invalid_rate) for i in range(count)]
+    if shape == "wide":
+        # The wide generator's rate is per field
+        num_fields = len(build_wide_schema())
+        return [_wide_record(rng, num_fields, invalid_rate / num_fields) for _ in range(count)]
+    if shape == "nested":
+        return [_nested_record(rng, i, invalid_rate) for i in range(count)]
+    raise ValueError(f"Unknown contract shape: {shape}")
+
+
+def evolve_contract(shape: str) -> ContractSchema:
+    # A new version touching every field: half tightened, half relaxed,
+    # plus one added and one removed field, for change detection
+    contract = build_contract(shape)
+    fields = {}
+    for i, (name, field) in enumerate(contract.schema.items()):
+        if i == 0:
+            continue
+        changed = field.model_copy()
+        if i % 2:
+            changed.required = not field.required
+        elif field.type in ("integer", "float"):
+            changed.max = 10 if field.max is None else field.max
+        else:
+            changed.description = "updated"
+        fields[name] = changed
+    fields["added_field"] = FieldDefinition(type="string", required=False)
+    return contract.model_copy(update={"schema": fields, "contract_version": "1.1"})
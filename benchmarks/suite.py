@@ -0,0 +1,369 @@
+"""
+Benchmark suite for the validation hot paths.
+
+Each case runs in a fresh process so its peak RSS is its own, and reports
+records/sec plus p50/p99 per-record latency. Batch and file cases time
+whole chunks; their per-record latency is the chunk time divided by the
+chunk's record count. Change detection counts one schema comparison as
+one record.
+
+Usage:
+    python benchmarks/suite.py list
+    python benchmarks/suite.py run [--records N] [--repeat R] [--case NAME ...] [--output FILE]
+    python benchmarks/suite.py compare BASELINE CURRENT [--threshold T]
+
+`run --compare` runs and compares against benchmarks/baseline.json in one
+go. The comparison exits with status 1 when any case regressed by more than
+its threshold. Numbers are only comparable on the machine that produced
+the baseline; refresh it with `run --output benchmarks/baseline.json`.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.contracts import SHAPES, build_contract, contract_yaml, evolve_contract, generate_records
+
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+CHUNK_SIZE = 1000
+
+FILE_TYPES = ("csv", "json", "jsonl", "parquet")
+
+# Change detection is far cheaper per call than validating a record
+CHANGE_DETECTION_SCALE = 0.1
+
+
+class Timing:
+
+    def __init__(self, records: int, elapsed: float, latencies: List[float]):
+        self.records = records
+        self.elapsed = elapsed
+        self.latencies = latencies
+
+
+def time_each(func: Callable[[Any], Any], items: Iterable[Any]) -> Timing:
+    latencies = []
+    clock = time.perf_counter
+    start = clock()
+    for item in items:
+        before = clock()
+        func(item)
+        latencies.append(clock() - before)
+    return Timing(len(latencies), clock() - start, latencies)
+
+
+def time_chunks(chunks: Iterable[List[Any]], func: Optional[Callable[[List[Any]], Any]] = None) -> Timing:
+    latencies = []
+    records = 0
+    clock = time.perf_counter
+    start = before = clock()
+    for chunk in chunks:
+        if func is not None:
+            func(chunk)
+        elapsed = clock() - before
+        latencies.extend([elapsed / len(chunk)] * len(chunk))
+        records += len(chunk)
+        before = clock()
+    return Timing(records, clock() - start, latencies)
+
+
+def chunked(records: List[Any], size: int = CHUNK_SIZE) -> Iterable[List[Any]]:
+    for i in range(0, len(records), size):
+        yield records[i:i + size]
+
+
+def bench_schema_validator(shape: str, records: int) -> Callable[[], Timing]:
+    from app.core.schema_validator import SchemaValidator
+
+    validator = SchemaValidator(build_contract(shape))
+    data = generate_records(shape, records)
+    return lambda: time_each(validator.validate, data)
+
+
+def bench_columnar_validator(shape: str, records: int) -> Callable[[], Timing]:
+    import pandas as pd
+
+    from app.core.validator_cache import CompiledValidator
+
+    validator = CompiledValidator("bench", "1.0", build_contract(shape)).columnar_validator
+    frames = [pd.DataFrame(chunk) for chunk in chunked(generate_records(shape, records))]
+    return lambda: time_chunks(frames, validator.validate)
+
+
+def bench_quality_validator(shape: str, records: int) -> Callable[[], Timing]:
+    from app.core.quality_validator import QualityValidator
+
+    validator = QualityValidator(build_contract(shape).quality_rules)
+    data = generate_records(shape, records)
+
+    def run():
+        accumulator = validator.create_accumulator()
+        timing = time_chunks(chunked(data), accumulator.update)
+        accumulator.finalize()
+        accumulator.close()
+        return timing
+
+    return run
+
+
+def bench_validation_engine(shape: str, records: int) -> Callable[[], Timing]:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from app.core.contract_manager import ContractManager
+    from app.core.validation_engine import ValidationEngine
+    from app.database import Base
+    from app.models.schemas import ContractCreate
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    contract = ContractManager(db).create_contract(ContractCreate(
+        name=f"bench-{shape}",
+        domain="bench",
+        yaml_content=contract_yaml(shape)
+    ))
+
+    validation_engine = ValidationEngine(db)
+    data = generate_records(shape, records)
+    loop = asyncio.new_event_loop()
+
+    def validate(chunk):
+        loop.run_until_complete(validation_engine.validate_batch(contract.id, chunk))
+
+    return lambda: time_chunks(chunked(data), validate)
+
+
+def write_dataset(file_type: str, data: List[Dict[str, Any]], directory: str) -> str:
+    path = os.path.join(directory, f"data.{file_type}")
+    if file_type in ("csv", "parquet"):
+        import pandas as pd
+
+        frame = pd.DataFrame(data)
+        if file_type == "csv":
+            frame.to_csv(path, index=False)
+        else:
+            frame.to_parquet(path, index=False)
+    elif file_type == "json":
+        with open(path, "w") as f:
+            json.dump(data, f)
+    else:
+        with open(path, "w") as f:
+            for record in data:
+                f.write(json.dumps(record) + "\n")
+    return path
+
+
+def bench_read_chunks(file_type: str, records: int) -> Callable[[], Timing]:
+    from app.core.file_handlers import FileHandlerFactory
+
+    # Valid wide records, so every column has a single type for Parquet
+    path = write_dataset(file_type, generate_records("wide", records, invalid_rate=0.0), tempfile.gettempdir())
+
+    # A fresh handler per repeat, so none reuses state opened by the last
+    return lambda: time_chunks(FileHandlerFactory.get_handler(file_type).read_chunks(path, CHUNK_SIZE))
+
+
+def bench_change_detector(shape: str, records: int) -> Callable[[], Timing]:
+    from app.core.change_detector import ChangeDetector
+
+    detector = ChangeDetector()
+    old, new = build_contract(shape), evolve_contract(shape)
+    pairs = [(old, new)] * max(int(records * CHANGE_DETECTION_SCALE), 1)
+    return lambda: time_each(lambda pair: detector.detect_changes(*pair), pairs)
+
+
+CASES: Dict[str, Callable[[int], Callable[[], Timing]]] = {}
+for _shape in SHAPES:
+    CASES[f"schema_validator.{_shape}"] = lambda n, s=_shape: bench_schema_validator(s, n)
+    CASES[f"columnar_validator.{_shape}"] = lambda n, s=_shape: bench_columnar_validator(s, n)
+    CASES[f"quality_validator.{_shape}"] = lambda n, s=_shape: bench_quality_validator(s, n)
+    CASES[f"validation_engine.validate_batch.{_shape}"] = lambda n, s=_shape: bench_validation_engine(s, n)
+    CASES[f"change_detector.{_shape}"] = lambda n, s=_shape: bench_change_detector(s, n)
+for _file_type in FILE_TYPES:
+    CASES[f"read_chunks.{_file_type}"] = lambda n, t=_file_type: bench_read_chunks(t, n)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(name: str, records: int, repeat: int) -> Dict[str, Any]:
+    import logging
+
+    # Warnings are still formatted, just not printed over the results
+    logging.getLogger().addHandler(logging.NullHandler())
+
+    # Datasets and spill files go to a directory removed with the case
+    with tempfile.TemporaryDirectory(prefix="dce-bench-") as workdir:
+        tempfile.tempdir = workdir
+        run = CASES[name](records)
+        best = None
+        for _ in range(repeat):
+            timing = run()
+            if best is None or timing.elapsed < best.elapsed:
+                best = timing
+
+    return {
+        "records": best.records,
+        "records_per_sec": round(best.records / best.elapsed, 1),
+        "p50_us": round(percentile(best.latencies, 0.50) * 1e6, 2),
+        "p99_us": round(percentile(best.latencies, 0.99) * 1e6, 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def run_suite(names: List[str], records: int, repeat: int) -> Dict[str, Any]:
+    results = {}
+    for name in names:
+        # One process per case, so peak RSS is not inherited from earlier cases
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            results[name] = pool.submit(run_case, name, records, repeat).result()
+        result = results[name]
+        print(
+            f"{name:<42} {result['records_per_sec']:>12,.0f} rec/s "
+            f"p50 {result['p50_us']:>9.2f}us  p99 {result['p99_us']:>9.2f}us  "
+            f"rss {result['peak_rss_mb']:>7.1f}MB",
+            flush=True
+        )
+
+    return {
+        "metadata": {
+            "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "records": records,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+# Higher is better for throughput, lower for latency and memory
+METRICS = (
+    ("records_per_sec", 1, "threshold"),
+    ("p50_us", -1, "latency_threshold"),
+    ("p99_us", -1, "latency_threshold"),
+    ("peak_rss_mb", -1, "rss_threshold"),
+)
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], thresholds: Dict[str, float]) -> List[str]:
+    regressions = []
+    for name, result in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            print(f"{name:<42} (not in baseline)")
+            continue
+
+        for metric, direction, threshold_name in METRICS:
+            before, after = reference[metric], result[metric]
+            change = (after - before) / before if before else 0.0
+            regressed = change * direction < -thresholds[threshold_name]
+            if regressed:
+                regressions.append(f"{name} {metric}")
+            print(
+                f"{name:<42} {metric:<16} {before:>12,.2f} -> {after:>12,.2f} "
+                f"{change:>+8.1%}{'  REGRESSION' if regressed else ''}"
+            )
+
+    for name in baseline["results"]:
+        if name not in current["results"]:
+            print(f"{name:<42} (not run)")
+
+    return regressions
+
+
+def load(path) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="List benchmark cases")
+
+    run_parser = commands.add_parser("run", help="Run benchmark cases")
+    run_parser.add_argument("--records", type=int, default=20000)
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--case", action="append", dest="cases", help="Case name or prefix; repeatable")
+    run_parser.add_argument("--output", help="Write results as JSON to this file")
+    run_parser.add_argument("--compare", nargs="?", const=str(BASELINE_PATH), help="Compare against a results file")
+
+    compare_parser = commands.add_parser("compare", help="Compare two results files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+
+    for sub in (run_parser, compare_parser):
+        sub.add_argument("--threshold", type=float, default=0.15, help="Allowed records/sec drop (fraction)")
+        sub.add_argument("--latency-threshold", type=float, default=0.30, help="Allowed p50/p99 rise (fraction)")
+        sub.add_argument("--rss-threshold", type=float, default=0.20, help="Allowed peak RSS rise (fraction)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        print("\n".join(CASES))
+        return 0
+
+    if args.command == "run":
+        names = list(CASES)
+        if args.cases:
+            names = [name for name in CASES if any(name.startswith(prefix) for prefix in args.cases)]
+            if not names:
+                parser.error(f"No benchmark cases match {args.cases}")
+
+        current = run_suite(names, args.records, args.repeat)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(current, f, indent=2)
+                f.write("\n")
+        if not args.compare:
+            return 0
+        baseline = load(args.compare)
+    else:
+        baseline, current = load(args.baseline), load(args.current)
+
+    if baseline["metadata"].get("records") != current["metadata"].get("records"):
+        print("warning: baseline and current runs used different --records")
+
+    regressions = compare(baseline, current, {
+        "threshold": args.threshold,
+        "latency_threshold": args.latency_threshold,
+        "rss_threshold": args.rss_threshold,
+    })
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
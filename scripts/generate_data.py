@@ -0,0 +1,59 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.data_generator import DEFAULT_CHUNK_SIZE, OUTPUT_FORMATS, VIOLATION_KINDS, DataGenerator
+from app.core.yaml_parser import YAMLParser
+from app.utils.contract_templates import get_all_templates, get_template_by_name
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic dataset for a data contract")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--contract", help="Path to a contract YAML file")
+    source.add_argument("--template", choices=[t.name for t in get_all_templates()], help="Built-in contract template")
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--output", required=True, help="Output file; the extension picks the format")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--violation-rate", type=float, default=0.0, help="Fraction of records breaking a rule")
+    parser.add_argument(
+        "--violations",
+        default=",".join(VIOLATION_KINDS),
+        help=f"Comma-separated rules to break (default: {','.join(VIOLATION_KINDS)})"
+    )
+    parser.add_argument("--null-rate", type=float, default=0.0, help="Fraction of nulls in optional fields")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if args.template:
+        yaml_content = get_template_by_name(args.template).yaml_content
+    else:
+        yaml_content = Path(args.contract).read_text()
+
+    generator = DataGenerator(
+        YAMLParser().parse_yaml(yaml_content),
+        seed=args.seed,
+        violation_rate=args.violation_rate,
+        violations=[kind.strip() for kind in args.violations.split(",") if kind.strip()],
+        null_rate=args.null_rate
+    )
+
+    start = time.perf_counter()
+    try:
+        rows = generator.write(args.output, args.rows, file_type=args.format, chunk_size=args.chunk_size)
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Wrote {rows:,} records to {args.output} in {elapsed:.1f}s ({rows / elapsed:,.0f} records/sec)")
+    if generator.violation_counts:
+        broken = ", ".join(f"{kind}={count:,}" for kind, count in sorted(generator.violation_counts.items()))
+        print(f"   Rule violations: {broken}")
+
+
+if __name__ == "__main__":
+    main()
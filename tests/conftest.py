@@ -1,23 +1,26 @@
 import pytest
-from typing import Generator
+import pytest_asyncio
+from typing import AsyncGenerator, Generator
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 
-from app.database import Base
+from app.database import Base, create_async_db_engine
 from app.main import app
 
 
-SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///:memory:"
+# File-backed so the sync and async engines see the same data.
+@pytest.fixture(scope="function")
+def test_database_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'test.db'}"
 
 
 @pytest.fixture(scope="function")
-def test_engine():
+def test_engine(test_database_url):
     engine = create_engine(
-        SQLALCHEMY_TEST_DATABASE_URL,
+        test_database_url,
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
     )
     Base.metadata.create_all(bind=engine)
     yield engine
@@ -25,6 +28,13 @@ def test_engine():
     engine.dispose()
 
 
+@pytest_asyncio.fixture(scope="function")
+async def async_test_engine(test_engine, test_database_url):
+    engine = create_async_db_engine(test_database_url)
+    yield engine
+    await engine.dispose()
+
+
 @pytest.fixture(scope="function")
 def test_db(test_engine) -> Generator[Session, None, None]:
     TestingSessionLocal = sessionmaker(
@@ -43,16 +53,42 @@ def db_session(test_db) -> Generator[Session, None, None]:
     yield test_db
 
 
+@pytest_asyncio.fixture(scope="function")
+async def async_db_session(async_test_engine) -> AsyncGenerator[AsyncSession, None]:
+    TestingAsyncSessionLocal = async_sessionmaker(
+        bind=async_test_engine, autoflush=False, expire_on_commit=False
+    )
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
 @pytest.fixture(scope="function")
-def client(test_db):
+def client(test_db, test_database_url, monkeypatch):
+    from app.config import settings
+    
+    # Results are written by the request itself, so a test can read them
+    # back straight away; the write-behind sink has its own tests.
+    monkeypatch.setattr(settings, "RESULT_SINK_ENABLED", False)
+    
     def override_get_db():
         try:
             yield test_db
         finally:
             pass
     
-    from app.database import get_db
+    # The TestClient runs requests on its own event loop, so the async
+    # engine is created per request rather than shared with the fixtures.
+    async def override_get_async_db():
+        engine = create_async_db_engine(test_database_url)
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as db:
+                yield db
+        finally:
+            await engine.dispose()
+    
+    from app.database import get_async_db, get_db
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     
     with TestClient(app) as test_client:
         yield test_client
@@ -59,7 +59,7 @@ def test_get_validation_history_api(client, db_session, sample_contract_data):
         {"user_id": "usr_123", "email": "test@example.com"}
     ))
     
-    response = client.get(f"/api/v1/validate/{contract.id}/results")
+    response = client.get(f"/api/v1/validate/{contract.id}/results?include_total=true")
     
     assert response.status_code == 200
     result = response.json()
@@ -97,4 +97,54 @@ def test_batch_size_limit(client, db_session, sample_contract_data):
         json={"data": large_batch}
     )
     
-    assert response.status_code == 413
\ No newline at end of file
+    assert response.status_code == 413
+
+def test_upload_limit_message_follows_setting(monkeypatch):
+    from app.api.validation import upload_too_large
+    from app.config import settings
+    
+    assert upload_too_large().detail == "File too large (max 100MB)"
+    
+    monkeypatch.setattr(settings, "UPLOAD_MAX_SIZE", 512 * 1024)
+    error = upload_too_large()
+    assert error.status_code == 413
+    assert error.detail == "File too large (max 0.5MB)"
+
+def test_stream_upload_api(client, db_session, sample_contract_data):
+    from app.core.contract_manager import ContractManager
+    
+    manager = ContractManager(db_session)
+    contract = manager.create_contract(sample_contract_data)
+    
+    def body():
+        yield b"user_id,email\n"
+        for i in range(100):
+            yield f"usr_{i},user{i}@example.com\n".encode()
+    
+    response = client.post(
+        f"/api/v1/validate/{contract.id}/upload/stream?file_type=csv",
+        content=body()
+    )
+    
+    assert response.status_code == 200
+    result = response.json()
+    assert result["total_records"] == 100
+    assert result["passed"] == 100
+
+
+def test_validate_record_stage_timings(client, db_session, sample_contract_data, monkeypatch):
+    from app.config import settings
+    from app.core.contract_manager import ContractManager
+    
+    monkeypatch.setattr(settings, "STAGE_TIMING_ENABLED", True)
+    contract = ContractManager(db_session).create_contract(sample_contract_data)
+    
+    response = client.post(
+        f"/api/v1/validate/{contract.id}",
+        json={"data": {"user_id": "usr_123", "email": "test@example.com"}}
+    )
+    
+    assert response.status_code == 200
+    stages = response.json()["timings"]
+    assert {"lookup", "schema", "store"} <= set(stages)
+    assert response.headers["Server-Timing"].startswith("lookup;dur=")
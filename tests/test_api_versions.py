@@ -169,7 +169,7 @@ def test_version_not_found(client, sample_contract):
 
 
 def test_contract_not_found_versions(client):
-    response = client.get("/api/v1/contracts/non-existent-id/versions")
+    response = client.get("/api/v1/contracts/non-existent-id/versions?include_total=true")
     
     # API returns empty list for non-existent contract (graceful handling)
     assert response.status_code == 200
@@ -0,0 +1,66 @@
+import pytest
+from app.api.validation import get_batch_status
+from app.core.batch_jobs import BatchJobRegistry, batch_jobs
+from app.core.batch_processor import BatchProcessor
+from app.core.contract_manager import ContractManager
+
+
+def test_registry_progress_and_eta(monkeypatch):
+    registry = BatchJobRegistry()
+    clock = iter([100.0, 110.0, 110.0, 110.0])
+    monkeypatch.setattr("app.core.batch_jobs.time.monotonic", lambda: next(clock))
+
+    job = registry.register("b1", "c1", file_name="data.csv", file_type="csv", file_size=1000)
+    assert job.state == "QUEUED"
+    assert job.eta_seconds() is None
+
+    registry.start("b1")
+    registry.update("b1", bytes_read=250, records=50, passed=45, failed=5)
+
+    assert job.state == "PROCESSING"
+    assert job.progress() == 25.0
+    assert job.records_per_second() == 5.0
+    assert job.eta_seconds() == 30.0
+
+
+def test_registry_keeps_bounded_history():
+    registry = BatchJobRegistry(max_finished=2)
+    for i in range(4):
+        registry.register(f"b{i}", "c1")
+        registry.fail(f"b{i}", "boom")
+    registry.register("running", "c1")
+
+    assert registry.get("b0") is None
+    assert registry.get("b3").to_dict()["error"] == "boom"
+    assert registry.active() == 1
+    assert len(registry) == 3
+
+
+@pytest.mark.asyncio
+async def test_process_file_reports_progress(db_session, sample_contract_data, tmp_path):
+    contract = ContractManager(db_session).create_contract(sample_contract_data)
+    csv_file = tmp_path / "test.csv"
+    csv_file.write_text("user_id,email\n" + "\n".join(f"usr_{i},user{i}@example.com" for i in range(10)))
+
+    job = batch_jobs.register("batch-progress", contract.id, file_type="csv", file_size=csv_file.stat().st_size)
+    batch_jobs.start(job.batch_id)
+    updates = []
+
+    def record(**progress):
+        updates.append(progress)
+        batch_jobs.update(job.batch_id, **progress)
+
+    processor = BatchProcessor(db_session)
+    processor.set_progress_callback(record)
+    result = await processor.process_file(contract.id, str(csv_file), "csv", chunk_size=4)
+
+    assert [u["records"] for u in updates] == [4, 8, 10]
+    assert updates[-1]["bytes_read"] == csv_file.stat().st_size
+    assert job.progress() == 99.9
+
+    batch_jobs.complete(job.batch_id, result)
+    status = await get_batch_status(job.batch_id, db=db_session)
+
+    assert status["status"] == "COMPLETED"
+    assert status["progress"] == 100.0
+    assert status["total_records"] == status["passed"] == 10
@@ -30,4 +30,148 @@ class TestBatchProcessor:
                 contract_id=sample_contract.id,
                 file_path=str(bad_file),
                 file_type='csv'
-            )
\ No newline at end of file
+            )
+    async def test_quality_rules_span_chunks(self, db_session, sample_contract_data, tmp_path):
+        from app.core.contract_manager import ContractManager
+        
+        sample_contract_data.yaml_content += """  uniqueness:
+    fields: ["user_id"]
+"""
+        contract = ContractManager(db_session).create_contract(sample_contract_data)
+        
+        csv_file = tmp_path / "test.csv"
+        rows = [f"usr_{i},user{i}@example.com" for i in range(10)] + ["usr_0,dup@example.com"]
+        csv_file.write_text("user_id,email\n" + "\n".join(rows))
+        
+        processor = BatchProcessor(db_session)
+        result = await processor.process_file(
+            contract_id=contract.id,
+            file_path=str(csv_file),
+            file_type='csv',
+            chunk_size=4
+        )
+        
+        assert result.total_records == 11
+        assert result.errors_summary == {"UNIQUENESS": 1}
+        assert result.sample_errors[0]["error_type"] == "UNIQUENESS"
+    
+    async def test_parallel_matches_serial(self, db_session, sample_contract_data, tmp_path):
+        from app.core.contract_manager import ContractManager
+        from app.core.batch_processor import shutdown_process_pool
+        
+        sample_contract_data.yaml_content += """  uniqueness:
+    fields: ["user_id"]
+"""
+        contract = ContractManager(db_session).create_contract(sample_contract_data)
+        
+        csv_file = tmp_path / "test.csv"
+        rows = [f"usr_{i},user{i}@example.com,{i % 150}" for i in range(40)]
+        rows += ["bad_id,broken,20", "usr_3,dup@example.com,30"]
+        csv_file.write_text("user_id,email,age\n" + "\n".join(rows))
+        
+        processor = BatchProcessor(db_session)
+        serial = await processor.process_file(
+            contract_id=contract.id,
+            file_path=str(csv_file),
+            file_type='csv',
+            chunk_size=5,
+            parallel=False
+        )
+        try:
+            parallel = await processor.process_file(
+                contract_id=contract.id,
+                file_path=str(csv_file),
+                file_type='csv',
+                chunk_size=5,
+                parallel=True
+            )
+        finally:
+            shutdown_process_pool()
+        
+        assert parallel.total_records == serial.total_records == 42
+        assert parallel.passed == serial.passed
+        assert parallel.failed == serial.failed
+        assert parallel.errors_summary == serial.errors_summary
+        assert "UNIQUENESS" in parallel.errors_summary
+        assert parallel.sample_errors == serial.sample_errors
+    
+    async def test_process_parquet_file(self, db_session, sample_contract_data, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        from app.core.contract_manager import ContractManager
+        
+        contract = ContractManager(db_session).create_contract(sample_contract_data)
+        
+        table = pa.table({
+            "user_id": ["usr_1", "usr_2", "bad"],
+            "email": ["a@example.com", "b@example.com", "c@example.com"],
+            "age": [20, 130, 40]
+        })
+        parquet_file = tmp_path / "test.parquet"
+        pq.write_table(table, str(parquet_file), row_group_size=2)
+        
+        processor = BatchProcessor(db_session)
+        result = await processor.process_file(
+            contract_id=contract.id,
+            file_path=str(parquet_file),
+            file_type='parquet',
+            chunk_size=2
+        )
+        
+        assert result.total_records == 3
+        assert result.passed == 1
+        assert result.errors_summary == {"VALUE_TOO_LARGE": 1, "PATTERN_MISMATCH": 1}
+    
+    async def test_process_stream_from_pipe(self, db_session, sample_contract_data):
+        import threading
+        from app.core.contract_manager import ContractManager
+        from app.core.upload_pipe import UploadPipe
+        
+        contract = ContractManager(db_session).create_contract(sample_contract_data)
+        
+        pipe = UploadPipe(max_buffered=64)
+        
+        def upload():
+            pipe.feed(b'{"user_id": "usr_1", "email": "a@example.com"}\n')
+            for i in range(200):
+                pipe.feed(f'{{"user_id": "usr_{i + 2}", "email": "user{i}@example.com"}}\n'.encode())
+            pipe.feed(b'{"user_id": "bad", "email": "b@example.com"}\n')
+            pipe.finish()
+        
+        writer = threading.Thread(target=upload)
+        writer.start()
+        
+        processor = BatchProcessor(db_session)
+        result = await processor.process_stream(
+            contract_id=contract.id,
+            stream=pipe,
+            file_type='jsonl',
+            chunk_size=50
+        )
+        writer.join()
+        
+        assert result.total_records == 202
+        assert result.failed == 1
+        assert result.errors_summary == {"PATTERN_MISMATCH": 1}
+    
+    async def test_rerun_batch_is_summarized_once(self, db_session, sample_contract_data, tmp_path, monkeypatch):
+        import uuid
+        from app.core.contract_manager import ContractManager
+        from app.core.metric_rollups import metric_rollups
+        from app.models.database import BatchSummary
+        
+        contract = ContractManager(db_session).create_contract(sample_contract_data)
+        csv_file = tmp_path / "test.csv"
+        csv_file.write_text("user_id,email\nusr_1,a@example.com\nbad,b@example.com")
+        metric_rollups.clear()
+        monkeypatch.setattr(metric_rollups, "enabled", True)
+        
+        batch_id = uuid.uuid4()
+        processor = BatchProcessor(db_session)
+        for _ in range(2):
+            await processor.process_file(contract_id=contract.id, file_path=str(csv_file), file_type='csv', batch_id=batch_id)
+        
+        assert db_session.query(BatchSummary).filter(BatchSummary.batch_id == str(batch_id)).count() == 1
+        counter = next(iter(metric_rollups._counters.values()))
+        assert (counter.passed, counter.failed) == (1, 1)
+        metric_rollups.clear()
@@ -0,0 +1,121 @@
+import pytest
+import pandas as pd
+from app.core.columnar_validator import ColumnarValidator
+from app.core.schema_validator import SchemaValidator
+from app.core.file_handlers import CSVHandler, frame_to_records
+from app.core.validation_engine import ValidationEngine
+from app.core.contract_manager import ContractManager
+from app.models.schemas import ContractSchema, FieldDefinition
+
+
+@pytest.fixture
+def columnar_schema():
+    return ContractSchema(
+        contract_version="1.0",
+        domain="test",
+        schema={
+            "user_id": FieldDefinition(type="string", pattern=r"^usr_\d+$"),
+            "email": FieldDefinition(type="string", format="email"),
+            "country": FieldDefinition(type="string", enum=["US", "GB"], required=False),
+            "age": FieldDefinition(type="integer", min=0, max=120, required=False),
+            "created_at": FieldDefinition(
+                type="timestamp",
+                min="2020-01-01T00:00:00",
+                max="2030-01-01T00:00:00"
+            )
+        }
+    )
+
+
+@pytest.fixture
+def columnar_csv(tmp_path):
+    csv_file = tmp_path / "records.csv"
+    csv_file.write_text(
+        "user_id,email,country,age,created_at\n"
+        "usr_1,a@example.com,US,25,2024-01-15T10:30:00\n"
+        "bad,a@example.com,FR,25,2024-01-15T10:30:00\n"
+        "usr_3,not-an-email,GB,30,2019-01-01T00:00:00\n"
+        "usr_4,b@example.com,,130,garbage\n"
+        "usr_5,c@example.com,US,40,2024-02-01\n"
+    )
+    return str(csv_file)
+
+
+def test_columnar_matches_row_validation(columnar_schema, columnar_csv):
+    schema_validator = SchemaValidator(columnar_schema)
+    columnar = ColumnarValidator(columnar_schema, schema_validator)
+
+    frame = next(CSVHandler().read_frames(columnar_csv, chunk_size=100))
+    result = columnar.validate(frame)
+
+    row_failed = [bool(schema_validator.validate(r)) for r in frame_to_records(frame)]
+
+    assert result.total_records == 5
+    assert list(result.failed_mask) == row_failed
+    assert result.passed == 2
+    assert result.error_counts == {
+        "PATTERN_MISMATCH": 1,
+        "ENUM_MISMATCH": 1,
+        "FORMAT_MISMATCH": 1,
+        "VALUE_TOO_LARGE": 1,
+        "TIMESTAMP_TOO_OLD": 1,
+        "INVALID_TIMESTAMP": 1
+    }
+
+
+@pytest.mark.parametrize("bounded", [False, True])
+def test_columnar_timestamp_parsing_matches_row_validation(bounded):
+    field = FieldDefinition(type="timestamp", min="2000-01-01T00:00:00Z" if bounded else None)
+    schema = ContractSchema(contract_version="1.0", domain="test", schema={"created_at": field})
+    schema_validator = SchemaValidator(schema)
+    values = [
+        "now", "today", "2021", "2021-01", " 2021-01-15", "2021-01-15 ",
+        "20210115", "2021-01-15", "2021-01-15T10:30", "2021-01-15 10:30:00.123456",
+        "2021-01-15T10:30:00Z", "2021-01-15T10:30:00+05:30", "2021-13-01", "2021-01-15T25:00:00",
+    ]
+
+    result = ColumnarValidator(schema, schema_validator).validate(pd.DataFrame({"created_at": values}))
+
+    row_failed = [bool(schema_validator.validate({"created_at": value})) for value in values]
+    assert list(result.failed_mask) == row_failed
+    assert row_failed[:6] == [True] * 6
+
+
+def test_columnar_missing_required_column(columnar_schema):
+    columnar = ColumnarValidator(columnar_schema)
+
+    frame = pd.DataFrame({
+        "user_id": ["usr_1", "usr_2"],
+        "created_at": ["2024-01-01", "2024-01-02"]
+    })
+    result = columnar.validate(frame)
+
+    assert result.failed == 2
+    assert result.error_counts == {"REQUIRED_FIELD_MISSING": 2}
+
+
+@pytest.mark.asyncio
+async def test_validate_batch_dataframe_matches_records(db_session, sample_contract_data, tmp_path):
+    manager = ContractManager(db_session)
+    contract = manager.create_contract(sample_contract_data)
+
+    csv_file = tmp_path / "users.csv"
+    csv_file.write_text(
+        "user_id,email,age\n"
+        "usr_1,test1@example.com,25\n"
+        "invalid,test2@example.com,30\n"
+        "usr_3,broken,200\n"
+    )
+
+    handler = CSVHandler()
+    frame = next(handler.read_frames(str(csv_file), chunk_size=100))
+    records = next(handler.read_chunks(str(csv_file), chunk_size=100))
+
+    engine = ValidationEngine(db_session)
+    columnar_result = await engine.validate_batch(contract.id, frame)
+    row_result = await engine.validate_batch(contract.id, records)
+
+    assert columnar_result.passed == row_result.passed == 1
+    assert columnar_result.failed == row_result.failed == 2
+    assert columnar_result.errors_summary == row_result.errors_summary
+    assert columnar_result.sample_errors == row_result.sample_errors
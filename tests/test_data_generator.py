@@ -0,0 +1,145 @@
+import re
+import pytest
+import numpy as np
+from datetime import datetime
+from app.core.data_generator import DataGenerator, PatternSampler
+from app.core.file_handlers import FileHandlerFactory
+from app.core.schema_validator import SchemaValidator
+from app.core.yaml_parser import YAMLParser
+from app.utils.contract_templates import get_all_templates, get_template_by_name
+
+
+NOW = datetime(2025, 3, 1, 12)
+
+NESTED_CONTRACT = """contract_version: "1.0"
+domain: "orders"
+schema:
+  order_id:
+    type: string
+    format: uuid
+  code:
+    type: string
+    pattern: "^(ab|c\\\\d){2,3}-[A-Z]{3}$"
+  shipped_on:
+    type: date
+    min: "2024-01-01"
+    max: "2024-12-31"
+  customer:
+    type: object
+    properties:
+      email:
+        type: string
+        format: email
+      ip:
+        type: string
+        format: ipv4
+      nickname:
+        type: string
+        required: false
+        min_length: 2
+        max_length: 4
+  lines:
+    type: array
+    min: 2
+    max: 4
+    items:
+      type: object
+      properties:
+        sku:
+          type: string
+          pattern: "^SKU-\\\\d{6}$"
+        quantity:
+          type: integer
+          min: 1
+          max: 9
+"""
+
+
+def parse(yaml_content):
+    return YAMLParser().parse_yaml(yaml_content)
+
+
+def failures(contract, records):
+    validator = SchemaValidator(contract)
+    return [errors for errors in map(validator.validate, records) if errors]
+
+
+@pytest.mark.parametrize("template", [t.name for t in get_all_templates()])
+def test_template_records_are_valid(template):
+    contract = parse(get_template_by_name(template).yaml_content)
+    records = DataGenerator(contract, seed=1, now=NOW).records(500)
+
+    assert len(records) == 500
+    assert failures(contract, records) == []
+
+
+def test_nested_records_respect_rules():
+    contract = parse(NESTED_CONTRACT)
+    records = DataGenerator(contract, seed=2, null_rate=0.5, now=NOW).records(300)
+
+    assert failures(contract, records) == []
+    assert all(2 <= len(r["lines"]) <= 4 for r in records)
+    # Optional properties left out rather than set to null
+    assert any("nickname" not in r["customer"] for r in records)
+    assert any("nickname" in r["customer"] for r in records)
+
+
+@pytest.mark.parametrize("pattern", [r"^usr_\d+$", r"(ab|c\d){2,3}\w-[^a-z]x?", r"^[A-F0-9]{4}\.\d{1,3}$"])
+def test_pattern_sampler(pattern):
+    values = PatternSampler(pattern).sample(np.random.default_rng(0), 200).to_array()
+    assert all(re.match(pattern, value) for value in values)
+
+
+def test_violation_rate():
+    contract = parse(get_template_by_name("basic-user-events").yaml_content)
+    generator = DataGenerator(contract, seed=3, violation_rate=0.25, now=NOW)
+    broken = failures(contract, generator.records(2000))
+
+    assert len(broken) == sum(generator.violation_counts.values())
+    assert 400 < len(broken) < 600
+
+
+def test_selected_violations_only():
+    contract = parse(get_template_by_name("iot-sensor-data").yaml_content)
+    generator = DataGenerator(contract, seed=4, violation_rate=0.5, violations=["enum"], now=NOW)
+    broken = failures(contract, generator.records(200))
+
+    assert broken
+    assert {error.error_type for errors in broken for error in errors} == {"ENUM_MISMATCH"}
+    assert set(generator.violation_counts) == {"enum"}
+
+
+def test_unknown_violation_kind():
+    contract = parse(get_template_by_name("iot-sensor-data").yaml_content)
+    with pytest.raises(ValueError):
+        DataGenerator(contract, violations=["nonsense"])
+
+
+def test_csv_rejects_nested_fields(tmp_path):
+    contract = parse(get_template_by_name("ecommerce-orders").yaml_content)
+    path = tmp_path / "data.csv"
+
+    with pytest.raises(ValueError, match="nested fields"):
+        DataGenerator(contract, seed=6, now=NOW).write(str(path), 10)
+    assert not path.exists()
+
+
+def test_seed_is_reproducible():
+    contract = parse(NESTED_CONTRACT)
+    first = DataGenerator(contract, seed=5, violation_rate=0.1, now=NOW).records(50)
+    second = DataGenerator(contract, seed=5, violation_rate=0.1, now=NOW).records(50)
+
+    assert first == second
+
+
+@pytest.mark.parametrize("file_type", ["csv", "json", "jsonl", "parquet"])
+def test_write_streams_chunks(tmp_path, file_type):
+    contract = parse(get_template_by_name("ecommerce-orders" if file_type != "csv" else "basic-user-events").yaml_content)
+    generator = DataGenerator(contract, seed=6, violation_rate=0.1, now=NOW)
+    path = tmp_path / f"data.{file_type}"
+
+    assert generator.write(str(path), 2500, chunk_size=1000) == 2500
+
+    records = [r for chunk in FileHandlerFactory.get_handler(file_type).read_chunks(str(path), 1000) for r in chunk]
+    assert len(records) == 2500
+    assert len(failures(contract, records)) == sum(generator.violation_counts.values())
@@ -30,3 +30,11 @@ def test_init_db():
 def test_test_db_fixture(test_db):
     assert test_db is not None
     assert isinstance(test_db, Session)
+
+
+def test_to_async_url():
+    from app.database import to_async_url
+    
+    assert to_async_url("postgresql://u:p@localhost:5432/db") == "postgresql+asyncpg://u:p@localhost:5432/db"
+    assert to_async_url("postgresql+psycopg2://u:p@localhost/db") == "postgresql+asyncpg://u:p@localhost/db"
+    assert to_async_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
@@ -0,0 +1,88 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy.orm import sessionmaker
+from app.api.validation import get_error_summary
+from app.core.contract_manager import ContractManager
+from app.core.error_counts import bucket_start, count_errors, record_error_counts
+from app.core.result_sink import ValidationResultSink
+from app.core.validation_engine import ValidationEngine
+from app.models.database import ValidationErrorCount
+
+
+def make_row(contract_id, validated_at, errors):
+    return {
+        "contract_id": str(contract_id),
+        "status": "FAIL" if errors else "PASS",
+        "errors": errors,
+        "execution_time_ms": 1.0,
+        "validated_at": validated_at,
+        "batch_id": None
+    }
+
+
+def test_count_errors_buckets_by_hour():
+    moment = datetime(2025, 2, 3, 10, 42, 7)
+    rows = count_errors([
+        make_row("c1", moment, [{"field": "email", "error_type": "FORMAT_INVALID"}]),
+        make_row("c1", moment + timedelta(minutes=5), [{"field": "email", "error_type": "FORMAT_INVALID"}, {"error_type": None}]),
+        make_row("c1", moment + timedelta(hours=1), [{"field": "email", "error_type": "FORMAT_INVALID"}]),
+        make_row("c1", moment, None),
+    ])
+
+    counts = {(row["bucket_start"].hour, row["field"], row["error_type"]): row["count"] for row in rows}
+    assert bucket_start(moment) == datetime(2025, 2, 3, 10)
+    assert counts == {
+        (10, "email", "FORMAT_INVALID"): 2,
+        (10, "", "UNKNOWN"): 1,
+        (11, "email", "FORMAT_INVALID"): 1,
+    }
+
+
+def test_record_error_counts_increments(db_session, sample_contract_data):
+    contract = ContractManager(db_session).create_contract(sample_contract_data)
+    row = make_row(contract.id, datetime.utcnow(), [{"field": "user_id", "error_type": "PATTERN_MISMATCH"}])
+
+    record_error_counts(db_session, [row])
+    db_session.commit()
+    record_error_counts(db_session, [row, row])
+    db_session.commit()
+
+    stored = db_session.query(ValidationErrorCount).all()
+    assert len(stored) == 1
+    assert stored[0].count == 3
+
+
+@pytest.mark.asyncio
+async def test_engine_and_sink_record_counts(db_session, test_engine, sample_contract_data):
+    contract = ContractManager(db_session).create_contract(sample_contract_data)
+
+    engine = ValidationEngine(db_session)
+    await engine.validate_record(contract.id, {"user_id": "bad", "email": "not-an-email"})
+    await engine.validate_record(contract.id, {"user_id": "usr_1", "email": "a@example.com"})
+
+    sink = ValidationResultSink(sessionmaker(bind=test_engine), batch_size=10)
+    sink.submit(make_row(contract.id, datetime.utcnow(), [{"field": "user_id", "error_type": "PATTERN_MISMATCH"}]))
+    sink.flush()
+
+    summary = get_error_summary(contract.id, days=1, db=db_session)
+
+    assert summary["error_counts"]["PATTERN_MISMATCH"] == 2
+    assert summary["field_counts"]["user_id"] == 2
+    assert summary["field_counts"]["email"] == summary["total_errors"] - 2
+    assert summary["top_errors"][0] == {"error_type": "PATTERN_MISMATCH", "count": 2}
+
+
+def test_error_summary_window(db_session, sample_contract_data):
+    contract = ContractManager(db_session).create_contract(sample_contract_data)
+    now = datetime.utcnow()
+    record_error_counts(db_session, [
+        make_row(contract.id, now, [{"field": "age", "error_type": "OUT_OF_RANGE"}]),
+        make_row(contract.id, now - timedelta(days=10), [{"field": "age", "error_type": "TYPE_MISMATCH"}]),
+    ])
+    db_session.commit()
+
+    summary = get_error_summary(contract.id, days=7, db=db_session)
+
+    assert summary["error_counts"] == {"OUT_OF_RANGE": 1}
+    assert summary["total_errors"] == 1
+    assert summary["period"] == "7 days"
@@ -1,5 +1,7 @@
+import io
+import json
 import pytest
-from app.core.file_handlers import CSVHandler, JSONHandler, JSONLHandler, FileHandlerFactory
+from app.core.file_handlers import CSVHandler, JSONHandler, JSONLHandler, JSONStreamReader, ParquetHandler, FileHandlerFactory
 
 
 class TestCSVHandler:
@@ -51,6 +53,70 @@ class TestJSONHandler:
         
         assert len(chunks) == 1
         assert len(chunks[0]) == 2
+    
+    def test_read_chunks_small_buffer(self, tmp_path):
+        records = [
+            {"id": i, "price": i * 1.25e-3, "name": f"item \"{i}\"", "tags": ["a", None, True]}
+            for i in range(50)
+        ]
+        json_file = tmp_path / "test.json"
+        json_file.write_text(json.dumps({"meta": {"count": 50}, "data": records, "next": None}, indent=2))
+        
+        handler = JSONHandler(buffer_size=3)
+        chunks = list(handler.read_chunks(str(json_file), chunk_size=20))
+        
+        assert [len(chunk) for chunk in chunks] == [20, 20, 10]
+        assert [r for chunk in chunks for r in chunk] == records
+    
+    def test_read_chunks_object_without_data(self, tmp_path):
+        json_file = tmp_path / "test.json"
+        json_file.write_text('{"id": 1, "items": [1, 2]}')
+        
+        handler = JSONHandler()
+        chunks = list(handler.read_chunks(str(json_file), chunk_size=10))
+        
+        assert chunks == [[{"id": 1, "items": [1, 2]}]]
+    
+    def test_validate_format_reads_only_head(self, tmp_path):
+        json_file = tmp_path / "test.json"
+        json_file.write_text('[' + ', '.join('{"id": %d}' % i for i in range(20)) + ', oops')
+        
+        handler = JSONHandler()
+        assert handler.validate_format(str(json_file))
+        
+        with pytest.raises(ValueError):
+            list(handler.read_chunks(str(json_file), chunk_size=100))
+    
+    def test_validate_format_invalid(self, tmp_path):
+        json_file = tmp_path / "test.json"
+        json_file.write_text('[{"id": 1} {"id": 2}]')
+        
+        assert not JSONHandler().validate_format(str(json_file))
+    
+    def test_malformed_value_fails_without_reading_on(self, tmp_path):
+        json_file = tmp_path / "test.json"
+        json_file.write_text('[{"id": bogus}, ' + ', '.join('{"id": %d}' % i for i in range(100000)) + ']')
+        
+        with open(json_file) as f:
+            reader = JSONStreamReader(f, buffer_size=1024)
+            with pytest.raises(json.JSONDecodeError):
+                list(reader.records())
+            assert len(reader.buffer) <= 1024
+        
+        assert not JSONHandler().validate_format(str(json_file))
+    
+    def test_values_split_across_reads(self):
+        text = '[' + ', '.join('{"ok": true, "n": -1.5e3, "s": "%s"}' % ('x' * i) for i in range(200)) + ']'
+        
+        for buffer_size in (3, 7, 64):
+            assert list(JSONStreamReader(io.StringIO(text), buffer_size).records()) == json.loads(text)
+    
+    def test_value_size_is_capped(self):
+        reader = JSONStreamReader(io.StringIO('[{"id": "' + 'x' * 100000), buffer_size=1024, max_value_size=4096)
+        
+        with pytest.raises(json.JSONDecodeError, match="exceeds 4096"):
+            list(reader.records())
+        assert len(reader.buffer) < 4 * 4096
 
 
 class TestJSONLHandler:
@@ -76,6 +142,50 @@ class TestJSONLHandler:
         assert len(chunks[0]) == 2
 
 
+class TestParquetHandler:
+    
+    @pytest.fixture
+    def parquet_file(self, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        
+        table = pa.table({
+            "id": [1, 2, 3, 4, 5],
+            "name": ["a", "b", "c", "d", None],
+            "tags": [["x"], [], None, ["y", "z"], ["x"]],
+            "unused": [0.1, 0.2, 0.3, 0.4, 0.5]
+        })
+        path = tmp_path / "test.parquet"
+        pq.write_table(table, str(path), row_group_size=2)
+        return str(path)
+    
+    def test_read_frames_streams_batches(self, parquet_file):
+        handler = ParquetHandler()
+        frames = list(handler.read_frames(parquet_file, chunk_size=2))
+        
+        assert [len(frame) for frame in frames] == [2, 2, 1]
+        assert frames[0]["tags"].tolist() == [["x"], []]
+    
+    def test_read_frames_projects_columns(self, parquet_file):
+        handler = ParquetHandler()
+        frame = next(handler.read_frames(parquet_file, chunk_size=10, columns=["id", "name", "missing"]))
+        
+        assert list(frame.columns) == ["id", "name"]
+        assert len(frame) == 5
+    
+    def test_read_chunks(self, parquet_file):
+        handler = ParquetHandler()
+        chunks = list(handler.read_chunks(parquet_file, chunk_size=10))
+        
+        assert chunks[0][4] == {"id": 5, "name": None, "tags": ["x"], "unused": 0.5}
+    
+    def test_validate_format_invalid(self, tmp_path):
+        bad_file = tmp_path / "test.parquet"
+        bad_file.write_text("not parquet")
+        
+        assert not ParquetHandler().validate_format(str(bad_file))
+
+
 class TestFileHandlerFactory:
     
     def test_get_csv_handler(self):
@@ -86,6 +196,10 @@ class TestFileHandlerFactory:
         handler = FileHandlerFactory.get_handler('json')
         assert isinstance(handler, JSONHandler)
     
+    def test_get_parquet_handler(self):
+        handler = FileHandlerFactory.get_handler('parquet')
+        assert isinstance(handler, ParquetHandler)
+    
     def test_unsupported_type(self):
         with pytest.raises(ValueError):
             FileHandlerFactory.get_handler('xml')
\ No newline at end of file
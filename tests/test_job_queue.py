@@ -0,0 +1,178 @@
+import pytest
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy.orm import sessionmaker
+from app.api.validation import get_batch_status
+from app.core.batch_jobs import batch_jobs
+from app.core.contract_manager import ContractManager
+from app.core.job_queue import JobQueue
+from app.core.metric_rollups import metric_rollups
+from app.models.database import BatchSummary, MetricRollup, QueuedJob
+from app.worker import BatchWorker
+
+
+@pytest.fixture
+def contract(db_session, sample_contract_data):
+    return ContractManager(db_session).create_contract(sample_contract_data)
+
+
+def enqueue(db_session, contract, **payload):
+    job_id = uuid.uuid4()
+    JobQueue(db_session).enqueue(job_id, contract.id, payload={"file_type": "csv", **payload})
+    return str(job_id)
+
+
+def expire_lease(db_session, job_id):
+    job = db_session.get(QueuedJob, job_id)
+    job.locked_until = datetime.utcnow() - timedelta(seconds=1)
+    db_session.commit()
+
+
+def test_claim_and_complete(db_session, contract):
+    job_id = enqueue(db_session, contract)
+    queue = JobQueue(db_session, visibility_timeout=60)
+
+    job = queue.claim("w1")
+    assert job.id == job_id
+    assert job.status == "RUNNING"
+    assert job.attempts == 1
+    assert job.locked_by == "w1"
+
+    # Leased jobs are not handed out again
+    assert queue.claim("w2") is None
+
+    assert queue.heartbeat(job_id, "w1", progress={"processed_records": 10})
+    assert not queue.complete(job_id, "w2")
+    assert queue.complete(job_id, "w1", progress={"processed_records": 20})
+
+    db_session.expire_all()
+    job = queue.get(job_id)
+    assert job.status == "COMPLETED"
+    assert job.progress == {"processed_records": 20}
+    assert job.finished_at is not None
+
+
+def test_expired_lease_is_reclaimed(db_session, contract):
+    job_id = enqueue(db_session, contract)
+    queue = JobQueue(db_session, visibility_timeout=60)
+    queue.claim("crashed")
+
+    expire_lease(db_session, job_id)
+    job = queue.claim("w2")
+
+    assert job.id == job_id
+    assert job.attempts == 2
+    assert job.locked_by == "w2"
+    # The crashed worker can no longer move the job on
+    assert not queue.heartbeat(job_id, "crashed")
+
+
+def test_fail_retries_with_backoff_then_gives_up(db_session, contract):
+    job_id = enqueue(db_session, contract)
+    queue = JobQueue(db_session, retry_backoff=10)
+
+    for attempt in range(1, 4):
+        db_session.query(QueuedJob).filter(QueuedJob.id == job_id).update(
+            {"run_after": datetime.utcnow() - timedelta(seconds=1)}
+        )
+        db_session.commit()
+        job = queue.claim("w1")
+        assert job.attempts == attempt
+
+        before = datetime.utcnow()
+        assert queue.fail(job_id, "w1", "boom")
+        db_session.expire_all()
+        job = queue.get(job_id)
+
+        if attempt < 3:
+            assert job.status == "QUEUED"
+            assert job.run_after >= before + timedelta(seconds=10 * 2 ** (attempt - 1))
+            assert queue.claim("w1") is None
+
+    assert job.status == "FAILED"
+    assert job.last_error == "boom"
+
+
+def test_permanent_failure_is_not_retried(db_session, contract):
+    job_id = enqueue(db_session, contract)
+    queue = JobQueue(db_session)
+    queue.claim("w1")
+
+    queue.fail(job_id, "w1", "bad file", retry=False)
+    db_session.expire_all()
+
+    assert queue.get(job_id).status == "FAILED"
+    assert queue.get(job_id).attempts == 1
+
+
+def test_reap_and_purge(db_session, contract):
+    job_id = enqueue(db_session, contract)
+    queue = JobQueue(db_session)
+    db_session.query(QueuedJob).update({"max_attempts": 1})
+    db_session.commit()
+    queue.claim("crashed")
+    expire_lease(db_session, job_id)
+
+    assert queue.claim("w2") is None
+    assert queue.reap_expired() == 1
+    db_session.expire_all()
+    assert queue.get(job_id).status == "FAILED"
+
+    assert queue.purge_finished(datetime.utcnow() - timedelta(days=1)) == 0
+    assert queue.purge_finished(datetime.utcnow() + timedelta(seconds=1)) == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_processes_queued_upload(test_engine, db_session, contract, tmp_path):
+    upload = tmp_path / "upload.csv"
+    upload.write_text(
+        "user_id,email,age\n"
+        "usr_1,a@example.com,30\n"
+        "usr_2,not-an-email,40\n"
+    )
+    job_id = enqueue(db_session, contract, file_path=str(upload), file_name="upload.csv")
+
+    pending = await get_batch_status(uuid.UUID(job_id), db=db_session)
+    assert pending["status"] == "QUEUED"
+
+    worker = BatchWorker(worker_id="w1", session_factory=sessionmaker(bind=test_engine))
+    try:
+        assert await worker.run(max_jobs=1) == 1
+    finally:
+        batch_jobs.clear()
+
+    db_session.expire_all()
+    assert JobQueue(db_session).get(job_id).status == "COMPLETED"
+    assert not upload.exists()
+
+    summary = db_session.query(BatchSummary).filter(BatchSummary.batch_id == job_id).one()
+    assert summary.total_records == 2
+    status = await get_batch_status(uuid.UUID(job_id), db=db_session)
+    assert status["status"] == "COMPLETED"
+    assert status["total_records"] == 2
+
+
+@pytest.mark.asyncio
+async def test_worker_flushes_metric_rollups(test_engine, db_session, contract, tmp_path, monkeypatch):
+    session_factory = sessionmaker(bind=test_engine)
+    monkeypatch.setattr(metric_rollups, "session_factory", session_factory)
+    monkeypatch.setattr(metric_rollups, "enabled", True)
+    metric_rollups.clear()
+
+    upload = tmp_path / "upload.csv"
+    upload.write_text(
+        "user_id,email,age\n"
+        "usr_1,a@example.com,30\n"
+        "usr_2,not-an-email,40\n"
+    )
+    enqueue(db_session, contract, file_path=str(upload), file_name="upload.csv")
+
+    worker = BatchWorker(worker_id="w1", session_factory=session_factory)
+    try:
+        assert await worker.run(max_jobs=1) == 1
+    finally:
+        batch_jobs.clear()
+
+    assert metric_rollups.pending() == 0
+    rollup = db_session.query(MetricRollup).filter(MetricRollup.contract_id == str(contract.id)).one()
+    assert (rollup.passed, rollup.failed) == (1, 1)
@@ -1,6 +1,17 @@
+import json
 import logging
+import sys
 from pathlib import Path
-from app.utils.logging import setup_logging, get_logger
+from app.core.telemetry import REGISTRY
+from app.utils.logging import (
+    ColoredFormatter,
+    DroppingQueueHandler,
+    JSONFormatter,
+    RateLimitFilter,
+    get_logger,
+    setup_logging,
+    stop_logging,
+)
 
 
 def test_setup_logging():
@@ -36,3 +47,80 @@ def test_log_file_created():
 
     log_files = list(log_dir.glob("*.log"))
     assert len(log_files) > 0
+
+
+def test_colored_formatter_reuses_formatters():
+    formatter = ColoredFormatter()
+    level_formatter = formatter._formatters[logging.INFO]
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "hello %s", ("world",), None)
+
+    assert "hello world" in formatter.format(record)
+    assert "hello world" in formatter.format(record)
+    assert formatter._formatters[logging.INFO] is level_formatter
+
+
+def test_json_formatter():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord("test", logging.ERROR, __file__, 1, "failed %d", (3,), sys.exc_info())
+    record.batch_id = "b-1"
+
+    entry = json.loads(JSONFormatter().format(record))
+
+    assert entry["level"] == "ERROR"
+    assert entry["logger"] == "test"
+    assert entry["message"] == "failed 3"
+    assert entry["batch_id"] == "b-1"
+    assert "ValueError: boom" in entry["exception"]
+
+
+def test_rate_limit_filter():
+    now = [0.0]
+    rate_limit = RateLimitFilter(1.0, clock=lambda: now[0])
+
+    def record(level=logging.INFO, lineno=10):
+        return logging.LogRecord("hot", level, "hot.py", lineno, "chunk", None, None)
+
+    assert rate_limit.filter(record())
+    assert not rate_limit.filter(record())
+    assert not rate_limit.filter(record())
+    assert rate_limit.filter(record(lineno=11))
+    assert rate_limit.filter(record(level=logging.WARNING))
+
+    now[0] = 1.5
+    passed = record()
+    assert rate_limit.filter(passed)
+    assert passed.suppressed == 2
+
+
+def test_queued_json_logging(tmp_path):
+    setup_logging("INFO", log_format="json", use_queue=True, log_dir=str(tmp_path))
+    try:
+        root = logging.getLogger()
+        assert [type(h) for h in root.handlers] == [DroppingQueueHandler]
+
+        get_logger("queued").info("processed %d records", 5, extra={"contract": "c-1"})
+        stop_logging()
+
+        entries = [json.loads(line) for line in (tmp_path / "dce.log").read_text().splitlines()]
+        assert {"logger": "queued", "message": "processed 5 records", "contract": "c-1"}.items() <= entries[-1].items()
+    finally:
+        setup_logging("INFO", log_format="text", use_queue=False)
+
+
+def test_dropped_records_reported(tmp_path):
+    setup_logging("INFO", log_format="json", use_queue=True, log_dir=str(tmp_path))
+    try:
+        handler = logging.getLogger().handlers[0]
+        handler.dropped = 3
+        assert "dce_log_records_dropped 3" in REGISTRY.render().splitlines()
+
+        stop_logging()
+        assert "dce_log_records_dropped 0" in REGISTRY.render().splitlines()
+
+        last = json.loads((tmp_path / "dce.log").read_text().splitlines()[-1])
+        assert last["level"] == "WARNING"
+        assert last["dropped"] == 3
+    finally:
+        setup_logging("INFO", log_format="text", use_queue=False)
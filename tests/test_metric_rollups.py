@@ -0,0 +1,81 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy.orm import sessionmaker
+from app.core.batch_processor import BatchProcessor
+from app.core.contract_manager import ContractManager
+from app.core.metric_rollups import MetricRollupBuffer, metric_rollups
+from app.core.metrics_aggregator import MetricsAggregator
+from app.core.validation_engine import ValidationEngine
+from app.models.database import MetricRollup, MetricRollupError
+
+
+@pytest.fixture
+def session_factory(test_engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+
+
+def test_flush_upserts_hourly_rollups(db_session, session_factory, sample_contract_data):
+    contract = ContractManager(db_session).create_contract(sample_contract_data)
+    buffer = MetricRollupBuffer(session_factory)
+    at = datetime(2025, 1, 15, 10, 30)
+    
+    buffer.record(contract.id, at, passed=3, failed=1, execution_time_ms=40.0, error_counts={"TYPE_MISMATCH": 2})
+    buffer.record(contract.id, at + timedelta(hours=1), passed=1, failed=0, execution_time_ms=5.0)
+    assert buffer.flush() == 2
+    assert buffer.pending() == 0
+    
+    buffer.record(contract.id, at + timedelta(minutes=10), passed=0, failed=2, execution_time_ms=20.0, error_counts={"TYPE_MISMATCH": 1, "ENUM_MISMATCH": 2})
+    assert buffer.flush() == 1
+    
+    rollups = db_session.query(MetricRollup).order_by(MetricRollup.hour).all()
+    assert [(r.hour, r.passed, r.failed, r.execution_time_ms) for r in rollups] == [
+        (10, 3, 3, 60.0),
+        (11, 1, 0, 5.0)
+    ]
+    
+    errors = db_session.query(MetricRollupError).filter(MetricRollupError.hour == 10).all()
+    assert {e.error_type: e.count for e in errors} == {"TYPE_MISMATCH": 3, "ENUM_MISMATCH": 2}
+
+
+def test_failed_flush_keeps_counters():
+    def broken_session():
+        raise RuntimeError("database unavailable")
+    
+    buffer = MetricRollupBuffer(broken_session)
+    buffer.record("c1", datetime(2025, 1, 15, 10), passed=1, failed=0, execution_time_ms=1.0)
+    
+    assert buffer.flush() == 0
+    assert buffer.pending() == 1
+
+
+@pytest.mark.asyncio
+async def test_rollups_match_raw_aggregation(db_session, session_factory, sample_contract_data, monkeypatch, tmp_path):
+    contract = ContractManager(db_session).create_contract(sample_contract_data)
+    metric_rollups.clear()
+    monkeypatch.setattr(metric_rollups, "session_factory", session_factory)
+    monkeypatch.setattr(metric_rollups, "enabled", True)
+    
+    engine = ValidationEngine(db_session)
+    for data in [
+        {"user_id": "usr_1", "email": "a@example.com"},
+        {"user_id": "bad", "email": "a@example.com"},
+        {"user_id": "bad", "email": "not-an-email"},
+    ]:
+        await engine.validate_record(contract.id, data)
+    
+    # Batch files are counted from their summary row on both paths
+    csv_file = tmp_path / "batch.csv"
+    csv_file.write_text("user_id,email\nusr_2,b@example.com\nbad,c@example.com\nusr_4,not-an-email\n")
+    await BatchProcessor(db_session).process_file(contract_id=contract.id, file_path=str(csv_file), file_type='csv')
+    
+    metric_rollups.flush()
+    
+    today = datetime.utcnow().date()
+    raw = MetricsAggregator(db_session).calculate_daily_metrics(contract.id, today)
+    rolled_up = MetricsAggregator(db_session, from_rollups=True).calculate_daily_metrics(contract.id, today)
+    
+    assert rolled_up.total_validations == raw.total_validations == 6
+    assert rolled_up.passed == raw.passed == 2
+    assert raw.top_errors["PATTERN_MISMATCH"] == 3
+    assert rolled_up.top_errors == raw.top_errors
+    assert rolled_up.avg_execution_time_ms == pytest.approx(raw.avg_execution_time_ms)
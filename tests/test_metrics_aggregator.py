@@ -36,4 +36,91 @@ class TestMetricsAggregator:
         trend = aggregator.get_trend_data(sample_contract.id, days=7)
         
         assert trend.days == 7
-        assert trend.pass_rate_trend in ['INCREASING', 'DECREASING', 'STABLE']
\ No newline at end of file
+        assert trend.pass_rate_trend in ['INCREASING', 'DECREASING', 'STABLE']
+
+@pytest.mark.asyncio
+async def test_async_calculate_daily_metrics(db_session, async_db_session, sample_contract_data):
+    from datetime import datetime
+    from app.core.contract_manager import ContractManager
+    from app.core.metrics_aggregator import AsyncMetricsAggregator
+    from app.models.database import ValidationResult
+    
+    from app.core.error_counts import record_error_counts
+    
+    contract = ContractManager(db_session).create_contract(sample_contract_data)
+    today = date.today()
+    rows = [
+        dict(
+            contract_id=contract.id,
+            status=status,
+            errors=[{"error_type": "PATTERN_MISMATCH"}] if status == "FAIL" else None,
+            execution_time_ms=10.0,
+            validated_at=datetime.combine(today, datetime.min.time()) + timedelta(hours=i)
+        )
+        for i, status in enumerate(["PASS", "PASS", "PASS", "FAIL"])
+    ]
+    db_session.add_all(ValidationResult(**row) for row in rows)
+    record_error_counts(db_session, rows)
+    db_session.commit()
+    
+    aggregator = AsyncMetricsAggregator(async_db_session)
+    metrics = await aggregator.calculate_daily_metrics(contract.id, today)
+    sync_score = MetricsAggregator(db_session)._score(75.0, 4, 1, 100)
+    
+    assert metrics.total_validations == 4
+    assert metrics.pass_rate == 75.0
+    assert metrics.top_errors == {"PATTERN_MISMATCH": 1}
+    assert metrics.quality_score == sync_score
+    
+    trend = await aggregator.get_trend_data(contract.id, days=7)
+    assert trend.volumes == [4]
+
+
+def _add_validations(db_session, contract_id, target_date, statuses):
+    from datetime import datetime
+    from app.core.error_counts import record_error_counts
+    from app.models.database import ValidationResult
+    
+    rows = []
+    for i, status in enumerate(statuses):
+        errors = None
+        if status == "FAIL":
+            errors = [{"error_type": "PATTERN_MISMATCH"}, {"error_type": "TYPE_MISMATCH" if i % 2 else "PATTERN_MISMATCH"}]
+        rows.append(dict(
+            contract_id=contract_id,
+            status=status,
+            errors=errors,
+            execution_time_ms=float(i + 1),
+            validated_at=datetime.combine(target_date, datetime.min.time()) + timedelta(minutes=i)
+        ))
+    db_session.add_all(ValidationResult(**row) for row in rows)
+    record_error_counts(db_session, rows)
+    db_session.commit()
+
+
+def test_aggregate_daily_metrics_group_by(db_session, sample_contract_data):
+    from app.core.contract_manager import ContractManager
+    from app.models.database import QualityMetric
+    
+    manager = ContractManager(db_session)
+    first = manager.create_contract(sample_contract_data)
+    second = manager.create_contract(sample_contract_data.model_copy(update={"name": "second-contract"}))
+    
+    target_date = date.today() - timedelta(days=1)
+    _add_validations(db_session, first.id, target_date, ["PASS", "FAIL", "PASS", "FAIL"])
+    _add_validations(db_session, second.id, target_date, ["PASS", "PASS"])
+    _add_validations(db_session, first.id, target_date + timedelta(days=1), ["FAIL"])
+    
+    aggregator = MetricsAggregator(db_session)
+    results = aggregator.aggregate_daily_metrics(target_date)
+    
+    assert set(results) == {first.id, second.id}
+    assert results[first.id].total_validations == 4
+    assert results[first.id].passed == 2
+    assert results[first.id].avg_execution_time_ms == 2.5
+    assert results[first.id].top_errors == {"PATTERN_MISMATCH": 2, "TYPE_MISMATCH": 2}
+    assert results[second.id].pass_rate == 100.0
+    assert results[second.id].top_errors == {}
+    
+    aggregator.aggregate_daily_metrics(target_date)
+    assert db_session.query(QualityMetric).filter(QualityMetric.metric_date == target_date).count() == 2
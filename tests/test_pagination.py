@@ -0,0 +1,82 @@
+import pytest
+from datetime import datetime, timedelta
+from app.api.validation import get_validation_history
+from app.core.contract_manager import ContractManager
+from app.models.database import ValidationResult
+from app.utils.exceptions import InvalidCursorError
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def history_page(db_session, contract_id, limit, cursor=None, include_total=False):
+    return get_validation_history(
+        contract_id,
+        status=None,
+        start_date=None,
+        end_date=None,
+        limit=limit,
+        offset=0,
+        cursor=cursor,
+        include_total=include_total,
+        db=db_session
+    )
+
+
+def test_cursor_round_trip():
+    moment = datetime(2025, 2, 10, 12, 30, 1, 250)
+    cursor = encode_cursor(moment, "abc")
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (moment, "abc")
+    assert decode_cursor(None) is None
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(datetime(2025, 1, 1), "x")[:-3]])
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+def test_validation_history_walks_all_pages(db_session, sample_contract_data):
+    contract = ContractManager(db_session).create_contract(sample_contract_data)
+    base = datetime(2025, 2, 10, 12)
+    for i in range(7):
+        # Pairs of rows share a timestamp, so the id breaks ties
+        db_session.add(ValidationResult(
+            id=f"00000000-0000-0000-0000-{i:012d}",
+            contract_id=contract.id,
+            status="PASS",
+            execution_time_ms=1.0,
+            validated_at=base + timedelta(seconds=i // 2)
+        ))
+    db_session.commit()
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        page = history_page(db_session, contract.id, limit=3, cursor=cursor)
+        seen.extend(r["id"] for r in page.results)
+        pages += 1
+        assert page.total is None
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert len(seen) == len(set(seen)) == 7
+    assert seen[0] == "00000000-0000-0000-0000-000000000006"
+    assert history_page(db_session, contract.id, limit=3, include_total=True).total == 7
+
+
+def test_list_contracts_keyset(db_session, sample_contract_data):
+    manager = ContractManager(db_session)
+    for i in range(5):
+        manager.create_contract(sample_contract_data.model_copy(update={"name": f"contract-{i}"}))
+
+    first, total = manager.list_contracts(limit=2, include_total=False)
+    after = (first[-1].updated_at, first[-1].id)
+    rest, _ = manager.list_contracts(limit=10, after=after)
+
+    assert total is None
+    assert len(rest) == 3
+    assert not {c.id for c in first} & {c.id for c in rest}
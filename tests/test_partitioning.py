@@ -0,0 +1,100 @@
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from app.core import partitioning
+from app.core.contract_manager import ContractManager
+from app.core.partitioning import (
+    PartitionManager,
+    next_partition_start,
+    parse_partition_name,
+    partition_name,
+    partition_start
+)
+from app.models.database import BatchSummary, ValidationResult
+
+
+def test_partition_ranges_and_names():
+    assert partition_start(date(2025, 12, 17), "month") == date(2025, 12, 1)
+    assert next_partition_start(date(2025, 12, 1), "month") == date(2026, 1, 1)
+    assert next_partition_start(date(2025, 2, 28), "day") == date(2025, 3, 1)
+    
+    assert partition_name("validation_results", date(2025, 3, 1), "month") == "validation_results_p202503"
+    assert partition_name("batch_summaries", date(2025, 3, 9), "day") == "batch_summaries_p20250309"
+    
+    assert parse_partition_name("validation_results", "validation_results_p202503") == (date(2025, 3, 1), "month")
+    assert parse_partition_name("batch_summaries", "batch_summaries_p20250309") == (date(2025, 3, 9), "day")
+    assert parse_partition_name("validation_results", "validation_results_default") is None
+    
+    with pytest.raises(ValueError):
+        partition_start(date(2025, 1, 1), "week")
+
+
+def test_retention_without_partitions(db_session, sample_contract_data, monkeypatch):
+    monkeypatch.setattr(partitioning, "DELETE_BATCH_SIZE", 2)
+    contract = ContractManager(db_session).create_contract(sample_contract_data)
+    now = datetime.utcnow()
+    
+    for days_ago in (1, 100, 120, 150, 200):
+        at = now - timedelta(days=days_ago)
+        db_session.add(ValidationResult(
+            contract_id=contract.id, status="PASS", execution_time_ms=1.0, validated_at=at
+        ))
+        db_session.add(BatchSummary(
+            batch_id=f"batch-{days_ago}", contract_id=contract.id, total_records=1,
+            passed=1, failed=0, pass_rate=100.0, execution_time_ms=1.0, processed_at=at
+        ))
+    db_session.commit()
+    
+    manager = PartitionManager(db_session)
+    assert manager.ensure_partitions() == []
+    
+    removed = manager.apply_retention(now - timedelta(days=90))
+    
+    assert removed == {"validation_results": 4, "batch_summaries": 4, "validation_error_counts": 0}
+    assert db_session.query(ValidationResult).count() == 1
+    assert db_session.query(BatchSummary).one().batch_id == "batch-1"
+
+
+def test_retention_trims_default_partitions(db_session, monkeypatch):
+    monkeypatch.setattr(partitioning, "DELETE_BATCH_SIZE", 2)
+    now = datetime.utcnow()
+    
+    # Stand-ins for the Postgres default partitions
+    for table, column in partitioning.PARTITIONED_TABLES.items():
+        db_session.execute(text(f"CREATE TABLE {table}_default (id VARCHAR(36) PRIMARY KEY, {column} DATETIME)"))
+        for days_ago in (1, 100, 120, 150):
+            db_session.execute(
+                text(f"INSERT INTO {table}_default (id, {column}) VALUES (:id, :at)"),
+                {"id": f"{table}-{days_ago}", "at": now - timedelta(days=days_ago)}
+            )
+    db_session.commit()
+    
+    manager = PartitionManager(db_session)
+    monkeypatch.setattr(manager, "is_partitioned", lambda table: True)
+    monkeypatch.setattr(manager, "drop_partitions_before", lambda table, cutoff: [f"{table}_p202501"])
+    
+    removed = manager.apply_retention(now - timedelta(days=90))
+    
+    assert removed == {
+        "validation_results": 1,
+        "validation_results_default": 3,
+        "batch_summaries": 1,
+        "batch_summaries_default": 3,
+        "validation_error_counts": 0
+    }
+    for table in partitioning.PARTITIONED_TABLES:
+        assert db_session.execute(text(f"SELECT id FROM {table}_default")).scalars().all() == [f"{table}-1"]
+
+
+def test_batch_summary_is_unique_per_batch_and_time(db_session, sample_contract_data):
+    contract = ContractManager(db_session).create_contract(sample_contract_data)
+    processed_at = datetime.utcnow()
+    
+    for _ in range(2):
+        db_session.add(BatchSummary(
+            batch_id="batch-1", contract_id=contract.id, total_records=1,
+            passed=1, failed=0, pass_rate=100.0, execution_time_ms=1.0, processed_at=processed_at
+        ))
+    with pytest.raises(IntegrityError):
+        db_session.commit()
@@ -0,0 +1,79 @@
+import pytest
+from datetime import date, timedelta
+from sqlalchemy import event
+from app.core.contract_manager import ContractManager
+from app.core.platform_summary import PlatformSummaryCache, build_platform_summary
+from app.models.database import QualityMetric
+
+
+def add_contracts(db_session, sample_contract_data, count, prefix="contract"):
+    manager = ContractManager(db_session)
+    contracts = []
+    for i in range(count):
+        contract = manager.create_contract(sample_contract_data.model_copy(update={"name": f"{prefix}-{i}"}))
+        for days_ago in range(3):
+            db_session.add(QualityMetric(
+                contract_id=contract.id,
+                metric_date=date.today() - timedelta(days=days_ago),
+                total_validations=10,
+                passed=i,
+                failed=10 - i,
+                pass_rate=i * 10.0,
+                avg_execution_time_ms=1.0,
+                quality_score=float(i * 10 + days_ago)
+            ))
+        contracts.append(contract)
+    db_session.commit()
+    return contracts
+
+
+@pytest.fixture
+def query_counter(async_test_engine):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_test_engine.sync_engine, "before_cursor_execute", count)
+    yield statements
+    event.remove(async_test_engine.sync_engine, "before_cursor_execute", count)
+
+
+@pytest.mark.asyncio
+async def test_summary_query_count_is_constant(db_session, async_db_session, sample_contract_data, query_counter):
+    contracts = add_contracts(db_session, sample_contract_data, 8)
+
+    summary = await build_platform_summary(async_db_session, from_rollups=False)
+
+    assert len(query_counter) == 2
+    assert summary["total_contracts"] == summary["active_contracts"] == 8
+    assert summary["total_validations_today"] == 80
+    assert summary["avg_pass_rate"] == 35.0
+    assert [c["name"] for c in summary["top_performing_contracts"]] == [f"contract-{i}" for i in (7, 6, 5, 4, 3)]
+    assert [c["name"] for c in summary["contracts_needing_attention"]] == [f"contract-{i}" for i in (0, 1, 2, 3, 4)]
+    assert summary["top_performing_contracts"][0] == {
+        "contract_id": contracts[7].id,
+        "name": "contract-7",
+        "quality_score": 71.0
+    }
+
+
+@pytest.mark.asyncio
+async def test_summary_cache_serves_snapshot(db_session, async_db_session, sample_contract_data, query_counter):
+    add_contracts(db_session, sample_contract_data, 2)
+    cache = PlatformSummaryCache(ttl=60)
+
+    first = await cache.get(async_db_session)
+    queries = len(query_counter)
+    second = await cache.get(async_db_session)
+
+    assert second is first
+    assert len(query_counter) == queries
+
+    add_contracts(db_session, sample_contract_data, 1, prefix="later")
+    refreshed = await cache.refresh(async_db_session)
+    assert len(query_counter) > queries
+    assert refreshed["total_contracts"] == 3
+
+    cache.invalidate()
+    assert cache.current() is None
@@ -1,6 +1,8 @@
+import os
 import pytest
 from datetime import datetime, timedelta
 from app.core.quality_validator import QualityValidator
+from app.core.uniqueness_tracker import BLOOM_FLUSH_ROWS, ApproximateUniquenessTracker, ExactUniquenessTracker
 
 
 def test_freshness_check_pass():
@@ -151,4 +153,176 @@ def test_quality_score_calculation():
     
     result = validator.validate(data)
     assert result.quality_score < 100
-    assert result.quality_score >= 0
\ No newline at end of file
+    assert result.quality_score >= 0
+
+def test_accumulators_merge_matches_single_pass():
+    rules = {
+        "completeness": {"min_row_count": 10, "max_null_percentage": 20},
+        "uniqueness": {"fields": ["user_id"]},
+        "statistics": {"amount": {"mean": {"max": 40}, "std_dev": {"max": 5}}}
+    }
+    validator = QualityValidator(rules)
+    
+    data = [
+        {"user_id": f"usr_{i % 7}", "amount": float(i) if i % 4 else None}
+        for i in range(30)
+    ]
+    single = validator.validate(data)
+    
+    parts = [validator.create_accumulator() for _ in range(3)]
+    for i, part in enumerate(parts):
+        part.update(data[i * 10:(i + 1) * 10])
+    merged = parts[0].merge(parts[1].merge(parts[2]))
+    result = merged.finalize()
+    
+    assert [e.message for e in result.errors] == [e.message for e in single.errors]
+    assert any(e.rule_type == "UNIQUENESS" for e in result.errors)
+    assert any(e.rule_type == "COMPLETENESS" for e in result.errors)
+    assert result.quality_score == single.quality_score
+
+
+def test_accumulator_dataframe_matches_records():
+    import pandas as pd
+    
+    rules = {
+        "freshness": {"max_latency_hours": 1},
+        "completeness": {"max_null_percentage": 10},
+        "statistics": {"amount": {"std_dev": {"max": 1}}}
+    }
+    validator = QualityValidator(rules)
+    
+    old_time = (datetime.utcnow() - timedelta(hours=3)).isoformat()
+    data = [
+        {"timestamp": old_time, "amount": 1.0},
+        {"timestamp": datetime.utcnow().isoformat(), "amount": None},
+        {"timestamp": datetime.utcnow().isoformat(), "amount": 10.0}
+    ]
+    
+    record_result = validator.validate(data)
+    frame_result = validator.validate(pd.DataFrame(data))
+    
+    assert [e.rule_type for e in frame_result.errors] == [e.rule_type for e in record_result.errors]
+    assert [e.rule_type for e in record_result.errors] == ["FRESHNESS", "COMPLETENESS", "STATISTICS"]
+
+
+def test_uniqueness_exact_mode_spills_to_disk():
+    rules = {"uniqueness": {"fields": ["user_id"], "mode": "exact", "memory_budget_mb": 0.01}}
+    validator = QualityValidator(rules)
+    
+    accumulator = validator.create_accumulator()
+    for start in range(0, 2000, 500):
+        accumulator.update([{"user_id": f"usr_{i}"} for i in range(start, start + 500)])
+    accumulator.update([{"user_id": "usr_7"}, {"user_id": "usr_1999"}])
+    
+    tracker = accumulator.accumulators[0].trackers["user_id"]
+    assert tracker.bucket_dir is not None
+    spill_dir = tracker.bucket_dir
+    
+    result = accumulator.finalize()
+    
+    assert len(result.errors) == 1
+    assert result.errors[0].details == {"field": "user_id", "duplicate_count": 2}
+    assert "(2x)" in result.errors[0].message
+    assert tracker.bucket_dir is None
+    assert not os.path.exists(spill_dir)
+
+
+def test_uniqueness_approximate_mode_across_merges():
+    rules = {"uniqueness": {"fields": ["user_id"], "mode": "approximate", "expected_count": 10000}}
+    validator = QualityValidator(rules)
+    
+    parts = []
+    for start in range(0, 3000, 1000):
+        part = validator.create_accumulator()
+        part.update([{"user_id": f"usr_{i}"} for i in range(start, start + 1000)])
+        parts.append(part)
+    parts[2].update([{"user_id": "usr_5"}])
+    
+    merged = parts[0].merge(parts[1]).merge(parts[2])
+    result = merged.finalize()
+    
+    assert len(result.errors) == 1
+    assert result.errors[0].details == {"field": "user_id", "duplicate_count": 1}
+    assert "'usr_5' (2x)" in result.errors[0].message
+
+
+def test_uniqueness_approximate_mode_small_batch_skips_filter():
+    rules = {"uniqueness": {"fields": ["user_id"], "mode": "approximate"}}
+    accumulator = QualityValidator(rules).create_accumulator()
+    accumulator.update([{"user_id": "usr_1"}, {"user_id": "usr_2"}, {"user_id": "usr_1"}])
+    
+    tracker = accumulator.accumulators[0].trackers["user_id"]
+    result = accumulator.finalize()
+    
+    assert tracker.bloom.bits is None
+    assert result.errors[0].details["duplicate_count"] == 1
+    assert "'usr_1' (2x)" in result.errors[0].message
+
+
+def test_uniqueness_exact_mode_splits_large_buckets(monkeypatch):
+    tracker = ExactUniquenessTracker(memory_budget_mb=0.01)
+    for start in range(0, 20000, 1000):
+        tracker.add([f"usr_{i}" for i in range(start, start + 1000)])
+    tracker.add([f"usr_{i}" for i in range(0, 20000, 100)])
+    
+    partitioned = []
+    partition = tracker._partition
+    monkeypatch.setattr(tracker, "_partition", lambda path, depth: partitioned.append(depth) or partition(path, depth))
+    
+    duplicate_count, sample = tracker.duplicates()
+    tracker.close()
+    
+    assert duplicate_count == 200
+    assert all(count == 2 for _, count in sample)
+    assert partitioned and set(partitioned) == {1}
+
+
+@pytest.mark.parametrize("memory_budget_mb", [64, 0.0001])
+def test_uniqueness_keys_match_in_memory_and_spilled(memory_budget_mb):
+    tracker = ExactUniquenessTracker(memory_budget_mb)
+    for values in ([1, True, "1"], [1.0, None], [2.5, None]):
+        tracker.add(values)
+    
+    duplicate_count, sample = tracker.duplicates()
+    tracker.close()
+    
+    assert duplicate_count == 2
+    assert sorted(sample, key=repr) == [(1, 2), (None, 2)]
+
+
+def test_uniqueness_approximate_mode_confirms_candidates(tmp_path):
+    # A filter sized for far fewer values flags many false positives
+    tracker = ApproximateUniquenessTracker(
+        memory_budget_mb=1, expected_count=100_000, false_positive_rate=0.01, spill_dir=str(tmp_path)
+    )
+    tracker.max_candidates = 1000
+    for start in range(0, 2 * BLOOM_FLUSH_ROWS + 5000, 10000):
+        tracker.add([f"usr_{i}" for i in range(start, start + 10000)])
+    
+    assert tracker.inserted >= BLOOM_FLUSH_ROWS
+    assert tracker.duplicates() == (0, [])
+    assert tracker.overflow > 0
+    
+    tracker.add(["usr_7", "usr_150000", "usr_7"])
+    duplicate_count, sample = tracker.duplicates()
+    tracker.close()
+    
+    assert duplicate_count == 2
+    assert sorted(sample) == [("usr_150000", 2), ("usr_7", 3)]
+    assert os.listdir(tmp_path) == []
+
+
+def test_uniqueness_approximate_merge_finds_repeats_across_trackers(tmp_path):
+    def tracker(values):
+        part = ApproximateUniquenessTracker(1, expected_count=10 ** 6, false_positive_rate=0.01, spill_dir=str(tmp_path))
+        part.add(values)
+        return part
+    
+    first = tracker([f"usr_{i}" for i in range(BLOOM_FLUSH_ROWS)])
+    second = tracker([f"usr_{i}" for i in range(BLOOM_FLUSH_ROWS - 2, 2 * BLOOM_FLUSH_ROWS)])
+    assert first.inserted and second.inserted
+    
+    duplicate_count, _ = first.merge(second).duplicates()
+    first.close()
+    
+    assert duplicate_count == 2
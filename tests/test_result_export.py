@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+import pytest
+import pyarrow.parquet as pq
+from datetime import datetime, timedelta
+from app.core.contract_manager import ContractManager
+from app.core.result_export import EXPORT_COLUMNS, ResultExporter
+from app.models.database import ValidationResult
+
+
+@pytest.fixture
+def exported_contract(db_session, sample_contract_data):
+    contract = ContractManager(db_session).create_contract(sample_contract_data)
+    base = datetime(2025, 2, 10, 12)
+    for i in range(25):
+        failed = i % 5 == 0
+        db_session.add(ValidationResult(
+            contract_id=contract.id,
+            status="FAIL" if failed else "PASS",
+            data_snapshot={"user_id": f"usr_{i}"},
+            errors=[{"field": "email", "error_type": "FORMAT_INVALID"}] if failed else None,
+            execution_time_ms=float(i),
+            validated_at=base + timedelta(minutes=i)
+        ))
+    db_session.commit()
+    return contract
+
+
+def export(db_session, contract_id, export_format, **filters):
+    exporter = ResultExporter(db_session, batch_size=10)
+    chunks = list(exporter.stream(export_format, exporter.export_query(contract_id, **filters)))
+    return chunks, b"".join(chunks)
+
+
+def test_ndjson_export_streams_in_batches(db_session, exported_contract):
+    chunks, body = export(db_session, exported_contract.id, "ndjson")
+    records = [json.loads(line) for line in body.decode().splitlines()]
+
+    assert len(chunks) == 3
+    assert len(records) == 25
+    assert records[0]["data_snapshot"] == {"user_id": "usr_0"}
+    assert records[0]["validated_at"] == "2025-02-10T12:00:00"
+    assert [r["execution_time_ms"] for r in records] == [float(i) for i in range(25)]
+
+
+def test_csv_export_filters(db_session, exported_contract):
+    _, body = export(db_session, exported_contract.id, "csv", status="FAIL")
+    rows = list(csv.DictReader(io.StringIO(body.decode())))
+
+    assert len(rows) == 5
+    assert json.loads(rows[0]["errors"]) == [{"field": "email", "error_type": "FORMAT_INVALID"}]
+
+    _, empty = export(db_session, exported_contract.id, "csv", start_date=datetime(2030, 1, 1))
+    assert empty.decode().strip() == ",".join(EXPORT_COLUMNS)
+
+
+def test_parquet_export_row_groups(db_session, exported_contract):
+    chunks, body = export(db_session, exported_contract.id, "parquet")
+    parquet_file = pq.ParquetFile(io.BytesIO(body))
+
+    assert len(chunks) > 1
+    assert parquet_file.metadata.num_row_groups == 3
+    table = parquet_file.read()
+    assert table.num_rows == 25
+    assert table.column_names == EXPORT_COLUMNS
+    assert table.column("validated_at")[24].as_py() == datetime(2025, 2, 10, 12, 24)
@@ -0,0 +1,171 @@
+import threading
+import time
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.core.result_sink import ValidationResultSink
+from app.core.validation_engine import ValidationEngine
+from app.core.contract_manager import ContractManager
+from app.models.database import ValidationResult as DBValidationResult
+
+
+@pytest.fixture
+def session_factory(test_engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+
+
+def make_row(contract_id, i):
+    from datetime import datetime
+    return {
+        "id": f"00000000-0000-0000-0000-{i:012d}",
+        "contract_id": str(contract_id),
+        "status": "PASS",
+        "errors": None,
+        "execution_time_ms": 1.0,
+        "validated_at": datetime.utcnow(),
+        "batch_id": None
+    }
+
+
+def test_sink_flushes_on_size(db_session, session_factory, sample_contract_data):
+    contract = ContractManager(db_session).create_contract(sample_contract_data)
+    sink = ValidationResultSink(session_factory, batch_size=10, flush_interval=60)
+    sink.start()
+    
+    try:
+        for i in range(10):
+            sink.submit(make_row(contract.id, i))
+        
+        deadline = time.time() + 5
+        while sink.written < 10 and time.time() < deadline:
+            time.sleep(0.01)
+        
+        assert sink.written == 10
+    finally:
+        sink.stop()
+    
+    assert db_session.query(DBValidationResult).count() == 10
+
+
+def test_sink_backpressure_and_flush(db_session, session_factory, sample_contract_data):
+    contract = ContractManager(db_session).create_contract(sample_contract_data)
+    sink = ValidationResultSink(session_factory, batch_size=100, max_queue_size=2)
+    
+    sink.submit(make_row(contract.id, 1))
+    sink.submit(make_row(contract.id, 2))
+    
+    blocked = threading.Thread(target=sink.submit, args=(make_row(contract.id, 3),))
+    blocked.start()
+    blocked.join(timeout=0.2)
+    assert blocked.is_alive()
+    
+    assert sink.flush() >= 2
+    blocked.join(timeout=5)
+    assert not blocked.is_alive()
+    
+    sink.flush()
+    assert db_session.query(DBValidationResult).count() == 3
+
+
+@pytest.mark.asyncio
+async def test_engine_writes_through_running_sink(db_session, session_factory, sample_contract_data, monkeypatch):
+    import app.core.validation_engine as validation_engine_module
+    
+    contract = ContractManager(db_session).create_contract(sample_contract_data)
+    sink = ValidationResultSink(session_factory, batch_size=50, flush_interval=60)
+    monkeypatch.setattr(validation_engine_module, "result_sink", sink)
+    sink.start()
+    
+    engine = ValidationEngine(db_session)
+    for i in range(5):
+        await engine.validate_record(contract.id, {"user_id": f"usr_{i}", "email": "a@example.com"})
+    
+    assert db_session.query(DBValidationResult).count() == 0
+    
+    sink.stop()
+    
+    assert sink.written == 5
+    assert db_session.query(DBValidationResult).count() == 5
+
+
+@pytest.mark.asyncio
+async def test_full_sink_falls_back_to_direct_write(db_session, session_factory, sample_contract_data, monkeypatch):
+    import app.core.validation_engine as validation_engine_module
+    
+    contract = ContractManager(db_session).create_contract(sample_contract_data)
+    gate = threading.Event()
+    
+    def slow_session():
+        gate.wait(5)
+        return session_factory()
+    
+    sink = ValidationResultSink(slow_session, batch_size=1, flush_interval=60, max_queue_size=1)
+    monkeypatch.setattr(validation_engine_module, "result_sink", sink)
+    sink.start()
+    
+    try:
+        # The writer holds one row and the queue holds another
+        assert sink.offer(make_row(contract.id, 1))
+        deadline = time.time() + 5
+        while sink.pending() and time.time() < deadline:
+            time.sleep(0.01)
+        assert sink.offer(make_row(contract.id, 2))
+        assert not sink.offer(make_row(contract.id, 3))
+        
+        engine = ValidationEngine(db_session)
+        await engine.validate_record(contract.id, {"user_id": "usr_9", "email": "a@example.com"})
+        assert db_session.query(DBValidationResult).count() == 1
+    finally:
+        gate.set()
+        sink.stop()
+    
+    assert db_session.query(DBValidationResult).count() == 3
+
+
+def test_failed_writes_are_spilled_and_replayed(db_session, session_factory, sample_contract_data, tmp_path, monkeypatch):
+    import app.core.result_sink as result_sink_module
+    
+    monkeypatch.setattr(result_sink_module, "RETRY_BACKOFF", 0)
+    contract = ContractManager(db_session).create_contract(sample_contract_data)
+    database_up = False
+    
+    def flaky_session():
+        if not database_up:
+            raise ConnectionError("database unavailable")
+        return session_factory()
+    
+    sink = ValidationResultSink(flaky_session, batch_size=10, write_retries=2, spill_dir=str(tmp_path))
+    sink.submit(make_row(contract.id, 1))
+    sink.submit(make_row(contract.id, 2))
+    sink.flush()
+    
+    assert sink.spilled == 2
+    assert sink.dropped == 0
+    assert len(list(tmp_path.glob("*.jsonl"))) == 1
+    
+    database_up = True
+    assert sink.replay_spilled() == 2
+    assert list(tmp_path.glob("*.jsonl")) == []
+    rows = db_session.query(DBValidationResult).all()
+    assert len(rows) == 2
+    assert all(row.validated_at is not None for row in rows)
+
+
+def test_failing_spill_file_is_quarantined(db_session, session_factory, sample_contract_data, tmp_path):
+    contract = ContractManager(db_session).create_contract(sample_contract_data)
+    sink = ValidationResultSink(session_factory, spill_dir=str(tmp_path), replay_attempts=2)
+    
+    # contract_id is NOT NULL, so this batch can never be written
+    bad = make_row(contract.id, 1)
+    bad["contract_id"] = None
+    sink._spill([bad])
+    sink._spill([make_row(contract.id, 2)])
+    
+    replayed = sink.replay_spilled()
+    assert sink.quarantined == 0
+    assert len(list(tmp_path.glob("*.jsonl"))) == 2 - replayed
+    
+    assert replayed + sink.replay_spilled() == 1
+    assert list(tmp_path.glob("*.jsonl")) == []
+    assert len(list((tmp_path / "quarantine").glob("*.jsonl"))) == 1
+    assert sink.quarantined == 1
+    assert db_session.query(DBValidationResult).count() == 1
@@ -172,4 +172,31 @@ def test_validate_array():
     
     errors = validator.validate(data)
     assert len(errors) == 1
-    assert "items[1]" in errors[0].field
\ No newline at end of file
+    assert "items[1]" in errors[0].field
+
+def test_compiled_checks_only_for_declared_constraints(simple_schema):
+    validator = SchemaValidator(simple_schema)
+    
+    checks = {field.name: len(field.checks) for field in validator.fields}
+    
+    assert checks == {"user_id": 1, "email": 1, "age": 2}
+
+
+def test_validate_enum_compiled():
+    schema = ContractSchema(
+        contract_version="1.0",
+        domain="test",
+        schema={
+            "country": FieldDefinition(type="string", enum=["US", "GB"]),
+            "tier": FieldDefinition(type="integer", enum=[1, 2, 3])
+        }
+    )
+    
+    validator = SchemaValidator(schema)
+    
+    assert validator.validate({"country": "US", "tier": 2}) == []
+    
+    errors = validator.validate({"country": "FR", "tier": 7})
+    assert [e.error_type for e in errors] == ["ENUM_MISMATCH", "ENUM_MISMATCH"]
+    assert errors[0].expected == "['US', 'GB']"
+    assert errors[1].value == "7"
@@ -0,0 +1,146 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.contract_manager import ContractManager
+from app.core.file_handlers import JSONLHandler
+from app.core.telemetry import (
+    CHUNK_READ_SECONDS,
+    HTTP_REQUESTS,
+    RECORDS_VALIDATED,
+    VALIDATION_ERRORS,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsMiddleware,
+    MetricsRegistry,
+    StageTimings,
+)
+from app.core.validation_engine import ValidationEngine
+
+
+def test_render_text_exposition():
+    registry = MetricsRegistry()
+    requests = Counter("requests_total", "Requests", ["path"], registry=registry)
+    depth = Gauge("queue_depth", "Queue depth", registry=registry)
+    latency = Histogram("latency_seconds", "Latency", buckets=[0.1, 1.0], registry=registry)
+
+    requests.labels('/a "quoted"\\path').inc(2)
+    depth.set_function(lambda: 7)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value)
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{path="/a \\"quoted\\"\\\\path"} 2.0',
+        "# HELP queue_depth Queue depth",
+        "# TYPE queue_depth gauge",
+        "queue_depth 7",
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1.0"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        "latency_seconds_sum 3.65",
+        "latency_seconds_count 4",
+    ]
+
+
+def test_labels_are_bound_once():
+    registry = MetricsRegistry()
+    counter = Counter("events_total", "Events", ["kind", "code"], registry=registry)
+
+    child = counter.labels("a", 200)
+    assert counter.labels("a", 200) is child
+    assert counter.labels("a", "200") is child
+
+    child.inc()
+    counter.labels("a", "200").inc()
+    assert registry.render().count("events_total{") == 1
+    assert 'events_total{kind="a",code="200"} 2.0' in registry.render()
+
+    with pytest.raises(ValueError):
+        counter.labels("a")
+    with pytest.raises(ValueError):
+        Counter("events_total", "Duplicate", registry=registry)
+
+
+def test_failing_gauge_is_skipped():
+    registry = MetricsRegistry()
+    gauge = Gauge("broken", "Broken", registry=registry)
+    gauge.set_function(lambda: 1 / 0)
+
+    assert registry.render().splitlines() == ["# HELP broken Broken", "# TYPE broken gauge"]
+
+
+@pytest.mark.asyncio
+async def test_validation_records_metrics(db_session, sample_contract_data):
+    contract = ContractManager(db_session).create_contract(sample_contract_data)
+    engine = ValidationEngine(db_session)
+    records = [
+        {"user_id": "usr_1", "email": "a@example.com"},
+        {"user_id": "bad", "email": "b@example.com"},
+        {"user_id": "usr_3", "email": "c@example.com", "age": "old"},
+    ]
+
+    await engine.validate_batch(contract.id, records, check_quality=False)
+    await engine.validate_record(contract.id, records[1])
+
+    contract_id = str(contract.id)
+    assert RECORDS_VALIDATED.labels(contract_id, "batch", "pass").value == 1
+    assert RECORDS_VALIDATED.labels(contract_id, "batch", "fail").value == 2
+    assert RECORDS_VALIDATED.labels(contract_id, "record", "fail").value == 1
+    assert VALIDATION_ERRORS.labels(contract_id, "PATTERN_MISMATCH").value == 2
+    assert VALIDATION_ERRORS.labels(contract_id, "TYPE_MISMATCH").value == 1
+
+
+@pytest.mark.asyncio
+async def test_stage_timings(db_session, sample_contract_data):
+    contract = ContractManager(db_session).create_contract(sample_contract_data)
+    record = {"user_id": "usr_1", "email": "a@example.com"}
+
+    engine = ValidationEngine(db_session)
+    engine.set_stage_timings(StageTimings())
+    result = await engine.validate_record(contract.id, record)
+    assert list(result.timings) == ["lookup", "load", "parse", "compile", "schema", "quality", "store"]
+    assert all(ms >= 0 for ms in result.timings.values())
+
+    # The compiled validator is cached now
+    timings = StageTimings()
+    engine.set_stage_timings(timings)
+    result = await engine.validate_batch(contract.id, [record, record])
+    assert list(result.timings) == ["lookup", "schema", "quality"]
+    assert timings.server_timing().startswith("lookup;dur=")
+
+    engine.set_stage_timings(None)
+    assert (await engine.validate_record(contract.id, record)).timings is None
+
+
+def test_chunk_reads_are_timed(tmp_path):
+    path = tmp_path / "data.jsonl"
+    path.write_text("\n".join('{"id": %d}' % i for i in range(25)))
+    observed = CHUNK_READ_SECONDS.labels("jsonl")
+    before = observed.count
+
+    handler = JSONLHandler()
+    chunks = list(handler.timed(handler.read_chunks(str(path), 10)))
+
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert observed.count - before == 3
+
+
+def test_http_requests_labeled_by_route():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/telemetry-test/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    client = TestClient(app)
+    for item_id in (1, 2, 3):
+        client.get(f"/telemetry-test/{item_id}")
+    client.get("/telemetry-test/not-a-number")
+
+    assert HTTP_REQUESTS.labels("GET", "/telemetry-test/{item_id}", "200").value == 3
+    assert HTTP_REQUESTS.labels("GET", "/telemetry-test/{item_id}", "422").value == 1
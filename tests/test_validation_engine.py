@@ -90,4 +90,49 @@ async def test_contract_not_found(db_session):
     engine = ValidationEngine(db_session)
     
     with pytest.raises(ValueError, match="not found"):
-        await engine.validate_record(uuid4(), {})
\ No newline at end of file
+        await engine.validate_record(uuid4(), {})
+
+@pytest.mark.asyncio
+async def test_async_validate_record_storage(db_session, async_db_session, sample_contract_data):
+    from sqlalchemy import select
+    from app.core.validation_engine import AsyncValidationEngine
+    from app.models.database import ValidationResult as DBValidationResult
+    
+    manager = ContractManager(db_session)
+    contract = manager.create_contract(sample_contract_data)
+    
+    engine = AsyncValidationEngine(async_db_session)
+    
+    passed = await engine.validate_record(contract.id, {"user_id": "usr_1", "email": "a@example.com"})
+    failed = await engine.validate_record(contract.id, {"user_id": "bad", "email": "a@example.com"})
+    
+    assert passed.status == "PASS"
+    assert failed.status == "FAIL"
+    
+    result = await async_db_session.execute(
+        select(DBValidationResult.status).where(DBValidationResult.contract_id == str(contract.id))
+    )
+    assert sorted(result.scalars().all()) == ["FAIL", "PASS"]
+
+
+@pytest.mark.asyncio
+async def test_async_validate_batch_matches_sync(db_session, async_db_session, sample_contract_data):
+    from app.core.validation_engine import AsyncValidationEngine
+    
+    manager = ContractManager(db_session)
+    contract = manager.create_contract(sample_contract_data)
+    
+    data = [
+        {"user_id": "usr_1", "email": "test1@example.com", "age": 25},
+        {"user_id": "invalid", "email": "test2@example.com", "age": 30},
+        {"user_id": "usr_3", "email": "test3@example.com", "age": 35}
+    ]
+    
+    sync_result = await ValidationEngine(db_session).validate_batch(contract.id, data)
+    async_result = await AsyncValidationEngine(async_db_session).validate_batch(contract.id, data)
+    
+    assert async_result.passed == sync_result.passed == 2
+    assert async_result.errors_summary == sync_result.errors_summary
+    
+    with pytest.raises(ValueError, match="not found"):
+        await AsyncValidationEngine(async_db_session).validate_batch(uuid4(), data)
@@ -0,0 +1,98 @@
+import pytest
+from app.core.validator_cache import ValidatorCache, CompiledValidator, validator_cache
+from app.core.validation_engine import ValidationEngine
+from app.core.contract_manager import ContractManager
+from app.core.version_controller import VersionController
+from app.models.schemas import ContractSchema, FieldDefinition
+
+
+def make_compiled(contract_id, version):
+    schema = ContractSchema(
+        contract_version="1.0",
+        domain="test",
+        schema={"user_id": FieldDefinition(type="string", required=True)}
+    )
+    return CompiledValidator(contract_id, version, schema)
+
+
+def test_cache_get_put():
+    cache = ValidatorCache(max_size=4)
+    compiled = make_compiled("c1", "1.0.0")
+
+    assert cache.get("c1", "1.0.0") is None
+    cache.put(compiled)
+
+    assert cache.get("c1", "1.0.0") is compiled
+    assert cache.get("c1", "1.1.0") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_cache_lru_eviction():
+    cache = ValidatorCache(max_size=2)
+    cache.put(make_compiled("c1", "1.0.0"))
+    cache.put(make_compiled("c2", "1.0.0"))
+
+    cache.get("c1", "1.0.0")
+    cache.put(make_compiled("c3", "1.0.0"))
+
+    assert len(cache) == 2
+    assert cache.get("c2", "1.0.0") is None
+    assert cache.get("c1", "1.0.0") is not None
+    assert cache.get("c3", "1.0.0") is not None
+
+
+def test_cache_invalidate_all_versions():
+    cache = ValidatorCache(max_size=4)
+    cache.put(make_compiled("c1", "1.0.0"))
+    cache.put(make_compiled("c1", "2.0.0"))
+    cache.put(make_compiled("c2", "1.0.0"))
+
+    assert cache.invalidate("c1") == 2
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_engine_reuses_compiled_validator(db_session, sample_contract_data):
+    validator_cache.clear()
+    manager = ContractManager(db_session)
+    contract = manager.create_contract(sample_contract_data)
+
+    engine = ValidationEngine(db_session)
+    first = engine.get_compiled_validator(contract.id)
+    second = engine.get_compiled_validator(contract.id)
+
+    assert first is second
+    assert first.version == "1.0.0"
+
+
+@pytest.mark.asyncio
+async def test_new_version_invalidates_cache(db_session, sample_contract_data):
+    validator_cache.clear()
+    manager = ContractManager(db_session)
+    contract = manager.create_contract(sample_contract_data)
+
+    engine = ValidationEngine(db_session)
+    data = {"user_id": "usr_1", "email": "test@example.com", "country": "US"}
+    result = await engine.validate_record(contract.id, data)
+    assert result.status == "PASS"
+
+    new_yaml = """contract_version: "1.0"
+domain: "test"
+schema:
+  user_id:
+    type: string
+    required: true
+  country:
+    type: string
+    required: true
+    enum: ["GB"]
+"""
+    VersionController(db_session).create_version(str(contract.id), new_yaml, "tester")
+
+    assert validator_cache.get(contract.id, "1.0.0") is None
+
+    result = await engine.validate_record(contract.id, data)
+    assert result.status == "FAIL"
+    assert result.contract_version != "1.0.0"
+    assert result.errors[0].error_type == "ENUM_MISMATCH"